@@ -0,0 +1,78 @@
+"""Add pg_trgm GIN indexes for autocomplete and fuzzy matching.
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-10-18
+
+Enables the pg_trgm extension and adds GIN trigram indexes so that
+ILIKE, similarity (%) and word similarity (<%) lookups used by the
+autocomplete endpoints are index-assisted instead of sequential scans:
+- projects.name
+- tags.name
+- organizations.name and organizations.aliases
+- contacts.name and contacts.email
+
+organizations.aliases is an array, so it is indexed through an IMMUTABLE
+wrapper around array_to_string (which is only STABLE and cannot be used
+in an index expression directly).
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "032"
+down_revision: str | None = "031"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and create trigram indexes."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION npd_array_to_text(text[])
+        RETURNS text
+        LANGUAGE sql
+        IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT coalesce(array_to_string($1, ' '), '') $$
+    """)
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_projects_name_trgm "
+        "ON projects USING gin (name gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tags_name_trgm "
+        "ON tags USING gin (name gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_organizations_name_trgm "
+        "ON organizations USING gin (name gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_organizations_aliases_trgm "
+        "ON organizations USING gin "
+        "(npd_array_to_text(aliases::text[]) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_contacts_name_trgm "
+        "ON contacts USING gin (name gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_contacts_email_trgm "
+        "ON contacts USING gin (email gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Drop trigram indexes (the extension is left installed)."""
+    op.execute("DROP INDEX IF EXISTS ix_contacts_email_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_contacts_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_organizations_aliases_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_organizations_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_tags_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_projects_name_trgm")
+    op.execute("DROP FUNCTION IF EXISTS npd_array_to_text(text[])")
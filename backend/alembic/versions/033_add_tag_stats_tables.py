@@ -0,0 +1,89 @@
+"""Add materialised tag usage and co-occurrence statistics.
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-10-18
+
+Creates:
+- tag_usage_stats: number of projects per tag
+- tag_cooccurrence: number of projects per tag pair (stored in both
+  directions so per-tag lookups are primary-key range scans)
+
+Both tables are populated from project_tags here and then maintained
+incrementally by TagStatsService, with a periodic full reconciliation
+(/cron/tag-stats).
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "033"
+down_revision: str | None = "032"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create and populate tag statistics tables."""
+    op.create_table(
+        "tag_usage_stats",
+        sa.Column("tag_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("usage_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("tag_id"),
+    )
+    op.create_index(
+        "ix_tag_usage_stats_usage_count",
+        "tag_usage_stats",
+        ["usage_count"],
+    )
+
+    op.create_table(
+        "tag_cooccurrence",
+        sa.Column("tag_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("other_tag_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["other_tag_id"], ["tags.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("tag_id", "other_tag_id"),
+    )
+    op.create_index(
+        "ix_tag_cooccurrence_tag_count",
+        "tag_cooccurrence",
+        ["tag_id", "project_count"],
+    )
+
+    op.execute("""
+        INSERT INTO tag_usage_stats (tag_id, usage_count)
+        SELECT tags.id, count(project_tags.project_id)
+        FROM tags
+        LEFT JOIN project_tags ON project_tags.tag_id = tags.id
+        GROUP BY tags.id
+    """)
+    op.execute("""
+        INSERT INTO tag_cooccurrence (tag_id, other_tag_id, project_count)
+        SELECT pt1.tag_id, pt2.tag_id, count(*)
+        FROM project_tags pt1
+        JOIN project_tags pt2
+          ON pt2.project_id = pt1.project_id AND pt2.tag_id <> pt1.tag_id
+        GROUP BY pt1.tag_id, pt2.tag_id
+    """)
+
+
+def downgrade() -> None:
+    """Drop tag statistics tables."""
+    op.drop_index("ix_tag_cooccurrence_tag_count", table_name="tag_cooccurrence")
+    op.drop_table("tag_cooccurrence")
+    op.drop_index("ix_tag_usage_stats_usage_count", table_name="tag_usage_stats")
+    op.drop_table("tag_usage_stats")
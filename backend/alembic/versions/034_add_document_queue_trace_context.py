@@ -0,0 +1,32 @@
+"""Add trace context to the document processing queue.
+
+Revision ID: 034
+Revises: 033
+Create Date: 2026-10-18
+
+Stores the W3C traceparent of the request that enqueued a document so the
+queue processor can continue the same trace (see app.core.tracing).
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "034"
+down_revision: str | None = "033"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_processing_queue",
+        sa.Column("trace_context", sa.String(55), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("document_processing_queue", "trace_context")
@@ -0,0 +1,89 @@
+"""Add per-document processing stage timings.
+
+Revision ID: 035
+Revises: 034
+Create Date: 2026-10-18
+
+Creates document_processing_runs: one row per processing run of a document
+with the time spent in each stage (storage read, extraction, chunking,
+embedding, tag suggestion, database write) and embedding cache counters.
+Aggregated by DocumentStatsService for the admin analytics endpoint.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "035"
+down_revision: str | None = "034"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_processing_runs",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("document_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("mime_type", sa.String(100), nullable=False),
+        sa.Column("file_size", sa.BigInteger(), nullable=False),
+        sa.Column("extraction_method", sa.String(20), nullable=True),
+        sa.Column("total_ms", sa.Float(), nullable=False),
+        sa.Column("storage_read_ms", sa.Float(), nullable=True),
+        sa.Column("extraction_ms", sa.Float(), nullable=True),
+        sa.Column("chunking_ms", sa.Float(), nullable=True),
+        sa.Column("embedding_ms", sa.Float(), nullable=True),
+        sa.Column("tag_suggestion_ms", sa.Float(), nullable=True),
+        sa.Column("db_write_ms", sa.Float(), nullable=True),
+        sa.Column("text_length", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunk_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "embedding_requests", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "embedding_cache_hits", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "embeddings_reused", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_document_processing_runs_document_id",
+        "document_processing_runs",
+        ["document_id"],
+    )
+    op.create_index(
+        "ix_document_processing_runs_created_at",
+        "document_processing_runs",
+        ["created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_document_processing_runs_created_at",
+        table_name="document_processing_runs",
+    )
+    op.drop_index(
+        "ix_document_processing_runs_document_id",
+        table_name="document_processing_runs",
+    )
+    op.drop_table("document_processing_runs")
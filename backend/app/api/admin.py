@@ -1,15 +1,16 @@
 """Admin API endpoints (requires admin role)."""
 
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import httpx
 from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import delete, func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import AdminUser, DbSession
-from app.core.file_utils import read_file_with_size_limit
+from app.core.file_utils import read_file_with_size_limit, read_file_with_spooling
 from app.core.logging import get_logger
 from app.core.rate_limit import admin_limit, limiter
 from app.models import Tag, TagSynonym, TagType
@@ -41,8 +42,21 @@ from app.schemas.job import JobListResponse, JobResponse, JobStatsResponse
 from app.schemas.metrics import (
     CacheMetrics,
     DatabaseMetrics,
+    DatabaseStorageResponse,
+    DocumentProcessingAnalyticsResponse,
     EndpointMetrics,
     ErrorRateMetrics,
+    EventLoopMetrics,
+    LatencySummary,
+    OllamaLaneMetrics,
+    OllamaMetricsResponse,
+    PoolMetrics,
+    QueryLabelMetrics,
+    QueryMetricsResponse,
+    RepeatedStatementMetrics,
+    SlowQueryCaptureEntry,
+    SlowQueryCaptureResponse,
+    StatementStatsResponse,
     SystemMetricsResponse,
 )
 from app.schemas.monday import (
@@ -70,6 +84,12 @@ from app.schemas.monday import (
     SyncQueueListResponse,
     SyncQueueStatsResponse,
 )
+from app.schemas.profiling import (
+    ProfileSummary,
+    ProfileTargetRequest,
+    ProfileTargetResponse,
+    ProfileTokenResponse,
+)
 from app.schemas.search import SavedSearchResponse
 from app.schemas.tag import (
     StructuredTagCreate,
@@ -163,7 +183,7 @@ async def create_structured_tag(
     )
 
     # Invalidate tag cache
-    await invalidate_tag_cache()
+    await invalidate_tag_cache(db)
 
     return TagResponse.model_validate(tag)
 
@@ -219,7 +239,7 @@ async def update_tag(
     )
 
     # Invalidate tag cache
-    await invalidate_tag_cache()
+    await invalidate_tag_cache(db)
 
     return TagResponse.model_validate(tag)
 
@@ -257,7 +277,7 @@ async def delete_tag(
     )
 
     # Invalidate tag cache
-    await invalidate_tag_cache()
+    await invalidate_tag_cache(db)
 
 
 @router.get("/tags/{tag_id}/usage")
@@ -352,7 +372,7 @@ async def merge_tags(
     )
 
     # Invalidate tag cache
-    await invalidate_tag_cache()
+    await invalidate_tag_cache(db)
 
     return TagMergeResponse(
         merged_count=merged_count,
@@ -460,9 +480,11 @@ async def get_cache_statistics(
     - Organization cache (15-minute TTL)
     - Dashboard cache (5-minute TTL)
     - Search cache (5-minute TTL)
+    - NL query parse cache (24-hour TTL)
     """
     from app.services.cache_service import (
         get_dashboard_cache,
+        get_nl_parse_cache,
         get_org_cache,
         get_tag_cache,
     )
@@ -473,6 +495,7 @@ async def get_cache_statistics(
         "org_cache": get_org_cache().stats,
         "dashboard_cache": get_dashboard_cache().stats,
         "search_cache": get_search_cache().stats,
+        "nl_parse_cache": get_nl_parse_cache().stats,
     }
 
 
@@ -523,6 +546,8 @@ async def preview_import(
         include_suggestions=include_suggestions,
         user_id=admin_user.id,
     )
+    if import_service.created_tag_count:
+        await invalidate_tag_cache(db)
 
     valid_rows = sum(1 for r in rows if r.validation.is_valid)
     invalid_rows = len(rows) - valid_rows
@@ -574,6 +599,94 @@ async def commit_import(
     )
 
 
+@router.post(
+    "/import/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@limiter.limit(admin_limit)
+async def start_import_job(
+    request: Request,
+    db: DbSession,
+    admin_user: AdminUser,
+    file: UploadFile = File(...),
+    skip_invalid: bool = Query(default=True, description="Skip rows that fail"),
+) -> JobResponse:
+    """
+    Upload a CSV or XLSX file and import it as a background job.
+
+    The file is parsed and committed in checkpointed batches by a bulk_import
+    job. Poll GET /import/jobs/{job_id}: ``result`` holds the progress and
+    per-row errors, and a retried job resumes after its last batch.
+    """
+    from app.config import get_settings
+    from app.core.storage import StorageService
+    from app.models.job import JobType
+
+    filename = file.filename or ""
+    if not filename.lower().endswith((".csv", ".xlsx")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only CSV and XLSX files are supported",
+        )
+
+    spooled_file = await read_file_with_spooling(
+        file=file,
+        max_size_bytes=get_settings().max_file_size_bytes,
+    )
+    try:
+        if spooled_file.seek(0, 2) == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is empty",
+            )
+        spooled_file.seek(0)
+        # Uploads are stored in a folder of their own until the job is done
+        file_path = await StorageService().save_file(
+            spooled_file,
+            filename=filename,
+            project_id=str(uuid4()),
+        )
+    finally:
+        spooled_file.close()
+
+    job = await JobService(db).create_job(
+        job_type=JobType.BULK_IMPORT,
+        payload={
+            "file_path": file_path,
+            "filename": filename,
+            "user_id": str(admin_user.id),
+            "skip_invalid": skip_invalid,
+        },
+        created_by=admin_user.id,
+        deduplicate=False,
+    )
+    await db.refresh(job)
+
+    return JobResponse.model_validate(job)
+
+
+@router.get("/import/jobs/{job_id}", response_model=JobResponse)
+@limiter.limit(admin_limit)
+async def get_import_job(
+    request: Request,
+    job_id: UUID,
+    db: DbSession,
+    admin_user: AdminUser,
+) -> JobResponse:
+    """Get a file import job, with its progress and per-row errors."""
+    from app.models.job import JobType
+
+    job = await JobService(db).get_job(job_id)
+    if not job or job.job_type != JobType.BULK_IMPORT:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
+        )
+
+    return JobResponse.model_validate(job)
+
+
 @router.post("/import/validate-rows", response_model=ImportRowsValidateResponse)
 @limiter.limit(admin_limit)
 async def validate_import_rows(
@@ -1777,32 +1890,41 @@ async def get_system_metrics(
 ) -> SystemMetricsResponse:
     """Get comprehensive system performance metrics. Admin only.
 
+    Request metrics are merged across all live workers (via Redis when
+    configured) and grouped by route template.
+
     Returns:
-    - Request timing percentiles (P50, P95, P99) by endpoint
+    - Request timing percentiles (P50, P95, P99) overall and by endpoint
     - Error rates (4xx and 5xx)
     - Cache statistics
-    - Database pool configuration
+    - Database pool configuration and live usage (this worker)
+    - Event loop lag and the functions that blocked the loop
+    - Hybrid search ranking branches dropped at their deadline
     """
     from datetime import UTC, datetime
 
     from app.config import get_settings
+    from app.core.pool_stats import pool_status
+    from app.database import engine
     from app.services.cache_service import (
         get_dashboard_cache,
+        get_nl_parse_cache,
         get_org_cache,
         get_tag_cache,
     )
-    from app.services.metrics_service import get_metrics_service
+    from app.services.metrics_service import get_fleet_snapshot, get_metrics_service
     from app.services.search_cache import get_search_cache
 
     settings = get_settings()
     metrics = get_metrics_service()
+    snapshot = await get_fleet_snapshot()
 
     # Get endpoint metrics
-    endpoint_data = metrics.get_endpoint_metrics(top_n=top_endpoints)
+    endpoint_data = snapshot.endpoint_metrics(top_n=top_endpoints)
     endpoints = [EndpointMetrics(**ep) for ep in endpoint_data]
 
     # Get error rates
-    error_rates = metrics.get_error_rates()
+    error_rates = snapshot.error_rates()
 
     # Get cache stats
     cache_metrics = CacheMetrics(
@@ -1810,25 +1932,293 @@ async def get_system_metrics(
         org_cache=get_org_cache().stats,
         dashboard_cache=get_dashboard_cache().stats,
         search_cache=get_search_cache().stats,
+        nl_parse_cache=get_nl_parse_cache().stats,
     )
 
     # Database config
     db_metrics = DatabaseMetrics(
         pool_size=settings.db_pool_size,
         max_overflow=settings.db_max_overflow,
+        pool=PoolMetrics(**pool_status(engine.pool)),
     )
 
     return SystemMetricsResponse(
         collected_at=datetime.now(UTC),
         uptime_seconds=metrics.get_uptime_seconds(),
+        workers=snapshot.workers,
         request_metrics=ErrorRateMetrics(**error_rates),
+        latency=LatencySummary(**snapshot.latency_summary()),
         endpoints=endpoints,
         cache=cache_metrics,
         database=db_metrics,
+        event_loop=EventLoopMetrics(**snapshot.loop_summary()),
+        search_branch_timeouts=dict(snapshot.search_branch_timeouts),
         slow_request_threshold_ms=500.0,
     )
 
 
+@router.get("/metrics/queries", response_model=QueryMetricsResponse)
+@limiter.limit(admin_limit)
+async def get_query_metrics(
+    request: Request,
+    admin_user: AdminUser,
+    top: int = Query(20, ge=1, le=100, description="Number of entries to return"),
+) -> QueryMetricsResponse:
+    """Get SQL statement counts per route and job type. Admin only.
+
+    Statistics cover this worker since startup. Returns routes/jobs ordered by
+    total statements issued, and the statement fingerprints most often
+    repeated above QUERY_REPEAT_THRESHOLD within one request (likely N+1).
+    """
+    from datetime import UTC, datetime
+
+    from app.config import get_settings
+    from app.core.query_stats import get_query_stats_registry
+
+    summary = get_query_stats_registry().summary(top_n=top)
+
+    return QueryMetricsResponse(
+        collected_at=datetime.now(UTC),
+        repeat_threshold=get_settings().query_repeat_threshold,
+        labels=[QueryLabelMetrics(**entry) for entry in summary["labels"]],
+        repeated_statements=[
+            RepeatedStatementMetrics(**entry)
+            for entry in summary["repeated_statements"]
+        ],
+    )
+
+
+@router.get("/metrics/slow-queries", response_model=SlowQueryCaptureResponse)
+@limiter.limit(admin_limit)
+async def get_slow_query_captures(
+    request: Request,
+    admin_user: AdminUser,
+    limit: int = Query(20, ge=1, le=100, description="Number of captures to return"),
+    label: str | None = Query(
+        None, description="Only captures for this label (e.g. search:vector)"
+    ),
+) -> SlowQueryCaptureResponse:
+    """Get recent EXPLAIN (ANALYZE, BUFFERS) captures of slow queries. Admin only.
+
+    Captures are opt-in (SLOW_QUERY_EXPLAIN_ENABLED), sampled and kept per
+    worker, most recent first. Parameter values are redacted from plans.
+    """
+    from app.config import get_settings
+    from app.services.slow_query_capture import get_slow_query_capture_service
+
+    settings = get_settings()
+    captures = get_slow_query_capture_service().get_captures(limit=limit, label=label)
+
+    return SlowQueryCaptureResponse(
+        enabled=settings.slow_query_explain_enabled,
+        threshold_ms=settings.slow_query_explain_threshold_ms,
+        captures=[
+            SlowQueryCaptureEntry.model_validate(capture, from_attributes=True)
+            for capture in captures
+        ],
+    )
+
+
+@router.get("/metrics/database/statements", response_model=StatementStatsResponse)
+@limiter.limit(admin_limit)
+async def get_database_statements(
+    request: Request,
+    db: DbSession,
+    admin_user: AdminUser,
+    limit: int = Query(20, ge=1, le=100, description="Number of statements"),
+    order_by: str = Query(
+        "total_time", enum=["total_time", "mean_time", "calls", "shared_blks_read"]
+    ),
+) -> StatementStatsResponse:
+    """Get the top statements from pg_stat_statements. Admin only.
+
+    Requires the pg_stat_statements extension (preloaded via
+    shared_preload_libraries); otherwise returns available=false with the
+    reason. Cached for DB_STATS_CACHE_TTL seconds.
+    """
+    from app.services.db_stats_service import DatabaseStatsService
+
+    stats = await DatabaseStatsService(db).get_statement_stats(
+        limit=limit, order_by=order_by
+    )
+    return StatementStatsResponse(**stats)
+
+
+@router.get("/metrics/database/storage", response_model=DatabaseStorageResponse)
+@limiter.limit(admin_limit)
+async def get_database_storage(
+    request: Request,
+    db: DbSession,
+    admin_user: AdminUser,
+    limit: int = Query(20, ge=1, le=100, description="Indexes per list"),
+) -> DatabaseStorageResponse:
+    """Get table/index sizes, index usage and search index health. Admin only.
+
+    Reports document_chunks, documents, audit_logs and projects with their
+    indexes, unused and most-scanned indexes, and the state of HNSW/GIN
+    indexes. Cached for DB_STATS_CACHE_TTL seconds.
+    """
+    from app.services.db_stats_service import DatabaseStatsService
+
+    stats = await DatabaseStatsService(db).get_storage_stats(limit=limit)
+    return DatabaseStorageResponse(**stats)
+
+
+@router.get(
+    "/metrics/document-processing",
+    response_model=DocumentProcessingAnalyticsResponse,
+)
+@limiter.limit(admin_limit)
+async def get_document_processing_analytics(
+    request: Request,
+    db: DbSession,
+    admin_user: AdminUser,
+    hours: int = Query(24, ge=1, le=24 * 90, description="Look-back window"),
+) -> DocumentProcessingAnalyticsResponse:
+    """Get document processing stage timings and throughput. Admin only.
+
+    Aggregates processing runs by MIME type and file size bucket: p50/p95
+    per stage (storage read, extraction, chunking, embedding, tag
+    suggestion, DB write), documents per hour, bytes per second and
+    embedding cache usage. Cached for DB_STATS_CACHE_TTL seconds.
+    """
+    from app.services.document_stats_service import DocumentStatsService
+
+    analytics = await DocumentStatsService(db).get_processing_analytics(hours=hours)
+    return DocumentProcessingAnalyticsResponse(**analytics)
+
+
+@router.get("/metrics/database/pool", response_model=PoolMetrics)
+@limiter.limit(admin_limit)
+async def get_database_pool(
+    request: Request,
+    admin_user: AdminUser,
+) -> PoolMetrics:
+    """Get live connection pool usage and checkout wait times. Admin only.
+
+    Pool statistics are per worker and never cached.
+    """
+    from app.core.pool_stats import pool_status
+    from app.database import engine
+
+    return PoolMetrics(**pool_status(engine.pool))
+
+
+@router.get("/metrics/ollama", response_model=OllamaMetricsResponse)
+@limiter.limit(admin_limit)
+async def get_ollama_metrics(
+    request: Request,
+    admin_user: AdminUser,
+) -> OllamaMetricsResponse:
+    """Get Ollama queue depth per priority lane and circuit states. Admin only.
+
+    Admission control and circuit breakers are per worker and never cached.
+    """
+    from app.core.circuit_breaker import get_circuit_breakers
+    from app.core.ollama_scheduler import get_ollama_scheduler
+
+    scheduler = get_ollama_scheduler()
+    return OllamaMetricsResponse(
+        enabled=scheduler.enabled,
+        lanes={
+            lane: OllamaLaneMetrics(**stats) for lane, stats in scheduler.stats.items()
+        },
+        circuits={
+            name: breaker.stats["state"]
+            for name, breaker in get_circuit_breakers().items()
+        },
+    )
+
+
+# ============== On-demand Profiling (Admin Only) ==============
+
+
+@router.post("/profiles/token", response_model=ProfileTokenResponse)
+@limiter.limit(admin_limit)
+async def create_profile_token(
+    request: Request,
+    admin_user: AdminUser,
+) -> ProfileTokenResponse:
+    """Issue a short-lived token for profiling requests. Admin only.
+
+    Send the token in the X-NPD-Profile header on any request; the response
+    carries X-Profile-Id, retrievable from GET /admin/profiles/{profile_id}.
+    """
+    from app.services import profiling_service
+
+    token, expires_at = profiling_service.create_profile_token(admin_user.id)
+    logger.info("profile_token_issued", user_id=str(admin_user.id))
+    return ProfileTokenResponse(token=token, expires_at=expires_at)
+
+
+@router.post("/profiles/targets", response_model=ProfileTargetResponse)
+@limiter.limit(admin_limit)
+async def arm_profile_target(
+    request: Request,
+    data: ProfileTargetRequest,
+    admin_user: AdminUser,
+) -> ProfileTargetResponse:
+    """Profile the next processing of a job or document. Admin only.
+
+    Applies once, to the next process_job_queue / process_document_queue run
+    that handles the target. Needs Redis to reach other workers.
+    """
+    from app.config import get_settings
+    from app.services.profiling_service import arm_target
+
+    await arm_target(data.kind, data.target_id)
+    logger.info(
+        "profile_target_armed",
+        kind=data.kind,
+        target_id=str(data.target_id),
+        user_id=str(admin_user.id),
+    )
+    return ProfileTargetResponse(
+        kind=data.kind,
+        target_id=data.target_id,
+        expires_in_seconds=get_settings().profile_retention_seconds,
+    )
+
+
+@router.get("/profiles", response_model=list[ProfileSummary])
+@limiter.limit(admin_limit)
+async def list_profiles(
+    request: Request,
+    admin_user: AdminUser,
+) -> list[ProfileSummary]:
+    """List recently captured profiles, newest first. Admin only."""
+    from app.services import profiling_service
+
+    return [ProfileSummary(**p) for p in await profiling_service.list_profiles()]
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+@limiter.limit(admin_limit)
+async def get_profile(
+    request: Request,
+    profile_id: str,
+    admin_user: AdminUser,
+) -> PlainTextResponse:
+    """Download a profile in folded-stack format. Admin only.
+
+    The output loads directly into speedscope, inferno or flamegraph.pl.
+    Stacks are rooted at [profiled] (the request/job and tasks it started),
+    [other tasks] or [loop].
+    """
+    from app.services import profiling_service
+
+    profile = await profiling_service.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found or expired",
+        )
+    return PlainTextResponse(
+        profile["folded"] + "\n",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+    )
+
+
 # ============== SharePoint Health (Admin Only) ==============
 
 
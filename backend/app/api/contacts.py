@@ -20,12 +20,15 @@ from app.schemas.contact import (
     ContactCreate,
     ContactDetail,
     ContactResponse,
+    ContactSuggestion,
+    ContactSuggestionsResponse,
     ContactSyncResponse,
     ContactUpdate,
     ContactWithOrganization,
     ProjectSummaryForContact,
 )
 from app.services.audit_service import AuditService
+from app.services.autocomplete_service import AutocompleteService, escape_like
 from app.services.permission_service import PermissionService
 from app.services.sync_service import sync_contact_to_monday
 
@@ -53,9 +56,11 @@ async def list_contacts(
         query = query.where(Contact.organization_id == organization_id)
 
     if search:
-        search_filter = f"%{search}%"
+        # Both predicates are served by pg_trgm GIN indexes
+        search_filter = f"%{escape_like(search)}%"
         query = query.where(
-            Contact.name.ilike(search_filter) | Contact.email.ilike(search_filter)
+            Contact.name.ilike(search_filter, escape="\\")
+            | Contact.email.ilike(search_filter, escape="\\")
         )
 
     # Get total count
@@ -78,6 +83,37 @@ async def list_contacts(
     )
 
 
+@router.get("/suggest", response_model=ContactSuggestionsResponse)
+@limiter.limit(crud_limit)
+async def suggest_contacts(
+    request: Request,
+    db: DbSession,
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=2, description="Contact name or email"),
+    organization_id: UUID | None = None,
+    limit: int = Query(default=10, ge=1, le=50),
+) -> ContactSuggestionsResponse:
+    """
+    Suggest contacts by name or email for autocomplete.
+
+    Matches are typo-tolerant and ranked by trigram similarity.
+    """
+    autocomplete = AutocompleteService(db)
+    results = await autocomplete.suggest_contacts(
+        q, organization_id=organization_id, limit=limit
+    )
+
+    return ContactSuggestionsResponse(
+        suggestions=[
+            ContactSuggestion(
+                contact=ContactResponse.model_validate(contact),
+                score=score,
+            )
+            for contact, score in results
+        ]
+    )
+
+
 @router.post("", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit(crud_limit)
 async def create_contact(
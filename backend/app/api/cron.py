@@ -35,6 +35,7 @@ from app.services.jira_service import (
     refresh_all_jira_statuses,
 )
 from app.services.monday_service import MondayAPIError
+from app.services.tag_stats_service import TagStatsService
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -978,3 +979,63 @@ async def process_jobs_endpoint(
             errors=[str(e)],
             timestamp=datetime.now(UTC).isoformat(),
         )
+
+
+class TagStatsCronResult(BaseModel):
+    """Response schema for tag statistics reconciliation endpoint."""
+
+    status: str
+    tags: int
+    pairs: int
+    errors: list[str]
+    timestamp: str
+
+
+@router.get("/tag-stats", response_model=TagStatsCronResult)
+async def reconcile_tag_stats_endpoint(
+    db: DbSession,
+    authorization: str | None = Header(None),
+) -> TagStatsCronResult:
+    """Rebuild materialised tag usage and co-occurrence counts.
+
+    This endpoint should be called by an external cron job every night.
+    Protected by CRON_SECRET bearer token.
+
+    Counts are maintained incrementally as project tags change; this full
+    rebuild corrects any drift (e.g. from direct database edits).
+    """
+    # Verify cron secret
+    if not verify_cron_secret(authorization):
+        logger.warning("cron_tag_stats_unauthorized")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing CRON_SECRET",
+        )
+
+    logger.info("cron_tag_stats_triggered")
+
+    try:
+        counts = await TagStatsService(db).reconcile()
+        await db.commit()
+        return TagStatsCronResult(
+            status="success",
+            tags=counts["tags"],
+            pairs=counts["pairs"],
+            errors=[],
+            timestamp=datetime.now(UTC).isoformat(),
+        )
+    except Exception as e:
+        await db.rollback()
+        logger.error(
+            "cron_tag_stats_error",
+            error=str(e),
+            error_type="unexpected",
+            exc_info=True,
+        )
+        return TagStatsCronResult(
+            status="error",
+            tags=0,
+            pairs=0,
+            errors=[str(e)],
+            timestamp=datetime.now(UTC).isoformat(),
+        )
@@ -19,10 +19,17 @@ from app.schemas.organization import (
     OrganizationCreate,
     OrganizationDetailWithRelations,
     OrganizationResponse,
+    OrganizationSuggestion,
+    OrganizationSuggestionsResponse,
     OrganizationUpdate,
     ProjectSummaryForOrg,
 )
 from app.services.audit_service import AuditService
+from app.services.autocomplete_service import (
+    AutocompleteService,
+    escape_like,
+    organization_aliases_text,
+)
 from app.services.cache_service import get_org_cache, invalidate_org_cache
 from app.services.permission_service import PermissionService
 from app.services.sync_service import sync_organization_to_monday
@@ -58,10 +65,11 @@ async def list_organizations(
     query = select(Organization)
 
     if search:
-        search_filter = f"%{search}%"
+        # Both predicates are served by pg_trgm GIN indexes
+        search_filter = f"%{escape_like(search)}%"
         query = query.where(
-            Organization.name.ilike(search_filter)
-            | Organization.aliases.any(search_filter)
+            Organization.name.ilike(search_filter, escape="\\")
+            | organization_aliases_text().ilike(search_filter, escape="\\")
         )
 
     # Get total count
@@ -93,6 +101,34 @@ async def list_organizations(
     return PaginatedResponse(**response_data)
 
 
+@router.get("/suggest", response_model=OrganizationSuggestionsResponse)
+@limiter.limit(crud_limit)
+async def suggest_organizations(
+    request: Request,
+    db: DbSession,
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=2, description="Organization name or alias"),
+    limit: int = Query(default=10, ge=1, le=50),
+) -> OrganizationSuggestionsResponse:
+    """
+    Suggest organizations by name or alias for autocomplete.
+
+    Matches are typo-tolerant and ranked by trigram similarity.
+    """
+    autocomplete = AutocompleteService(db)
+    results = await autocomplete.suggest_organizations(q, limit=limit)
+
+    return OrganizationSuggestionsResponse(
+        suggestions=[
+            OrganizationSuggestion(
+                organization=OrganizationResponse.model_validate(org),
+                score=score,
+            )
+            for org, score in results
+        ]
+    )
+
+
 @router.post(
     "", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED
 )
@@ -144,7 +180,7 @@ async def create_organization(
         background_tasks.add_task(sync_organization_to_monday, org.id)
 
     # Invalidate organization cache
-    await invalidate_org_cache()
+    await invalidate_org_cache(db)
 
     return OrganizationResponse.model_validate(org)
 
@@ -312,6 +348,6 @@ async def update_organization(
         background_tasks.add_task(sync_organization_to_monday, org.id)
 
     # Invalidate organization cache
-    await invalidate_org_cache()
+    await invalidate_org_cache(db)
 
     return OrganizationResponse.model_validate(org)
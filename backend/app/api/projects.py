@@ -48,16 +48,21 @@ from app.schemas.project import (
     DismissProjectTagSuggestionRequest,
     ProjectCreate,
     ProjectDetail,
+    ProjectFacet,
+    ProjectListResponse,
     ProjectResponse,
     ProjectUpdate,
 )
 from app.schemas.tag import TagResponse
 from app.services.audit_service import AuditService
+from app.services.facet_service import FacetService
 from app.services.import_service import ImportService
 from app.services.jira_service import JiraService
 from app.services.monday_service import MondayService
 from app.services.permission_service import PermissionService
 from app.services.search_cache import invalidate_search_cache
+from app.services.slow_query_capture import capture_slow_queries
+from app.services.tag_stats_service import TagStatsService
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 logger = get_logger(__name__)
@@ -84,7 +89,7 @@ def _build_project_list_query():
     )
 
 
-@router.get("", response_model=PaginatedResponse[ProjectResponse])
+@router.get("", response_model=ProjectListResponse)
 @limiter.limit(crud_limit)
 async def list_projects(
     request: Request,
@@ -101,8 +106,11 @@ async def list_projects(
     ),
     sort_by: str = Query("updated_at", enum=["name", "start_date", "updated_at"]),
     sort_order: str = Query("desc", enum=["asc", "desc"]),
-) -> PaginatedResponse[ProjectResponse]:
-    """List projects with optional filters."""
+    facets: list[ProjectFacet] | None = Query(
+        None, description="Facet counts to compute over the filtered result set"
+    ),
+) -> ProjectListResponse:
+    """List projects with optional filters and facet counts."""
     start_time = time.perf_counter()
 
     query = _build_project_list_query()
@@ -144,7 +152,19 @@ async def list_projects(
         if query.whereclause is not None
         else Project
     )
-    total = await db.scalar(count_query) or 0
+    with capture_slow_queries("projects:list"):
+        total = await db.scalar(count_query) or 0
+
+    # Facet counts over the same filtered, ACL-restricted set (one query)
+    facet_counts = None
+    if facets:
+        facet_service = FacetService(db)
+        facet_counts = await facet_service.get_facets(
+            facets,
+            filter_conditions=(
+                [query.whereclause] if query.whereclause is not None else None
+            ),
+        )
 
     # Apply sorting with whitelist validation
     if sort_by not in PROJECT_SORT_COLUMNS:
@@ -161,7 +181,8 @@ async def list_projects(
     # Apply pagination
     query = query.offset((page - 1) * page_size).limit(page_size)
 
-    result = await db.execute(query)
+    with capture_slow_queries("projects:list"):
+        result = await db.execute(query)
     projects = result.scalars().unique().all()
 
     items = []
@@ -195,14 +216,16 @@ async def list_projects(
         has_status_filter=bool(status),
         has_org_filter=bool(organization_id),
         has_tag_filter=bool(tag_ids),
+        facets=[f.value for f in facets] if facets else None,
     )
 
-    return PaginatedResponse(
+    return ProjectListResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
         pages=(total + page_size - 1) // page_size if total > 0 else 0,
+        facets=facet_counts,
     )
 
 
@@ -305,6 +328,7 @@ async def create_project(
         db.add(pt)
 
     await db.flush()
+    await TagStatsService(db).record_project_tag_change([], data.tag_ids)
 
     # Reload with relationships
     result = await db.execute(_build_project_query().where(Project.id == project.id))
@@ -574,6 +598,7 @@ async def update_project(
             )
 
         # Remove old tags
+        previous_tag_ids = [pt.tag_id for pt in project.project_tags]
         for pt in project.project_tags:
             await db.delete(pt)
 
@@ -582,6 +607,10 @@ async def update_project(
             pt = ProjectTag(project_id=project.id, tag_id=tag_id)
             db.add(pt)
 
+        await TagStatsService(db).record_project_tag_change(
+            previous_tag_ids, data.tag_ids
+        )
+
     await db.flush()
 
     # Reload with relationships
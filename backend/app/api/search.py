@@ -16,12 +16,14 @@ from app.core.rate_limit import limiter, search_limit
 from app.models.project import Project, ProjectStatus
 from app.models.saved_search import SavedSearch
 from app.models.user import User
+from app.schemas.project import ProjectFacet
 from app.schemas.search import (
     ParsedQueryMetadata,
     SavedSearchCreate,
     SavedSearchListResponse,
     SavedSearchResponse,
     SavedSearchUpdate,
+    SearchDegradation,
     SearchResponse,
     SearchResultItem,
     SearchSuggestion,
@@ -60,6 +62,10 @@ async def search_projects(
         default=True,
         description="Expand tag filters to include synonym tags (default: true)",
     ),
+    facets: list[ProjectFacet] | None = Query(
+        default=None,
+        description="Facet counts to compute over the full result set",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> SearchResponse:
@@ -79,6 +85,9 @@ async def search_projects(
     - name
     - start_date
     - updated_at
+
+    Facets (status, organization, tag) are counted over the filtered,
+    ACL-restricted result set in a single query and returned with the page.
     """
     cache = get_search_cache()
 
@@ -94,6 +103,7 @@ async def search_projects(
         page=page,
         page_size=page_size,
         expand_synonyms=expand_synonyms,
+        facets=[f.value for f in facets] if facets else None,
     )
 
     # Check cache (unless bypassed)
@@ -122,6 +132,7 @@ async def search_projects(
         page=page,
         page_size=page_size,
         expand_synonyms=expand_synonyms,
+        facets=facets,
     )
 
     # Convert to response models
@@ -145,10 +156,19 @@ async def search_projects(
         page_size=page_size,
         query=q,
         synonym_expansion=synonym_expansion,
+        facets=search_service.last_facets,
+        degraded=(
+            SearchDegradation(skipped=search_service.skipped_sources)
+            if search_service.skipped_sources
+            else None
+        ),
+        partial=bool(search_service.skipped_sources),
+        ranking_sources=list(search_service.ranking_sources) or None,
     )
 
-    # Store in cache
-    if not no_cache:
+    # Store in cache (degraded results are not cached so full ranking
+    # resumes as soon as the upstream recovers)
+    if not no_cache and response.degraded is None:
         # Serialize response for caching
         response_dict = response.model_dump(mode="json")
         await cache.set(cache_key, response_dict)
@@ -236,6 +256,11 @@ async def semantic_search(
         parse_explanation=parse_result.parse_explanation,
     )
 
+    ranking_skipped = dict(search_service.skipped_sources)
+    skipped = dict(ranking_skipped)
+    if parse_result.upstream_failure:
+        skipped["query_parser"] = parse_result.upstream_failure
+
     return SemanticSearchResponse(
         items=items,
         total=total,
@@ -243,6 +268,9 @@ async def semantic_search(
         page_size=body.page_size,
         query=body.query,
         parsed_query=parsed_metadata,
+        degraded=SearchDegradation(skipped=skipped) if skipped else None,
+        partial=bool(ranking_skipped),
+        ranking_sources=list(search_service.ranking_sources) or None,
     )
 
 
@@ -189,7 +189,7 @@ async def create_freeform_tag(
     )
 
     # Invalidate tag cache
-    await invalidate_tag_cache()
+    await invalidate_tag_cache(db)
 
     return TagResponse.model_validate(tag)
 
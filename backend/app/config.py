@@ -47,6 +47,26 @@ class Settings(BaseSettings):
     ollama_base_url: str = "http://localhost:6703"
     ollama_embedding_model: str = "nomic-embed-text"
     ollama_chat_model: str = "mistral"  # LLM for NL query parsing
+    ollama_embedding_timeout_seconds: float = 60.0  # Ceiling per embedding call
+    ollama_chat_timeout_seconds: float = 30.0  # Ceiling per query-parse call
+
+    # Ollama circuit breakers (per worker; embeddings and chat separately)
+    ollama_breaker_enabled: bool = True
+    ollama_breaker_failure_threshold: int = 5  # Consecutive failures to open
+    ollama_breaker_slow_call_rate: float = 0.5  # Slow/failed share to open
+    ollama_breaker_window_size: int = 20  # Recent calls for the slow share
+    ollama_breaker_open_seconds: float = 30.0  # Fail fast before probing
+    ollama_embedding_slow_call_ms: int = 3000  # Slower embedding calls count
+    ollama_chat_slow_call_ms: int = 15000  # Slower chat calls count
+    ollama_timeout_multiplier: float = 4.0  # Adaptive timeout = p95 x this
+    ollama_min_timeout_seconds: float = 2.0  # Floor for the adaptive timeout
+
+    # Ollama admission control (per worker): interactive calls go first,
+    # batch (document embedding) concurrency adapts to observed latency
+    ollama_scheduler_enabled: bool = True
+    ollama_interactive_concurrency: int = 4  # Queries, parsing, summaries
+    ollama_batch_concurrency: int = 2  # Upper bound for document embeddings
+    ollama_batch_target_latency_ms: int = 2000  # Slower batch calls back off
 
     # File Storage
     upload_dir: str = "./uploads"
@@ -81,6 +101,13 @@ class Settings(BaseSettings):
     search_cache_ttl: int = 300  # 5 minutes in seconds
     search_cache_enabled: bool = True  # Allow disabling cache
 
+    # Hybrid search latency budget: ranking branches still running at their
+    # deadline are dropped and the rest fused into a partial result (0 = none)
+    search_budget_ms: int = 2500  # Overall, from the start of the search
+    search_project_text_deadline_ms: int = 1000
+    search_document_text_deadline_ms: int = 1500
+    search_vector_deadline_ms: int = 2000  # Includes the query embedding call
+
     # Tag/Organization Cache (Redis - Optional)
     tag_cache_ttl: int = 3600  # 1 hour in seconds
     tag_cache_enabled: bool = True
@@ -88,6 +115,25 @@ class Settings(BaseSettings):
     org_cache_enabled: bool = True
     dashboard_cache_ttl: int = 300  # 5 minutes in seconds
     dashboard_cache_enabled: bool = True
+    db_stats_cache_ttl: int = 60  # Postgres statistics on the admin pages
+
+    # Entity resolution (NL parser, import, Monday sync): names missing from
+    # the in-memory index fall back to a pg_trgm match scoring at least this
+    entity_fuzzy_match_enabled: bool = True
+    entity_fuzzy_match_min_score: float = 0.6
+
+    # NL query parse cache (semantic search). Resolved parses are keyed by
+    # date and the tags/orgs generations, raw LLM output by query and model
+    nl_parse_cache_ttl: int = 86400  # 24 hours in seconds
+    nl_parse_cache_enabled: bool = True
+    # Rule-based pre-parser: queries it parses at least this confidently
+    # (0.0-1.0) skip the LLM
+    nl_rule_parser_enabled: bool = True
+    nl_rule_parser_min_confidence: float = 0.8
+
+    # CSV import commit: rows per multi-row INSERT (a rejected batch is
+    # retried row by row to report per-row errors)
+    import_commit_batch_size: int = 500
 
     # ClamAV Antivirus (optional)
     clamav_enabled: bool = False
@@ -123,6 +169,36 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
 
+    # Request Metrics (fleet-wide aggregation uses Redis when configured)
+    metrics_token: str = ""  # Bearer token for /metrics (endpoint disabled if unset)
+    metrics_publish_interval_seconds: int = 15  # How often workers publish
+    metrics_stale_after_seconds: int = 60  # Ignore workers silent for longer
+    query_repeat_threshold: int = 10  # Same statement > N times per request = N+1
+
+    # On-demand profiling (admin-issued token in the X-NPD-Profile header)
+    profile_sample_interval_ms: int = 5  # Sampling period
+    profile_max_seconds: int = 120  # Stop sampling after this long
+    profile_token_ttl_seconds: int = 900  # Validity of issued profile tokens
+    profile_retention_seconds: int = 3600  # How long profiles are kept
+
+    # Event loop lag monitor (names the sync code that blocks the loop)
+    event_loop_monitor_enabled: bool = True
+    event_loop_monitor_interval_ms: int = 100  # Sampling period
+    event_loop_block_threshold_ms: int = 100  # Lag above this captures a stack
+
+    # Slow-query EXPLAIN capture (opt-in; re-runs slow SELECTs with ANALYZE)
+    slow_query_explain_enabled: bool = False
+    slow_query_explain_threshold_ms: int = 500  # Capture statements slower than
+    slow_query_explain_sample_rate: float = 1.0  # Fraction of slow statements
+    slow_query_explain_interval_seconds: int = 300  # Per statement shape
+    slow_query_explain_buffer_size: int = 50  # Captures kept per worker
+
+    # Distributed tracing (OTLP/JSON; off unless an exporter is set)
+    trace_exporter: str = ""  # "file" or "otlp"
+    trace_file_path: str = "./traces.jsonl"  # For the file exporter
+    trace_otlp_endpoint: str = "http://localhost:4318"  # OTLP/HTTP collector
+    trace_sample_ratio: float = 1.0  # Fraction of new traces recorded
+
     # Anthropic/Claude Integration
     anthropic_api_key: str = ""
     claude_code_path: str = "claude"  # Path to Claude Code CLI
@@ -142,6 +218,7 @@ class Settings(BaseSettings):
     # Monday.com Integration
     monday_api_key: str = ""  # API key from Monday.com admin
     monday_api_version: str = "2024-10"  # API version
+    monday_api_url: str = "https://api.monday.com/v2"  # Override for load tests
     monday_contacts_board_id: str = ""  # Board ID containing contacts
     monday_organizations_board_id: str = ""  # Board ID containing organizations
 
@@ -0,0 +1,282 @@
+"""Circuit breakers with latency-based tripping and adaptive timeouts.
+
+A breaker guards calls to one upstream operation (e.g. Ollama embeddings).
+It opens after ``failure_threshold`` consecutive failures, or when at least
+``slow_call_rate`` of the last ``window_size`` calls failed or took longer
+than ``slow_call_ms``. While open, calls fail immediately with
+``CircuitOpenError``. After ``open_seconds`` a single probe call is let
+through (half-open): if it succeeds quickly the breaker closes, otherwise it
+opens again.
+
+``timeout()`` adapts the per-call timeout to the upstream's recent
+behaviour: a multiple of the p95 latency of recent successful calls, clamped
+between ``min_timeout_seconds`` and the caller's ceiling. A stalled upstream
+is then noticed within seconds rather than after the full ceiling.
+
+Breaker state is per worker process.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from enum import Enum
+from threading import Lock
+from typing import Literal
+
+from app.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Successful calls needed before the timeout adapts to observed latency
+MIN_TIMEOUT_SAMPLES = 10
+
+# Calls in the window needed before the slow-call rate can trip the breaker
+MIN_WINDOW_CALLS = 5
+
+
+class CircuitState(str, Enum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit '{name}' is open (retry in {retry_after:.1f}s)")
+
+
+class CircuitBreaker:
+    """Fails fast when an upstream is down or too slow."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        slow_call_ms: float = 5000.0,
+        slow_call_rate: float = 0.5,
+        window_size: int = 20,
+        open_seconds: float = 30.0,
+        timeout_multiplier: float = 4.0,
+        min_timeout_seconds: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout_seconds = min_timeout_seconds
+        self._clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        # True for each recent call that failed or was slow
+        self._window: deque[bool] = deque(maxlen=window_size)
+        # Latencies (ms) of recent successful calls, for the adaptive timeout
+        self._latencies: deque[float] = deque(maxlen=max(window_size, 50))
+        self._times_opened = 0
+        self._rejected = 0
+        self._lock = Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an expired open period reads as half-open)."""
+        with self._lock:
+            if (
+                self._state == CircuitState.OPEN
+                and self._clock() - self._opened_at >= self.open_seconds
+            ):
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def timeout(self, ceiling: float) -> float:
+        """Per-call timeout in seconds, at most ``ceiling``."""
+        if not self.enabled:
+            return ceiling
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < MIN_TIMEOUT_SAMPLES:
+            return ceiling
+        p95_seconds = samples[int(0.95 * (len(samples) - 1))] / 1000
+        adaptive = p95_seconds * self.timeout_multiplier
+        return min(ceiling, max(self.min_timeout_seconds, adaptive))
+
+    def check(self) -> None:
+        """Raise ``CircuitOpenError`` if a call would be rejected right now.
+
+        For callers that wait (e.g. for an Ollama scheduler slot) before
+        entering ``guard``: an open breaker rejects them before they queue.
+        Does not claim the half-open probe; ``guard`` still does.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == CircuitState.OPEN:
+                remaining = self.open_seconds - (self._clock() - self._opened_at)
+                if remaining > 0:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.name, remaining)
+            elif self._state == CircuitState.HALF_OPEN and self._probe_in_flight:
+                self._rejected += 1
+                raise CircuitOpenError(self.name, 0.0)
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Run the enclosed upstream call through the breaker.
+
+        Raises ``CircuitOpenError`` without running the block while open.
+        Any exception from the block counts as a failure and is re-raised;
+        cancellation (e.g. a client disconnect) is not counted.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self._before_call()
+        started_at = time.perf_counter()
+        try:
+            yield
+        except asyncio.CancelledError:
+            with self._lock:
+                self._probe_in_flight = False
+            raise
+        except Exception:
+            self._record((time.perf_counter() - started_at) * 1000, success=False)
+            raise
+        self._record((time.perf_counter() - started_at) * 1000, success=True)
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == CircuitState.OPEN:
+                remaining = self.open_seconds - (self._clock() - self._opened_at)
+                if remaining > 0:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.name, remaining)
+                self._state = CircuitState.HALF_OPEN
+            if self._state == CircuitState.HALF_OPEN:
+                if self._probe_in_flight:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._probe_in_flight = True
+
+    def _record(self, latency_ms: float, success: bool) -> None:
+        slow = latency_ms >= self.slow_call_ms
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probe_in_flight = False
+                if success and not slow:
+                    self._close()
+                else:
+                    self._open("probe_failed" if not success else "probe_slow")
+                return
+
+            if success:
+                self._consecutive_failures = 0
+                self._latencies.append(latency_ms)
+            else:
+                self._consecutive_failures += 1
+            self._window.append(slow or not success)
+
+            if self._consecutive_failures >= self.failure_threshold:
+                self._open("failures")
+            elif len(self._window) >= MIN_WINDOW_CALLS and (
+                sum(self._window) / len(self._window) >= self.slow_call_rate
+            ):
+                self._open("slow_calls")
+
+    def _open(self, reason: str) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._consecutive_failures = 0
+        self._window.clear()
+        self._times_opened += 1
+        logger.warning(
+            "circuit_opened",
+            circuit=self.name,
+            reason=reason,
+            open_seconds=self.open_seconds,
+        )
+
+    def _close(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._window.clear()
+        logger.info("circuit_closed", circuit=self.name)
+
+    @property
+    def stats(self) -> dict:
+        """State and counters for health and metrics endpoints."""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state.value,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+                "consecutive_failures": self._consecutive_failures,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_registry_lock = Lock()
+
+OllamaOperation = Literal["embeddings", "embeddings.batch", "chat"]
+
+
+def get_ollama_breaker(operation: OllamaOperation) -> CircuitBreaker:
+    """The worker-wide breaker for one kind of Ollama call.
+
+    Embeddings and chat completions get separate breakers: their normal
+    latencies differ by orders of magnitude. Batch embeddings (document
+    ingest) get their own breaker without a slow-call rule: long chunks on a
+    busy Ollama are expected to be slow, and must not open the breaker that
+    query embeddings use.
+    """
+    name = f"ollama.{operation}"
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            settings = get_settings()
+            breaker = CircuitBreaker(
+                name,
+                enabled=settings.ollama_breaker_enabled,
+                failure_threshold=settings.ollama_breaker_failure_threshold,
+                slow_call_ms={
+                    "embeddings": settings.ollama_embedding_slow_call_ms,
+                    "embeddings.batch": math.inf,
+                    "chat": settings.ollama_chat_slow_call_ms,
+                }[operation],
+                slow_call_rate=settings.ollama_breaker_slow_call_rate,
+                window_size=settings.ollama_breaker_window_size,
+                open_seconds=settings.ollama_breaker_open_seconds,
+                timeout_multiplier=settings.ollama_timeout_multiplier,
+                min_timeout_seconds=settings.ollama_min_timeout_seconds,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_circuit_breakers() -> dict[str, CircuitBreaker]:
+    """All breakers created in this worker, by name."""
+    with _registry_lock:
+        return dict(_breakers)
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breakers (for testing)."""
+    with _registry_lock:
+        _breakers.clear()
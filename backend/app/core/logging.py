@@ -7,6 +7,7 @@ from typing import Any
 from uuid import uuid4
 
 import structlog
+from opentelemetry import trace
 
 from app.config import get_settings
 
@@ -26,6 +27,18 @@ def add_request_id(
     return event_dict
 
 
+def add_trace_id(
+    _logger: logging.Logger,
+    _method_name: str,
+    event_dict: dict[str, Any],
+) -> dict[str, Any]:
+    """Add the active trace ID to log entries so they can be matched to spans."""
+    span_context = trace.get_current_span().get_span_context()
+    if span_context.is_valid and span_context.trace_flags.sampled:
+        event_dict["trace_id"] = format(span_context.trace_id, "032x")
+    return event_dict
+
+
 def configure_logging() -> None:
     """Configure structured logging for the application."""
     settings = get_settings()
@@ -41,6 +54,7 @@ def configure_logging() -> None:
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         add_request_id,
+        add_trace_id,
     ]
 
     if settings.environment == "development":
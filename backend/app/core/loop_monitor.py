@@ -0,0 +1,197 @@
+"""Event loop lag monitor that names the code blocking the loop.
+
+A sampler task sleeps for ``EVENT_LOOP_MONITOR_INTERVAL_MS`` and records how
+late it wakes up (scheduling delay). While the loop is stalled the sampler
+cannot run, so a watchdog thread checks the sampler's heartbeat and, once
+the loop has been stuck for longer than ``EVENT_LOOP_BLOCK_THRESHOLD_MS``,
+captures the loop thread's stack - the synchronous code still running
+(pdfplumber, pandas, Tesseract, msal, file I/O...).
+
+When the loop resumes the stall is attributed to an offender: the innermost
+application frame on the captured stack (e.g.
+``app.services.sharepoint.auth:get_app_token``), falling back to the
+innermost frame. Stalls are logged as ``event_loop_blocked`` with the stack
+and counted per offender in the metrics service.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Root of the application package; frames below it are "our" code
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+# Frames kept in logged stacks (innermost)
+MAX_STACK_FRAMES = 20
+
+UNKNOWN_OFFENDER = "<unknown>"
+
+
+def frame_name(frame: traceback.FrameSummary) -> str:
+    """``module:function`` for a frame (module path relative to the app)."""
+    path = Path(frame.filename)
+    try:
+        relative = path.resolve().relative_to(APP_ROOT.parent)
+        module = ".".join(relative.with_suffix("").parts)
+    except ValueError:
+        # Library frame: keep the last two path parts (package/module.py)
+        module = ".".join(path.with_suffix("").parts[-2:])
+    return f"{module}:{frame.name}"
+
+
+def find_offender(stack: traceback.StackSummary) -> tuple[str, str]:
+    """(offender, blocking call) for a stack ordered outermost first.
+
+    The offender is the innermost frame inside the application package -
+    the code that made the blocking call; the blocking call is the innermost
+    frame overall (often library code).
+    """
+    if not stack:
+        return UNKNOWN_OFFENDER, UNKNOWN_OFFENDER
+    blocking_call = frame_name(stack[-1])
+    for frame in reversed(stack):
+        try:
+            Path(frame.filename).resolve().relative_to(APP_ROOT)
+        except ValueError:
+            continue
+        return frame_name(frame), blocking_call
+    return blocking_call, blocking_call
+
+
+@dataclass
+class _StallCapture:
+    heartbeat: float
+    stack: traceback.StackSummary
+    task: str | None
+
+
+class EventLoopMonitor:
+    """Measure event loop lag and capture stacks of blocking code."""
+
+    def __init__(self, interval_ms: float = 100, threshold_ms: float = 100):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat = time.perf_counter()
+        self._capture: _StallCapture | None = None
+        self._sampler: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start sampling the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopped.clear()
+        self._sampler = self._loop.create_task(self._sample(), name="loop-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the sampler and watchdog."""
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._sampler
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - expected, 0.0)
+            self._observe(lag)
+            self._heartbeat = time.perf_counter()
+
+    def _observe(self, lag: float) -> None:
+        """Record one sample; report a stall if it crossed the threshold."""
+        from app.services.metrics_service import get_metrics_service
+
+        lag_ms = lag * 1000
+        metrics = get_metrics_service()
+        metrics.record_loop_lag(lag_ms)
+        if lag < self.threshold:
+            return
+
+        capture = self._capture
+        self._capture = None
+        if capture is None or capture.heartbeat != self._heartbeat:
+            # Stall shorter than the watchdog's polling could catch
+            stack = traceback.StackSummary()
+            task = None
+        else:
+            stack, task = capture.stack, capture.task
+
+        offender, blocking_call = find_offender(stack)
+        metrics.record_loop_block(offender, lag_ms)
+        logger.warning(
+            "event_loop_blocked",
+            lag_ms=round(lag_ms, 2),
+            offender=offender,
+            blocking_call=blocking_call,
+            task=task,
+            stack=[
+                f"{frame.filename}:{frame.lineno} in {frame.name}"
+                for frame in stack[-MAX_STACK_FRAMES:]
+            ],
+        )
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack during a stall."""
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stopped.wait(poll):
+            heartbeat = self._heartbeat
+            stalled_for = time.perf_counter() - heartbeat - self.interval
+            if stalled_for < self.threshold:
+                continue
+            capture = self._capture
+            if capture is not None and capture.heartbeat == heartbeat:
+                continue  # Already captured this stall
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop) if self._loop else None
+            self._capture = _StallCapture(
+                heartbeat=heartbeat,
+                stack=traceback.extract_stack(frame),
+                task=task.get_name() if task else None,
+            )
+
+
+_monitor: EventLoopMonitor | None = None
+
+
+def start_loop_monitor(interval_ms: float, threshold_ms: float) -> EventLoopMonitor:
+    """Start monitoring the running loop (call from the app lifespan)."""
+    global _monitor
+    _monitor = EventLoopMonitor(interval_ms=interval_ms, threshold_ms=threshold_ms)
+    _monitor.start()
+    logger.info(
+        "event_loop_monitor_started",
+        interval_ms=interval_ms,
+        threshold_ms=threshold_ms,
+    )
+    return _monitor
+
+
+async def stop_loop_monitor() -> None:
+    """Stop the monitor started by ``start_loop_monitor``."""
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
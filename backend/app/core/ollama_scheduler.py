@@ -0,0 +1,225 @@
+"""Priority admission control for the shared Ollama instance.
+
+Interactive calls (query embeddings, query parsing, summaries) and batch
+calls (document chunk embeddings) share one CPU-bound Ollama. Every call
+takes a slot in its priority lane first:
+
+- Each lane has a concurrency cap. Calls over the cap queue in FIFO order.
+- Interactive calls take precedence. While an interactive call is queued or
+  in flight, no new batch call is admitted. Batch calls already running
+  finish, because an embedding request cannot be interrupted usefully.
+- The batch cap adapts to observed latency (AIMD). A failed batch call, or
+  one slower than ``ollama_batch_target_latency_ms``, halves the cap (minimum
+  1). After a full cap's worth of fast calls the cap grows by one, up to
+  ``ollama_batch_concurrency``.
+
+Scheduler state is per worker process, like the circuit breakers.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import Enum
+
+from app.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Queue waits longer than this are logged
+SLOW_ADMISSION_MS = 1000
+
+
+class OllamaPriority(str, Enum):
+    """Scheduling lane of an Ollama call."""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+class _Lane:
+    """Concurrency cap, queue and counters of one priority lane."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.admitted += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self.waiters if not waiter.done())
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "limit": self.limit,
+            "admitted": self.admitted,
+            "avg_wait_ms": (
+                round(self.total_wait_ms / self.admitted, 2) if self.admitted else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
+
+
+class OllamaScheduler:
+    """Admits Ollama calls by priority lane."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        interactive_concurrency: int = 4,
+        batch_concurrency: int = 2,
+        batch_target_latency_ms: float = 2000.0,
+    ):
+        self.enabled = enabled
+        self.batch_max_concurrency = max(1, batch_concurrency)
+        self.batch_target_latency_ms = batch_target_latency_ms
+        self._lanes = {
+            OllamaPriority.INTERACTIVE: _Lane(interactive_concurrency),
+            OllamaPriority.BATCH: _Lane(self.batch_max_concurrency),
+        }
+        # Fast batch calls since the batch cap last changed
+        self._batch_fast_calls = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: OllamaPriority) -> AsyncIterator[None]:
+        """Hold a slot in ``priority``'s lane for the enclosed Ollama call."""
+        if not self.enabled:
+            yield
+            return
+
+        lane = self._lanes[priority]
+        queued_at = time.perf_counter()
+        await self._acquire(priority)
+        wait_ms = (time.perf_counter() - queued_at) * 1000
+        lane.record_wait(wait_ms)
+        if wait_ms >= SLOW_ADMISSION_MS:
+            logger.info(
+                "ollama_admission_slow",
+                priority=priority.value,
+                wait_ms=round(wait_ms, 2),
+                **{
+                    f"{p.value}_queued": other.queued
+                    for p, other in self._lanes.items()
+                },
+            )
+
+        started_at = time.perf_counter()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            latency_ms = (time.perf_counter() - started_at) * 1000
+            self._release(priority, latency_ms, succeeded)
+
+    def _can_admit(self, priority: OllamaPriority) -> bool:
+        lane = self._lanes[priority]
+        if lane.in_flight >= lane.limit:
+            return False
+        if priority == OllamaPriority.BATCH:
+            interactive = self._lanes[OllamaPriority.INTERACTIVE]
+            return interactive.in_flight == 0 and interactive.queued == 0
+        return True
+
+    async def _acquire(self, priority: OllamaPriority) -> None:
+        lane = self._lanes[priority]
+        if lane.queued == 0 and self._can_admit(priority):
+            lane.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        lane.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just before the cancellation: give the slot back
+                self._release_slot(priority)
+            else:
+                # A cancelled interactive waiter may unblock batch calls
+                self._dispatch()
+            raise
+
+    def _release(
+        self, priority: OllamaPriority, latency_ms: float, succeeded: bool
+    ) -> None:
+        if priority == OllamaPriority.BATCH:
+            self._adapt_batch_limit(latency_ms, succeeded)
+        self._release_slot(priority)
+
+    def _release_slot(self, priority: OllamaPriority) -> None:
+        self._lanes[priority].in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued calls, interactive first."""
+        for priority in (OllamaPriority.INTERACTIVE, OllamaPriority.BATCH):
+            lane = self._lanes[priority]
+            while lane.waiters:
+                if lane.waiters[0].done():
+                    lane.waiters.popleft()  # Cancelled while queued
+                    continue
+                if not self._can_admit(priority):
+                    break
+                lane.in_flight += 1
+                lane.waiters.popleft().set_result(None)
+
+    def _adapt_batch_limit(self, latency_ms: float, succeeded: bool) -> None:
+        lane = self._lanes[OllamaPriority.BATCH]
+        previous = lane.limit
+        if not succeeded or latency_ms > self.batch_target_latency_ms:
+            lane.limit = max(1, lane.limit // 2)
+            self._batch_fast_calls = 0
+        else:
+            self._batch_fast_calls += 1
+            if self._batch_fast_calls >= lane.limit:
+                lane.limit = min(self.batch_max_concurrency, lane.limit + 1)
+                self._batch_fast_calls = 0
+        if lane.limit != previous:
+            logger.debug(
+                "ollama_batch_limit_changed",
+                limit=lane.limit,
+                previous=previous,
+                latency_ms=round(latency_ms, 2),
+            )
+
+    @property
+    def stats(self) -> dict:
+        """Per-lane queue depth, concurrency and wait times."""
+        return {priority.value: lane.stats() for priority, lane in self._lanes.items()}
+
+
+_scheduler: OllamaScheduler | None = None
+
+
+def get_ollama_scheduler() -> OllamaScheduler:
+    """The worker-wide scheduler for Ollama calls."""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = OllamaScheduler(
+            enabled=settings.ollama_scheduler_enabled,
+            interactive_concurrency=settings.ollama_interactive_concurrency,
+            batch_concurrency=settings.ollama_batch_concurrency,
+            batch_target_latency_ms=settings.ollama_batch_target_latency_ms,
+        )
+    return _scheduler
+
+
+def reset_ollama_scheduler() -> None:
+    """Forget the scheduler (for testing)."""
+    global _scheduler
+    _scheduler = None
@@ -0,0 +1,105 @@
+"""Connection pool instrumentation.
+
+SQLAlchemy reports how many connections are checked out and in overflow but
+not how long requests waited for one. ``InstrumentedAsyncQueuePool`` times
+every checkout that goes through the pool queue, so pool exhaustion shows up
+as wait time (and timeouts) rather than only as slow requests.
+"""
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+@dataclass
+class PoolWaitStats:
+    """Time spent waiting for pool connections since the pool was created."""
+
+    checkouts: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    timeouts: int = 0
+
+    def __post_init__(self) -> None:
+        self._lock = Lock()
+
+    def observe(self, wait_ms: float, timed_out: bool = False) -> None:
+        """Record one checkout attempt."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    @property
+    def avg_wait_ms(self) -> float:
+        """Mean wait per successful checkout."""
+        return self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+
+
+class PoolWaitTimingMixin:
+    """Time ``QueuePool._do_get`` (the blocking part of a checkout)."""
+
+    wait_stats: PoolWaitStats
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.observe(0.0, timed_out=True)
+            raise
+        self.wait_stats.observe((time.perf_counter() - started_at) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(PoolWaitTimingMixin, QueuePool):
+    """QueuePool that records checkout wait time (sync engines)."""
+
+
+class InstrumentedAsyncQueuePool(PoolWaitTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time."""
+
+
+def pool_status(pool: Pool) -> dict:
+    """Live pool usage for the admin metrics endpoints."""
+    status = {
+        "pool_class": type(pool).__name__,
+        "size": None,
+        "checked_out": None,
+        "checked_in": None,
+        "overflow": None,
+        "max_overflow": None,
+        "timeout_seconds": None,
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # overflow() counts from -pool_size; report only connections
+            # opened beyond the pool size
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+
+    wait_stats: PoolWaitStats | None = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(
+            checkouts=wait_stats.checkouts,
+            avg_wait_ms=round(wait_stats.avg_wait_ms, 3),
+            max_wait_ms=round(wait_stats.max_wait_ms, 3),
+            total_wait_ms=round(wait_stats.total_wait_ms, 2),
+            timeouts=wait_stats.timeouts,
+        )
+    return status
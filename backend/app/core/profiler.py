@@ -0,0 +1,155 @@
+"""Sampling profiler for a single request, job or document.
+
+A background thread samples the event loop thread's stack every
+``interval_ms`` and counts samples per stack in the folded format read by
+flamegraph.pl, inferno and speedscope (``frame;frame;frame count``).
+
+All tasks share the loop thread, so each sample is attributed to the task
+that was running: the profiled task and the tasks it creates (tracked with a
+temporary task factory) are rooted at ``[profiled]``, other requests at
+``[other tasks]`` and the loop itself (polling, callbacks) at ``[loop]``.
+Nothing is installed unless a profile is running.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter
+
+from app.core.loop_monitor import frame_name
+
+PROFILED_ROOT = "[profiled]"
+OTHER_TASKS_ROOT = "[other tasks]"
+LOOP_ROOT = "[loop]"
+
+# Deepest stack kept per sample (outermost frames are dropped)
+MAX_STACK_DEPTH = 128
+
+# Profilers currently running, sharing one task factory
+_active: list["SamplingProfiler"] = []
+_previous_factory = None
+
+
+def _task_factory(loop, coro, context=None):
+    """Create a task and let running profilers adopt children of their tasks."""
+    if _previous_factory is not None:
+        task = (
+            _previous_factory(loop, coro)
+            if context is None
+            else _previous_factory(loop, coro, context=context)
+        )
+    else:
+        task = asyncio.Task(coro, loop=loop, context=context)
+    parent = asyncio.current_task(loop)
+    for profiler in _active:
+        if parent in profiler.tasks:
+            profiler.tasks.add(task)
+    return task
+
+
+class SamplingProfiler:
+    """Sample the loop thread's stack while one task (tree) runs."""
+
+    def __init__(self, interval_ms: float = 5, max_seconds: float = 120):
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.tasks: weakref.WeakSet[asyncio.Task] = weakref.WeakSet()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id: int | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._started_at = 0.0
+        self.duration_ms = 0.0
+
+    def start(self) -> None:
+        """Start profiling the current task and the tasks it creates."""
+        global _previous_factory
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        task = asyncio.current_task()
+        if task is not None:
+            self.tasks.add(task)
+
+        if not _active:
+            _previous_factory = self._loop.get_task_factory()
+            self._loop.set_task_factory(_task_factory)
+        _active.append(self)
+
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and restore the loop's task factory."""
+        global _previous_factory
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self.duration_ms = (time.perf_counter() - self._started_at) * 1000
+
+        if self in _active:
+            _active.remove(self)
+            if not _active and self._loop is not None:
+                self._loop.set_task_factory(_previous_factory)
+                _previous_factory = None
+
+    def _run(self) -> None:
+        deadline = self._started_at + self.max_seconds
+        while not self._stopped.wait(self.interval):
+            if time.perf_counter() > deadline:
+                return
+            self._sample()
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return
+        current = asyncio.current_task(self._loop)
+        if current is None:
+            root = LOOP_ROOT
+        elif current in self.tasks:
+            root = PROFILED_ROOT
+        else:
+            root = OTHER_TASKS_ROOT
+
+        names = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            names.append(
+                frame_name_for(code.co_filename, code.co_name).replace(";", ":")
+            )
+            frame = frame.f_back
+        names.append(root)
+        self.stacks[";".join(reversed(names))] += 1
+        self.samples += 1
+
+    @property
+    def profiled_samples(self) -> int:
+        """Samples taken while the profiled task (tree) was running."""
+        return sum(
+            n for stack, n in self.stacks.items() if stack.startswith(PROFILED_ROOT)
+        )
+
+    def folded(self) -> str:
+        """Samples in folded-stack format, most frequent first."""
+        return "\n".join(f"{stack} {n}" for stack, n in self.stacks.most_common())
+
+
+_frame_names: dict[tuple[str, str], str] = {}
+
+
+def frame_name_for(filename: str, function: str) -> str:
+    """Cached ``module:function`` name for a code location."""
+    key = (filename, function)
+    name = _frame_names.get(key)
+    if name is None:
+        name = frame_name(traceback.FrameSummary(filename, 0, function, line=""))
+        _frame_names[key] = name
+    return name
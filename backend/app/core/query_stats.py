@@ -0,0 +1,287 @@
+"""Per-request and per-job SQL statement statistics with N+1 detection.
+
+``instrument_engine`` hooks SQLAlchemy cursor events. Every statement is
+timed (``db`` Server-Timing entry, and a span when traced) and, inside a
+``track_queries`` scope, counted under a fingerprint: the statement text
+with literals and bind parameters replaced by ``?`` and IN-lists collapsed.
+A fingerprint repeated more than ``query_repeat_threshold`` times within one
+scope is logged as a likely N+1 pattern.
+
+Scopes are opened by the request middleware (labelled ``METHOD /route``) and
+by the background job and sync queue processors (``job:<type>``,
+``sync:<entity>``). Scopes nest; a statement counts toward every open scope.
+Finished scopes are aggregated per label in this worker for the admin
+metrics endpoint.
+
+Other modules can watch every timed statement with
+``add_statement_observer`` (used by the slow-query EXPLAIN capture).
+"""
+
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.core.server_timing import DB, record_timing
+from app.core.tracing import record_statement_span
+
+logger = get_logger(__name__)
+
+# Longest fingerprint kept (statements beyond this are truncated)
+MAX_FINGERPRINT_LENGTH = 1000
+
+# Most repeated-statement entries kept in the worker-wide registry
+MAX_TRACKED_REPEATS = 200
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"\?(?:::\w+(?:\[\])?)?"  # ? optionally with a ::type cast
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_ROW_LIST = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise a SQL statement so repeated executions share one key."""
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _BIND_PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    text = _IN_LIST.sub("(?+)", text)
+    text = _ROW_LIST.sub("(?+), ...", text)
+    return text[:MAX_FINGERPRINT_LENGTH]
+
+
+@dataclass
+class QueryStats:
+    """Statements issued within one request or job."""
+
+    label: str = ""
+    count: int = 0
+    total_ms: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, statement_fingerprint: str, duration_ms: float) -> None:
+        """Count one statement."""
+        self.count += 1
+        self.total_ms += duration_ms
+        self.fingerprints[statement_fingerprint] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Fingerprints executed more than ``threshold`` times, most first."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n > threshold]
+
+
+# Called with (statement, parameters, duration_ms, executemany) after each
+# timed statement
+StatementObserver = Callable[[str, object, float, bool], None]
+_statement_observers: list[StatementObserver] = []
+
+
+def add_statement_observer(observer: StatementObserver) -> None:
+    """Call ``observer`` after every statement on instrumented engines."""
+    if observer not in _statement_observers:
+        _statement_observers.append(observer)
+
+
+def remove_statement_observer(observer: StatementObserver) -> None:
+    """Stop calling a previously added observer."""
+    if observer in _statement_observers:
+        _statement_observers.remove(observer)
+
+
+_active_ctx: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+def record_statement(statement: str, duration_ms: float) -> None:
+    """Attribute an executed statement to every open tracking scope."""
+    active = _active_ctx.get()
+    if not active:
+        return
+    statement_fingerprint = fingerprint(statement)
+    for stats in active:
+        stats.record(statement_fingerprint, duration_ms)
+
+
+def start_query_tracking(label: str = "") -> tuple[Token, QueryStats]:
+    """Open a tracking scope. Pair with ``finish_query_tracking``."""
+    stats = QueryStats(label=label)
+    token = _active_ctx.set((*_active_ctx.get(), stats))
+    return token, stats
+
+
+def finish_query_tracking(
+    token: Token,
+    stats: QueryStats,
+    label: str | None = None,
+    aggregate: bool = True,
+) -> None:
+    """
+    Close a tracking scope, warn about likely N+1 patterns and aggregate.
+
+    Args:
+        token: Token from ``start_query_tracking``.
+        stats: Stats from ``start_query_tracking``.
+        label: Final label (e.g. the route template, known only after routing).
+        aggregate: Add the scope to the worker-wide registry.
+    """
+    _active_ctx.reset(token)
+    if label is not None:
+        stats.label = label
+
+    threshold = get_settings().query_repeat_threshold
+    repeated = stats.repeated(threshold)
+    for statement_fingerprint, repeats in repeated:
+        logger.warning(
+            "n_plus_one_suspected",
+            label=stats.label,
+            repeats=repeats,
+            statements=stats.count,
+            fingerprint=statement_fingerprint[:200],
+        )
+
+    if aggregate:
+        get_query_stats_registry().observe(stats, repeated)
+
+
+@contextmanager
+def track_queries(label: str, aggregate: bool = True) -> Iterator[QueryStats]:
+    """Track statements issued by the enclosed block under ``label``."""
+    token, stats = start_query_tracking(label)
+    try:
+        yield stats
+    finally:
+        finish_query_tracking(token, stats, aggregate=aggregate)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time and count statements on a (sync) engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement_timer(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._npd_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, many):
+        started_at = getattr(context, "_npd_started_at", None)
+        if started_at is None:
+            return
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        record_timing(DB, duration_ms)
+        record_statement(statement, duration_ms)
+        record_statement_span(statement, duration_ms)
+        for observer in _statement_observers:
+            observer(statement, parameters, duration_ms, many)
+
+
+@dataclass
+class _LabelTotals:
+    executions: int = 0
+    statements: int = 0
+    db_ms: float = 0.0
+    max_statements: int = 0
+    n_plus_one: int = 0
+
+
+class QueryStatsRegistry:
+    """Worker-wide query statistics aggregated per label."""
+
+    def __init__(self) -> None:
+        self._labels: dict[str, _LabelTotals] = {}
+        # (label, fingerprint) -> [occurrences, max repeats]
+        self._repeats: dict[tuple[str, str], list[int]] = {}
+        self._lock = Lock()
+
+    def observe(self, stats: QueryStats, repeated: list[tuple[str, int]]) -> None:
+        """Add a finished scope."""
+        with self._lock:
+            totals = self._labels.get(stats.label)
+            if totals is None:
+                totals = self._labels[stats.label] = _LabelTotals()
+            totals.executions += 1
+            totals.statements += stats.count
+            totals.db_ms += stats.total_ms
+            totals.max_statements = max(totals.max_statements, stats.count)
+            if repeated:
+                totals.n_plus_one += 1
+
+            for statement_fingerprint, repeats in repeated:
+                key = (stats.label, statement_fingerprint)
+                if key not in self._repeats and (
+                    len(self._repeats) >= MAX_TRACKED_REPEATS
+                ):
+                    self._evict_least_seen()
+                entry = self._repeats.setdefault(key, [0, 0])
+                entry[0] += 1
+                entry[1] = max(entry[1], repeats)
+
+    def _evict_least_seen(self) -> None:
+        key = min(self._repeats, key=lambda k: self._repeats[k][0])
+        del self._repeats[key]
+
+    def summary(self, top_n: int = 20) -> dict:
+        """Per-label totals (by statements issued) and top repeated statements."""
+        with self._lock:
+            labels = [
+                {
+                    "label": label,
+                    "executions": t.executions,
+                    "statements": t.statements,
+                    "avg_statements": round(t.statements / t.executions, 2),
+                    "max_statements": t.max_statements,
+                    "db_ms_total": round(t.db_ms, 2),
+                    "avg_db_ms": round(t.db_ms / t.executions, 2),
+                    "n_plus_one_count": t.n_plus_one,
+                }
+                for label, t in self._labels.items()
+            ]
+            repeats = [
+                {
+                    "label": label,
+                    "fingerprint": statement_fingerprint,
+                    "occurrences": occurrences,
+                    "max_repeats": max_repeats,
+                }
+                for (label, statement_fingerprint), (
+                    occurrences,
+                    max_repeats,
+                ) in self._repeats.items()
+            ]
+
+        labels.sort(key=lambda x: x["statements"], reverse=True)
+        repeats.sort(key=lambda x: (x["occurrences"], x["max_repeats"]), reverse=True)
+        return {"labels": labels[:top_n], "repeated_statements": repeats[:top_n]}
+
+    def reset(self) -> None:
+        """Clear all aggregates (for testing)."""
+        with self._lock:
+            self._labels.clear()
+            self._repeats.clear()
+
+
+_registry: QueryStatsRegistry | None = None
+
+
+def get_query_stats_registry() -> QueryStatsRegistry:
+    """Get or create the worker-wide registry."""
+    global _registry
+    if _registry is None:
+        _registry = QueryStatsRegistry()
+    return _registry
+
+
+def reset_query_stats_registry() -> None:
+    """Reset the registry (for testing)."""
+    global _registry
+    _registry = None
@@ -0,0 +1,100 @@
+"""Per-request sub-timings collected through contextvars.
+
+The request middleware starts a fresh timing table for every request; code
+that waits on a backend (database, cache, Ollama, Microsoft Graph, other HTTP
+APIs) wraps the wait in ``track_time``. Child tasks inherit the table, so
+concurrent work is included. The totals are emitted as a ``Server-Timing``
+header and in the slow-request log.
+
+Outside a request (background jobs, CLI) timing is a no-op. Inside a trace
+each tracked block is also recorded as a span (see ``app.core.tracing``).
+"""
+
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from app.core.tracing import child_span, in_trace
+
+# Timing categories
+DB = "db"
+CACHE = "cache"
+OLLAMA = "ollama"
+GRAPH = "graph"
+UPSTREAM = "upstream"
+
+# name -> [total_ms, count]
+_timings_ctx: ContextVar[dict[str, list[float]] | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> Token:
+    """Begin collecting timings for the current request."""
+    return _timings_ctx.set({})
+
+
+def stop_request_timings(token: Token) -> None:
+    """Stop collecting timings (restores the previous context)."""
+    _timings_ctx.reset(token)
+
+
+def record_timing(name: str, duration_ms: float) -> None:
+    """Add a duration to the current request's timing for ``name``."""
+    timings = _timings_ctx.get()
+    if timings is None:
+        return
+    entry = timings.get(name)
+    if entry is None:
+        timings[name] = [duration_ms, 1]
+    else:
+        entry[0] += duration_ms
+        entry[1] += 1
+
+
+@contextmanager
+def track_time(name: str) -> Iterator[None]:
+    """Time the enclosed block (sync or async code) under ``name``.
+
+    In a trace the block becomes a span named after the category and the
+    calling function (e.g. ``upstream TikaClient.extract_text``).
+    """
+    timing = _timings_ctx.get() is not None
+    if not timing and not in_trace():
+        yield
+        return
+    # Frames: this generator, contextmanager.__enter__, the caller
+    caller = sys._getframe(2).f_code.co_qualname
+    start = time.perf_counter()
+    with child_span(
+        f"{name} {caller}", **{"npd.category": name, "code.function": caller}
+    ):
+        try:
+            yield
+        finally:
+            if timing:
+                record_timing(name, (time.perf_counter() - start) * 1000)
+
+
+def get_request_timings() -> dict[str, dict[str, float]]:
+    """Current request timings as ``{name: {"ms": total, "count": n}}``."""
+    timings = _timings_ctx.get() or {}
+    return {
+        name: {"ms": round(total, 2), "count": int(count)}
+        for name, (total, count) in timings.items()
+    }
+
+
+def format_server_timing(
+    timings: dict[str, dict[str, float]], total_ms: float | None = None
+) -> str:
+    """Format timings as a ``Server-Timing`` header value."""
+    parts = [
+        f'{name};dur={values["ms"]};desc="{values["count"]}x"'
+        for name, values in sorted(timings.items())
+    ]
+    if total_ms is not None:
+        parts.append(f"total;dur={round(total_ms, 2)}")
+    return ", ".join(parts)
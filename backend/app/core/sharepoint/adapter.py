@@ -4,6 +4,7 @@ Provides a high-level storage abstraction for SharePoint Online using
 the GraphClient for low-level operations.
 """
 
+from collections.abc import AsyncIterator
 from typing import BinaryIO
 from uuid import UUID
 
@@ -25,6 +26,7 @@ class SharePointStorageAdapter(StorageBackend):
     Provides file storage operations via Microsoft Graph API:
     - save: Upload files with automatic chunking for large files
     - read: Download file content by item ID
+    - read_stream: Download file content by item ID in chunks
     - delete: Soft-delete files to SharePoint recycle bin
     - exists: Check if file exists by item ID
 
@@ -193,6 +195,31 @@ class SharePointStorageAdapter(StorageBackend):
             )
             raise FileNotFoundError(f"File not found: {path}") from e
 
+    async def read_stream(self, path: str) -> AsyncIterator[bytes]:
+        """Download file by item ID in chunks.
+
+        Args:
+            path: SharePoint item ID (returned by save())
+
+        Yields:
+            File content in chunks
+
+        Raises:
+            FileNotFoundError: If file does not exist
+            SharePointError: For other Graph API errors
+        """
+        client = await self._get_client()
+
+        try:
+            async for chunk in client.download_stream(self._drive_id, path):
+                yield chunk
+        except SharePointNotFoundError as e:
+            logger.warning(
+                "sharepoint_adapter_read_not_found",
+                item_id=path,
+            )
+            raise FileNotFoundError(f"File not found: {path}") from e
+
     async def delete(self, path: str) -> None:
         """Delete file by item ID (soft-delete to recycle bin).
 
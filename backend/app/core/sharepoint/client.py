@@ -14,6 +14,7 @@ from typing import Any
 import httpx
 
 from app.core.logging import get_logger
+from app.core.server_timing import GRAPH, track_time
 from app.core.sharepoint.auth import SharePointAuthService
 from app.core.sharepoint.exceptions import (
     SharePointAuthenticationError,
@@ -127,7 +128,8 @@ class GraphClient:
                     max_attempts=retry_count + 1,
                 )
 
-                response = await client.request(method, path, **kwargs)
+                with track_time(GRAPH):
+                    response = await client.request(method, path, **kwargs)
 
                 # Handle specific status codes
                 if response.status_code == 401:
@@ -472,14 +474,15 @@ class GraphClient:
         try:
             # Upload session uses its own URL, not base URL
             async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.put(
-                    upload_url,
-                    content=content,
-                    headers={
-                        "Content-Length": str(len(content)),
-                        "Content-Range": content_range,
-                    },
-                )
+                with track_time(GRAPH):
+                    response = await client.put(
+                        upload_url,
+                        content=content,
+                        headers={
+                            "Content-Length": str(len(content)),
+                            "Content-Range": content_range,
+                        },
+                    )
 
                 if response.status_code == 202:
                     # More chunks expected
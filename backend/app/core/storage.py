@@ -6,12 +6,15 @@ implemented with different backends (local filesystem, SharePoint, S3, etc.).
 
 import shutil
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import AbstractContextManager
 from pathlib import Path
 from typing import BinaryIO
 from uuid import UUID, uuid4
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.tracing import child_span
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -35,6 +38,14 @@ class StorageBackend(ABC):
         """Read a file's contents."""
         pass
 
+    async def read_stream(self, path: str) -> AsyncIterator[bytes]:
+        """Read a file's contents in chunks.
+
+        Backends that can download incrementally override this; the default
+        reads the whole file.
+        """
+        yield await self.read(path)
+
     @abstractmethod
     async def delete(self, path: str) -> None:
         """Delete a file."""
@@ -167,7 +178,8 @@ class StorageService:
         import io
 
         file_obj = io.BytesIO(content)
-        return await self._backend.save(file_obj, filename, UUID(project_id))
+        with self._span("storage.save", filename=filename, size=len(content)):
+            return await self._backend.save(file_obj, filename, UUID(project_id))
 
     async def save_file(
         self,
@@ -189,20 +201,37 @@ class StorageService:
         Returns:
             Relative storage path
         """
-        return await self._backend.save(file, filename, UUID(project_id))
+        with self._span("storage.save", filename=filename):
+            return await self._backend.save(file, filename, UUID(project_id))
 
     async def read(self, path: str) -> bytes:
         """Read file contents."""
-        return await self._backend.read(path)
+        with self._span("storage.read", path=path):
+            return await self._backend.read(path)
+
+    async def read_stream(self, path: str) -> AsyncIterator[bytes]:
+        """Read file contents in chunks."""
+        with self._span("storage.read", path=path):
+            async for chunk in self._backend.read_stream(path):
+                yield chunk
 
     async def delete(self, path: str) -> None:
         """Delete a file."""
-        await self._backend.delete(path)
+        with self._span("storage.delete", path=path):
+            await self._backend.delete(path)
 
     async def exists(self, path: str) -> bool:
         """Check if file exists."""
         return await self._backend.exists(path)
 
+    def _span(self, name: str, **attributes: object) -> AbstractContextManager[object]:
+        """Trace span for a storage operation, tagged with the backend."""
+        return child_span(
+            name,
+            **{"storage.backend": type(self._backend).__name__},
+            **{f"storage.{key}": value for key, value in attributes.items()},
+        )
+
     def get_path(self, relative_path: str) -> str:
         """Get absolute path for a stored file.
 
@@ -0,0 +1,392 @@
+"""Distributed tracing with OpenTelemetry.
+
+Traces follow a document or job from the API request that created it,
+through the queue, to the upstream calls made while processing it:
+- the request middleware starts a server span per request, continuing an
+  incoming W3C ``traceparent`` header when present
+- every SQL statement and every ``track_time`` block (cache, Ollama, Graph,
+  other HTTP APIs) is recorded as a child span
+- storage, antivirus and text extraction calls are wrapped in
+  ``child_span`` or decorated with ``traced``
+- queue rows and job payloads store the ``traceparent`` of the code that
+  enqueued them (``current_traceparent``); the queue processors resume that
+  trace per item with ``continue_trace``
+
+Spans are exported as OTLP/JSON, either appended to a local file (one
+``ExportTraceServiceRequest`` per line) or POSTed to an OTLP/HTTP collector
+at ``<endpoint>/v1/traces``. Without an exporter configured no tracer is
+installed and every helper here is a no-op.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, ParamSpec, TypeVar
+
+import httpx
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Link, Span, SpanKind, Status, StatusCode
+from opentelemetry.trace.propagation.tracecontext import (
+    TraceContextTextMapPropagator,
+)
+
+from app.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+SERVICE_NAME = "npd-backend"
+TRACEPARENT_HEADER = "traceparent"
+
+# Key under which job payloads carry the enqueuing trace
+JOB_TRACE_KEY = "_trace"
+
+# Longest SQL statement kept on a span
+MAX_STATEMENT_LENGTH = 2000
+
+EXPORTERS = ("file", "otlp")
+
+_propagator = TraceContextTextMapPropagator()
+_provider: TracerProvider | None = None
+_tracer: trace.Tracer = trace.NoOpTracer()
+
+
+def _attributes(values: dict[str, Any]) -> dict[str, Any]:
+    """Span attributes with None dropped and non-primitive values as strings."""
+    return {
+        key: value if isinstance(value, str | bool | int | float) else str(value)
+        for key, value in values.items()
+        if value is not None
+    }
+
+
+def tracing_enabled() -> bool:
+    """Whether a tracer is installed."""
+    return _provider is not None
+
+
+def in_trace() -> bool:
+    """Whether a sampled span is active (child spans would be recorded)."""
+    return _provider is not None and trace.get_current_span().is_recording()
+
+
+@contextmanager
+def child_span(
+    name: str, kind: SpanKind = SpanKind.CLIENT, **attributes: Any
+) -> Iterator[Span | None]:
+    """Run the enclosed block (sync or async code) in a child span.
+
+    Nothing is recorded outside a trace, so cache lookups or storage reads
+    from unrelated code do not start traces of their own. Exceptions are
+    recorded on the span and re-raised.
+    """
+    if not in_trace():
+        yield None
+        return
+    with _tracer.start_as_current_span(
+        name, kind=kind, attributes=_attributes(attributes)
+    ) as current:
+        yield current
+
+
+def traced(
+    name: str, kind: SpanKind = SpanKind.INTERNAL
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Decorate an async function to run in a ``child_span``."""
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with child_span(name, kind=kind, **{"code.function": func.__qualname__}):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_span(
+    name: str,
+    duration_ms: float,
+    kind: SpanKind = SpanKind.CLIENT,
+    **attributes: Any,
+) -> None:
+    """Record a finished child span that ended now (e.g. a SQL statement)."""
+    if not in_trace():
+        return
+    end_ns = time.time_ns()
+    finished = _tracer.start_span(
+        name,
+        kind=kind,
+        attributes=_attributes(attributes),
+        start_time=end_ns - int(duration_ms * 1_000_000),
+    )
+    finished.end(end_time=end_ns)
+
+
+def record_statement_span(statement: str, duration_ms: float) -> None:
+    """Record a SQL statement as a child span of the current trace."""
+    if not in_trace():
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else "SQL"
+    record_span(
+        f"db {operation}",
+        duration_ms,
+        **{
+            "db.system": "postgresql",
+            "db.operation": operation,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        },
+    )
+
+
+def current_traceparent() -> str | None:
+    """W3C ``traceparent`` of the active span, to store with queued work."""
+    if not in_trace():
+        return None
+    carrier: dict[str, str] = {}
+    _propagator.inject(carrier)
+    return carrier.get(TRACEPARENT_HEADER)
+
+
+@contextmanager
+def continue_trace(
+    traceparent: str | None,
+    name: str,
+    kind: SpanKind = SpanKind.CONSUMER,
+    **attributes: Any,
+) -> Iterator[Span | None]:
+    """Run the enclosed block in a span continuing a stored trace.
+
+    The span's parent is the one identified by ``traceparent`` (a new trace
+    is started when it is missing or malformed). A span that was active
+    before, such as the cron request draining a queue, is linked rather
+    than used as parent.
+    """
+    if _provider is None:
+        yield None
+        return
+    parent = (
+        _propagator.extract({TRACEPARENT_HEADER: traceparent})
+        if traceparent
+        else otel_context.Context()
+    )
+    ambient = trace.get_current_span().get_span_context()
+    links = [Link(ambient)] if ambient.is_valid else None
+    with _tracer.start_as_current_span(
+        name,
+        context=parent,
+        kind=kind,
+        links=links,
+        attributes=_attributes(attributes),
+    ) as current:
+        yield current
+
+
+def current_trace_id() -> str | None:
+    """Hex ID of the active (sampled) trace, for response headers."""
+    if not in_trace():
+        return None
+    return format(trace.get_current_span().get_span_context().trace_id, "032x")
+
+
+def set_span_error(current: Span | None, message: str) -> None:
+    """Mark a span as failed without an exception (e.g. a 5xx response)."""
+    if current is not None:
+        current.set_status(Status(StatusCode.ERROR, message))
+
+
+# OTLP/JSON encoding (opentelemetry-proto ExportTraceServiceRequest)
+
+
+def _any_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, list | tuple):
+        return {"arrayValue": {"values": [_any_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _key_values(attributes: Any) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _any_value(value)}
+        for key, value in (attributes or {}).items()
+    ]
+
+
+def _encode_span(finished: ReadableSpan) -> dict[str, Any]:
+    span_context = finished.context
+    encoded: dict[str, Any] = {
+        "traceId": format(span_context.trace_id, "032x"),
+        "spanId": format(span_context.span_id, "016x"),
+        "name": finished.name,
+        # OTLP kinds are the SDK's shifted by one (0 means unspecified)
+        "kind": finished.kind.value + 1,
+        "startTimeUnixNano": str(finished.start_time),
+        "endTimeUnixNano": str(finished.end_time),
+        "attributes": _key_values(finished.attributes),
+        "status": {"code": finished.status.status_code.value},
+    }
+    if finished.parent is not None:
+        encoded["parentSpanId"] = format(finished.parent.span_id, "016x")
+    if finished.status.description:
+        encoded["status"]["message"] = finished.status.description
+    if finished.events:
+        encoded["events"] = [
+            {
+                "timeUnixNano": str(event.timestamp),
+                "name": event.name,
+                "attributes": _key_values(event.attributes),
+            }
+            for event in finished.events
+        ]
+    if finished.links:
+        encoded["links"] = [
+            {
+                "traceId": format(link.context.trace_id, "032x"),
+                "spanId": format(link.context.span_id, "016x"),
+                "attributes": _key_values(link.attributes),
+            }
+            for link in finished.links
+        ]
+    return encoded
+
+
+def encode_spans(spans: Sequence[ReadableSpan]) -> dict[str, Any]:
+    """Finished spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    by_resource: dict[int, tuple[Resource, dict[str, list[dict[str, Any]]]]] = {}
+    for finished in spans:
+        _resource, scopes = by_resource.setdefault(
+            id(finished.resource), (finished.resource, {})
+        )
+        scope = finished.instrumentation_scope
+        scopes.setdefault(scope.name if scope else "", []).append(
+            _encode_span(finished)
+        )
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _key_values(resource.attributes)},
+                "scopeSpans": [
+                    {"scope": {"name": scope_name}, "spans": encoded}
+                    for scope_name, encoded in scopes.items()
+                ],
+            }
+            for resource, scopes in by_resource.values()
+        ]
+    }
+
+
+class FileSpanExporter(SpanExporter):
+    """Append each batch to a file as one line of OTLP/JSON."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        line = json.dumps(encode_spans(spans), separators=(",", ":"))
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning("trace_export_failed", exporter="file", error=str(e))
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """POST batches as OTLP/JSON to a collector's ``/v1/traces``."""
+
+    def __init__(self, endpoint: str, timeout: float = 10.0) -> None:
+        self.url = f"{endpoint.rstrip('/')}/v1/traces"
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            response = self._client.post(self.url, json=encode_spans(spans))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("trace_export_failed", exporter="otlp", error=str(e))
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        self._client.close()
+
+
+def install_tracing(
+    exporter: SpanExporter, sample_ratio: float = 1.0, batch: bool = True
+) -> None:
+    """Install a tracer exporting finished spans through ``exporter``.
+
+    Sampling is decided per trace at its root; continued traces follow the
+    stored decision.
+    """
+    global _provider, _tracer
+    shutdown_tracing()
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter)
+    )
+    _provider = provider
+    _tracer = provider.get_tracer("app")
+
+
+def configure_tracing() -> None:
+    """Install the exporter selected in settings (no-op when unset)."""
+    settings = get_settings()
+    if not settings.trace_exporter:
+        return
+    if settings.trace_exporter == "file":
+        exporter: SpanExporter = FileSpanExporter(settings.trace_file_path)
+        target = settings.trace_file_path
+    elif settings.trace_exporter == "otlp":
+        exporter = OtlpHttpSpanExporter(settings.trace_otlp_endpoint)
+        target = exporter.url
+    else:
+        logger.warning(
+            "trace_exporter_unknown",
+            exporter=settings.trace_exporter,
+            expected=EXPORTERS,
+        )
+        return
+    install_tracing(exporter, sample_ratio=settings.trace_sample_ratio)
+    logger.info(
+        "tracing_configured",
+        exporter=settings.trace_exporter,
+        target=target,
+        sample_ratio=settings.trace_sample_ratio,
+    )
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and uninstall the tracer."""
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = trace.NoOpTracer()
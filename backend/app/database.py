@@ -12,6 +12,8 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
+from app.core.pool_stats import InstrumentedAsyncQueuePool
+from app.core.query_stats import instrument_engine
 
 settings = get_settings()
 
@@ -21,12 +23,17 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
+    poolclass=InstrumentedAsyncQueuePool,  # Records checkout wait time
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
     pool_timeout=settings.db_pool_timeout,
     pool_recycle=settings.db_pool_recycle,
 )
 
+
+# Per-request statement timing and counting (Server-Timing, N+1 detection)
+instrument_engine(engine.sync_engine)
+
 # Create session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -1,10 +1,13 @@
 """FastAPI application entry point."""
 
+import asyncio
+import secrets
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -28,15 +31,14 @@ from app.api import (
 )
 from app.config import get_settings
 from app.core.auth import azure_scheme
-from app.core.logging import (
-    configure_logging,
-    generate_request_id,
-    get_logger,
-    request_id_ctx,
-)
+from app.core.logging import configure_logging, get_logger
+from app.core.loop_monitor import start_loop_monitor, stop_loop_monitor
 from app.core.rate_limit import limiter
-from app.middleware.timing import TimingMiddleware
+from app.core.tracing import configure_tracing, shutdown_tracing
+from app.middleware.timing import RequestContextMiddleware
 from app.services.antivirus import close_clamav_pool, init_clamav_pool
+from app.services.metrics_service import run_metrics_publisher
+from app.services.slow_query_capture import install_slow_query_capture
 
 settings = get_settings()
 
@@ -72,15 +74,39 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
             "Set AZURE_AD_TENANT_ID, AZURE_AD_CLIENT_ID, and AZURE_AD_CLIENT_SECRET.",
         )
 
+    # Export traces (no-op unless TRACE_EXPORTER is set)
+    configure_tracing()
+
     # Initialize ClamAV connection pool (if enabled)
     await init_clamav_pool()
 
+    # Find sync code blocking the event loop
+    if settings.event_loop_monitor_enabled:
+        start_loop_monitor(
+            interval_ms=settings.event_loop_monitor_interval_ms,
+            threshold_ms=settings.event_loop_block_threshold_ms,
+        )
+
+    # Opt-in EXPLAIN capture for slow search/list statements
+    install_slow_query_capture()
+
+    # Publish request metrics for fleet-wide aggregation (no-op without Redis)
+    metrics_publisher = asyncio.create_task(run_metrics_publisher())
+
     yield
 
     # Shutdown
+    metrics_publisher.cancel()
+    with suppress(asyncio.CancelledError):
+        await metrics_publisher
+    await stop_loop_monitor()
+
     # Close ClamAV connection pool
     await close_clamav_pool()
 
+    # Flush buffered spans
+    shutdown_tracing()
+
     logger.info("application_shutdown")
 
 
@@ -112,6 +138,8 @@ app.add_middleware(
     ],
     expose_headers=[
         "X-Request-ID",
+        "X-Response-Time-Ms",
+        "Server-Timing",
         "X-RateLimit-Limit",
         "X-RateLimit-Remaining",
         "X-RateLimit-Reset",
@@ -122,19 +150,8 @@ app.add_middleware(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# Performance timing middleware
-app.add_middleware(TimingMiddleware)
-
-
-# Request correlation ID middleware
-@app.middleware("http")
-async def add_request_id_middleware(request, call_next):
-    """Add correlation ID to each request."""
-    request_id = generate_request_id()
-    request_id_ctx.set(request_id)
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
+# Request ID, timing and metrics middleware (outermost, pure ASGI)
+app.add_middleware(RequestContextMiddleware)
 
 
 # Include routers
@@ -161,13 +178,16 @@ app.include_router(project_permissions.router, prefix="/api/v1")
 async def health_check() -> dict:
     """Enhanced health check endpoint with system metrics."""
     from app.config import get_settings
+    from app.core.circuit_breaker import get_circuit_breakers
     from app.services.cache_service import get_tag_cache
-    from app.services.metrics_service import get_metrics_service
+    from app.services.metrics_service import get_fleet_snapshot, get_metrics_service
 
     app_settings = get_settings()
     metrics = get_metrics_service()
-    error_rates = metrics.get_error_rates()
-    avg_response = metrics.get_average_response_time()
+    snapshot = await get_fleet_snapshot()
+    error_rates = snapshot.error_rates()
+    latency = snapshot.latency_summary()
+    avg_response = latency["avg_ms"]
     uptime = metrics.get_uptime_seconds()
 
     # Determine status
@@ -198,6 +218,11 @@ async def health_check() -> dict:
         tika_healthy = await tika_client.health_check()
         tika_status = "healthy" if tika_healthy else "unavailable"
 
+    # Upstream circuit breakers (this worker only)
+    circuits = {
+        name: breaker.stats["state"] for name, breaker in get_circuit_breakers().items()
+    }
+
     return {
         "status": health_status,
         "version": "1.0.0",
@@ -207,11 +232,45 @@ async def health_check() -> dict:
         "storage": storage_type,
         "sharepoint": sharepoint_status,
         "tika": tika_status,
+        "circuits": circuits,
         "error_rate_percent": error_rates["error_rate_percent"],
         "avg_response_time_ms": avg_response,
+        "p50_ms": latency["p50_ms"],
+        "p95_ms": latency["p95_ms"],
+        "p99_ms": latency["p99_ms"],
+        "workers": snapshot.workers,
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(
+    authorization: str | None = Header(None),
+) -> PlainTextResponse:
+    """Prometheus scrape endpoint with request metrics merged across workers.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>``; disabled when
+    METRICS_TOKEN is not set.
+    """
+    from app.services.metrics_service import get_fleet_snapshot, render_prometheus
+
+    app_settings = get_settings()
+    if not app_settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    expected = f"Bearer {app_settings.metrics_token}"
+    if not authorization or not secrets.compare_digest(authorization, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing metrics token",
+        )
+
+    snapshot = await get_fleet_snapshot()
+    return PlainTextResponse(
+        render_prometheus(snapshot),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint."""
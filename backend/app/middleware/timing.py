@@ -1,54 +1,207 @@
-"""Request timing middleware for performance monitoring."""
+"""Request context and timing middleware.
+
+A single pure ASGI middleware (no ``BaseHTTPMiddleware``) that, per request:
+- assigns a correlation ID (``X-Request-ID`` header, log context)
+- collects sub-timings (see ``app.core.server_timing``) and SQL statement
+  statistics (see ``app.core.query_stats``)
+- adds ``X-Response-Time-Ms`` and ``Server-Timing`` headers
+- records the request in the metrics service by route template
+- logs slow requests with their timing breakdown
+- profiles the request when it carries a valid ``X-NPD-Profile`` token
+  (see ``app.services.profiling_service``), returning ``X-Profile-Id``
+- runs the request in a tracing span (see ``app.core.tracing``), continuing
+  an incoming ``traceparent`` header and returning ``X-Trace-Id``
+
+Response bodies are passed through untouched, so streaming responses (CSV
+export, SSE) are not buffered. For those, the headers reflect the time to
+the first byte while metrics record the full duration.
+"""
 
 import time
-
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-
-from app.core.logging import get_logger
+from contextlib import AsyncExitStack
+
+from opentelemetry.trace import SpanKind
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import generate_request_id, get_logger, request_id_ctx
+from app.core.query_stats import (
+    QueryStats,
+    finish_query_tracking,
+    start_query_tracking,
+)
+from app.core.server_timing import (
+    format_server_timing,
+    get_request_timings,
+    start_request_timings,
+    stop_request_timings,
+)
+from app.core.tracing import continue_trace, current_trace_id, set_span_error
 
 logger = get_logger(__name__)
 
 SLOW_REQUEST_THRESHOLD_MS = 500  # Configurable threshold
 
+# Request header carrying an admin-issued profile token
+PROFILE_HEADER = b"x-npd-profile"
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    """Middleware to track request timing and log slow requests."""
+# W3C trace context header of a calling service
+TRACEPARENT_HEADER = b"traceparent"
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Track request timing and record to metrics service."""
-        start_time = time.perf_counter()
 
-        response = await call_next(request)
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled the request.
+
+    FastAPI stores the matched route in the ASGI scope, so
+    ``/api/v1/projects/<uuid>`` is reported as
+    ``/api/v1/projects/{project_id}``. Unmatched requests share one label to
+    keep metric cardinality bounded.
+    """
+    from app.services.metrics_service import UNMATCHED_ROUTE
+
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
 
-        duration_ms = (time.perf_counter() - start_time) * 1000
+class RequestContextMiddleware:
+    """Assign request IDs, collect timings and record request metrics."""
 
-        # Get metrics service and record
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile_user = self._profile_requested_by(scope)
+        request_id = generate_request_id()
+        id_token = request_id_ctx.set(request_id)
+        timings_token = start_request_timings()
+        queries_token, query_stats = start_query_tracking()
+        start_time = time.perf_counter()
+        status_code = 500
+        profile = None
+        trace_id = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Response-Time-Ms"] = str(round(elapsed_ms, 2))
+                headers.append(
+                    "Server-Timing",
+                    format_server_timing(get_request_timings(), elapsed_ms),
+                )
+                if profile is not None:
+                    headers["X-Profile-Id"] = profile.profile_id
+                if trace_id is not None:
+                    headers["X-Trace-Id"] = trace_id
+            await send(message)
+
+        try:
+            async with AsyncExitStack() as stack:
+                request_span = stack.enter_context(
+                    continue_trace(
+                        self._header(scope, TRACEPARENT_HEADER),
+                        f"{scope['method']} {scope['path']}",
+                        kind=SpanKind.SERVER,
+                        **{
+                            "http.request.method": scope["method"],
+                            "url.path": scope["path"],
+                            "request_id": request_id,
+                        },
+                    )
+                )
+                trace_id = current_trace_id()
+                if profile_user is not None:
+                    from app.services.profiling_service import profile_block
+
+                    profile = await stack.enter_async_context(
+                        profile_block(
+                            "request",
+                            f"{scope['method']} {scope['path']}",
+                            requested_by=profile_user,
+                        )
+                    )
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    route = route_template(scope)
+                    label = f"{scope['method']} {route}"
+                    if profile is not None:
+                        profile.label = label
+                    if request_span is not None:
+                        request_span.update_name(label)
+                        request_span.set_attribute("http.route", route)
+                        request_span.set_attribute(
+                            "http.response.status_code", status_code
+                        )
+                        if status_code >= 500:
+                            set_span_error(request_span, f"HTTP {status_code}")
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            route = route_template(scope)
+            finish_query_tracking(
+                queries_token, query_stats, label=f"{scope['method']} {route}"
+            )
+            self._record(scope, route, status_code, duration_ms, query_stats)
+            stop_request_timings(timings_token)
+            request_id_ctx.reset(id_token)
+
+    @staticmethod
+    def _header(scope: Scope, header: bytes) -> str | None:
+        """Value of a request header (lower-case name), if present."""
+        for name, value in scope["headers"]:
+            if name == header:
+                return value.decode("latin-1")
+        return None
+
+    def _profile_requested_by(self, scope: Scope) -> str | None:
+        """User who signed the request's profile token, if it has a valid one."""
+        token = self._header(scope, PROFILE_HEADER)
+        if token is None:
+            return None
+
+        from app.services.profiling_service import verify_profile_token
+
+        user_id = verify_profile_token(token)
+        if user_id is None:
+            logger.warning("profile_token_rejected", path=scope["path"])
+        return user_id
+
+    @staticmethod
+    def _record(
+        scope: Scope,
+        route: str,
+        status_code: int,
+        duration_ms: float,
+        query_stats: QueryStats,
+    ) -> None:
+        """Record metrics and log the request."""
         from app.services.metrics_service import get_metrics_service
 
-        metrics = get_metrics_service()
-        metrics.record_request(
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
+        method = scope["method"]
+        get_metrics_service().record_request(
+            method=method,
+            path=route,
+            status_code=status_code,
             duration_ms=duration_ms,
         )
 
-        # Log timing
         log_data = {
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
+            "method": method,
+            "path": scope["path"],
+            "route": route,
+            "status_code": status_code,
             "duration_ms": round(duration_ms, 2),
+            "queries": query_stats.count,
         }
 
         if duration_ms > SLOW_REQUEST_THRESHOLD_MS:
-            logger.warning("slow_request", **log_data)
+            logger.warning("slow_request", timings=get_request_timings(), **log_data)
         else:
             logger.debug("request_timing", **log_data)
-
-        # Add timing header for debugging
-        response.headers["X-Response-Time-Ms"] = str(round(duration_ms, 2))
-
-        return response
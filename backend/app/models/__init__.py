@@ -3,7 +3,7 @@
 from app.models.api_token import APIToken
 from app.models.audit import AuditAction, AuditLog
 from app.models.contact import Contact
-from app.models.document import Document
+from app.models.document import Document, DocumentProcessingRun
 from app.models.document_queue import (
     DocumentProcessingQueue,
     DocumentQueueOperation,
@@ -38,7 +38,13 @@ from app.models.project_permission import (
     ProjectPermission,
     ProjectVisibility,
 )
-from app.models.tag import Tag, TagSynonym, TagType
+from app.models.tag import (
+    Tag,
+    TagCooccurrence,
+    TagSynonym,
+    TagType,
+    TagUsageStat,
+)
 from app.models.team import Team, TeamMember
 from app.models.user import User, UserRole
 
@@ -49,6 +55,7 @@ __all__ = [
     "Contact",
     "Document",
     "DocumentProcessingQueue",
+    "DocumentProcessingRun",
     "DocumentQueueOperation",
     "DocumentQueueStatus",
     "EmailMonitorState",
@@ -79,8 +86,10 @@ __all__ = [
     "SyncQueueOperation",
     "SyncQueueStatus",
     "Tag",
+    "TagCooccurrence",
     "TagSynonym",
     "TagType",
+    "TagUsageStat",
     "Team",
     "TeamMember",
     "User",
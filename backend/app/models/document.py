@@ -191,3 +191,85 @@ class DocumentChunk(Base):
 
     def __repr__(self) -> str:
         return f"<DocumentChunk {self.document_id}:{self.chunk_index}>"
+
+
+class DocumentProcessingRun(Base):
+    """Stage timings of one processing run of a document.
+
+    Written by the document processing pipeline; aggregated by
+    DocumentStatsService for the admin throughput analytics.
+    """
+
+    __tablename__ = "document_processing_runs"
+
+    id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        primary_key=True,
+        server_default=func.gen_random_uuid(),
+    )
+    document_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+    )  # completed, failed, skipped
+    mime_type: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+    )
+    file_size: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    extraction_method: Mapped[str | None] = mapped_column(
+        String(20),
+        nullable=True,
+    )  # native, tika, ocr
+    total_ms: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+    )
+    storage_read_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    extraction_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    chunking_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    embedding_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    tag_suggestion_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    db_write_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    text_length: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    chunk_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    embedding_requests: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )  # Chunks sent to Ollama
+    embedding_cache_hits: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    embeddings_reused: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )  # Duplicate chunks within the document
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<DocumentProcessingRun {self.document_id} {self.status}>"
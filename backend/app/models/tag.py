@@ -4,7 +4,16 @@ import enum
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, UniqueConstraint, func
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -154,3 +163,62 @@ class TagSynonym(Base):
 # Forward references
 from app.models.project import ProjectTag  # noqa: E402, F401
 from app.models.user import User  # noqa: E402, F401
+
+
+class TagUsageStat(Base):
+    """Materialised usage count for a tag (number of projects using it).
+
+    Maintained incrementally by TagStatsService when project tags change and
+    rebuilt periodically by a full reconciliation.
+    """
+
+    __tablename__ = "tag_usage_stats"
+
+    __table_args__ = (Index("ix_tag_usage_stats_usage_count", "usage_count"),)
+
+    tag_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    usage_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class TagCooccurrence(Base):
+    """Materialised number of projects sharing a pair of tags.
+
+    Each unordered pair is stored in both directions so that looking up
+    the tags co-occurring with a tag is a primary-key range scan.
+    """
+
+    __tablename__ = "tag_cooccurrence"
+
+    __table_args__ = (
+        Index("ix_tag_cooccurrence_tag_count", "tag_id", "project_count"),
+    )
+
+    tag_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    other_tag_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    project_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
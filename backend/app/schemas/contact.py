@@ -73,6 +73,19 @@ class ContactWithOrganization(ContactResponse):
     organization: OrganizationResponse
 
 
+class ContactSuggestion(BaseModel):
+    """Contact autocomplete suggestion with similarity score."""
+
+    contact: ContactResponse
+    score: float = Field(..., description="Similarity score (0-1)")
+
+
+class ContactSuggestionsResponse(BaseModel):
+    """Response for contact suggestions."""
+
+    suggestions: list[ContactSuggestion]
+
+
 class ContactDetail(ContactWithOrganization):
     """Detailed contact response with related projects."""
 
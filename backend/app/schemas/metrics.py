@@ -30,12 +30,61 @@ class ErrorRateMetrics(BaseModel):
     error_rate_percent: float = 0.0
 
 
+class LatencySummary(BaseModel):
+    """Overall request latency percentiles across all endpoints."""
+
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    avg_ms: float = 0.0
+
+
+class PoolMetrics(BaseModel):
+    """Live SQLAlchemy connection pool usage for this worker."""
+
+    pool_class: str
+    size: int | None = None
+    checked_out: int | None = Field(None, description="Connections in use")
+    checked_in: int | None = Field(None, description="Idle connections")
+    overflow: int | None = Field(None, description="Connections beyond pool_size")
+    max_overflow: int | None = None
+    timeout_seconds: float | None = None
+    checkouts: int = Field(0, description="Checkouts since the pool was created")
+    avg_wait_ms: float = Field(0.0, description="Mean wait for a connection")
+    max_wait_ms: float = 0.0
+    total_wait_ms: float = 0.0
+    timeouts: int = Field(0, description="Checkouts that hit pool_timeout")
+
+
+class OllamaLaneMetrics(BaseModel):
+    """Admission state of one Ollama priority lane."""
+
+    in_flight: int = Field(..., description="Calls currently running")
+    queued: int = Field(..., description="Calls waiting for a slot")
+    limit: int = Field(..., description="Current concurrency cap")
+    admitted: int = Field(0, description="Calls admitted since startup")
+    avg_wait_ms: float = Field(0.0, description="Mean wait for a slot")
+    max_wait_ms: float = 0.0
+
+
+class OllamaMetricsResponse(BaseModel):
+    """Ollama admission lanes and circuit breakers for this worker."""
+
+    enabled: bool
+    lanes: dict[str, OllamaLaneMetrics] = Field(
+        default_factory=dict, description="Lane name (interactive, batch) -> state"
+    )
+    circuits: dict[str, str] = Field(
+        default_factory=dict, description="Circuit breaker name -> state"
+    )
+
+
 class DatabaseMetrics(BaseModel):
     """Database connection pool metrics."""
 
     pool_size: int = Field(..., description="Configured pool size")
     max_overflow: int = Field(..., description="Max overflow connections")
-    # Note: Actual usage requires SQLAlchemy pool instrumentation
+    pool: PoolMetrics | None = None
 
 
 class CacheMetrics(BaseModel):
@@ -45,6 +94,29 @@ class CacheMetrics(BaseModel):
     org_cache: dict = Field(default_factory=dict)
     dashboard_cache: dict = Field(default_factory=dict)
     search_cache: dict = Field(default_factory=dict)
+    nl_parse_cache: dict = Field(default_factory=dict)
+
+
+class LoopOffenderMetrics(BaseModel):
+    """Event loop stalls attributed to one function."""
+
+    function: str = Field(..., description="module:function that blocked the loop")
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class EventLoopMetrics(BaseModel):
+    """Event loop scheduling delay and blocking offenders."""
+
+    samples: int = 0
+    lag_p50_ms: float = 0.0
+    lag_p99_ms: float = 0.0
+    lag_max_ms: float = 0.0
+    blocked_count: int = Field(0, description="Stalls above the block threshold")
+    offenders: list[LoopOffenderMetrics] = Field(
+        default_factory=list, description="Sorted by total blocked time"
+    )
 
 
 class SystemMetricsResponse(BaseModel):
@@ -52,13 +124,20 @@ class SystemMetricsResponse(BaseModel):
 
     collected_at: datetime
     uptime_seconds: float
+    workers: int = Field(1, description="Worker processes included in the metrics")
     request_metrics: ErrorRateMetrics
+    latency: LatencySummary = Field(default_factory=LatencySummary)
     endpoints: list[EndpointMetrics] = Field(
         default_factory=list,
-        description="Per-endpoint metrics, sorted by request count",
+        description="Per-route-template metrics, sorted by request count",
     )
     cache: CacheMetrics
     database: DatabaseMetrics
+    event_loop: EventLoopMetrics = Field(default_factory=EventLoopMetrics)
+    search_branch_timeouts: dict[str, int] = Field(
+        default_factory=dict,
+        description="Hybrid search ranking branches dropped at their deadline",
+    )
     slow_request_threshold_ms: float = 500.0
 
 
@@ -72,3 +151,184 @@ class HealthCheckResponse(BaseModel):
     cache: str = Field(..., description="redis, in_memory, or error")
     error_rate_percent: float = 0.0
     avg_response_time_ms: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    workers: int = 1
+
+
+class QueryLabelMetrics(BaseModel):
+    """SQL statement totals for one route or job type."""
+
+    label: str = Field(..., description="METHOD /route, job:<type> or sync:<entity>")
+    executions: int = 0
+    statements: int = 0
+    avg_statements: float = 0.0
+    max_statements: int = 0
+    db_ms_total: float = 0.0
+    avg_db_ms: float = 0.0
+    n_plus_one_count: int = Field(
+        0, description="Executions in which a statement repeated above the threshold"
+    )
+
+
+class RepeatedStatementMetrics(BaseModel):
+    """A statement fingerprint flagged as a likely N+1 pattern."""
+
+    label: str
+    fingerprint: str
+    occurrences: int = Field(0, description="Executions in which it was flagged")
+    max_repeats: int = Field(0, description="Most repeats within one execution")
+
+
+class QueryMetricsResponse(BaseModel):
+    """Per-request/job SQL statement statistics for this worker."""
+
+    collected_at: datetime
+    repeat_threshold: int
+    labels: list[QueryLabelMetrics] = Field(default_factory=list)
+    repeated_statements: list[RepeatedStatementMetrics] = Field(default_factory=list)
+
+
+class SlowQueryCaptureEntry(BaseModel):
+    """A slow statement with its redacted EXPLAIN (ANALYZE, BUFFERS) plan."""
+
+    label: str = Field(..., description="Code path, e.g. search:vector")
+    fingerprint: str = Field(..., description="Statement with parameters as ?")
+    duration_ms: float
+    captured_at: datetime
+    request_id: str | None = None
+    plan: list[str] = Field(default_factory=list)
+    execution_ms: float | None = Field(None, description="Execution time of the re-run")
+    indexes_used: list[str] = Field(default_factory=list)
+    seq_scans: list[str] = Field(
+        default_factory=list, description="Tables read with a sequential scan"
+    )
+    error: str | None = Field(None, description="Why the EXPLAIN failed, if it did")
+
+
+class SlowQueryCaptureResponse(BaseModel):
+    """Recent slow-query captures for this worker."""
+
+    enabled: bool
+    threshold_ms: int
+    captures: list[SlowQueryCaptureEntry] = Field(default_factory=list)
+
+
+class StatementStats(BaseModel):
+    """One normalised statement from pg_stat_statements."""
+
+    query_id: str
+    query: str
+    calls: int
+    rows: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    shared_blks_read: int = 0
+    temp_blks_written: int = 0
+    cache_hit_ratio: float | None = None
+
+
+class StatementStatsResponse(BaseModel):
+    """Top statements by the requested measure since stats were last reset."""
+
+    collected_at: datetime
+    available: bool
+    reason: str | None = Field(None, description="Why statistics are unavailable")
+    order_by: str
+    statements: list[StatementStats] = Field(default_factory=list)
+
+
+class IndexStats(BaseModel):
+    """Usage and size of one index."""
+
+    table_name: str
+    index_name: str
+    method: str = Field(..., description="Access method (btree, gin, hnsw, ...)")
+    idx_scan: int
+    idx_tup_read: int
+    size_bytes: int
+    is_unique: bool
+    is_primary: bool
+    is_valid: bool
+    dead_tuple_ratio: float = Field(0.0, description="Dead tuples in the table")
+    status: str | None = Field(
+        None, description="Search indexes: ok, unused, needs_vacuum or invalid"
+    )
+
+
+class TableStorage(BaseModel):
+    """Size and scan statistics of one table."""
+
+    table_name: str
+    total_bytes: int
+    table_bytes: int
+    index_bytes: int
+    toast_bytes: int
+    live_tuples: int
+    dead_tuples: int
+    dead_tuple_ratio: float
+    seq_scan: int
+    idx_scan: int | None = None
+    last_autovacuum: datetime | None = None
+    last_autoanalyze: datetime | None = None
+    indexes: list[IndexStats] = Field(default_factory=list)
+
+
+class DatabaseStorageResponse(BaseModel):
+    """Table sizes, index usage and search index health."""
+
+    collected_at: datetime
+    tables: list[TableStorage] = Field(default_factory=list)
+    unused_indexes: list[IndexStats] = Field(
+        default_factory=list, description="Never scanned, non-unique, largest first"
+    )
+    most_scanned_indexes: list[IndexStats] = Field(default_factory=list)
+    search_indexes: list[IndexStats] = Field(
+        default_factory=list, description="HNSW, IVFFlat and GIN indexes"
+    )
+
+
+class StageLatency(BaseModel):
+    """Latency percentiles of one document processing stage."""
+
+    stage: str = Field(
+        ...,
+        description="storage_read, extraction, chunking, embedding, "
+        "tag_suggestion or db_write",
+    )
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+
+
+class DocumentProcessingGroup(BaseModel):
+    """Processing statistics for one MIME type and size bucket."""
+
+    mime_type: str | None = Field(None, description="None for the overall row")
+    size_bucket: str | None = Field(None, description="e.g. 100KB-1MB")
+    documents: int
+    completed: int
+    failed: int
+    docs_per_hour: float = Field(..., description="Completed documents per hour")
+    bytes_per_second: float | None = Field(
+        None, description="Bytes processed per second of processing time"
+    )
+    total_p50_ms: float | None = None
+    total_p95_ms: float | None = None
+    stages: list[StageLatency] = Field(default_factory=list)
+    chunks: int = 0
+    embedding_requests: int = Field(0, description="Chunks sent to Ollama")
+    embedding_cache_hits: int = 0
+    embeddings_reused: int = Field(
+        0, description="Duplicate chunks that reused an embedding"
+    )
+
+
+class DocumentProcessingAnalyticsResponse(BaseModel):
+    """Document processing stage timings and throughput."""
+
+    window_hours: int
+    since: datetime
+    overall: DocumentProcessingGroup | None = None
+    groups: list[DocumentProcessingGroup] = Field(default_factory=list)
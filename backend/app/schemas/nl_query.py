@@ -88,3 +88,7 @@ class NLQueryParseResponse(BaseModel):
         default=None,
         description="Human-readable explanation of how query was interpreted",
     )
+    upstream_failure: str | None = Field(
+        default=None,
+        description="Why the LLM was unavailable (circuit_open, timeout, error)",
+    )
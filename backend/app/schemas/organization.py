@@ -92,6 +92,19 @@ class OrganizationResponse(OrganizationBase):
     sync_direction: str = "none"
 
 
+class OrganizationSuggestion(BaseModel):
+    """Organization autocomplete suggestion with similarity score."""
+
+    organization: OrganizationResponse
+    score: float = Field(..., description="Similarity score (0-1)")
+
+
+class OrganizationSuggestionsResponse(BaseModel):
+    """Response for organization suggestions."""
+
+    suggestions: list[OrganizationSuggestion]
+
+
 class OrganizationDetail(OrganizationResponse):
     """Detailed organization response with counts."""
 
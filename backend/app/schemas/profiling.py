@@ -0,0 +1,46 @@
+"""On-demand profiling Pydantic schemas."""
+
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ProfileTokenResponse(BaseModel):
+    """Signed token that enables profiling of requests carrying it."""
+
+    token: str
+    header: str = Field("X-NPD-Profile", description="Request header to send it in")
+    expires_at: datetime
+
+
+class ProfileTargetRequest(BaseModel):
+    """A job or document to profile the next time it is processed."""
+
+    kind: Literal["job", "document"]
+    target_id: UUID = Field(..., description="Job ID or document ID")
+
+
+class ProfileTargetResponse(BaseModel):
+    """Confirmation of an armed profile target."""
+
+    kind: str
+    target_id: UUID
+    expires_in_seconds: int
+
+
+class ProfileSummary(BaseModel):
+    """A stored profile (without its stacks)."""
+
+    profile_id: str
+    kind: str = Field(..., description="request, job or document")
+    label: str
+    created_at: datetime
+    duration_ms: float
+    samples: int
+    profiled_samples: int = Field(
+        0, description="Samples taken while the profiled work was running"
+    )
+    interval_ms: float
+    requested_by: str | None = None
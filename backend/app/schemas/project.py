@@ -1,5 +1,6 @@
 """Project Pydantic schemas."""
 
+import enum
 from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
@@ -8,6 +9,7 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from app.models.project import ProjectLocation, ProjectStatus
 from app.models.project_permission import ProjectVisibility
+from app.schemas.base import PaginatedResponse
 from app.schemas.contact import ContactResponse
 from app.schemas.organization import OrganizationResponse
 from app.schemas.tag import TagResponse
@@ -166,3 +168,36 @@ class DismissProjectTagSuggestionRequest(BaseModel):
     """Request to dismiss a tag suggestion for all project documents."""
 
     tag_id: UUID
+
+
+# ============== Facets ==============
+
+
+class ProjectFacet(str, enum.Enum):
+    """Facet dimensions that can be counted over a project result set."""
+
+    STATUS = "status"
+    ORGANIZATION = "organization"
+    TAG = "tag"
+
+
+class FacetBucket(BaseModel):
+    """A single facet value with the number of matching projects."""
+
+    value: str
+    label: str
+    count: int
+
+
+class ProjectFacets(BaseModel):
+    """Facet counts over a filtered, ACL-restricted project result set."""
+
+    status: list[FacetBucket] | None = None
+    organization: list[FacetBucket] | None = None
+    tag: list[FacetBucket] | None = None
+
+
+class ProjectListResponse(PaginatedResponse[ProjectResponse]):
+    """Paginated project list with optional facet counts."""
+
+    facets: ProjectFacets | None = None
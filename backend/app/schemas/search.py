@@ -7,7 +7,7 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.project import ProjectStatus
 from app.schemas.nl_query import ParsedQueryIntent
-from app.schemas.project import ProjectResponse
+from app.schemas.project import ProjectFacets, ProjectResponse
 
 
 class SearchRequest(BaseModel):
@@ -45,6 +45,17 @@ class SynonymExpansionMetadata(BaseModel):
     synonym_matches: dict[str, list[str]]  # original_tag_id -> list of synonym_tag_ids
 
 
+class SearchDegradation(BaseModel):
+    """Search steps skipped because an upstream service was unavailable."""
+
+    skipped: dict[str, str] = Field(
+        description=(
+            "Skipped step (project_text, document_text, vector, query_parser) "
+            "-> reason (deadline, circuit_open, timeout, error)"
+        ),
+    )
+
+
 class SearchResponse(BaseModel):
     """Search response with results and metadata."""
 
@@ -57,6 +68,23 @@ class SearchResponse(BaseModel):
         default=None,
         description="Metadata about tag synonym expansion (if synonyms were used)",
     )
+    facets: ProjectFacets | None = Field(
+        default=None,
+        description="Facet counts over the full result set (if requested)",
+    )
+    degraded: SearchDegradation | None = Field(
+        default=None,
+        description="Set when results were ranked without some sources "
+        "(e.g. keyword-only while the embedding service is unavailable)",
+    )
+    partial: bool = Field(
+        default=False,
+        description="True when a ranking branch was skipped or missed its deadline",
+    )
+    ranking_sources: list[str] | None = Field(
+        default=None,
+        description="Ranking branches fused into the results (text queries only)",
+    )
 
 
 class SearchSuggestion(BaseModel):
@@ -168,6 +196,18 @@ class SemanticSearchResponse(BaseModel):
     page_size: int
     query: str
     parsed_query: ParsedQueryMetadata
+    degraded: SearchDegradation | None = Field(
+        default=None,
+        description="Set when parsing or ranking skipped an unavailable upstream",
+    )
+    partial: bool = Field(
+        default=False,
+        description="True when a ranking branch was skipped or missed its deadline",
+    )
+    ranking_sources: list[str] | None = Field(
+        default=None,
+        description="Ranking branches fused into the results (text queries only)",
+    )
 
 
 # ============== Summarization ==============
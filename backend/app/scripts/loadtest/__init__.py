@@ -0,0 +1,23 @@
+"""Load-test kit: seeded data, fake upstreams and scripted scenarios.
+
+- ``seed``: synthetic projects, organizations, tags, ACL grants, documents
+  and embedded chunks
+- ``fake_upstreams``: stand-in Ollama, Tika, Monday, Jira and Graph servers
+  with configurable latency
+- ``run``: mixed search, list, upload, export and queue-drain traffic with
+  throughput and latency percentiles
+
+See docs/operations/LOAD-TESTING.md.
+"""
+
+# Embedding size of nomic-embed-text (document_chunks.embedding)
+EMBEDDING_DIMENSIONS = 768
+
+# Vocabulary for generated names, text and search terms
+WORDS = (
+    "acoustic anechoic audio bluetooth beamforming calibration cellular codec "
+    "compliance embedded enclosure firmware frequency gateway headphone "
+    "impedance latency loudspeaker microphone modem noise prototype radio "
+    "sensor signal speaker thermal tracker validation vibration wearable "
+    "wireless zigbee antenna battery charger display haptics camera lidar"
+).split()
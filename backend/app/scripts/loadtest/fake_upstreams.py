@@ -0,0 +1,282 @@
+"""Local stand-ins for the upstream services, with configurable latency.
+
+Run with: python -m app.scripts.loadtest.fake_upstreams --port 9100
+
+One server answers for every upstream, so point the backend at it with:
+
+    OLLAMA_BASE_URL=http://localhost:9100
+    TIKA_URL=http://localhost:9100
+    MONDAY_API_URL=http://localhost:9100/v2
+    JIRA_BASE_URL=http://localhost:9100
+
+Routes:
+- Ollama: ``POST /api/embeddings``, ``POST /api/embed`` (deterministic unit
+  vectors per text), ``POST /api/chat`` (query-parser JSON when
+  ``format`` is ``json``, otherwise a canned summary), ``GET /api/tags``
+- Tika: ``PUT /tika`` (echoes text content), ``GET /tika``
+- Monday: ``POST /v2`` (boards, items and item mutations)
+- Jira: issues, projects, ``myself`` and ``serverInfo`` under ``/rest/api/3``
+- Graph: mailbox messages and ``sendMail`` under ``/v1.0/users/{user}``.
+  The Graph SDK still authenticates against Azure AD and always calls
+  graph.microsoft.com, so these serve direct HTTP clients only.
+
+Each upstream has its own latency (mean and jitter) and error rate, e.g.
+``--ollama-latency 80 --ollama-error-rate 0.05``. Errors are HTTP 503s.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
+
+from app.scripts.loadtest import EMBEDDING_DIMENSIONS
+
+UPSTREAMS = ("ollama", "tika", "monday", "jira", "graph")
+
+# Default mean latency per upstream, in milliseconds
+DEFAULT_LATENCY_MS = {
+    "ollama": 60.0,
+    "tika": 150.0,
+    "monday": 250.0,
+    "jira": 120.0,
+    "graph": 200.0,
+}
+
+
+@dataclass
+class UpstreamProfile:
+    """Simulated behaviour of one upstream."""
+
+    latency_ms: float = 0.0
+    jitter: float = 0.25  # Latency varies uniformly by +/- this fraction
+    error_rate: float = 0.0
+    calls: int = 0
+    errors: int = 0
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    async def respond(self) -> None:
+        """Wait out the simulated latency, then maybe fail the call."""
+        self.calls += 1
+        if self.latency_ms > 0:
+            spread = self.latency_ms * self.jitter
+            delay = self.latency_ms + self.rng.uniform(-spread, spread)
+            await asyncio.sleep(max(delay, 0.0) / 1000)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors += 1
+            raise HTTPException(status_code=503, detail="Simulated upstream error")
+
+
+def fake_embedding(text: str) -> list[float]:
+    """Deterministic unit vector for ``text`` (same text, same vector)."""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    vector = np.random.default_rng(seed).standard_normal(
+        EMBEDDING_DIMENSIONS, dtype=np.float32
+    )
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def _parsed_query(text: str) -> dict[str, Any]:
+    """A plausible query-parser answer: keywords only, nothing extracted."""
+    query = text.rsplit(":", 1)[-1].strip()
+    return {
+        "search_text": query,
+        "time_expression": None,
+        "organization_mention": None,
+        "technologies": [],
+        "status_filter": [],
+        "confidence": 0.6,
+    }
+
+
+def _monday_response(query: str) -> dict[str, Any]:
+    item_id = str(random.randint(10**9, 10**10))
+    for mutation in ("create_item", "change_multiple_column_values", "delete_item"):
+        if re.search(rf"\b{mutation}\s*\(", query):
+            return {mutation: {"id": item_id}}
+    if "items_page" in query:
+        return {
+            "boards": [{"id": "1", "items_page": {"cursor": None, "items": []}}],
+            "next_items_page": {"cursor": None, "items": []},
+        }
+    return {
+        "boards": [
+            {
+                "id": "1",
+                "name": "Load test board",
+                "columns": [{"id": "name", "title": "Name", "type": "name"}],
+            }
+        ]
+    }
+
+
+def _jira_issue(key: str) -> dict[str, Any]:
+    return {
+        "id": str(zlib.crc32(key.encode()) % 100_000),
+        "key": key,
+        "fields": {
+            "summary": f"Load test issue {key}",
+            "status": {
+                "id": "3",
+                "name": "In Progress",
+                "statusCategory": {"key": "indeterminate"},
+            },
+            "issuetype": {"id": "10001", "name": "Task"},
+            "assignee": None,
+            "reporter": None,
+            "created": "2024-01-01T09:00:00.000+0000",
+            "updated": "2024-06-01T09:00:00.000+0000",
+        },
+    }
+
+
+def create_app(profiles: dict[str, UpstreamProfile] | None = None) -> FastAPI:
+    """Build the stand-in server for the given upstream profiles."""
+    profiles = profiles or {name: UpstreamProfile() for name in UPSTREAMS}
+    app = FastAPI(title="NPD fake upstreams")
+    app.state.profiles = profiles
+
+    # Ollama
+    @app.post("/api/embeddings")
+    async def ollama_embeddings(body: dict) -> dict:
+        await profiles["ollama"].respond()
+        return {"embedding": fake_embedding(body.get("prompt", ""))}
+
+    @app.post("/api/embed")
+    async def ollama_embed(body: dict) -> dict:
+        await profiles["ollama"].respond()
+        inputs = body.get("input", "")
+        texts = [inputs] if isinstance(inputs, str) else inputs
+        return {"embeddings": [fake_embedding(text) for text in texts]}
+
+    @app.post("/api/chat")
+    async def ollama_chat(body: dict) -> dict:
+        await profiles["ollama"].respond()
+        messages = body.get("messages") or [{}]
+        if body.get("format") == "json":
+            content = json.dumps(_parsed_query(messages[-1].get("content", "")))
+        else:
+            content = "Summary: the matching projects cover the requested topics."
+        return {
+            "model": body.get("model", ""),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+        }
+
+    @app.get("/api/tags")
+    async def ollama_tags() -> dict:
+        return {"models": [{"name": "nomic-embed-text"}, {"name": "mistral"}]}
+
+    # Tika
+    @app.put("/tika")
+    async def tika_extract(request: Request) -> PlainTextResponse:
+        await profiles["tika"].respond()
+        content = await request.body()
+        return PlainTextResponse(content.decode("utf-8", errors="ignore"))
+
+    @app.get("/tika")
+    async def tika_status() -> PlainTextResponse:
+        return PlainTextResponse("This is Tika Server (fake). Please PUT")
+
+    # Monday.com GraphQL
+    @app.post("/v2")
+    async def monday_graphql(body: dict) -> dict:
+        await profiles["monday"].respond()
+        return {"data": _monday_response(body.get("query", ""))}
+
+    # Jira
+    @app.get("/rest/api/3/issue/{key}")
+    async def jira_issue(key: str) -> dict:
+        await profiles["jira"].respond()
+        return _jira_issue(key)
+
+    @app.get("/rest/api/3/project/{key}")
+    async def jira_project(key: str) -> dict:
+        await profiles["jira"].respond()
+        return {"id": "10000", "key": key, "name": f"Load test {key}"}
+
+    @app.get("/rest/api/3/myself")
+    async def jira_myself() -> dict:
+        await profiles["jira"].respond()
+        return {"accountId": "loadtest", "displayName": "Load Test"}
+
+    @app.get("/rest/api/3/serverInfo")
+    async def jira_server_info() -> dict:
+        await profiles["jira"].respond()
+        return {"baseUrl": "http://localhost", "version": "1001.0.0"}
+
+    # Microsoft Graph
+    @app.get("/v1.0/users/{user}/messages")
+    async def graph_messages(user: str) -> dict:  # noqa: ARG001
+        await profiles["graph"].respond()
+        return {"value": []}
+
+    @app.post("/v1.0/users/{user}/sendMail", status_code=202)
+    async def graph_send_mail(user: str) -> Response:  # noqa: ARG001
+        await profiles["graph"].respond()
+        return Response(status_code=202)
+
+    @app.get("/_stats")
+    async def stats() -> dict:
+        """Calls and simulated errors per upstream."""
+        return {
+            name: {"calls": profile.calls, "errors": profile.errors}
+            for name, profile in profiles.items()
+        }
+
+    return app
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Fake upstream services")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.25,
+        help="Latency varies uniformly by +/- this fraction of the mean",
+    )
+    for name in UPSTREAMS:
+        parser.add_argument(
+            f"--{name}-latency",
+            type=float,
+            default=DEFAULT_LATENCY_MS[name],
+            help=f"Mean {name} latency in ms (default: {DEFAULT_LATENCY_MS[name]})",
+        )
+        parser.add_argument(
+            f"--{name}-error-rate",
+            type=float,
+            default=0.0,
+            help=f"Fraction of {name} calls failing with 503",
+        )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Serve the fake upstreams."""
+    import uvicorn
+
+    args = parse_args()
+    profiles = {
+        name: UpstreamProfile(
+            latency_ms=getattr(args, f"{name}_latency"),
+            jitter=args.jitter,
+            error_rate=getattr(args, f"{name}_error_rate"),
+        )
+        for name in UPSTREAMS
+    }
+    uvicorn.run(create_app(profiles), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Run scripted load against a backend and report throughput and latency.
+
+Run with:
+    python -m app.scripts.loadtest.run --token npd_... --users 20 --duration 60
+
+Virtual users loop over a weighted mix of scenarios (search, semantic search,
+project list and detail, document upload, CSV export and document queue
+drain) until the duration is up. The report gives requests per second, error
+counts and p50/p90/p95/p99/max latency per scenario and overall; ``--output``
+also writes it as JSON so runs can be compared.
+
+Scenario weights are set with ``--mix``, e.g. ``--mix search=5,upload=0``.
+Queue drains call the cron endpoint and need ``--cron-secret``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.models.project import ProjectStatus
+from app.scripts.loadtest import WORDS
+
+API_PREFIX = "/api/v1"
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class LoadContext:
+    """Shared state for the virtual users."""
+
+    client: httpx.AsyncClient
+    rng: random.Random
+    project_ids: list[str]
+    cron_secret: str | None = None
+    no_cache: bool = False
+
+    def words(self, count: int) -> str:
+        """Random search terms from the seeded vocabulary."""
+        return " ".join(self.rng.sample(WORDS, count))
+
+    def project_id(self) -> str:
+        """A random known project."""
+        return self.rng.choice(self.project_ids)
+
+
+async def search(ctx: LoadContext) -> httpx.Response:
+    """Hybrid keyword/vector search."""
+    params: dict[str, Any] = {
+        "q": ctx.words(ctx.rng.randint(1, 3)),
+        "page_size": 20,
+    }
+    if ctx.no_cache:
+        params["no_cache"] = "true"
+    return await ctx.client.get(f"{API_PREFIX}/search", params=params)
+
+
+async def semantic_search(ctx: LoadContext) -> httpx.Response:
+    """Natural-language search (query parsed by the LLM)."""
+    query = f"{ctx.words(2)} projects from the last {ctx.rng.randint(1, 5)} years"
+    return await ctx.client.post(f"{API_PREFIX}/search/semantic", json={"query": query})
+
+
+async def list_projects(ctx: LoadContext) -> httpx.Response:
+    """Paged project list."""
+    return await ctx.client.get(
+        f"{API_PREFIX}/projects",
+        params={"page": ctx.rng.randint(1, 20), "page_size": 20},
+    )
+
+
+async def project_detail(ctx: LoadContext) -> httpx.Response:
+    """Single project with its relationships."""
+    return await ctx.client.get(f"{API_PREFIX}/projects/{ctx.project_id()}")
+
+
+async def upload(ctx: LoadContext) -> httpx.Response:
+    """Upload a small text document (queued for processing)."""
+    content = " ".join(ctx.words(10) + "." for _ in range(50)).encode()
+    return await ctx.client.post(
+        f"{API_PREFIX}/projects/{ctx.project_id()}/documents",
+        files={"file": ("loadtest-notes.txt", content, "text/plain")},
+    )
+
+
+async def export(ctx: LoadContext) -> httpx.Response:
+    """Streaming CSV export of one status (body read completely)."""
+    status = ctx.rng.choice(list(ProjectStatus)).value
+    async with ctx.client.stream(
+        "GET", f"{API_PREFIX}/projects/export/csv", params={"status": status}
+    ) as response:
+        await response.aread()
+    return response
+
+
+async def queue_drain(ctx: LoadContext) -> httpx.Response:
+    """Process pending document queue items (the per-minute cron call)."""
+    return await ctx.client.get(
+        f"{API_PREFIX}/cron/document-queue",
+        headers={"Authorization": f"Bearer {ctx.cron_secret}"},
+    )
+
+
+SCENARIOS: dict[str, Callable[[LoadContext], Awaitable[httpx.Response]]] = {
+    "search": search,
+    "semantic_search": semantic_search,
+    "list": list_projects,
+    "detail": project_detail,
+    "upload": upload,
+    "export": export,
+    "queue_drain": queue_drain,
+}
+
+DEFAULT_MIX = {
+    "search": 40,
+    "semantic_search": 5,
+    "list": 25,
+    "detail": 20,
+    "upload": 5,
+    "export": 3,
+    "queue_drain": 2,
+}
+
+
+@dataclass
+class ScenarioStats:
+    """Latencies (ms) and failures recorded for one scenario."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+    def record(self, latency_ms: float, status_code: int | None) -> None:
+        """Record one request (``status_code`` None for transport errors)."""
+        self.latencies_ms.append(latency_ms)
+        code = status_code or 0
+        self.status_codes[code] = self.status_codes.get(code, 0) + 1
+        if status_code is None or status_code >= 400:
+            self.errors += 1
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Percentile by linear interpolation of a sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+
+
+def summarize(stats: ScenarioStats, elapsed_s: float) -> dict[str, Any]:
+    """Throughput and latency percentiles for recorded requests."""
+    latencies = sorted(stats.latencies_ms)
+    summary: dict[str, Any] = {
+        "requests": len(latencies),
+        "errors": stats.errors,
+        "rps": round(len(latencies) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        "status_codes": dict(sorted(stats.status_codes.items())),
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(latencies, pct), 2)
+    summary["max_ms"] = round(latencies[-1], 2) if latencies else 0.0
+    return summary
+
+
+def build_report(
+    results: dict[str, ScenarioStats], elapsed_s: float, users: int
+) -> dict[str, Any]:
+    """Per-scenario and overall summaries."""
+    overall = ScenarioStats()
+    for stats in results.values():
+        overall.latencies_ms.extend(stats.latencies_ms)
+        overall.errors += stats.errors
+        for code, count in stats.status_codes.items():
+            overall.status_codes[code] = overall.status_codes.get(code, 0) + count
+    return {
+        "duration_s": round(elapsed_s, 2),
+        "users": users,
+        "overall": summarize(overall, elapsed_s),
+        "scenarios": {
+            name: summarize(stats, elapsed_s) for name, stats in sorted(results.items())
+        },
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Report as a plain-text table."""
+    columns = (
+        "requests",
+        "errors",
+        "rps",
+        *(f"p{pct}_ms" for pct in PERCENTILES),
+        "max_ms",
+    )
+    lines = [
+        f"Duration {report['duration_s']}s, {report['users']} users",
+        f"{'scenario':<16}" + "".join(f"{column:>10}" for column in columns),
+    ]
+    rows = [*report["scenarios"].items(), ("overall", report["overall"])]
+    for name, summary in rows:
+        lines.append(
+            f"{name:<16}" + "".join(f"{summary[column]:>10}" for column in columns)
+        )
+    return "\n".join(lines)
+
+
+async def _virtual_user(
+    ctx: LoadContext,
+    scenarios: list[str],
+    weights: list[int],
+    deadline: float,
+    think_time_s: float,
+    results: dict[str, ScenarioStats],
+) -> None:
+    while time.monotonic() < deadline:
+        name = ctx.rng.choices(scenarios, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await SCENARIOS[name](ctx)
+            status_code: int | None = response.status_code
+        except httpx.HTTPError:
+            status_code = None
+        latency_ms = (time.perf_counter() - start) * 1000
+        results.setdefault(name, ScenarioStats()).record(latency_ms, status_code)
+        if think_time_s:
+            await asyncio.sleep(ctx.rng.uniform(0, 2 * think_time_s))
+
+
+async def _load_project_ids(client: httpx.AsyncClient) -> list[str]:
+    response = await client.get(f"{API_PREFIX}/projects", params={"page_size": 100})
+    response.raise_for_status()
+    return [item["id"] for item in response.json()["items"]]
+
+
+async def run_load(
+    base_url: str,
+    token: str,
+    mix: dict[str, int],
+    users: int = 10,
+    duration_s: float = 60.0,
+    think_time_s: float = 0.0,
+    cron_secret: str | None = None,
+    no_cache: bool = False,
+    seed: int = 1,
+) -> dict[str, Any]:
+    """Run the scenario mix and return the report."""
+    if not cron_secret:
+        mix = {**mix, "queue_drain": 0}
+    scenarios = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in scenarios]
+
+    results: dict[str, ScenarioStats] = {}
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=120.0,
+        limits=limits,
+    ) as client:
+        project_ids = await _load_project_ids(client)
+        if not project_ids:
+            raise SystemExit("No projects visible - seed data first")
+
+        start = time.monotonic()
+        deadline = start + duration_s
+        await asyncio.gather(
+            *(
+                _virtual_user(
+                    LoadContext(
+                        client=client,
+                        rng=random.Random(seed + index),
+                        project_ids=project_ids,
+                        cron_secret=cron_secret,
+                        no_cache=no_cache,
+                    ),
+                    scenarios,
+                    weights,
+                    deadline,
+                    think_time_s,
+                    results,
+                )
+                for index in range(users)
+            )
+        )
+        elapsed_s = time.monotonic() - start
+
+    return build_report(results, elapsed_s, users)
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse ``name=weight,...`` overrides onto the default mix."""
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, value.split(",")):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario: {name}")
+        mix[name] = int(weight)
+    return mix
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run load-test scenarios")
+    parser.add_argument("--base-url", default="http://localhost:6701")
+    parser.add_argument("--token", required=True, help="API token (see seed)")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds")
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.0,
+        help="Mean pause between a user's requests, in seconds",
+    )
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX))
+    parser.add_argument("--cron-secret", default=None)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the search result cache"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the load test and print the report."""
+    args = parse_args()
+    report = asyncio.run(
+        run_load(
+            base_url=args.base_url,
+            token=args.token,
+            mix=args.mix,
+            users=args.users,
+            duration_s=args.duration,
+            think_time_s=args.think_time,
+            cron_secret=args.cron_secret,
+            no_cache=args.no_cache,
+            seed=args.seed,
+        )
+    )
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""Seed synthetic data for load testing.
+
+Run with: python -m app.scripts.loadtest.seed --projects 5000
+
+Creates users, teams, organizations, tags, projects with tags, ACL grants
+for restricted projects, documents and document chunks with random
+768-dimensional embeddings. Data is generated from ``--seed`` so runs are
+reproducible. Seeded rows are recognisable by their ``loadtest`` markers
+(see ``MARKER``), and ``--purge`` removes them again.
+
+The first seeded user is an admin; an API token for it is printed at the
+end for use with ``app.scripts.loadtest.run --token``.
+
+Documents are metadata only (no stored files): they are searchable through
+their extracted text and chunks, but downloading them fails.
+"""
+
+import argparse
+import asyncio
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import configure_logging, get_logger
+from app.database import async_session_maker
+from app.models import (
+    APIToken,
+    Document,
+    Organization,
+    Project,
+    ProjectPermission,
+    ProjectTag,
+    Tag,
+    TagType,
+    Team,
+    TeamMember,
+    User,
+    UserRole,
+)
+from app.models.document import DocumentChunk
+from app.models.project import ProjectLocation, ProjectStatus
+from app.models.project_permission import PermissionLevel, ProjectVisibility
+from app.schemas.api_token import APITokenCreate
+from app.scripts.loadtest import EMBEDDING_DIMENSIONS, WORDS
+from app.services.token_service import TokenService
+
+logger = get_logger(__name__)
+
+# Marks seeded rows: user azure_id / team group ID prefix, name prefix
+MARKER = "loadtest"
+NAME_PREFIX = "LT"
+
+FILE_TYPES = (
+    ("application/pdf", "pdf"),
+    ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx"),
+    ("text/plain", "txt"),
+)
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    """Sizes of the generated data set."""
+
+    projects: int = 1000
+    organizations: int = 100
+    users: int = 50
+    teams: int = 10
+    tags: int = 300
+    tags_per_project: int = 4
+    documents_per_project: int = 3
+    chunks_per_document: int = 8
+    restricted_ratio: float = 0.2
+    seed: int = 42
+    batch_size: int = 1000
+
+
+class DatasetGenerator:
+    """Generates rows for each table, referencing each other by UUID."""
+
+    def __init__(self, config: SeedConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.np_rng = np.random.default_rng(config.seed)
+        self.user_ids = [self._uuid() for _ in range(config.users)]
+        self.team_ids = [self._uuid() for _ in range(config.teams)]
+        self.organization_ids = [self._uuid() for _ in range(config.organizations)]
+        self.tag_ids = [self._uuid() for _ in range(config.tags)]
+        self.project_ids = [self._uuid() for _ in range(config.projects)]
+
+    def _uuid(self) -> UUID:
+        return UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _words(self, count: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=count))
+
+    def _text(self, sentences: int) -> str:
+        return " ".join(
+            self._words(self.rng.randint(8, 16)).capitalize() + "."
+            for _ in range(sentences)
+        )
+
+    def users(self) -> list[dict[str, Any]]:
+        """Users; the first one is an admin."""
+        return [
+            {
+                "id": user_id,
+                "azure_id": f"{MARKER}-user-{index}",
+                "email": f"{MARKER}.user{index}@example.com",
+                "display_name": f"{NAME_PREFIX} User {index}",
+                "role": UserRole.ADMIN if index == 0 else UserRole.USER,
+                "is_active": True,
+            }
+            for index, user_id in enumerate(self.user_ids)
+        ]
+
+    def teams(self) -> list[dict[str, Any]]:
+        """Teams (Azure AD groups)."""
+        return [
+            {
+                "id": team_id,
+                "name": f"{NAME_PREFIX} Team {index}",
+                "azure_ad_group_id": f"{MARKER}-group-{index}",
+            }
+            for index, team_id in enumerate(self.team_ids)
+        ]
+
+    def team_members(self) -> list[dict[str, Any]]:
+        """Each non-admin user in one or two teams."""
+        rows = []
+        for user_id in self.user_ids[1:]:
+            count = min(len(self.team_ids), self.rng.randint(1, 2))
+            for team_id in self.rng.sample(self.team_ids, count):
+                rows.append(
+                    {"id": self._uuid(), "team_id": team_id, "user_id": user_id}
+                )
+        return rows
+
+    def organizations(self) -> list[dict[str, Any]]:
+        """Client organizations."""
+        return [
+            {
+                "id": organization_id,
+                "name": f"{NAME_PREFIX} {self._words(2).title()} {index}",
+            }
+            for index, organization_id in enumerate(self.organization_ids)
+        ]
+
+    def tags(self) -> list[dict[str, Any]]:
+        """Tags spread over the structured types and freeform."""
+        types = list(TagType)
+        return [
+            {
+                "id": tag_id,
+                "name": f"{NAME_PREFIX} {self._words(2).title()} {index}",
+                "type": types[index % len(types)],
+                "created_by": self.user_ids[0],
+            }
+            for index, tag_id in enumerate(self.tag_ids)
+        ]
+
+    def projects(self) -> Iterator[list[dict[str, Any]]]:
+        """Projects, in batches."""
+        statuses = list(ProjectStatus)
+        locations = list(ProjectLocation)
+        batch = []
+        for index, project_id in enumerate(self.project_ids):
+            owner_id = self.rng.choice(self.user_ids)
+            start = date(2018, 1, 1) + timedelta(days=self.rng.randint(0, 2500))
+            restricted = self.rng.random() < self.config.restricted_ratio
+            batch.append(
+                {
+                    "id": project_id,
+                    "name": f"{NAME_PREFIX} {self._words(3).title()} {index}",
+                    "organization_id": self.rng.choice(self.organization_ids),
+                    "owner_id": owner_id,
+                    "description": self._text(self.rng.randint(3, 10)),
+                    "status": self.rng.choice(statuses),
+                    "visibility": (
+                        ProjectVisibility.RESTRICTED
+                        if restricted
+                        else ProjectVisibility.PUBLIC
+                    ),
+                    "start_date": start,
+                    "end_date": start + timedelta(days=self.rng.randint(30, 400)),
+                    "location": self.rng.choice(locations),
+                    "billing_amount": Decimal(self.rng.randint(1000, 250_000)),
+                    "invoice_count": self.rng.randint(0, 12),
+                    "pm_notes": self._text(1),
+                    "jira_url": f"https://jira.example.com/browse/LT-{index}",
+                    "created_by": owner_id,
+                    "updated_by": owner_id,
+                }
+            )
+            if len(batch) >= self.config.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def project_tags(self) -> Iterator[list[dict[str, Any]]]:
+        """Tag assignments, in batches."""
+        count = min(self.config.tags_per_project, len(self.tag_ids))
+        batch = []
+        for project_id in self.project_ids:
+            for tag_id in self.rng.sample(self.tag_ids, count):
+                batch.append({"project_id": project_id, "tag_id": tag_id})
+            if len(batch) >= self.config.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def permissions(self, restricted_ids: list[UUID]) -> list[dict[str, Any]]:
+        """Grants on restricted projects to a user and a team each."""
+        levels = list(PermissionLevel)
+        rows = []
+        for project_id in restricted_ids:
+            rows.append(
+                {
+                    "id": self._uuid(),
+                    "project_id": project_id,
+                    "user_id": self.rng.choice(self.user_ids[1:] or self.user_ids),
+                    "team_id": None,
+                    "permission_level": self.rng.choice(levels),
+                    "granted_by": self.user_ids[0],
+                }
+            )
+            if self.team_ids:
+                rows.append(
+                    {
+                        "id": self._uuid(),
+                        "project_id": project_id,
+                        "user_id": None,
+                        "team_id": self.rng.choice(self.team_ids),
+                        "permission_level": PermissionLevel.VIEWER,
+                        "granted_by": self.user_ids[0],
+                    }
+                )
+        return rows
+
+    def documents(
+        self,
+    ) -> Iterator[tuple[list[dict[str, Any]], list[dict[str, Any]]]]:
+        """(documents, chunks) batches; chunks carry unit-length embeddings."""
+        documents: list[dict[str, Any]] = []
+        chunks: list[dict[str, Any]] = []
+        chunk_count = self.config.chunks_per_document
+        for project_id in self.project_ids:
+            for _ in range(self.config.documents_per_project):
+                document_id = self._uuid()
+                mime_type, extension = self.rng.choice(FILE_TYPES)
+                contents = [self._text(6) for _ in range(chunk_count)]
+                documents.append(
+                    {
+                        "id": document_id,
+                        "project_id": project_id,
+                        "file_path": f"{MARKER}/{document_id}.{extension}",
+                        "display_name": f"{self._words(2)}.{extension}",
+                        "mime_type": mime_type,
+                        "file_size": self.rng.randint(10_000, 5_000_000),
+                        "uploaded_by": self.rng.choice(self.user_ids),
+                        "extracted_text": "\n\n".join(contents),
+                        "processing_status": "completed",
+                    }
+                )
+                vectors = self.np_rng.standard_normal(
+                    (chunk_count, EMBEDDING_DIMENSIONS), dtype=np.float32
+                )
+                vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+                chunks.extend(
+                    {
+                        "document_id": document_id,
+                        "chunk_index": index,
+                        "content": content,
+                        "embedding": vector,
+                    }
+                    for index, (content, vector) in enumerate(
+                        zip(contents, vectors, strict=True)
+                    )
+                )
+            if len(chunks) >= self.config.batch_size:
+                yield documents, chunks
+                documents, chunks = [], []
+        if documents:
+            yield documents, chunks
+
+
+async def _insert(db: AsyncSession, model: type, rows: list[dict[str, Any]]) -> None:
+    if rows:
+        await db.execute(insert(model), rows)
+
+
+async def seed(db: AsyncSession, config: SeedConfig) -> str:
+    """Insert a generated data set and return an admin API token."""
+    generator = DatasetGenerator(config)
+
+    await _insert(db, User, generator.users())
+    await _insert(db, Team, generator.teams())
+    await _insert(db, TeamMember, generator.team_members())
+    await _insert(db, Organization, generator.organizations())
+    await _insert(db, Tag, generator.tags())
+    await db.commit()
+
+    restricted_ids = []
+    for batch in generator.projects():
+        await _insert(db, Project, batch)
+        restricted_ids.extend(
+            row["id"]
+            for row in batch
+            if row["visibility"] == ProjectVisibility.RESTRICTED
+        )
+        await db.commit()
+        logger.info("loadtest_projects_seeded", count=len(batch))
+
+    for batch in generator.project_tags():
+        await _insert(db, ProjectTag, batch)
+    await _insert(db, ProjectPermission, generator.permissions(restricted_ids))
+    await db.commit()
+
+    for documents, chunks in generator.documents():
+        await _insert(db, Document, documents)
+        await _insert(db, DocumentChunk, chunks)
+        await db.commit()
+        logger.info(
+            "loadtest_documents_seeded",
+            documents=len(documents),
+            chunks=len(chunks),
+        )
+
+    token, _api_token = await TokenService(db).create_token(
+        generator.user_ids[0], APITokenCreate(name=f"{MARKER} admin")
+    )
+    await db.commit()
+    return token
+
+
+async def purge(db: AsyncSession) -> None:
+    """Delete all seeded rows (and anything created on seeded projects)."""
+    user_ids = select(User.id).where(User.azure_id.startswith(f"{MARKER}-"))
+
+    # Documents, chunks, tags and grants cascade from projects
+    await db.execute(delete(Project).where(Project.created_by.in_(user_ids)))
+    await db.execute(
+        delete(Organization).where(Organization.name.startswith(f"{NAME_PREFIX} "))
+    )
+    await db.execute(delete(Tag).where(Tag.created_by.in_(user_ids)))
+    await db.execute(delete(Team).where(Team.azure_ad_group_id.startswith(MARKER)))
+    await db.execute(delete(APIToken).where(APIToken.user_id.in_(user_ids)))
+    await db.execute(delete(User).where(User.azure_id.startswith(f"{MARKER}-")))
+    await db.commit()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(
+        description="Seed synthetic data for load testing",
+    )
+    for field_name in (
+        "projects",
+        "organizations",
+        "users",
+        "teams",
+        "tags",
+        "tags_per_project",
+        "documents_per_project",
+        "chunks_per_document",
+        "seed",
+        "batch_size",
+    ):
+        parser.add_argument(
+            f"--{field_name.replace('_', '-')}",
+            type=int,
+            default=getattr(defaults, field_name),
+        )
+    parser.add_argument(
+        "--restricted-ratio", type=float, default=defaults.restricted_ratio
+    )
+    parser.add_argument(
+        "--purge",
+        action="store_true",
+        help="Delete previously seeded data instead of seeding",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Seed (or purge) load-test data."""
+    configure_logging()
+    args = parse_args()
+
+    async with async_session_maker() as db:
+        if args.purge:
+            await purge(db)
+            print("Seeded load-test data deleted.")
+            return
+
+        config = SeedConfig(
+            **{
+                name: value
+                for name, value in vars(args).items()
+                if name in SeedConfig.__dataclass_fields__
+            }
+        )
+        token = await seed(db, config)
+
+    print(f"Seeded {config.projects} projects.")
+    print(f"Admin API token: {token}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
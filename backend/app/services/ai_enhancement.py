@@ -15,6 +15,7 @@ import httpx
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.server_timing import UPSTREAM, track_time
 
 logger = get_logger(__name__)
 
@@ -87,20 +88,21 @@ class AIEnhancementService:
             user_message = f"{feedback_type.title()} Report: {description}"
 
             async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": self.settings.anthropic_api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-sonnet-4-20250514",
-                        "max_tokens": 300,
-                        "system": system_prompt,
-                        "messages": [{"role": "user", "content": user_message}],
-                    },
-                )
+                with track_time(UPSTREAM):
+                    response = await client.post(
+                        "https://api.anthropic.com/v1/messages",
+                        headers={
+                            "x-api-key": self.settings.anthropic_api_key,
+                            "anthropic-version": "2023-06-01",
+                            "content-type": "application/json",
+                        },
+                        json={
+                            "model": "claude-sonnet-4-20250514",
+                            "max_tokens": 300,
+                            "system": system_prompt,
+                            "messages": [{"role": "user", "content": user_message}],
+                        },
+                    )
                 response.raise_for_status()
                 data = response.json()
 
@@ -320,20 +322,21 @@ class AIEnhancementService:
         system_prompt = self._build_enhance_system_prompt(feedback_type)
 
         async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": self.settings.anthropic_api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                },
-                json={
-                    "model": "claude-sonnet-4-20250514",
-                    "max_tokens": 2000,
-                    "system": system_prompt,
-                    "messages": [{"role": "user", "content": user_context}],
-                },
-            )
+            with track_time(UPSTREAM):
+                response = await client.post(
+                    "https://api.anthropic.com/v1/messages",
+                    headers={
+                        "x-api-key": self.settings.anthropic_api_key,
+                        "anthropic-version": "2023-06-01",
+                        "content-type": "application/json",
+                    },
+                    json={
+                        "model": "claude-sonnet-4-20250514",
+                        "max_tokens": 2000,
+                        "system": system_prompt,
+                        "messages": [{"role": "user", "content": user_context}],
+                    },
+                )
             response.raise_for_status()
             data = response.json()
 
@@ -7,8 +7,11 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import IO, NamedTuple
 
+from opentelemetry.trace import SpanKind
+
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -226,6 +229,7 @@ class AntivirusService:
         """Check if uploads should proceed when scanning fails."""
         return self.settings.clamav_fail_open
 
+    @traced("antivirus.scan", kind=SpanKind.CLIENT)
     async def scan_bytes(
         self, content: bytes, filename: str = "unknown"
     ) -> ScanResponse:
@@ -463,6 +467,7 @@ class AntivirusService:
             message=f"Unknown response: {response}",
         )
 
+    @traced("antivirus.scan", kind=SpanKind.CLIENT)
     async def scan_file(
         self, file: IO[bytes], filename: str = "unknown"
     ) -> ScanResponse:
@@ -0,0 +1,172 @@
+"""Trigram-backed autocomplete for projects, tags, organizations and contacts.
+
+All lookups rely on pg_trgm GIN indexes (migration 032), so per-keystroke
+latency depends on the number of matching rows rather than table size:
+- ``ILIKE 'q%'`` prefix matches are index-assisted by gin_trgm_ops
+- ``q <% column`` (word similarity) catches typos and mid-string matches
+- ``column % q`` (similarity) is used for whole-name near-duplicate checks
+"""
+
+from uuid import UUID
+
+from sqlalchemy import Text, case, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.contact import Contact
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.tag import Tag, TagType
+
+logger = get_logger(__name__)
+
+# Minimum query length before suggestions are returned
+MIN_QUERY_LENGTH = 2
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards in user input (uses backslash escape)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def organization_aliases_text():
+    """Aliases as a single string - matches the ix_organizations_aliases_trgm index."""
+    return func.npd_array_to_text(cast(Organization.aliases, ARRAY(Text)))
+
+
+def trigram_match(column, query: str):
+    """
+    Build an index-assisted match condition and relevance score for a column.
+
+    Score ordering: exact (1.0) > prefix (0.9-1.0, shorter names first) >
+    word-similarity matches (scaled below 0.9).
+
+    Returns:
+        Tuple of (where_condition, score_expression).
+    """
+    prefix = column.ilike(f"{escape_like(query)}%", escape="\\")
+    fuzzy = literal(query).op("<%")(column)
+
+    score = case(
+        (func.lower(column) == query.lower(), 1.0),
+        (prefix, 0.9 + 0.1 * func.similarity(column, query)),
+        else_=0.9 * func.word_similarity(query, column),
+    )
+    return or_(prefix, fuzzy), score
+
+
+class AutocompleteService:
+    """Similarity-ranked suggestions using pg_trgm indexes."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def suggest_project_names(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        accessible_ids: set[UUID] | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Suggest project names.
+
+        Args:
+            query: User input (at least 2 characters).
+            limit: Maximum suggestions to return.
+            accessible_ids: Restrict to these project IDs (ACL). None or an
+                empty set means no restriction (admin).
+
+        Returns:
+            List of (project_name, score) ordered by relevance.
+        """
+        query = (query or "").strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+
+        condition, score = trigram_match(Project.name, query)
+        stmt = select(Project.name, score.label("score")).where(condition)
+        if accessible_ids:
+            stmt = stmt.where(Project.id.in_(accessible_ids))
+        stmt = stmt.order_by(score.desc(), Project.name).limit(limit)
+
+        result = await self.db.execute(stmt)
+        return [(row.name, float(row.score)) for row in result.all()]
+
+    async def suggest_organizations(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+    ) -> list[tuple[Organization, float]]:
+        """Suggest organizations by name or alias. Returns (organization, score)."""
+        query = (query or "").strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+
+        name_condition, name_score = trigram_match(Organization.name, query)
+        alias_condition, alias_score = trigram_match(organization_aliases_text(), query)
+        score = func.greatest(name_score, alias_score)
+
+        stmt = (
+            select(Organization, score.label("score"))
+            .where(or_(name_condition, alias_condition))
+            .order_by(score.desc(), Organization.name)
+            .limit(limit)
+        )
+
+        result = await self.db.execute(stmt)
+        return [(row[0], float(row[1])) for row in result.all()]
+
+    async def suggest_contacts(
+        self,
+        query: str,
+        *,
+        organization_id: UUID | None = None,
+        limit: int = 10,
+    ) -> list[tuple[Contact, float]]:
+        """Suggest contacts by name or email. Returns (contact, score)."""
+        query = (query or "").strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+
+        name_condition, name_score = trigram_match(Contact.name, query)
+        email_condition, email_score = trigram_match(Contact.email, query)
+        score = func.greatest(name_score, email_score)
+
+        stmt = select(Contact, score.label("score")).where(
+            or_(name_condition, email_condition)
+        )
+        if organization_id:
+            stmt = stmt.where(Contact.organization_id == organization_id)
+        stmt = stmt.order_by(score.desc(), Contact.name).limit(limit)
+
+        result = await self.db.execute(stmt)
+        return [(row[0], float(row[1])) for row in result.all()]
+
+    async def find_similar_tags(
+        self,
+        name: str,
+        *,
+        tag_type: TagType | None = None,
+        limit: int = 10,
+    ) -> list[tuple[Tag, float]]:
+        """
+        Find tags whose whole name is similar to ``name`` (near-duplicates).
+
+        Uses the trigram similarity operator (``%``), which honours
+        ``pg_trgm.similarity_threshold`` and is served by the GIN index.
+        """
+        name = (name or "").strip()
+        if not name:
+            return []
+
+        similarity = func.similarity(Tag.name, name)
+        stmt = select(Tag, similarity.label("score")).where(Tag.name.op("%")(name))
+        if tag_type:
+            stmt = stmt.where(Tag.type == tag_type)
+        stmt = stmt.order_by(similarity.desc()).limit(limit)
+
+        result = await self.db.execute(stmt)
+        return [(row[0], float(row[1])) for row in result.all()]
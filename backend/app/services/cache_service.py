@@ -1,22 +1,31 @@
 """Generic caching service with Redis backend and in-memory fallback.
 
 Provides a reusable cache infrastructure for tag lists, organization lists,
-dashboard stats, and other frequently-accessed, rarely-changing data.
+dashboard stats, natural language query parses, and other frequently-accessed,
+rarely-changing data.
 """
 
+import asyncio
 import json
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any, TypeVar
 
 import redis.exceptions
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.server_timing import CACHE, track_time
 
 logger = get_logger(__name__)
 
 T = TypeVar("T")
 
+# Session.info key holding cached datasets to invalidate once the session commits
+PENDING_INVALIDATIONS_KEY = "cache_invalidations"
+
 
 class CacheInterface:
     """Interface for cache implementations."""
@@ -145,7 +154,8 @@ class RedisCache:
         try:
             client = await self._get_client()
             prefixed_key = self._make_key(key)
-            data = await client.get(prefixed_key)
+            with track_time(CACHE):
+                data = await client.get(prefixed_key)
             if data:
                 self._hits += 1
                 return json.loads(data)
@@ -164,7 +174,10 @@ class RedisCache:
             client = await self._get_client()
             prefixed_key = self._make_key(key)
             actual_ttl = ttl if ttl is not None else self._default_ttl
-            await client.setex(prefixed_key, actual_ttl, json.dumps(value, default=str))
+            with track_time(CACHE):
+                await client.setex(
+                    prefixed_key, actual_ttl, json.dumps(value, default=str)
+                )
         except RedisError as e:
             logger.warning("redis_cache_set_error", prefix=self._prefix, error=str(e))
 
@@ -175,7 +188,8 @@ class RedisCache:
         try:
             client = await self._get_client()
             prefixed_key = self._make_key(key)
-            result = await client.delete(prefixed_key)
+            with track_time(CACHE):
+                result = await client.delete(prefixed_key)
             return result > 0
         except RedisError as e:
             logger.warning(
@@ -415,10 +429,89 @@ async def get_or_set(
     return value
 
 
+class CacheGeneration:
+    """Monotonic generation number for a cached dataset.
+
+    In-process snapshots (e.g. compiled tag matchers) compare the generation
+    they were built from against the current one and rebuild on change. The
+    counter lives in Redis when configured so that a bump in one worker is
+    seen by all workers; otherwise it is process-local.
+    """
+
+    KEY_PREFIX = "gen:"
+
+    def __init__(self, name: str, redis_url: str | None = None):
+        self._name = name
+        self._redis_url = redis_url
+        self._client = None
+        self._local = 0
+
+    async def _get_client(self):
+        """Get or create Redis client (lazy initialization)."""
+        if self._client is None:
+            from redis.asyncio import Redis as AsyncRedis
+
+            self._client = AsyncRedis.from_url(
+                self._redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+        return self._client
+
+    @property
+    def key(self) -> str:
+        """Redis key holding the counter."""
+        return f"{self.KEY_PREFIX}{self._name}"
+
+    async def get(self) -> int:
+        """Return the current generation."""
+        if self._redis_url:
+            try:
+                client = await self._get_client()
+                with track_time(CACHE):
+                    value = await client.get(self.key)
+                return int(value) if value else 0
+            except (redis.exceptions.RedisError, ConnectionError, TimeoutError) as e:
+                logger.warning(
+                    "cache_generation_get_error", name=self._name, error=str(e)
+                )
+        return self._local
+
+    async def bump(self) -> int:
+        """Advance the generation, invalidating snapshots built from older data."""
+        self._local += 1
+        if self._redis_url:
+            try:
+                client = await self._get_client()
+                return int(await client.incr(self.key))
+            except (redis.exceptions.RedisError, ConnectionError, TimeoutError) as e:
+                logger.warning(
+                    "cache_generation_bump_error", name=self._name, error=str(e)
+                )
+        return self._local
+
+
 # Global cache instances (lazy initialization)
 _tag_cache: FallbackCache | None = None
 _org_cache: FallbackCache | None = None
 _dashboard_cache: FallbackCache | None = None
+_db_stats_cache: FallbackCache | None = None
+_profile_cache: FallbackCache | None = None
+_nl_parse_cache: FallbackCache | None = None
+_generations: dict[str, CacheGeneration] = {}
+
+
+def get_cache_generation(name: str) -> CacheGeneration:
+    """Get or create the shared generation counter for a dataset name."""
+    generation = _generations.get(name)
+    if generation is None:
+        settings = get_settings()
+        generation = CacheGeneration(
+            name,
+            redis_url=settings.redis_url if settings.is_redis_configured else None,
+        )
+        _generations[name] = generation
+    return generation
 
 
 def get_tag_cache() -> FallbackCache:
@@ -475,22 +568,126 @@ def get_dashboard_cache() -> FallbackCache:
     return _dashboard_cache
 
 
-async def invalidate_tag_cache() -> int:
-    """Invalidate all tag cache entries."""
+def get_db_stats_cache() -> FallbackCache:
+    """Get or create the Postgres statistics cache (admin database pages)."""
+    global _db_stats_cache
+    if _db_stats_cache is None:
+        settings = get_settings()
+        _db_stats_cache = FallbackCache(
+            redis_url=settings.redis_url if settings.is_redis_configured else None,
+            prefix="dbstats:",
+            default_ttl=settings.db_stats_cache_ttl,
+            maxsize=50,
+        )
+    return _db_stats_cache
+
+
+def get_profile_cache() -> FallbackCache:
+    """Get or create the store for on-demand profiles."""
+    global _profile_cache
+    if _profile_cache is None:
+        settings = get_settings()
+        _profile_cache = FallbackCache(
+            redis_url=settings.redis_url if settings.is_redis_configured else None,
+            prefix="profiles:",
+            default_ttl=settings.profile_retention_seconds,
+            maxsize=100,
+        )
+    return _profile_cache
+
+
+def get_nl_parse_cache() -> FallbackCache:
+    """Get or create the natural language query parse cache."""
+    global _nl_parse_cache
+    if _nl_parse_cache is None:
+        settings = get_settings()
+        _nl_parse_cache = FallbackCache(
+            redis_url=settings.redis_url if settings.is_redis_configured else None,
+            prefix="nlq:",
+            default_ttl=settings.nl_parse_cache_ttl,
+            maxsize=1000,
+        )
+    return _nl_parse_cache
+
+
+def _defer_to_commit(db: AsyncSession | None, name: str) -> bool:
+    """Record a dataset to invalidate again when ``db`` commits."""
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return False
+    info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(name)
+    return True
+
+
+async def invalidate_tag_cache(db: AsyncSession | None = None) -> int:
+    """Invalidate all tag cache entries.
+
+    Pass the session that made the change if it has not committed yet: the
+    "tags" generation is then bumped after the commit, so snapshots rebuilt
+    in between (tag matcher, entity index) are not kept as current.
+    """
     cache = get_tag_cache()
     count = await cache.invalidate_prefix("tags:")
+    if not _defer_to_commit(db, "tags"):
+        await get_cache_generation("tags").bump()
     logger.info("tag_cache_invalidated", keys_deleted=count)
     return count
 
 
-async def invalidate_org_cache() -> int:
-    """Invalidate all organization cache entries."""
+async def invalidate_org_cache(db: AsyncSession | None = None) -> int:
+    """Invalidate all organization cache entries.
+
+    As for ``invalidate_tag_cache``, pass an uncommitted session to bump the
+    "orgs" generation after its commit.
+    """
     cache = get_org_cache()
     count = await cache.invalidate_prefix("orgs:")
+    if not _defer_to_commit(db, "orgs"):
+        await get_cache_generation("orgs").bump()
     logger.info("org_cache_invalidated", keys_deleted=count)
     return count
 
 
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _invalidate_committed(names: Iterable[str]) -> None:
+    """Drop entries and bump generations for datasets changed by a commit."""
+    caches = {"tags": (get_tag_cache, "tags:"), "orgs": (get_org_cache, "orgs:")}
+    for name in names:
+        get_cache, prefix = caches[name]
+        try:
+            # Entries cached from the uncommitted state's predecessor
+            await get_cache().invalidate_prefix(prefix)
+            await get_cache_generation(name).bump()
+        except Exception as e:
+            logger.warning(
+                "cache_invalidation_after_commit_failed", name=name, error=str(e)
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """Run a session's deferred cache invalidations after commit."""
+    names = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    if not names:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Committed outside an event loop; the cache TTLs cover it
+        return
+    task = loop.create_task(_invalidate_committed(sorted(names)))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_invalidations(session: Session) -> None:
+    """Forget invalidations recorded by a rolled back transaction."""
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+
 async def invalidate_dashboard_cache() -> int:
     """Invalidate all dashboard cache entries."""
     cache = get_dashboard_cache()
@@ -501,7 +698,12 @@ async def invalidate_dashboard_cache() -> int:
 
 def reset_caches() -> None:
     """Reset all cache instances. Primarily for testing."""
-    global _tag_cache, _org_cache, _dashboard_cache
+    global _tag_cache, _org_cache, _dashboard_cache, _db_stats_cache, _profile_cache
+    global _nl_parse_cache
     _tag_cache = None
     _org_cache = None
     _dashboard_cache = None
+    _db_stats_cache = None
+    _profile_cache = None
+    _nl_parse_cache = None
+    _generations.clear()
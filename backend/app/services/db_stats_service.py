@@ -0,0 +1,251 @@
+"""Postgres performance statistics for the admin database pages.
+
+Reads the cumulative statistics views - ``pg_stat_statements`` (when the
+extension is installed and preloaded), ``pg_stat_user_indexes`` and
+``pg_stat_user_tables`` - and relation sizes. Results are cached for
+``DB_STATS_CACHE_TTL`` seconds (shared via Redis when configured) so that
+loading the admin page does not itself add catalogue load.
+
+Statement text from ``pg_stat_statements`` is already normalised by
+Postgres; it is passed through the same fingerprinting as the per-request
+statistics so that no literal values reach the API.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.core.query_stats import fingerprint
+from app.services.cache_service import get_db_stats_cache, get_or_set
+
+logger = get_logger(__name__)
+
+# Tables whose storage the admin page always reports (the largest ones)
+TRACKED_TABLES = ("document_chunks", "documents", "audit_logs", "projects")
+
+# Index access methods used for search (vector and full-text/trigram)
+SEARCH_INDEX_METHODS = ("hnsw", "ivfflat", "gin")
+
+# Dead/live tuple ratio above which a search index's table needs vacuuming
+DEAD_TUPLE_RATIO_WARNING = 0.2
+
+# Public sort keys -> pg_stat_statements columns
+STATEMENT_ORDER_COLUMNS = {
+    "total_time": "total_exec_time",
+    "mean_time": "mean_exec_time",
+    "calls": "calls",
+    "shared_blks_read": "shared_blks_read",
+}
+
+EXTENSION_INSTALLED_SQL = """
+    SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements')
+"""
+
+STATEMENTS_SQL = """
+    SELECT queryid, query, calls, rows,
+           total_exec_time, mean_exec_time, max_exec_time,
+           shared_blks_hit, shared_blks_read, temp_blks_written
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY {order_column} DESC
+    LIMIT :limit
+"""
+
+INDEXES_SQL = """
+    SELECT s.relname AS table_name,
+           s.indexrelname AS index_name,
+           am.amname AS method,
+           s.idx_scan,
+           s.idx_tup_read,
+           pg_relation_size(s.indexrelid) AS size_bytes,
+           i.indisunique AS is_unique,
+           i.indisprimary AS is_primary,
+           i.indisvalid AND i.indisready AS is_valid,
+           t.n_live_tup AS table_live_tuples,
+           t.n_dead_tup AS table_dead_tuples
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    JOIN pg_class c ON c.oid = s.indexrelid
+    JOIN pg_am am ON am.oid = c.relam
+    JOIN pg_stat_user_tables t ON t.relid = s.relid
+    {where}
+    ORDER BY {order}
+    LIMIT :limit
+"""
+
+UNUSED_INDEXES_WHERE = "WHERE s.idx_scan = 0 AND NOT i.indisunique"
+SEARCH_INDEXES_WHERE = "WHERE am.amname = ANY(:methods)"
+TABLE_INDEXES_WHERE = "WHERE s.relname = ANY(:tables)"
+
+TABLES_SQL = """
+    SELECT c.relname AS table_name,
+           pg_total_relation_size(c.oid) AS total_bytes,
+           pg_relation_size(c.oid) AS table_bytes,
+           pg_indexes_size(c.oid) AS index_bytes,
+           COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0)
+               AS toast_bytes,
+           s.n_live_tup AS live_tuples,
+           s.n_dead_tup AS dead_tuples,
+           s.seq_scan,
+           s.idx_scan,
+           s.last_autovacuum,
+           s.last_autoanalyze
+    FROM pg_class c
+    JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.relname = ANY(:tables)
+    ORDER BY total_bytes DESC
+"""
+
+
+def _dead_tuple_ratio(live: int | None, dead: int | None) -> float:
+    live, dead = live or 0, dead or 0
+    return round(dead / (live + dead), 4) if live + dead else 0.0
+
+
+def search_index_status(index: dict) -> str:
+    """Health of a vector/full-text index: invalid, unused, needs_vacuum or ok."""
+    if not index["is_valid"]:
+        return "invalid"  # Failed or in-progress CREATE INDEX CONCURRENTLY
+    if not index["idx_scan"]:
+        return "unused"
+    if index["dead_tuple_ratio"] > DEAD_TUPLE_RATIO_WARNING:
+        return "needs_vacuum"  # Dead entries slow HNSW and GIN scans
+    return "ok"
+
+
+class DatabaseStatsService:
+    """Read (and briefly cache) Postgres performance statistics."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_statement_stats(
+        self, limit: int = 20, order_by: str = "total_time"
+    ) -> dict:
+        """Top statements from pg_stat_statements for this database."""
+        return await get_or_set(
+            get_db_stats_cache(),
+            f"statements:{order_by}:{limit}",
+            lambda: self._query_statement_stats(limit, order_by),
+        )
+
+    async def get_storage_stats(self, limit: int = 20) -> dict:
+        """Table/index sizes, index usage and search index health."""
+        return await get_or_set(
+            get_db_stats_cache(),
+            f"storage:{limit}",
+            lambda: self._query_storage_stats(limit),
+        )
+
+    async def _query_statement_stats(self, limit: int, order_by: str) -> dict:
+        order_column = STATEMENT_ORDER_COLUMNS[order_by]
+        stats = {
+            "collected_at": datetime.now(UTC),
+            "available": False,
+            "reason": None,
+            "order_by": order_by,
+            "statements": [],
+        }
+
+        installed = await self.db.scalar(text(EXTENSION_INSTALLED_SQL))
+        if not installed:
+            stats["reason"] = "pg_stat_statements extension is not installed"
+            return stats
+
+        try:
+            # Savepoint: the view errors if the library is not preloaded
+            async with self.db.begin_nested():
+                result = await self.db.execute(
+                    text(STATEMENTS_SQL.format(order_column=order_column)),
+                    {"limit": limit},
+                )
+                rows = result.mappings().all()
+        except DBAPIError as e:
+            logger.warning("pg_stat_statements_unavailable", error=str(e)[:200])
+            stats["reason"] = (
+                "pg_stat_statements is not loaded (shared_preload_libraries)"
+            )
+            return stats
+
+        stats["available"] = True
+        for row in rows:
+            blocks = (row["shared_blks_hit"] or 0) + (row["shared_blks_read"] or 0)
+            stats["statements"].append(
+                {
+                    "query_id": str(row["queryid"]),
+                    "query": fingerprint(row["query"] or ""),
+                    "calls": row["calls"],
+                    "rows": row["rows"],
+                    "total_ms": round(row["total_exec_time"], 2),
+                    "mean_ms": round(row["mean_exec_time"], 3),
+                    "max_ms": round(row["max_exec_time"], 3),
+                    "shared_blks_read": row["shared_blks_read"],
+                    "temp_blks_written": row["temp_blks_written"],
+                    "cache_hit_ratio": (
+                        round(row["shared_blks_hit"] / blocks, 4) if blocks else None
+                    ),
+                }
+            )
+        return stats
+
+    async def _query_storage_stats(self, limit: int) -> dict:
+        tables = list(TRACKED_TABLES)
+
+        result = await self.db.execute(text(TABLES_SQL), {"tables": tables})
+        table_rows = [dict(row) for row in result.mappings().all()]
+
+        table_indexes = await self._query_indexes(
+            TABLE_INDEXES_WHERE,
+            "s.relname, size_bytes DESC",
+            limit=1000,
+            tables=tables,
+        )
+        for table in table_rows:
+            table["dead_tuple_ratio"] = _dead_tuple_ratio(
+                table["live_tuples"], table["dead_tuples"]
+            )
+            table["indexes"] = [
+                index
+                for index in table_indexes
+                if index["table_name"] == table["table_name"]
+            ]
+
+        search_indexes = await self._query_indexes(
+            SEARCH_INDEXES_WHERE,
+            "s.relname, s.indexrelname",
+            limit=1000,
+            methods=list(SEARCH_INDEX_METHODS),
+        )
+        for index in search_indexes:
+            index["status"] = search_index_status(index)
+
+        return {
+            "collected_at": datetime.now(UTC),
+            "tables": table_rows,
+            "unused_indexes": await self._query_indexes(
+                UNUSED_INDEXES_WHERE, "size_bytes DESC", limit=limit
+            ),
+            "most_scanned_indexes": await self._query_indexes(
+                "", "s.idx_scan DESC", limit=limit
+            ),
+            "search_indexes": search_indexes,
+        }
+
+    async def _query_indexes(
+        self, where: str, order: str, limit: int, **params
+    ) -> list[dict]:
+        result = await self.db.execute(
+            text(INDEXES_SQL.format(where=where, order=order)),
+            {"limit": limit, **params},
+        )
+        indexes = []
+        for row in result.mappings().all():
+            index = dict(row)
+            index["dead_tuple_ratio"] = _dead_tuple_ratio(
+                index.pop("table_live_tuples"), index.pop("table_dead_tuples")
+            )
+            indexes.append(index)
+        return indexes
@@ -11,13 +11,17 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import OllamaServiceError
 from app.core.logging import get_logger
+from app.core.ollama_scheduler import OllamaPriority
 from app.core.storage import StorageService
+from app.core.tracing import child_span
 from app.database import async_session_maker
 from app.models.document import Document, DocumentChunk
 from app.services.document_processor import DocumentProcessor
+from app.services.document_stats_service import DocumentStageTimer
 from app.services.document_tag_suggester import DocumentTagSuggester
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import UNAVAILABLE_FAILURES, EmbeddingService
 
 logger = get_logger(__name__)
 
@@ -73,8 +77,10 @@ async def process_document_background(document_id: UUID) -> None:
                     "sharepoint" if storage.is_sharepoint_storage() else "local"
                 ),
             )
+            timer = DocumentStageTimer()
             try:
-                file_content = await storage.read(document.file_path)
+                with timer.stage("storage_read"):
+                    file_content = await storage.read(document.file_path)
             except FileNotFoundError:
                 document.processing_status = "failed"
                 document.processing_error = "File not found in storage"
@@ -87,7 +93,7 @@ async def process_document_background(document_id: UUID) -> None:
                 return
 
             # Process the document
-            await _process_document_content(db, document, file_content)
+            await _process_document_content(db, document, file_content, timer)
 
             logger.info(
                 "background_processing_completed",
@@ -125,19 +131,25 @@ async def _process_document_content(
     db: AsyncSession,
     document: Document,
     file_content: bytes,
+    timer: DocumentStageTimer | None = None,
 ) -> None:
     """
     Process document content: extract text, create chunks, generate embeddings.
 
+    Stage timings are stored as a DocumentProcessingRun in the same commit.
+
     Args:
         db: Database session
         document: Document model instance
         file_content: Raw file bytes
+        timer: Stage timer started by the caller (to include the storage read)
     """
+    timer = timer or DocumentStageTimer()
     processor = DocumentProcessor()
 
     if not processor.is_supported(document.mime_type):
         document.processing_status = "skipped"
+        db.add(timer.to_run(document, "skipped"))
         await db.commit()
         logger.info(
             "document_processing_skipped",
@@ -147,18 +159,24 @@ async def _process_document_content(
         )
         return
 
+    extracted_text = ""
+    chunks: list[str] = []
     try:
-        # Extract text
-        extracted_text = await processor.extract_text(
-            file_content,
-            document.mime_type,
-            document.display_name,
-        )
+        # Extract text (in-process; Tika and OCR are not on this path)
+        with timer.stage("extraction"):
+            extracted_text = await processor.extract_text(
+                file_content,
+                document.mime_type,
+                document.display_name,
+            )
+        timer.extraction_method = "native"
         document.extracted_text = extracted_text
 
         # Create chunks and embeddings
-        embedding_service = EmbeddingService()
-        chunks = embedding_service.chunk_text(extracted_text)
+        # Batch lane: chunk embeddings yield to search queries
+        embedding_service = EmbeddingService(priority=OllamaPriority.BATCH)
+        with timer.stage("chunking"):
+            chunks = embedding_service.chunk_text(extracted_text)
 
         logger.debug(
             "creating_document_chunks",
@@ -166,38 +184,72 @@ async def _process_document_content(
             chunk_count=len(chunks),
         )
 
-        for i, chunk_content in enumerate(chunks):
-            embedding = await embedding_service.generate_embedding(chunk_content)
-            chunk = DocumentChunk(
-                document_id=document.id,
-                chunk_index=i,
-                content=chunk_content,
-                embedding=embedding,
+        with timer.stage("embedding"), child_span("embed", chunks=len(chunks)):
+            # Repeated chunks (boilerplate, headers) are embedded once
+            embeddings: dict[str, list[float]] = {}
+            chunk_embeddings: list[list[float] | None] = []
+            for chunk_content in chunks:
+                embedding = embeddings.get(chunk_content)
+                if embedding is not None:
+                    timer.embeddings_reused += 1
+                else:
+                    embedding = await embedding_service.generate_embedding(
+                        chunk_content
+                    )
+                    if embedding_service.last_failure in UNAVAILABLE_FAILURES:
+                        # No chunks are written: the queue retries the
+                        # document once Ollama is back
+                        raise OllamaServiceError(
+                            "Embedding service unavailable "
+                            f"({embedding_service.last_failure})"
+                        )
+                    if embedding is not None:
+                        embeddings[chunk_content] = embedding
+                chunk_embeddings.append(embedding)
+        timer.embedding_requests = embedding_service.requests
+        timer.embedding_cache_hits = embedding_service.cache_hits
+
+        for i, (chunk_content, embedding) in enumerate(
+            zip(chunks, chunk_embeddings, strict=True)
+        ):
+            db.add(
+                DocumentChunk(
+                    document_id=document.id,
+                    chunk_index=i,
+                    content=chunk_content,
+                    embedding=embedding,
+                )
             )
-            db.add(chunk)
 
         document.processing_status = "completed"
 
         # Generate tag suggestions from extracted text
         if extracted_text and len(extracted_text) > 100:
-            try:
-                tag_suggester = DocumentTagSuggester(db)
-                suggestions = await tag_suggester.suggest_tags_from_text(extracted_text)
-                if suggestions:
-                    document.suggested_tag_ids = [tag.id for tag, _ in suggestions]
-                    logger.info(
-                        "document_tags_suggested",
+            with timer.stage("tag_suggestion"):
+                try:
+                    tag_suggester = DocumentTagSuggester(db)
+                    suggestions = await tag_suggester.suggest_tags_from_text(
+                        extracted_text
+                    )
+                    if suggestions:
+                        document.suggested_tag_ids = [tag.id for tag, _ in suggestions]
+                        logger.info(
+                            "document_tags_suggested",
+                            document_id=str(document.id),
+                            suggested_count=len(suggestions),
+                        )
+                except Exception as e:
+                    # Tag suggestion is non-critical, log and continue
+                    logger.warning(
+                        "tag_suggestion_failed",
                         document_id=str(document.id),
-                        suggested_count=len(suggestions),
+                        error=str(e),
                     )
-            except Exception as e:
-                # Tag suggestion is non-critical, log and continue
-                logger.warning(
-                    "tag_suggestion_failed",
-                    document_id=str(document.id),
-                    error=str(e),
-                )
 
+        # Write chunks and document, then store the run with the same commit
+        with timer.stage("db_write"):
+            await db.flush()
+        db.add(timer.to_run(document, "completed", len(extracted_text), len(chunks)))
         await db.commit()
 
         logger.info(
@@ -205,11 +257,14 @@ async def _process_document_content(
             document_id=str(document.id),
             text_length=len(extracted_text),
             chunk_count=len(chunks),
+            total_ms=round(timer.total_ms, 2),
+            stages_ms=timer.rounded_stages(),
         )
 
     except Exception as e:
         document.processing_status = "failed"
         document.processing_error = str(e)[:500]
+        db.add(timer.to_run(document, "failed", len(extracted_text), len(chunks)))
         await db.commit()
 
         logger.exception(
@@ -217,4 +272,8 @@ async def _process_document_content(
             document_id=str(document.id),
             filename=document.display_name,
             error=str(e),
+            stages_ms=timer.rounded_stages(),
         )
+        if isinstance(e, OllamaServiceError):
+            # Let the queue requeue the document with backoff
+            raise
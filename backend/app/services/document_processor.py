@@ -7,6 +7,7 @@ import pdfplumber
 from docx import Document as DocxDocument
 
 from app.core.logging import get_logger
+from app.core.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -33,6 +34,7 @@ class DocumentProcessor:
         """Get the file type from MIME type."""
         return cls.SUPPORTED_MIME_TYPES.get(mime_type)
 
+    @traced("extract")
     async def extract_text(
         self,
         file_content: bytes,
@@ -12,12 +12,14 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
+from app.core.tracing import continue_trace, current_traceparent
 from app.database import async_session_maker
 from app.models.document_queue import (
     DocumentProcessingQueue,
     DocumentQueueOperation,
     DocumentQueueStatus,
 )
+from app.services.profiling_service import get_armed_targets, maybe_profile
 
 logger = get_logger(__name__)
 
@@ -157,6 +159,7 @@ class DocumentQueueService:
             priority=priority,
             status=DocumentQueueStatus.PENDING,
             next_retry=datetime.now(UTC),  # Ready for immediate processing
+            trace_context=current_traceparent(),
         )
         self.db.add(queue_item)
         await self.db.flush()
@@ -512,6 +515,7 @@ async def process_document_queue() -> dict:
     from app.core.storage import StorageService
     from app.models.document import Document
     from app.services.document_processing_task import _process_document_content
+    from app.services.document_stats_service import DocumentStageTimer
 
     logger.info("document_queue_processing_started")
 
@@ -546,6 +550,9 @@ async def process_document_queue() -> dict:
 
             logger.info("document_queue_items_found", count=len(pending_items))
 
+            # Documents an admin asked to profile (one lookup per run)
+            armed_profiles = await get_armed_targets()
+
             for item in pending_items:
                 results["items_processed"] += 1
 
@@ -553,31 +560,54 @@ async def process_document_queue() -> dict:
                     await service.mark_in_progress(item)
                     await db.commit()
 
-                    # Process with fresh session for isolation
-                    async with async_session_maker() as process_db:
-                        # Fetch document
-                        doc_result = await process_db.execute(
-                            select(Document).where(Document.id == item.document_id)
-                        )
-                        document = doc_result.scalar_one_or_none()
-
-                        if not document:
-                            raise ValueError(f"Document {item.document_id} not found")
-
-                        # Read file content
-                        storage = StorageService()
-                        try:
-                            file_content = await storage.read(document.file_path)
-                        except FileNotFoundError:
-                            raise ValueError(
-                                f"File not found in storage: {document.file_path}"
+                    # Process with fresh session for isolation, continuing
+                    # the trace of the request that enqueued the document
+                    with continue_trace(
+                        item.trace_context,
+                        "document_queue.process",
+                        document_id=item.document_id,
+                        queue_id=item.id,
+                        operation=item.operation.value,
+                        attempt=item.attempts,
+                    ):
+                        async with (
+                            maybe_profile(
+                                armed_profiles,
+                                "document",
+                                item.document_id,
+                                "document:process",
+                            ),
+                            async_session_maker() as process_db,
+                        ):
+                            # Fetch document
+                            doc_result = await process_db.execute(
+                                select(Document).where(Document.id == item.document_id)
                             )
+                            document = doc_result.scalar_one_or_none()
 
-                        # Process document content
-                        await _process_document_content(
-                            process_db, document, file_content
-                        )
-                        await process_db.commit()
+                            if not document:
+                                raise ValueError(
+                                    f"Document {item.document_id} not found"
+                                )
+
+                            # Read file content
+                            storage = StorageService()
+                            timer = DocumentStageTimer()
+                            try:
+                                with timer.stage("storage_read"):
+                                    file_content = await storage.read(
+                                        document.file_path
+                                    )
+                            except FileNotFoundError:
+                                raise ValueError(
+                                    f"File not found in storage: {document.file_path}"
+                                )
+
+                            # Process document content
+                            await _process_document_content(
+                                process_db, document, file_content, timer
+                            )
+                            await process_db.commit()
 
                     # Mark as completed with fresh session
                     async with async_session_maker() as update_db:
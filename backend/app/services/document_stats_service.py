@@ -0,0 +1,217 @@
+"""Per-document processing stage timings and throughput analytics.
+
+Every processing run of a document (queue, job handler or legacy background
+task) records in ``document_processing_runs`` how long it spent in each
+stage - storage read, text extraction, chunking, embedding, tag suggestion
+and the final database write - together with embedding cache hits and
+chunks reused within the document.
+
+``DocumentStatsService.get_processing_analytics`` aggregates recent runs by
+MIME type and file size bucket (p50/p95 per stage, documents per hour,
+bytes per second) for sizing workers and spotting regressions. Results are
+cached for ``DB_STATS_CACHE_TTL`` seconds.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.document import Document, DocumentProcessingRun
+from app.services.cache_service import get_db_stats_cache, get_or_set
+
+logger = get_logger(__name__)
+
+# Pipeline stages, in order (``<stage>_ms`` columns on the run)
+STAGES = (
+    "storage_read",
+    "extraction",
+    "chunking",
+    "embedding",
+    "tag_suggestion",
+    "db_write",
+)
+
+# (exclusive upper bound in bytes, label); the last bucket is open-ended
+SIZE_BUCKETS = (
+    (100 * 1024, "<100KB"),
+    (1024 * 1024, "100KB-1MB"),
+    (10 * 1024 * 1024, "1-10MB"),
+    (None, ">=10MB"),
+)
+
+
+def _size_bucket_sql() -> str:
+    cases = " ".join(
+        f"WHEN file_size < {upper} THEN '{label}'"
+        for upper, label in SIZE_BUCKETS
+        if upper is not None
+    )
+    return f"CASE {cases} ELSE '{SIZE_BUCKETS[-1][1]}' END"
+
+
+def _stage_percentiles_sql() -> str:
+    return ",\n           ".join(
+        f"percentile_cont({quantile}) WITHIN GROUP (ORDER BY {stage}_ms)"
+        f" FILTER (WHERE status = 'completed') AS {stage}_p{int(quantile * 100)}"
+        for stage in (*STAGES, "total")
+        for quantile in (0.5, 0.95)
+    )
+
+
+# Grouping sets add an overall row (mime_type and size_bucket NULL)
+ANALYTICS_SQL = f"""
+    WITH runs AS (
+        SELECT *, {_size_bucket_sql()} AS size_bucket
+        FROM document_processing_runs
+        WHERE created_at >= :since AND status <> 'skipped'
+    )
+    SELECT mime_type,
+           size_bucket,
+           count(*) AS documents,
+           count(*) FILTER (WHERE status = 'completed') AS completed,
+           count(*) FILTER (WHERE status = 'failed') AS failed,
+           coalesce(sum(file_size) FILTER (WHERE status = 'completed'), 0)
+               AS completed_bytes,
+           coalesce(sum(total_ms) FILTER (WHERE status = 'completed'), 0)
+               AS completed_ms,
+           coalesce(sum(chunk_count), 0) AS chunks,
+           coalesce(sum(embedding_requests), 0) AS embedding_requests,
+           coalesce(sum(embedding_cache_hits), 0) AS embedding_cache_hits,
+           coalesce(sum(embeddings_reused), 0) AS embeddings_reused,
+           {_stage_percentiles_sql()}
+    FROM runs
+    GROUP BY GROUPING SETS ((mime_type, size_bucket), ())
+    ORDER BY documents DESC
+"""
+
+
+@dataclass
+class DocumentStageTimer:
+    """Collects stage timings and counters for one processing run."""
+
+    stage_ms: dict[str, float] = field(default_factory=dict)
+    extraction_method: str | None = None
+    embedding_requests: int = 0
+    embedding_cache_hits: int = 0
+    embeddings_reused: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block (sync or async code) as ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stage_ms[name] = self.stage_ms.get(name, 0.0) + elapsed
+
+    @property
+    def total_ms(self) -> float:
+        """Time since the timer was created."""
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def rounded_stages(self) -> dict[str, float]:
+        """Stage timings rounded for logging."""
+        return {name: round(ms, 2) for name, ms in self.stage_ms.items()}
+
+    def to_run(
+        self,
+        document: Document,
+        status: str,
+        text_length: int = 0,
+        chunk_count: int = 0,
+    ) -> DocumentProcessingRun:
+        """The run row to persist for ``document``."""
+        return DocumentProcessingRun(
+            document_id=document.id,
+            status=status,
+            mime_type=document.mime_type,
+            file_size=document.file_size,
+            extraction_method=self.extraction_method,
+            total_ms=round(self.total_ms, 2),
+            text_length=text_length,
+            chunk_count=chunk_count,
+            embedding_requests=self.embedding_requests,
+            embedding_cache_hits=self.embedding_cache_hits,
+            embeddings_reused=self.embeddings_reused,
+            **{
+                f"{stage}_ms": round(self.stage_ms[stage], 2)
+                for stage in STAGES
+                if stage in self.stage_ms
+            },
+        )
+
+
+def _rate(amount: float, seconds: float) -> float | None:
+    return round(amount / seconds, 2) if seconds > 0 else None
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+class DocumentStatsService:
+    """Aggregates document processing runs for the admin analytics."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_processing_analytics(self, hours: int = 24) -> dict:
+        """Stage latency and throughput by MIME type and size bucket."""
+        return await get_or_set(
+            get_db_stats_cache(),
+            f"document_processing:{hours}",
+            lambda: self._query_processing_analytics(hours),
+        )
+
+    async def _query_processing_analytics(self, hours: int) -> dict:
+        since = datetime.now(UTC) - timedelta(hours=hours)
+        result = await self.db.execute(text(ANALYTICS_SQL), {"since": since})
+
+        overall = None
+        groups = []
+        for row in result.mappings().all():
+            group = {
+                "mime_type": row["mime_type"],
+                "size_bucket": row["size_bucket"],
+                "documents": row["documents"],
+                "completed": row["completed"],
+                "failed": row["failed"],
+                "docs_per_hour": round(row["completed"] / hours, 2),
+                # Processing speed while busy (not wall-clock throughput)
+                "bytes_per_second": _rate(
+                    float(row["completed_bytes"]), row["completed_ms"] / 1000
+                ),
+                "total_p50_ms": _round(row["total_p50"]),
+                "total_p95_ms": _round(row["total_p95"]),
+                "stages": [
+                    {
+                        "stage": stage,
+                        "p50_ms": _round(row[f"{stage}_p50"]),
+                        "p95_ms": _round(row[f"{stage}_p95"]),
+                    }
+                    for stage in STAGES
+                ],
+                "chunks": row["chunks"],
+                "embedding_requests": row["embedding_requests"],
+                "embedding_cache_hits": row["embedding_cache_hits"],
+                "embeddings_reused": row["embeddings_reused"],
+            }
+            if row["mime_type"] is None:
+                overall = group
+            else:
+                groups.append(group)
+
+        return {
+            "window_hours": hours,
+            "since": since.isoformat(),
+            "overall": overall,
+            "groups": groups,
+        }
@@ -11,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.tag import Tag
+from app.services.tag_matcher import get_tag_matcher, tokenize
 
 # Common English stop words to filter out from keyword extraction
 STOP_WORDS = frozenset(
@@ -250,8 +251,9 @@ class DocumentTagSuggester:
     ) -> list[tuple[Tag, float]]:
         """Suggest tags based on document text content.
 
-        Extracts keywords from the text and matches them against existing
-        tag names and tag name words.
+        Scans the text once with the cached tag matcher (see tag_matcher)
+        for full tag names, then matches frequent keywords against tag
+        name words.
 
         Args:
             text: Document text content to analyze
@@ -269,35 +271,18 @@ class DocumentTagSuggester:
         if not keywords:
             return []
 
-        # Fetch all tags
-        result = await self.db.execute(select(Tag))
-        all_tags = result.scalars().all()
-
-        matches: list[tuple[Tag, float]] = []
+        matcher = await get_tag_matcher(self.db)
+        scores = matcher.match(tokenize(text), keywords)
+        if not scores:
+            return []
 
-        for tag in all_tags:
-            tag_name_lower = tag.name.lower()
-            tag_words = set(tag_name_lower.replace("-", " ").replace("_", " ").split())
+        ranked = sorted(scores, key=lambda tag_id: scores[tag_id], reverse=True)
+        top_ids = set(ranked[:limit])
 
-            # Check for exact tag name match in keywords
-            if tag_name_lower in keywords:
-                # Exact match - highest score
-                matches.append((tag, 1.0))
-            elif tag_words & keywords:
-                # Partial match - tag word appears in keywords
-                # Score based on how many tag words match
-                matching_words = tag_words & keywords
-                score = 0.6 + (len(matching_words) / len(tag_words)) * 0.3
-                matches.append((tag, score))
-            else:
-                # Check if tag name appears as substring in any keyword
-                # This catches cases like "python" matching keyword "python3"
-                for keyword in keywords:
-                    if tag_name_lower in keyword or keyword in tag_name_lower:
-                        matches.append((tag, 0.5))
-                        break
+        result = await self.db.execute(select(Tag).where(Tag.id.in_(top_ids)))
+        tags = [tag for tag in result.scalars().all() if tag.id in top_ids]
 
-        # Sort by score descending
+        matches = [(tag, scores[tag.id]) for tag in tags]
         matches.sort(key=lambda x: x[1], reverse=True)
 
         return matches[:limit]
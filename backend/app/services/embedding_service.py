@@ -8,10 +8,17 @@ import httpx
 import redis.exceptions
 
 from app.config import get_settings
+from app.core.circuit_breaker import CircuitOpenError, get_ollama_breaker
 from app.core.logging import get_logger
+from app.core.ollama_scheduler import OllamaPriority, get_ollama_scheduler
+from app.core.server_timing import CACHE, OLLAMA, track_time
 
 logger = get_logger(__name__)
 
+# last_failure values meaning Ollama is down or overloaded rather than that it
+# rejected the text; batch callers retry later instead of storing no embedding
+UNAVAILABLE_FAILURES = frozenset({"circuit_open", "timeout"})
+
 
 class EmbeddingCacheInterface(Protocol):
     """Interface for embedding cache implementations."""
@@ -118,7 +125,8 @@ class RedisEmbeddingCache:
         try:
             client = await self._get_client()
             key = self._normalize_key(text)
-            data = await client.get(key)
+            with track_time(CACHE):
+                data = await client.get(key)
             if data:
                 self._hits += 1
                 return json.loads(data)
@@ -136,7 +144,8 @@ class RedisEmbeddingCache:
         try:
             client = await self._get_client()
             key = self._normalize_key(text)
-            await client.setex(key, self._ttl, json.dumps(embedding))
+            with track_time(CACHE):
+                await client.setex(key, self._ttl, json.dumps(embedding))
         except RedisError as e:
             logger.warning("redis_cache_set_error", error=str(e))
 
@@ -311,10 +320,24 @@ class EmbeddingService:
     CHUNK_SIZE_TOKENS = 512
     CHUNK_OVERLAP_PERCENT = 0.12
 
-    def __init__(self):
+    def __init__(self, priority: OllamaPriority = OllamaPriority.INTERACTIVE):
+        """Initialize the embedding service.
+
+        Args:
+            priority: Ollama scheduling lane. Bulk callers (document
+                processing, re-embedding jobs) use ``OllamaPriority.BATCH`` so
+                they yield to query embeddings.
+        """
         self.settings = get_settings()
         self.model = self.settings.ollama_embedding_model
         self.base_url = self.settings.ollama_base_url
+        self.priority = priority
+        # Per-instance counters (read by the document processing stats)
+        self.cache_hits = 0
+        self.requests = 0
+        # Why the last generate_embedding call returned None ("circuit_open",
+        # "timeout" or "error"), None if it succeeded
+        self.last_failure: str | None = None
 
     @property
     def chunk_size_chars(self) -> int:
@@ -388,12 +411,14 @@ class EmbeddingService:
         Returns:
             List of floats representing the embedding, or None if failed
         """
+        self.last_failure = None
         if not text or not text.strip():
             return None
 
         # Check cache first
         cached = await _embedding_cache.get(text)
         if cached is not None:
+            self.cache_hits += 1
             logger.debug(
                 "embedding_cache_hit",
                 query_length=len(text),
@@ -402,16 +427,30 @@ class EmbeddingService:
             return cached
 
         # Cache miss - generate embedding
+        self.requests += 1
         start_time = time.perf_counter()
+        breaker = get_ollama_breaker(
+            "embeddings.batch"
+            if self.priority == OllamaPriority.BATCH
+            else "embeddings"
+        )
+        timeout = breaker.timeout(self.settings.ollama_embedding_timeout_seconds)
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/embeddings",
-                    json={
-                        "model": self.model,
-                        "prompt": text,
-                    },
-                )
+            # Fail fast before queueing for a slot behind in-flight calls
+            breaker.check()
+            async with (
+                get_ollama_scheduler().slot(self.priority),
+                breaker.guard(),
+                httpx.AsyncClient(timeout=timeout) as client,
+            ):
+                with track_time(OLLAMA):
+                    response = await client.post(
+                        f"{self.base_url}/api/embeddings",
+                        json={
+                            "model": self.model,
+                            "prompt": text,
+                        },
+                    )
                 response.raise_for_status()
                 data = response.json()
                 embedding = data.get("embedding")
@@ -429,14 +468,23 @@ class EmbeddingService:
                     )
 
                 return embedding
+        except CircuitOpenError as e:
+            # Ollama is down or overloaded - fail fast without calling it
+            self.last_failure = "circuit_open"
+            logger.debug("embedding_skipped_circuit_open", retry_after=e.retry_after)
+            return None
         except httpx.HTTPError as e:
             elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self.last_failure = (
+                "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+            )
             # Log error but don't raise - embeddings are optional
             logger.warning(
                 "embedding_generation_failed",
                 error=str(e),
                 error_type=type(e).__name__,
                 elapsed_ms=round(elapsed_ms, 2),
+                timeout_seconds=round(timeout, 2),
             )
             return None
 
@@ -0,0 +1,269 @@
+"""Shared in-memory index for resolving entity names to IDs.
+
+The NL query parser, CSV import and Monday sync all resolve organization
+names, tag names and owner emails. Instead of one case-insensitive query per
+row per field, they look names up in a process-wide snapshot:
+
+- organizations by lowercased name, alias and Monday ID (names win over
+  aliases; an alias shared by several organizations resolves to none);
+- tags by lowercased name. Synonyms are tags themselves, so they resolve
+  by name, and search expands the synonyms of the resolved tags. A name
+  used by several tag types resolves to the technology tag;
+- users by lowercased email.
+
+The snapshot is rebuilt when the "tags" or "orgs" cache generation changes,
+or after ``tag_cache_ttl`` seconds as a safety net. Users have no generation,
+so an email missing from the snapshot is looked up in the database.
+
+``EntityResolver`` wraps the snapshot for one session. It remembers entities
+created in that session (e.g. freeform tags created by an import, which the
+snapshot cannot contain yet) and memoises database fallbacks, including the
+optional pg_trgm fuzzy match for organization names.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.models.organization import Organization
+from app.models.tag import Tag, TagType
+from app.models.user import User
+from app.services.autocomplete_service import trigram_match
+from app.services.cache_service import get_cache_generation
+
+logger = get_logger(__name__)
+
+
+def entity_key(text: str) -> str:
+    """Lookup key for a name or email: trimmed and lowercased."""
+    return text.strip().lower()
+
+
+@dataclass(frozen=True)
+class EntityIndex:
+    """Immutable snapshot of organization, tag and user lookup keys."""
+
+    organizations: dict[str, UUID]
+    organization_names: dict[str, UUID]
+    organizations_by_monday_id: dict[str, UUID]
+    tags: dict[str, UUID]
+    users: dict[str, UUID]
+    # Source rows, for indexes derived from this snapshot (nl_query_rules)
+    organization_rows: tuple[tuple[UUID, str, list[str] | None], ...] = ()
+    tag_rows: tuple[tuple[UUID, str], ...] = ()
+
+    @classmethod
+    def build(
+        cls,
+        organizations: Iterable[tuple[UUID, str, list[str] | None, str | None]],
+        tags: Iterable[tuple[UUID, str, TagType]],
+        users: Iterable[tuple[UUID, str]] = (),
+    ) -> "EntityIndex":
+        """Index (id, name, aliases, monday_id) organizations, (id, name, type)
+        tags and (id, email) users."""
+        organizations = list(organizations)
+        tags = list(tags)
+
+        org_names: dict[str, UUID] = {}
+        alias_owners: dict[str, set[UUID]] = defaultdict(set)
+        by_monday_id: dict[str, UUID] = {}
+        for org_id, name, aliases, monday_id in organizations:
+            org_names[entity_key(name)] = org_id
+            for alias in aliases or []:
+                if alias and alias.strip():
+                    alias_owners[entity_key(alias)].add(org_id)
+            if monday_id:
+                by_monday_id[monday_id] = org_id
+
+        org_keys = {
+            alias: next(iter(owners))
+            for alias, owners in alias_owners.items()
+            if len(owners) == 1
+        }
+        org_keys.update(org_names)
+
+        # Technology tags first, so they win a name shared across types
+        tag_keys: dict[str, UUID] = {}
+        for tag_id, name, _ in sorted(
+            tags, key=lambda row: row[2] != TagType.TECHNOLOGY
+        ):
+            tag_keys.setdefault(entity_key(name), tag_id)
+
+        return cls(
+            organizations=org_keys,
+            organization_names=org_names,
+            organizations_by_monday_id=by_monday_id,
+            tags=tag_keys,
+            users={entity_key(email): user_id for user_id, email in users if email},
+            organization_rows=tuple(
+                (org_id, name, aliases) for org_id, name, aliases, _ in organizations
+            ),
+            tag_rows=tuple((tag_id, name) for tag_id, name, _ in tags),
+        )
+
+    @property
+    def organization_ids(self) -> set[UUID]:
+        return {row[0] for row in self.organization_rows}
+
+
+class EntityResolver:
+    """Resolves names to IDs for one session, on top of the shared index."""
+
+    def __init__(self, db: AsyncSession, index: EntityIndex):
+        self.db = db
+        self.index = index
+        self._organization_ids = index.organization_ids
+        # Entities created in this session, and memoised database fallbacks
+        self._organizations: dict[str, UUID | None] = {}
+        self._tags: dict[str, UUID] = {}
+        self._users: dict[str, UUID | None] = {}
+
+    def organization_id(self, name: str, *, aliases: bool = True) -> UUID | None:
+        """Exact (case-insensitive) match on organization name or alias."""
+        key = entity_key(name)
+        if key in self._organizations:
+            return self._organizations[key]
+        if not aliases:
+            return self.index.organization_names.get(key)
+        return self.index.organizations.get(key)
+
+    def organization_id_for_monday(self, monday_id: str) -> UUID | None:
+        """Organization previously synced from the Monday item ``monday_id``."""
+        return self.index.organizations_by_monday_id.get(monday_id)
+
+    async def fuzzy_organization_id(self, name: str) -> UUID | None:
+        """Best trigram match on organization name, if similar enough.
+
+        Served by the pg_trgm index on organizations.name (migration 032) and
+        memoised, so each distinct name costs at most one query.
+        """
+        key = entity_key(name)
+        org_id = self.organization_id(name)
+        if org_id is not None or not key or key in self._organizations:
+            return org_id
+
+        condition, score = trigram_match(Organization.name, key)
+        result = await self.db.execute(
+            select(Organization.id, score.label("score"))
+            .where(condition)
+            .order_by(score.desc(), Organization.name)
+            .limit(1)
+        )
+        row = result.first()
+        min_score = get_settings().entity_fuzzy_match_min_score
+        org_id = row[0] if row is not None and float(row[1]) >= min_score else None
+        self._organizations[key] = org_id
+        return org_id
+
+    async def has_organization(self, org_id: UUID) -> bool:
+        """Whether the organization exists (newer than the snapshot included)."""
+        if org_id in self._organization_ids:
+            return True
+        if await self.db.get(Organization, org_id) is None:
+            return False
+        self._organization_ids.add(org_id)
+        return True
+
+    def tag_id(self, name: str) -> UUID | None:
+        """Exact (case-insensitive) match on tag name."""
+        key = entity_key(name)
+        return self._tags.get(key) or self.index.tags.get(key)
+
+    async def user_id(self, email: str) -> UUID | None:
+        """Match on user email, asking the database once for unknown emails."""
+        key = entity_key(email)
+        if key in self.index.users:
+            return self.index.users[key]
+        if key not in self._users:
+            result = await self.db.execute(
+                select(User.id).where(func.lower(User.email) == key)
+            )
+            self._users[key] = result.scalar_one_or_none()
+        return self._users[key]
+
+    def add_organization(self, name: str, org_id: UUID) -> None:
+        """Record an organization created in this session."""
+        self._organizations[entity_key(name)] = org_id
+        self._organization_ids.add(org_id)
+
+    def add_tag(self, name: str, tag_id: UUID) -> None:
+        """Record a tag created in this session."""
+        self._tags[entity_key(name)] = tag_id
+
+
+_index: EntityIndex | None = None
+_index_generations: tuple[int, int] | None = None
+_index_built_at: float = 0.0
+_index_lock = asyncio.Lock()
+
+
+async def _load_index(db: AsyncSession) -> EntityIndex:
+    """Load organization, tag and user keys and build the index."""
+    start = time.perf_counter()
+    org_result = await db.execute(
+        select(
+            Organization.id,
+            Organization.name,
+            Organization.aliases,
+            Organization.monday_id,
+        )
+    )
+    organizations = [tuple(row) for row in org_result.all()]
+    tag_result = await db.execute(select(Tag.id, Tag.name, Tag.type))
+    tags = [tuple(row) for row in tag_result.all()]
+    user_result = await db.execute(select(User.id, User.email))
+    users = [tuple(row) for row in user_result.all()]
+
+    index = EntityIndex.build(organizations, tags, users)
+    logger.info(
+        "entity_index_built",
+        organization_count=len(organizations),
+        tag_count=len(tags),
+        user_count=len(users),
+        build_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+    return index
+
+
+async def get_entity_index(db: AsyncSession) -> EntityIndex:
+    """Get the process-wide index, rebuilding it if tags or orgs changed."""
+    global _index, _index_generations, _index_built_at
+
+    generations = (
+        await get_cache_generation("tags").get(),
+        await get_cache_generation("orgs").get(),
+    )
+    max_age = get_settings().tag_cache_ttl
+
+    async with _index_lock:
+        if (
+            _index is None
+            or _index_generations != generations
+            or time.monotonic() - _index_built_at > max_age
+        ):
+            _index = await _load_index(db)
+            _index_generations = generations
+            _index_built_at = time.monotonic()
+        return _index
+
+
+async def get_entity_resolver(db: AsyncSession) -> EntityResolver:
+    """A resolver for ``db`` over the current process-wide index."""
+    return EntityResolver(db, await get_entity_index(db))
+
+
+def reset_entity_index() -> None:
+    """Drop the cached index (for testing)."""
+    global _index, _index_generations, _index_built_at, _index_lock
+    _index = None
+    _index_generations = None
+    _index_built_at = 0.0
+    _index_lock = asyncio.Lock()
@@ -0,0 +1,157 @@
+"""Facet counts for project search and listing using a GROUPING SETS query."""
+
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import distinct, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.organization import Organization
+from app.models.project import Project, ProjectTag
+from app.models.tag import Tag
+from app.schemas.project import FacetBucket, ProjectFacet, ProjectFacets
+
+logger = get_logger(__name__)
+
+
+class FacetService:
+    """Computes status, organization and tag counts over a project result set.
+
+    All requested facets are computed in a single statement using
+    ``GROUP BY GROUPING SETS``, so adding facets does not add round trips.
+    """
+
+    # Maximum buckets returned per facet (tags can be numerous)
+    MAX_BUCKETS = 50
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_facets(
+        self,
+        facets: Sequence[ProjectFacet],
+        *,
+        filter_conditions: list | None = None,
+        project_ids: Sequence[UUID] | None = None,
+    ) -> ProjectFacets:
+        """
+        Count projects per facet value.
+
+        Args:
+            facets: Facet dimensions to compute.
+            filter_conditions: WHERE conditions already applied to the result
+                set (filters and ACL restrictions).
+            project_ids: Explicit candidate set (e.g. the fused hybrid search
+                candidates). Takes precedence over filter_conditions.
+
+        Returns:
+            ProjectFacets with only the requested facets populated.
+        """
+        requested = list(dict.fromkeys(ProjectFacet(f) for f in facets))
+        if not requested:
+            return ProjectFacets()
+
+        if project_ids is not None and not project_ids:
+            return ProjectFacets(**{f.value: [] for f in requested})
+
+        columns = []
+        grouping_sets = []
+        stmt_from = Project.__table__
+
+        if ProjectFacet.STATUS in requested:
+            columns += [
+                Project.status.label("status"),
+                func.grouping(Project.status).label("g_status"),
+            ]
+            grouping_sets.append(tuple_(Project.status))
+
+        if ProjectFacet.ORGANIZATION in requested:
+            columns += [
+                Project.organization_id.label("organization_id"),
+                Organization.name.label("organization_name"),
+                func.grouping(Project.organization_id).label("g_organization"),
+            ]
+            grouping_sets.append(tuple_(Project.organization_id, Organization.name))
+            stmt_from = stmt_from.join(
+                Organization.__table__,
+                Organization.id == Project.organization_id,
+            )
+
+        if ProjectFacet.TAG in requested:
+            columns += [
+                ProjectTag.tag_id.label("tag_id"),
+                Tag.name.label("tag_name"),
+                func.grouping(ProjectTag.tag_id).label("g_tag"),
+            ]
+            grouping_sets.append(tuple_(ProjectTag.tag_id, Tag.name))
+            stmt_from = stmt_from.outerjoin(
+                ProjectTag.__table__, ProjectTag.project_id == Project.id
+            ).outerjoin(Tag.__table__, Tag.id == ProjectTag.tag_id)
+
+        # DISTINCT because the tag join fans out one row per project tag
+        columns.append(func.count(distinct(Project.id)).label("count"))
+
+        stmt = (
+            select(*columns)
+            .select_from(stmt_from)
+            .group_by(func.grouping_sets(*grouping_sets))
+        )
+
+        if project_ids is not None:
+            stmt = stmt.where(Project.id.in_(list(project_ids)))
+        elif filter_conditions:
+            # Filter through an ID subquery: conditions correlated to projects
+            # (e.g. the tag EXISTS filters) would otherwise auto-correlate to
+            # the joined project_tags and lose their FROM clause
+            filtered_ids = select(Project.id).where(*filter_conditions).correlate(None)
+            stmt = stmt.where(Project.id.in_(filtered_ids))
+
+        result = await self.db.execute(stmt)
+        rows = result.all()
+
+        buckets: dict[ProjectFacet, list[FacetBucket]] = {f: [] for f in requested}
+        for row in rows:
+            mapping = row._mapping
+            if ProjectFacet.STATUS in requested and mapping["g_status"] == 0:
+                status = mapping["status"]
+                if status is not None:
+                    value = getattr(status, "value", str(status))
+                    buckets[ProjectFacet.STATUS].append(
+                        FacetBucket(value=value, label=value, count=mapping["count"])
+                    )
+            elif (
+                ProjectFacet.ORGANIZATION in requested
+                and mapping["g_organization"] == 0
+            ):
+                if mapping["organization_id"] is not None:
+                    buckets[ProjectFacet.ORGANIZATION].append(
+                        FacetBucket(
+                            value=str(mapping["organization_id"]),
+                            label=mapping["organization_name"],
+                            count=mapping["count"],
+                        )
+                    )
+            elif ProjectFacet.TAG in requested and mapping["g_tag"] == 0:
+                # Projects without tags produce a NULL tag group - skip it
+                if mapping["tag_id"] is not None:
+                    buckets[ProjectFacet.TAG].append(
+                        FacetBucket(
+                            value=str(mapping["tag_id"]),
+                            label=mapping["tag_name"],
+                            count=mapping["count"],
+                        )
+                    )
+
+        for facet, facet_buckets in buckets.items():
+            facet_buckets.sort(key=lambda b: (-b.count, b.label.lower()))
+            buckets[facet] = facet_buckets[: self.MAX_BUCKETS]
+
+        logger.debug(
+            "facet_counts_computed",
+            facets=[f.value for f in requested],
+            bucket_counts={f.value: len(b) for f, b in buckets.items()},
+            candidate_set=len(project_ids) if project_ids is not None else None,
+        )
+
+        return ProjectFacets(**{f.value: b for f, b in buckets.items()})
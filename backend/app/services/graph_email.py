@@ -32,6 +32,7 @@ from msgraph.generated.users.item.send_mail.send_mail_post_request_body import (
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.server_timing import GRAPH, track_time
 
 logger = get_logger(__name__)
 
@@ -109,28 +110,31 @@ class GraphEmailService:
             )
 
             # Fetch messages from the shared mailbox
-            messages = await client.users.by_user_id(feedback_email).messages.get(
-                request_configuration=lambda config: (
-                    setattr(
-                        config.query_parameters,
-                        "filter",
-                        f"receivedDateTime ge {filter_date}",
-                    ),
-                    setattr(
-                        config.query_parameters,
-                        "select",
-                        [
-                            "id",
-                            "from",
-                            "subject",
-                            "body",
-                            "receivedDateTime",
-                            "internetMessageHeaders",
-                        ],
-                    ),
-                    setattr(config.query_parameters, "orderby", ["receivedDateTime"]),
+            with track_time(GRAPH):
+                messages = await client.users.by_user_id(feedback_email).messages.get(
+                    request_configuration=lambda config: (
+                        setattr(
+                            config.query_parameters,
+                            "filter",
+                            f"receivedDateTime ge {filter_date}",
+                        ),
+                        setattr(
+                            config.query_parameters,
+                            "select",
+                            [
+                                "id",
+                                "from",
+                                "subject",
+                                "body",
+                                "receivedDateTime",
+                                "internetMessageHeaders",
+                            ],
+                        ),
+                        setattr(
+                            config.query_parameters, "orderby", ["receivedDateTime"]
+                        ),
+                    )
                 )
-            )
 
             if not messages or not messages.value:
                 return []
@@ -236,9 +240,10 @@ class GraphEmailService:
                 save_to_sent_items=True,
             )
 
-            await client.users.by_user_id(self.settings.feedback_email).send_mail.post(
-                request_body
-            )
+            with track_time(GRAPH):
+                await client.users.by_user_id(
+                    self.settings.feedback_email
+                ).send_mail.post(request_body)
 
             logger.info(
                 "graph_email_sent",
@@ -284,12 +289,15 @@ class GraphEmailService:
 
         try:
             # Try to fetch one message to test connection
-            await client.users.by_user_id(self.settings.feedback_email).messages.get(
-                request_configuration=lambda config: (
-                    setattr(config.query_parameters, "top", 1),
-                    setattr(config.query_parameters, "select", ["id"]),
+            with track_time(GRAPH):
+                await client.users.by_user_id(
+                    self.settings.feedback_email
+                ).messages.get(
+                    request_configuration=lambda config: (
+                        setattr(config.query_parameters, "top", 1),
+                        setattr(config.query_parameters, "select", ["id"]),
+                    )
                 )
-            )
 
             logger.info("graph_email_connection_test", result="success")
             return True
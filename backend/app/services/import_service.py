@@ -1,17 +1,24 @@
 """Import service for bulk import with RAG assistance."""
 
+import codecs
 import csv
 import io
+from collections.abc import AsyncIterator, Iterable, Iterator
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from uuid import UUID
+from itertools import islice
+from typing import BinaryIO
+from uuid import UUID, uuid4
 
 from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.ollama_scheduler import OllamaPriority
 from app.models.organization import Organization
-from app.models.project import Project, ProjectLocation, ProjectStatus
+from app.models.project import Project, ProjectLocation, ProjectStatus, ProjectTag
 from app.models.tag import Tag, TagType
 from app.models.user import User
 from app.schemas.import_ import (
@@ -25,9 +32,18 @@ from app.schemas.import_ import (
     ImportRowValidation,
 )
 from app.services.embedding_service import EmbeddingService
+from app.services.entity_index import (
+    EntityResolver,
+    entity_key,
+    get_entity_resolver,
+)
+from app.services.tag_stats_service import TagStatsService
 
 logger = get_logger(__name__)
 
+# Bind parameters asyncpg accepts in one statement
+MAX_BIND_PARAMS = 32767
+
 # Column name mappings (CSV header -> internal field)
 COLUMN_MAPPINGS = {
     # Name variations
@@ -156,7 +172,13 @@ class ImportService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.embedding_service = EmbeddingService()
+        self._resolver: EntityResolver | None = None
+        # Freeform tags created while resolving rows (see _create_freeform_tags)
+        self.created_tag_count = 0
+        # Recent projects used for suggestions, per (organization_id, limit)
+        self._similar_projects: dict[tuple[UUID | None, int], list[Project]] = {}
+        # Batch lane: one embedding per imported row yields to search queries
+        self.embedding_service = EmbeddingService(priority=OllamaPriority.BATCH)
 
     async def parse_csv(
         self,
@@ -168,36 +190,55 @@ class ImportService:
 
         Returns tuple of (rows, column_mappings).
         """
-        try:
-            text = content.decode("utf-8-sig")  # Handle BOM
-        except UnicodeDecodeError:
-            text = content.decode("latin-1")
+        column_mappings, rows = self.iter_file_rows(io.BytesIO(content), "import.csv")
+        return list(rows), column_mappings
+
+    def iter_file_rows(
+        self,
+        file: BinaryIO,
+        filename: str,
+    ) -> tuple[dict[str, str], Iterator[dict]]:
+        """
+        Parse a CSV or XLSX file incrementally.
+
+        Rows are mapped lazily, so only the current row is held as a dict.
+        XLSX files are read from their first sheet.
 
-        reader = csv.DictReader(io.StringIO(text))
+        Returns tuple of (column_mappings, rows).
+        """
+        if filename.lower().endswith(".xlsx"):
+            raw_rows = _xlsx_rows(file)
+        else:
+            raw_rows = _csv_rows(file)
 
-        # Map column names
+        header = next(raw_rows, [])
+        # Like csv.DictReader, a repeated header keeps its last column
+        positions = {h: i for i, h in enumerate(header)}
         column_mappings = {}
-        for header in reader.fieldnames or []:
-            normalized = header.lower().strip()
+        for h in positions:
+            normalized = h.lower().strip()
             if normalized in COLUMN_MAPPINGS:
-                column_mappings[header] = COLUMN_MAPPINGS[normalized]
-
-        rows = []
-        for row in reader:
-            mapped_row = {}
-            for original, internal in column_mappings.items():
-                value = row.get(original, "").strip()
-                if value:
-                    if internal == "tags":
-                        # Parse tags as comma-separated list
-                        mapped_row[internal] = [
-                            t.strip() for t in value.split(",") if t.strip()
-                        ]
-                    else:
-                        mapped_row[internal] = value
-            rows.append(mapped_row)
-
-        return rows, column_mappings
+                column_mappings[h] = COLUMN_MAPPINGS[normalized]
+
+        def mapped_rows() -> Iterator[dict]:
+            for values in raw_rows:
+                if not values:
+                    continue  # Blank line, skipped as by csv.DictReader
+                mapped_row = {}
+                for original, internal in column_mappings.items():
+                    i = positions[original]
+                    value = values[i].strip() if i < len(values) else ""
+                    if value:
+                        if internal == "tags":
+                            # Parse tags as comma-separated list
+                            mapped_row[internal] = [
+                                t.strip() for t in value.split(",") if t.strip()
+                            ]
+                        else:
+                            mapped_row[internal] = value
+                yield mapped_row
+
+        return column_mappings, mapped_rows()
 
     async def validate_row(
         self,
@@ -216,8 +257,8 @@ class ImportService:
             errors.append("Organization is required")
         else:
             # Check if organization exists
-            org_exists = await self._find_organization(row["organization_name"])
-            if not org_exists:
+            org_id = await self._find_organization_id(row["organization_name"])
+            if not org_id:
                 errors.append(f"Organization '{row['organization_name']}' not found")
 
         if not row.get("start_date"):
@@ -237,8 +278,8 @@ class ImportService:
 
         # Owner validation
         if row.get("owner_email"):
-            owner = await self._find_user_by_email(row["owner_email"])
-            if not owner:
+            owner_id = await self._find_user_id(row["owner_email"])
+            if not owner_id:
                 warnings.append(
                     f"Owner '{row['owner_email']}' not found, will use current user"
                 )
@@ -310,8 +351,8 @@ class ImportService:
         if not row.organization_id:
             errors.append("Organization is required")
         else:
-            org = await self.db.get(Organization, row.organization_id)
-            if not org:
+            resolver = await self._entity_resolver()
+            if not await resolver.has_organization(row.organization_id):
                 errors.append("Selected organization not found")
 
         # Required: start_date
@@ -354,6 +395,11 @@ class ImportService:
         """
         rows, column_mappings = await self.parse_csv(content, filename)
 
+        # Freeform tags missing anywhere in the file are created in one INSERT
+        await self._create_freeform_tags(
+            [name for row in rows for name in row.get("tags", [])], user_id
+        )
+
         previews = []
         for idx, row in enumerate(rows):
             row_number = idx + 2  # Account for header row
@@ -367,19 +413,13 @@ class ImportService:
             tag_ids = None
 
             if row.get("organization_name"):
-                org = await self._find_organization(row["organization_name"])
-                if org:
-                    org_id = org.id
+                org_id = await self._find_organization_id(row["organization_name"])
 
             if row.get("owner_email"):
-                owner = await self._find_user_by_email(row["owner_email"])
-                if owner:
-                    owner_id = owner.id
+                owner_id = await self._find_user_id(row["owner_email"])
 
             if row.get("tags"):
-                tag_ids = await self._resolve_tags(
-                    row["tags"], user_id=user_id, create_missing=True
-                )
+                tag_ids = await self._resolve_tags(row["tags"])
 
             # Get suggestions if requested and row has a name
             suggestions = None
@@ -426,6 +466,13 @@ class ImportService:
         """
         Commit import rows as new projects.
 
+        Rows are checked in memory, and their organizations, owners and tags
+        with one query each. Valid rows are then inserted in batches of
+        ``import_commit_batch_size``: one multi-row INSERT for projects, one
+        for project_tags and one tag statistics update per batch. A batch the
+        database rejects is retried row by row, each row in its own savepoint,
+        so every failing row still gets its own error.
+
         Returns list of results for each row.
         """
         logger.info(
@@ -434,88 +481,282 @@ class ImportService:
             skip_invalid=skip_invalid,
         )
 
-        results = []
+        results: dict[int, ImportCommitResult] = {}
+        for idx, error in (await self._find_commit_errors(rows)).items():
+            row = rows[idx]
+            logger.warning(
+                "import_row_failed",
+                row_number=row.row_number,
+                error=error,
+            )
+            if not skip_invalid:
+                raise ValueError(error)
+            results[idx] = ImportCommitResult(
+                row_number=row.row_number,
+                success=False,
+                error=error,
+            )
 
-        for row in rows:
+        valid = [(idx, row) for idx, row in enumerate(rows) if idx not in results]
+        batch_size = get_settings().import_commit_batch_size
+        for start in range(0, len(valid), batch_size):
+            batch = valid[start : start + batch_size]
             try:
-                # Validate required fields
-                if not row.name:
-                    raise ValueError("Name is required")
-                if not row.organization_id:
-                    raise ValueError("Organization is required")
-                if not row.start_date:
-                    raise ValueError("Start date is required")
-                if not row.location:
-                    raise ValueError("Location is required")
-
-                # Handle location_other for "other" location type
-                location_other = None
-                if row.location == ProjectLocation.OTHER:
-                    location_other = row.location_other
-
-                # Create project
-                project = Project(
-                    name=row.name,
-                    organization_id=row.organization_id,
-                    owner_id=row.owner_id or user_id,
-                    description=row.description or "",
-                    status=row.status or ProjectStatus.APPROVED,
-                    start_date=row.start_date,
-                    end_date=row.end_date,
-                    location=row.location,
-                    location_other=location_other,
-                    billing_amount=row.billing_amount,
-                    billing_recipient=row.billing_recipient,
-                    billing_notes=row.billing_notes,
-                    pm_notes=row.pm_notes,
-                    monday_url=row.monday_url,
-                    jira_url=row.jira_url,
-                    gitlab_url=row.gitlab_url,
-                    milestone_version=row.milestone_version,
-                    run_number=row.run_number,
-                    engagement_period=row.engagement_period,
-                    created_by=user_id,
-                    updated_by=user_id,
+                async with self.db.begin_nested():
+                    project_ids = await self._insert_projects(
+                        [row for _, row in batch], user_id
+                    )
+            except Exception as e:
+                if not skip_invalid:
+                    raise
+                logger.warning(
+                    "import_batch_failed",
+                    row_count=len(batch),
+                    error=str(e),
+                )
+                for idx, row in batch:
+                    results[idx] = await self._insert_project_row(row, user_id)
+                continue
+
+            for (idx, row), project_id in zip(batch, project_ids, strict=True):
+                results[idx] = ImportCommitResult(
+                    row_number=row.row_number,
+                    success=True,
+                    project_id=project_id,
+                )
+
+        return [results[idx] for idx in range(len(rows))]
+
+    async def _find_commit_errors(self, rows: list[ImportRowUpdate]) -> dict[int, str]:
+        """Check commit rows, returning an error per invalid row index.
+
+        Referenced organizations, owners and tags are checked with one
+        query per table for all rows.
+        """
+        errors: dict[int, str] = {}
+        for idx, row in enumerate(rows):
+            if not row.name:
+                errors[idx] = "Name is required"
+            elif not row.organization_id:
+                errors[idx] = "Organization is required"
+            elif not row.start_date:
+                errors[idx] = "Start date is required"
+            elif not row.location:
+                errors[idx] = "Location is required"
+
+        candidates = [row for idx, row in enumerate(rows) if idx not in errors]
+        org_ids = await self._existing_ids(
+            Organization.id, {row.organization_id for row in candidates}
+        )
+        owner_ids = await self._existing_ids(
+            User.id, {row.owner_id for row in candidates if row.owner_id}
+        )
+        tag_ids = await self._existing_ids(
+            Tag.id, {tag_id for row in candidates for tag_id in row.tag_ids or []}
+        )
+
+        for idx, row in enumerate(rows):
+            if idx in errors:
+                continue
+            missing_tags = [t for t in row.tag_ids or [] if t not in tag_ids]
+            if row.organization_id not in org_ids:
+                errors[idx] = "Organization not found"
+            elif row.owner_id and row.owner_id not in owner_ids:
+                errors[idx] = "Owner not found"
+            elif missing_tags:
+                errors[idx] = "Tags not found: " + ", ".join(
+                    str(tag_id) for tag_id in missing_tags
                 )
-                self.db.add(project)
-                await self.db.flush()
 
-                # Add tags
-                if row.tag_ids:
-                    from app.models.project import ProjectTag
+        return errors
 
-                    for tag_id in row.tag_ids:
-                        project_tag = ProjectTag(
-                            project_id=project.id,
-                            tag_id=tag_id,
-                        )
-                        self.db.add(project_tag)
+    async def _existing_ids(self, column, ids: set[UUID]) -> set[UUID]:
+        """The subset of ``ids`` present in ``column``, in one query."""
+        if not ids:
+            return set()
+        result = await self.db.execute(select(column).where(column.in_(ids)))
+        return set(result.scalars().all())
 
+    async def _insert_project_row(
+        self, row: ImportRowUpdate, user_id: UUID
+    ) -> ImportCommitResult:
+        """Insert a single row in its own savepoint, reporting its error."""
+        try:
+            async with self.db.begin_nested():
+                (project_id,) = await self._insert_projects([row], user_id)
+        except Exception as e:
+            logger.warning(
+                "import_row_failed",
+                row_number=row.row_number,
+                error=str(e),
+            )
+            return ImportCommitResult(
+                row_number=row.row_number,
+                success=False,
+                error=str(e),
+            )
+        return ImportCommitResult(
+            row_number=row.row_number,
+            success=True,
+            project_id=project_id,
+        )
+
+    async def _insert_projects(
+        self, rows: list[ImportRowUpdate], user_id: UUID
+    ) -> list[UUID]:
+        """Insert checked rows with their tags, returning the new project IDs."""
+        project_ids = [uuid4() for _ in rows]
+        for values in _insert_chunks(
+            Project,
+            [
+                {
+                    "id": project_id,
+                    "name": row.name,
+                    "organization_id": row.organization_id,
+                    "owner_id": row.owner_id or user_id,
+                    "description": row.description or "",
+                    "status": row.status or ProjectStatus.APPROVED,
+                    "start_date": row.start_date,
+                    "end_date": row.end_date,
+                    "location": row.location,
+                    # location_other only applies to the "other" location
+                    "location_other": (
+                        row.location_other
+                        if row.location == ProjectLocation.OTHER
+                        else None
+                    ),
+                    "billing_amount": row.billing_amount,
+                    "billing_recipient": row.billing_recipient,
+                    "billing_notes": row.billing_notes,
+                    "pm_notes": row.pm_notes,
+                    "monday_url": row.monday_url,
+                    "jira_url": row.jira_url,
+                    "gitlab_url": row.gitlab_url,
+                    "milestone_version": row.milestone_version,
+                    "run_number": row.run_number,
+                    "engagement_period": row.engagement_period,
+                    "created_by": user_id,
+                    "updated_by": user_id,
+                }
+                for project_id, row in zip(project_ids, rows, strict=True)
+            ],
+        ):
+            await self.db.execute(insert(Project).values(values))
+
+        project_tags = [
+            {"project_id": project_id, "tag_id": tag_id}
+            for project_id, row in zip(project_ids, rows, strict=True)
+            for tag_id in dict.fromkeys(row.tag_ids or [])
+        ]
+        if project_tags:
+            for values in _insert_chunks(ProjectTag, project_tags):
+                await self.db.execute(insert(ProjectTag).values(values))
+            await TagStatsService(self.db).record_project_tag_changes(
+                ([], row.tag_ids) for row in rows if row.tag_ids
+            )
+
+        return project_ids
+
+    async def import_rows(
+        self,
+        rows: Iterable[dict],
+        user_id: UUID,
+        skip_invalid: bool = True,
+        start_after_row: int = 0,
+    ) -> AsyncIterator[tuple[int, list[ImportCommitResult]]]:
+        """
+        Import parsed file rows in batches of ``import_commit_batch_size``.
+
+        Each batch is validated, resolved (creating its missing freeform tags
+        in one INSERT) and committed with ``commit_import``, then yielded as
+        (last row number, results) so the caller can checkpoint it. Rows
+        numbered up to ``start_after_row`` are skipped, to resume an import.
+        Row numbers count the header row, as in the preview.
+        """
+        batch_size = get_settings().import_commit_batch_size
+        numbered = (
+            (row_number, row)
+            for row_number, row in enumerate(rows, start=2)
+            if row_number > start_after_row
+        )
+        while batch := list(islice(numbered, batch_size)):
+            await self._create_freeform_tags(
+                [name for _, row in batch for name in row.get("tags", [])], user_id
+            )
+
+            results = []
+            updates = []
+            for row_number, row in batch:
+                validation = await self.validate_row(row, row_number)
+                if validation.is_valid:
+                    updates.append(await self._row_update(row, row_number))
+                    continue
+                error = "; ".join(validation.errors)
+                if not skip_invalid:
+                    raise ValueError(f"Row {row_number}: {error}")
                 results.append(
                     ImportCommitResult(
-                        row_number=row.row_number,
-                        success=True,
-                        project_id=project.id,
+                        row_number=row_number,
+                        success=False,
+                        error=error,
                     )
                 )
-            except Exception as e:
-                logger.warning(
-                    "import_row_failed",
-                    row_number=row.row_number,
-                    error=str(e),
+
+            results.extend(await self.commit_import(updates, user_id, skip_invalid))
+            results.sort(key=lambda r: r.row_number)
+            yield batch[-1][0], results
+
+    async def _row_update(self, row: dict, row_number: int) -> ImportRowUpdate:
+        """Resolve a validated file row the way the preview would."""
+        status = None
+        if row.get("status"):
+            status = STATUS_MAPPINGS.get(row["status"].lower())
+
+        location = None
+        location_other = None
+        if row.get("location"):
+            location = LOCATION_MAPPINGS.get(
+                row["location"].lower().strip(), ProjectLocation.OTHER
+            )
+            if location == ProjectLocation.OTHER:
+                location_other = row["location"]
+
+        billing_amount = None
+        if row.get("billing_amount"):
+            try:
+                billing_amount = Decimal(
+                    row["billing_amount"].replace(",", "").replace("$", "")
                 )
-                if skip_invalid:
-                    results.append(
-                        ImportCommitResult(
-                            row_number=row.row_number,
-                            success=False,
-                            error=str(e),
-                        )
-                    )
-                else:
-                    raise
+            except InvalidOperation:
+                billing_amount = None
 
-        return results
+        owner_id = None
+        if row.get("owner_email"):
+            owner_id = await self._find_user_id(row["owner_email"])
+
+        return ImportRowUpdate(
+            row_number=row_number,
+            name=row["name"],
+            organization_id=await self._find_organization_id(row["organization_name"]),
+            owner_id=owner_id,
+            description=row.get("description"),
+            status=status,
+            start_date=self._parse_date(row["start_date"]),
+            end_date=self._parse_date(row["end_date"]) if row.get("end_date") else None,
+            location=location,
+            location_other=location_other,
+            tag_ids=await self._resolve_tags(row.get("tags", [])),
+            billing_amount=billing_amount,
+            billing_recipient=row.get("billing_recipient"),
+            billing_notes=row.get("billing_notes"),
+            pm_notes=row.get("pm_notes"),
+            monday_url=row.get("monday_url"),
+            jira_url=row.get("jira_url"),
+            gitlab_url=row.get("gitlab_url"),
+            milestone_version=row.get("milestone_version"),
+            run_number=row.get("run_number"),
+            engagement_period=row.get("engagement_period"),
+        )
 
     async def autofill_project(
         self,
@@ -634,6 +875,12 @@ class ImportService:
         """Find similar projects using vector search on project names/descriptions."""
         from sqlalchemy.orm import selectinload
 
+        # The result does not depend on the embedding yet, so preview asks
+        # the database once rather than once per row
+        key = (organization_id, limit)
+        if key in self._similar_projects:
+            return self._similar_projects[key]
+
         # For now, we'll use a simple name similarity approach
         # In production, you'd want embeddings on projects too
         stmt = (
@@ -649,19 +896,23 @@ class ImportService:
             stmt = stmt.where(Project.organization_id == organization_id)
 
         result = await self.db.execute(stmt)
-        return list(result.scalars().all()[:limit])
+        self._similar_projects[key] = list(result.scalars().all()[:limit])
+        return self._similar_projects[key]
+
+    async def _entity_resolver(self) -> EntityResolver:
+        if self._resolver is None:
+            self._resolver = await get_entity_resolver(self.db)
+        return self._resolver
 
-    async def _find_organization(self, name: str) -> Organization | None:
+    async def _find_organization_id(self, name: str) -> UUID | None:
         """Find organization by name (case-insensitive)."""
-        stmt = select(Organization).where(func.lower(Organization.name) == name.lower())
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        resolver = await self._entity_resolver()
+        return resolver.organization_id(name)
 
-    async def _find_user_by_email(self, email: str) -> User | None:
+    async def _find_user_id(self, email: str) -> UUID | None:
         """Find user by email (case-insensitive)."""
-        stmt = select(User).where(func.lower(User.email) == email.lower())
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        resolver = await self._entity_resolver()
+        return await resolver.user_id(email)
 
     async def _resolve_tags(
         self,
@@ -682,36 +933,66 @@ class ImportService:
         if not tag_names:
             return []
 
-        tag_ids = []
+        resolver = await self._entity_resolver()
+        names = [name.strip() for name in tag_names if name.strip()]
+        if create_missing:
+            await self._create_freeform_tags(names, user_id)
+
+        return [tag_id for name in names if (tag_id := resolver.tag_id(name))]
+
+    async def _create_freeform_tags(
+        self, tag_names: list[str], user_id: UUID | None
+    ) -> None:
+        """Create freeform tags for every unknown name with one INSERT.
+
+        Created tags are registered with the resolver, so later rows of the
+        same import resolve them without queries.
+        """
+        resolver = await self._entity_resolver()
+        missing: dict[str, str] = {}
         for name in tag_names:
             name = name.strip()
-            if not name:
-                continue
+            if name and resolver.tag_id(name) is None:
+                missing.setdefault(entity_key(name), name)
+        if not missing:
+            return
+
+        created = []
+        for values in _insert_chunks(
+            Tag,
+            [
+                {"name": name, "type": TagType.FREEFORM, "created_by": user_id}
+                for name in missing.values()
+            ],
+        ):
+            result = await self.db.execute(
+                insert(Tag)
+                .values(values)
+                .on_conflict_do_nothing(constraint="uq_tag_name_type")
+                .returning(Tag.id, Tag.name)
+            )
+            created += result.all()
+        for tag_id, name in created:
+            resolver.add_tag(name, tag_id)
+        self.created_tag_count += len(created)
+        if created:
+            logger.info(
+                "created_freeform_tags_during_import",
+                tag_count=len(created),
+                tag_names=[name for _, name in created],
+            )
 
-            # Try to find existing tag (case-insensitive)
-            stmt = select(Tag).where(func.lower(Tag.name) == name.lower())
-            result = await self.db.execute(stmt)
-            tag = result.scalar_one_or_none()
-
-            if tag:
-                tag_ids.append(tag.id)
-            elif create_missing:
-                # Create new freeform tag
-                new_tag = Tag(
-                    name=name,
-                    type=TagType.FREEFORM,
-                    created_by=user_id,
+        # Tags created by someone else since the index snapshot was taken
+        conflicting = [key for key in missing if resolver.tag_id(key) is None]
+        if conflicting:
+            result = await self.db.execute(
+                select(Tag.id, Tag.name).where(
+                    Tag.type == TagType.FREEFORM,
+                    func.lower(Tag.name).in_(conflicting),
                 )
-                self.db.add(new_tag)
-                await self.db.flush()
-                tag_ids.append(new_tag.id)
-                logger.info(
-                    "created_freeform_tag_during_import",
-                    tag_name=name,
-                    tag_id=str(new_tag.id),
-                )
-
-        return tag_ids
+            )
+            for tag_id, name in result.all():
+                resolver.add_tag(name, tag_id)
 
     def _parse_date(self, value: str) -> date:
         """Parse date from various formats."""
@@ -731,3 +1012,68 @@ class ImportService:
                 continue
 
         raise ValueError(f"Could not parse date: {value}")
+
+
+def _insert_chunks(model: type, values: list[dict]) -> Iterator[list[dict]]:
+    """Split multi-row INSERT values to stay under MAX_BIND_PARAMS.
+
+    Each row is counted as one parameter per table column, since columns
+    with Python-side defaults are bound too.
+    """
+    size = max(MAX_BIND_PARAMS // len(model.__table__.columns), 1)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _csv_rows(file: BinaryIO) -> Iterator[list[str]]:
+    """Yield CSV rows, decoding as UTF-8 (BOM aware) or else Latin-1."""
+    text = io.TextIOWrapper(file, encoding=_detect_encoding(file), newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        # Leave closing the underlying file to the caller
+        text.detach()
+
+
+def _detect_encoding(file: BinaryIO, chunk_size: int = 64 * 1024) -> str:
+    """utf-8-sig if the whole file is valid UTF-8, else latin-1.
+
+    Checked chunk by chunk without keeping the decoded text.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    encoding = "utf-8-sig"
+    try:
+        while chunk := file.read(chunk_size):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+    file.seek(0)
+    return encoding
+
+
+def _xlsx_rows(file: BinaryIO) -> Iterator[list[str]]:
+    """Yield the first sheet's rows as text."""
+    from python_calamine import CalamineWorkbook
+
+    workbook = CalamineWorkbook.from_filelike(file)
+    try:
+        for values in workbook.get_sheet_by_index(0).iter_rows():
+            cells = [_cell_text(value) for value in values]
+            # Empty rows read like blank CSV lines
+            yield cells if any(cells) else []
+    finally:
+        workbook.close()
+
+
+def _cell_text(value: object) -> str:
+    """Render a spreadsheet cell the way it would appear in a CSV export."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
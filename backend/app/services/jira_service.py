@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
 from app.core.exceptions import ExternalServiceError
 from app.core.logging import get_logger
+from app.core.server_timing import UPSTREAM, track_time
 from app.schemas.jira import (
     JiraConnectionStatus,
     JiraIssue,
@@ -138,7 +139,8 @@ class JiraService:
         client = await self._get_client()
 
         try:
-            response = await client.request(method, path, **kwargs)
+            with track_time(UPSTREAM):
+                response = await client.request(method, path, **kwargs)
 
             if response.status_code == 401:
                 raise JiraAuthenticationError("Invalid Jira credentials")
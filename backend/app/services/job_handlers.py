@@ -6,10 +6,14 @@ Handlers are registered using the @register_job_handler decorator.
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import EmbeddingServiceError  # noqa: F401
+from app.core.exceptions import EmbeddingServiceError
 from app.core.logging import get_logger
+from app.core.ollama_scheduler import OllamaPriority
 from app.models.job import Job, JobType
-from app.services.job_service import register_job_handler
+from app.services.job_service import (
+    register_job_failure_handler,
+    register_job_handler,
+)
 
 logger = get_logger(__name__)
 
@@ -70,7 +74,10 @@ async def handle_embedding_generation(job: Job, db: AsyncSession) -> dict | None
     from sqlalchemy import select
 
     from app.models.document import Document, DocumentChunk
-    from app.services.embedding_service import EmbeddingService
+    from app.services.embedding_service import (
+        UNAVAILABLE_FAILURES,
+        EmbeddingService,
+    )
 
     logger.info(
         "embedding_generation_job_started",
@@ -81,7 +88,7 @@ async def handle_embedding_generation(job: Job, db: AsyncSession) -> dict | None
     payload = job.payload or {}
     document_ids = payload.get("document_ids", [])
 
-    embedding_service = EmbeddingService()
+    embedding_service = EmbeddingService(priority=OllamaPriority.BATCH)
     processed = 0
     failed = 0
     chunks_created = 0
@@ -116,8 +123,21 @@ async def handle_embedding_generation(job: Job, db: AsyncSession) -> dict | None
             # Create chunks and embeddings
             chunks = embedding_service.chunk_text(doc.extracted_text)
 
-            for i, chunk_content in enumerate(chunks):
+            embeddings = []
+            for chunk_content in chunks:
                 embedding = await embedding_service.generate_embedding(chunk_content)
+                if embedding_service.last_failure in UNAVAILABLE_FAILURES:
+                    # Leave the document without chunks so a later run picks
+                    # it up again, rather than storing NULL embeddings
+                    raise EmbeddingServiceError(
+                        "Embedding service unavailable "
+                        f"({embedding_service.last_failure})"
+                    )
+                embeddings.append(embedding)
+
+            for i, (chunk_content, embedding) in enumerate(
+                zip(chunks, embeddings, strict=True)
+            ):
                 chunk = DocumentChunk(
                     document_id=doc.id,
                     chunk_index=i,
@@ -163,7 +183,9 @@ async def handle_bulk_import(job: Job, db: AsyncSession) -> dict | None:
     too large to handle synchronously.
 
     Payload must contain:
-        - rows: List of ImportRowUpdate dicts
+        - rows: List of ImportRowUpdate dicts, or
+        - file_path/filename: Uploaded CSV or XLSX file in storage,
+          imported incrementally (see _import_file)
         - user_id: UUID of user who initiated import
         - skip_invalid: bool (default True)
 
@@ -187,11 +209,14 @@ async def handle_bulk_import(job: Job, db: AsyncSession) -> dict | None:
 
     payload = job.payload or {}
 
-    if "rows" not in payload:
-        raise ValueError("Payload must contain 'rows' list")
+    if "rows" not in payload and "file_path" not in payload:
+        raise ValueError("Payload must contain 'rows' list or 'file_path'")
     if "user_id" not in payload:
         raise ValueError("Payload must contain 'user_id'")
 
+    if "file_path" in payload:
+        return await _import_file(job, db)
+
     rows_data = payload["rows"]
     user_id = (
         UUID(payload["user_id"])
@@ -246,6 +271,142 @@ async def handle_bulk_import(job: Job, db: AsyncSession) -> dict | None:
     }
 
 
+# Per-row errors kept in a file import's result (the failed count is exact)
+MAX_IMPORT_JOB_ERRORS = 1000
+
+# Uploads from remote storage larger than this are spooled to disk
+IMPORT_SPOOL_THRESHOLD = 5 * 1024 * 1024  # 5MB
+
+
+async def _import_file(job: Job, db: AsyncSession) -> dict:
+    """Import an uploaded file in checkpointed batches.
+
+    Rows are parsed incrementally and committed in batches. Each batch is
+    committed together with the job's ``result`` (progress, per-row errors
+    and the last imported row number), so a retried or recovered job
+    resumes after the last committed batch instead of importing rows twice.
+
+    Uploads in remote storage are downloaded in chunks to a spooled
+    temporary file first, so large files are not held in memory.
+    """
+    import tempfile
+    from uuid import UUID
+
+    from sqlalchemy import func, select, update
+
+    from app.core.storage import StorageService
+    from app.services.cache_service import invalidate_tag_cache
+    from app.services.import_service import ImportService
+
+    payload = job.payload or {}
+    user_id = UUID(str(payload["user_id"]))
+
+    # Latest checkpoint: re-read, as a previous attempt may have moved it
+    result = await db.execute(select(Job.result).where(Job.id == job.id))
+    progress = result.scalar_one_or_none() or {
+        "filename": payload.get("filename"),
+        "last_row": 0,
+        "processed": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "errors": [],
+        "complete": False,
+    }
+    if progress["last_row"]:
+        logger.info(
+            "bulk_import_job_resumed",
+            job_id=str(job.id),
+            last_row=progress["last_row"],
+        )
+
+    storage = StorageService()
+    if storage.is_local_storage():
+        file = open(storage.get_path(payload["file_path"]), "rb")  # noqa: SIM115
+    else:
+        file = tempfile.SpooledTemporaryFile(  # noqa: SIM115
+            max_size=IMPORT_SPOOL_THRESHOLD, mode="w+b"
+        )
+        try:
+            async for chunk in storage.read_stream(payload["file_path"]):
+                file.write(chunk)
+        except BaseException:
+            file.close()
+            raise
+        file.seek(0)
+
+    import_service = ImportService(db)
+    tags_created = 0
+    with file:
+        _, rows = import_service.iter_file_rows(file, payload.get("filename", ""))
+        batches = import_service.import_rows(
+            rows,
+            user_id,
+            skip_invalid=payload.get("skip_invalid", True),
+            start_after_row=progress["last_row"],
+        )
+        async for last_row, results in batches:
+            failures = [r for r in results if not r.success]
+            progress["last_row"] = last_row
+            progress["processed"] += len(results)
+            progress["succeeded"] += len(results) - len(failures)
+            progress["failed"] += len(failures)
+            room = MAX_IMPORT_JOB_ERRORS - len(progress["errors"])
+            progress["errors"].extend(
+                {"row_number": r.row_number, "error": r.error}
+                for r in failures[: max(room, 0)]
+            )
+
+            # The checkpoint commits with the batch. Refreshing started_at
+            # keeps stuck-job recovery off imports that are making progress.
+            await db.execute(
+                update(Job)
+                .where(Job.id == job.id)
+                .values(result=progress, started_at=func.now())
+            )
+            await db.commit()
+            if import_service.created_tag_count > tags_created:
+                tags_created = import_service.created_tag_count
+                await invalidate_tag_cache()
+            logger.info(
+                "bulk_import_job_checkpoint",
+                job_id=str(job.id),
+                last_row=last_row,
+                processed=progress["processed"],
+                failed=progress["failed"],
+            )
+
+    await storage.delete(payload["file_path"])
+
+    progress["complete"] = True
+    logger.info(
+        "bulk_import_job_completed",
+        job_id=str(job.id),
+        total=progress["processed"],
+        succeeded=progress["succeeded"],
+        failed=progress["failed"],
+    )
+    return progress
+
+
+@register_job_failure_handler(JobType.BULK_IMPORT)
+async def cleanup_bulk_import(job: Job) -> None:
+    """Delete the upload of a file import that will not run again.
+
+    A successful import deletes its upload itself (see _import_file).
+    """
+    from app.core.storage import StorageService
+
+    file_path = (job.payload or {}).get("file_path")
+    if not file_path:
+        return
+    await StorageService().delete(file_path)
+    logger.info(
+        "bulk_import_upload_deleted",
+        job_id=str(job.id),
+        status=job.status.value if job.status else None,
+    )
+
+
 @register_job_handler(JobType.AUDIT_CLEANUP)
 async def handle_audit_cleanup(job: Job, db: AsyncSession) -> dict | None:
     """Clean up old audit log entries.
@@ -406,6 +567,7 @@ async def handle_document_processing(job: Job, db: AsyncSession) -> dict | None:
     from app.core.storage import StorageService
     from app.models.document import Document
     from app.services.document_processing_task import _process_document_content
+    from app.services.document_stats_service import DocumentStageTimer
 
     logger.info(
         "document_processing_job_started",
@@ -425,13 +587,15 @@ async def handle_document_processing(job: Job, db: AsyncSession) -> dict | None:
 
     # Read file content
     storage = StorageService()
+    timer = DocumentStageTimer()
     try:
-        file_content = await storage.read(document.file_path)
+        with timer.stage("storage_read"):
+            file_content = await storage.read(document.file_path)
     except FileNotFoundError:
         raise ValueError(f"File not found in storage: {document.file_path}")
 
     # Process document content
-    await _process_document_content(db, document, file_content)
+    await _process_document_content(db, document, file_content, timer)
 
     logger.info(
         "document_processing_job_completed",
@@ -14,8 +14,11 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
+from app.core.query_stats import track_queries
+from app.core.tracing import JOB_TRACE_KEY, continue_trace, current_traceparent
 from app.database import async_session_maker
 from app.models.job import Job, JobStatus, JobType
+from app.services.profiling_service import get_armed_targets, maybe_profile
 
 logger = get_logger(__name__)
 
@@ -87,6 +90,48 @@ def register_job_handler(
     return decorator
 
 
+# Cleanup for jobs that will not run again (failed for good or cancelled)
+JOB_FAILURE_HANDLERS: dict[JobType, Callable[[Job], Coroutine[Any, Any, None]]] = {}
+
+
+def register_job_failure_handler(
+    job_type: JobType,
+) -> Callable[
+    [Callable[[Job], Coroutine[Any, Any, None]]],
+    Callable[[Job], Coroutine[Any, Any, None]],
+]:
+    """Decorator to register cleanup for a job that ended without completing.
+
+    Called after the job is marked FAILED (max retries or a non-retryable
+    error) or when a pending job is cancelled, e.g. to delete files the job
+    would have removed on success.
+    """
+
+    def decorator(
+        func: Callable[[Job], Coroutine[Any, Any, None]],
+    ) -> Callable[[Job], Coroutine[Any, Any, None]]:
+        JOB_FAILURE_HANDLERS[job_type] = func
+        return func
+
+    return decorator
+
+
+async def run_job_failure_handler(job: Job) -> None:
+    """Run a job's failure cleanup, logging (not raising) its errors."""
+    handler = JOB_FAILURE_HANDLERS.get(job.job_type)
+    if handler is None:
+        return
+    try:
+        await handler(job)
+    except Exception as e:
+        logger.exception(
+            "job_failure_handler_error",
+            job_id=str(job.id),
+            job_type=job.job_type.value,
+            error=str(e),
+        )
+
+
 def calculate_next_retry(attempts: int) -> datetime:
     """Calculate next retry time based on attempt count.
 
@@ -192,6 +237,11 @@ class JobService:
                 )
                 return existing
 
+        # Carry the creating request's trace so the job run continues it
+        traceparent = current_traceparent()
+        if traceparent is not None:
+            payload = {**(payload or {}), JOB_TRACE_KEY: traceparent}
+
         # Create new job
         job = Job(
             job_type=job_type,
@@ -588,6 +638,7 @@ class JobService:
         )
 
         await self.db.flush()
+        await run_job_failure_handler(job)
         return True
 
 
@@ -641,6 +692,9 @@ async def process_job_queue(job_type: JobType | None = None) -> dict:
 
             logger.info("job_queue_jobs_found", count=len(pending_jobs))
 
+            # Jobs an admin asked to profile (one lookup per run)
+            armed_profiles = await get_armed_targets()
+
             for job in pending_jobs:
                 results["jobs_processed"] += 1
 
@@ -657,9 +711,23 @@ async def process_job_queue(job_type: JobType | None = None) -> dict:
                         )
 
                     # Process with fresh session for isolation
-                    async with async_session_maker() as process_db:
-                        result = await handler(job, process_db)
-                        await process_db.commit()
+                    label = f"job:{job.job_type.value}"
+                    with (
+                        track_queries(label),
+                        continue_trace(
+                            (job.payload or {}).get(JOB_TRACE_KEY),
+                            label,
+                            job_id=job.id,
+                            entity_id=job.entity_id,
+                            attempt=job.attempts,
+                        ),
+                    ):
+                        async with (
+                            maybe_profile(armed_profiles, "job", job.id, label),
+                            async_session_maker() as process_db,
+                        ):
+                            result = await handler(job, process_db)
+                            await process_db.commit()
 
                     # Mark as completed with fresh session
                     async with async_session_maker() as update_db:
@@ -696,6 +764,7 @@ async def process_job_queue(job_type: JobType | None = None) -> dict:
                                 select(Job).where(Job.id == job.id)
                             )
                             fresh_job = result.scalar_one_or_none()
+                            requeued = True
                             if fresh_job:
                                 requeued = await error_service.mark_failed_retry(
                                     fresh_job, error_str
@@ -705,6 +774,8 @@ async def process_job_queue(job_type: JobType | None = None) -> dict:
                                 else:
                                     results["jobs_max_retries"] += 1
                             await error_db.commit()
+                        if not requeued:
+                            await run_job_failure_handler(fresh_job)
                     except SQLAlchemyError as inner_e:
                         logger.exception(
                             "job_failed_to_mark_error",
@@ -1,49 +1,375 @@
-"""Metrics aggregation service for performance monitoring."""
-
-import statistics
+"""Metrics aggregation service for performance monitoring.
+
+Requests are aggregated per matched route template (e.g.
+``GET /api/v1/projects/{project_id}``), so the number of series is bounded by
+the number of routes rather than by distinct URLs. Latencies are counted in
+fixed log-spaced buckets: memory per endpoint is constant, percentiles are
+read from cumulative bucket counts without sorting, and histograms from
+several workers merge by adding counts.
+
+Fleet view: each worker periodically publishes its snapshot to a Redis hash
+(when Redis is configured). ``get_fleet_snapshot`` merges the fresh entries
+with the live local snapshot and falls back to local-only metrics otherwise.
+
+Event loop lag samples and blocking stalls (see ``app.core.loop_monitor``)
+are part of the snapshot, with stalls counted per offending function, as are
+hybrid search ranking branches dropped at their deadline (per branch).
+"""
+
+import asyncio
+import json
+import os
+import socket
 import time
-from collections import defaultdict, deque
+from bisect import bisect_left
+from collections import Counter
+from contextlib import suppress
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import NamedTuple
 
+import redis.exceptions
+
+from app.config import get_settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Rolling window size for metrics retention
-MAX_REQUESTS_PER_ENDPOINT = 1000
 STARTUP_TIME = time.time()
 
+# Route label for requests that did not match any route (404s, probes)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Bucket upper bounds in ms: ~10% relative width from 0.1ms to 90s, plus an
+# overflow bucket. Percentile error is bounded by the bucket width.
+_MANTISSAS = (1, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.8, 2, 2.2, 2.5, 2.8, 3, 3.5, 4)
+_MANTISSAS += (4.5, 5, 5.5, 6, 7, 8, 9)
+BUCKET_BOUNDS_MS: tuple[float, ...] = tuple(
+    sorted({round(m * 10**e, 4) for e in range(-1, 5) for m in _MANTISSAS})
+)
+
+# Coarser buckets exposed to Prometheus (all are internal bounds, so the
+# cumulative counts are exact)
+PROMETHEUS_BUCKETS_MS: tuple[float, ...] = (
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+)
+
+# Redis hash holding one published snapshot per worker
+FLEET_KEY = "metrics:workers"
+
+# Most event loop offenders kept per worker (least frequent evicted)
+MAX_LOOP_OFFENDERS = 100
+
+
+def status_class(status_code: int) -> str:
+    """Collapse a status code to its class label (``2xx``, ``4xx``...)."""
+    return f"{status_code // 100}xx"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    __slots__ = ("counts", "count", "sum_ms", "max_ms")
 
-class RequestRecord(NamedTuple):
-    """Single request timing record."""
-
-    timestamp: float
-    duration_ms: float
-    status_code: int
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's observations to this one."""
+        for index, value in enumerate(other.counts):
+            if value:
+                self.counts[index] += value
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, p: float) -> float:
+        """Estimate a percentile, interpolating linearly within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = self.count * p / 100
+        cumulative = 0
+        for index, value in enumerate(self.counts):
+            if not value:
+                continue
+            if cumulative + value >= rank:
+                lower = BUCKET_BOUNDS_MS[index - 1] if index else 0.0
+                upper = (
+                    BUCKET_BOUNDS_MS[index]
+                    if index < len(BUCKET_BOUNDS_MS)
+                    else self.max_ms
+                )
+                estimate = lower + (upper - lower) * (rank - cumulative) / value
+                return min(estimate, self.max_ms)
+            cumulative += value
+        return self.max_ms
+
+    def cumulative_count(self, upper_bound_ms: float) -> int:
+        """Number of observations <= ``upper_bound_ms`` (an internal bound)."""
+        return sum(self.counts[: bisect_left(BUCKET_BOUNDS_MS, upper_bound_ms) + 1])
+
+    @property
+    def mean(self) -> float:
+        """Average observation, 0 when empty."""
+        return self.sum_ms / self.count if self.count else 0.0
+
+    def copy(self) -> "LatencyHistogram":
+        """Independent copy."""
+        clone = LatencyHistogram()
+        clone.merge(self)
+        return clone
+
+    def to_dict(self) -> dict:
+        """Compact JSON-serialisable form (non-zero buckets only)."""
+        return {
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "max_ms": self.max_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        """Rebuild a histogram from ``to_dict`` output."""
+        histogram = cls()
+        for index, value in data.get("buckets", {}).items():
+            histogram.counts[int(index)] = value
+        histogram.count = data.get("count", 0)
+        histogram.sum_ms = data.get("sum_ms", 0.0)
+        histogram.max_ms = data.get("max_ms", 0.0)
+        return histogram
 
 
 @dataclass
 class EndpointStats:
-    """Stats container for a single endpoint."""
+    """Latency histogram and status-class counts for one route."""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter = field(default_factory=Counter)
+
+    @property
+    def error_count(self) -> int:
+        """4xx + 5xx responses."""
+        return sum(n for cls, n in self.statuses.items() if cls in ("4xx", "5xx"))
+
+    def merge(self, other: "EndpointStats") -> None:
+        """Add another endpoint's counts to this one."""
+        self.latency.merge(other.latency)
+        self.statuses.update(other.statuses)
+
+    def copy(self) -> "EndpointStats":
+        """Independent copy."""
+        return EndpointStats(
+            latency=self.latency.copy(), statuses=Counter(self.statuses)
+        )
+
+
+@dataclass
+class LoopBlockStats:
+    """Event loop stalls attributed to one function."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
 
-    timings: deque = field(
-        default_factory=lambda: deque(maxlen=MAX_REQUESTS_PER_ENDPOINT)
-    )
-    lock: Lock = field(default_factory=Lock)
+    def observe(self, lag_ms: float) -> None:
+        """Record one stall."""
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def merge(self, other: "LoopBlockStats") -> None:
+        """Add another offender's stalls to this one."""
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def copy(self) -> "LoopBlockStats":
+        """Independent copy."""
+        return LoopBlockStats(self.count, self.total_ms, self.max_ms)
+
+
+@dataclass
+class MetricsSnapshot:
+    """Request and event loop metrics of one worker or a merged fleet."""
+
+    endpoints: dict[tuple[str, str], EndpointStats] = field(default_factory=dict)
+    workers: int = 1
+    loop_lag: LatencyHistogram = field(default_factory=LatencyHistogram)
+    loop_blocks: dict[str, LoopBlockStats] = field(default_factory=dict)
+    search_branch_timeouts: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "MetricsSnapshot") -> None:
+        """Add another snapshot's metrics to this one."""
+        for key, stats in other.endpoints.items():
+            existing = self.endpoints.get(key)
+            if existing is None:
+                self.endpoints[key] = stats.copy()
+            else:
+                existing.merge(stats)
+        self.loop_lag.merge(other.loop_lag)
+        for offender, blocks in other.loop_blocks.items():
+            existing_blocks = self.loop_blocks.get(offender)
+            if existing_blocks is None:
+                self.loop_blocks[offender] = blocks.copy()
+            else:
+                existing_blocks.merge(blocks)
+        self.search_branch_timeouts.update(other.search_branch_timeouts)
+        self.workers += other.workers
+
+    def overall_latency(self) -> LatencyHistogram:
+        """Latency histogram across all endpoints."""
+        total = LatencyHistogram()
+        for stats in self.endpoints.values():
+            total.merge(stats.latency)
+        return total
+
+    def endpoint_metrics(self, top_n: int = 20) -> list[dict]:
+        """Per-endpoint summaries for the top N endpoints by request count."""
+        results = []
+        for (method, route), stats in self.endpoints.items():
+            latency = stats.latency
+            if not latency.count:
+                continue
+            errors = stats.error_count
+            results.append(
+                {
+                    "path": route,
+                    "method": method,
+                    "request_count": latency.count,
+                    "error_count": errors,
+                    "error_rate_percent": round(errors / latency.count * 100, 2),
+                    "p50_ms": round(latency.percentile(50), 2),
+                    "p95_ms": round(latency.percentile(95), 2),
+                    "p99_ms": round(latency.percentile(99), 2),
+                    "avg_ms": round(latency.mean, 2),
+                    "max_ms": round(latency.max_ms, 2),
+                }
+            )
+
+        results.sort(key=lambda x: x["request_count"], reverse=True)
+        return results[:top_n]
+
+    def error_rates(self) -> dict:
+        """Global error rate statistics."""
+        statuses: Counter = Counter()
+        for stats in self.endpoints.values():
+            statuses.update(stats.statuses)
+        total = sum(statuses.values())
+        errors = statuses["4xx"] + statuses["5xx"]
+        return {
+            "total_requests": total,
+            "total_errors": errors,
+            "error_4xx_count": statuses["4xx"],
+            "error_5xx_count": statuses["5xx"],
+            "error_rate_percent": round(errors / total * 100, 2) if total else 0,
+        }
+
+    def latency_summary(self) -> dict:
+        """Overall p50/p95/p99/avg in milliseconds."""
+        latency = self.overall_latency()
+        return {
+            "p50_ms": round(latency.percentile(50), 2),
+            "p95_ms": round(latency.percentile(95), 2),
+            "p99_ms": round(latency.percentile(99), 2),
+            "avg_ms": round(latency.mean, 2),
+        }
+
+    def loop_summary(self, top_n: int = 20) -> dict:
+        """Event loop lag percentiles and the functions that blocked it most."""
+        offenders = [
+            {
+                "function": offender,
+                "count": blocks.count,
+                "total_ms": round(blocks.total_ms, 2),
+                "max_ms": round(blocks.max_ms, 2),
+            }
+            for offender, blocks in self.loop_blocks.items()
+        ]
+        offenders.sort(key=lambda x: x["total_ms"], reverse=True)
+        return {
+            "samples": self.loop_lag.count,
+            "lag_p50_ms": round(self.loop_lag.percentile(50), 2),
+            "lag_p99_ms": round(self.loop_lag.percentile(99), 2),
+            "lag_max_ms": round(self.loop_lag.max_ms, 2),
+            "blocked_count": sum(b.count for b in self.loop_blocks.values()),
+            "offenders": offenders[:top_n],
+        }
+
+    def to_dict(self) -> dict:
+        """JSON-serialisable form used for publishing to Redis."""
+        return {
+            "endpoints": [
+                {
+                    "method": method,
+                    "route": route,
+                    "latency": stats.latency.to_dict(),
+                    "statuses": dict(stats.statuses),
+                }
+                for (method, route), stats in self.endpoints.items()
+            ],
+            "loop_lag": self.loop_lag.to_dict(),
+            "loop_blocks": {
+                offender: [blocks.count, blocks.total_ms, blocks.max_ms]
+                for offender, blocks in self.loop_blocks.items()
+            },
+            "search_branch_timeouts": dict(self.search_branch_timeouts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MetricsSnapshot":
+        """Rebuild a single-worker snapshot from ``to_dict`` output."""
+        snapshot = cls()
+        for entry in data.get("endpoints", []):
+            snapshot.endpoints[(entry["method"], entry["route"])] = EndpointStats(
+                latency=LatencyHistogram.from_dict(entry["latency"]),
+                statuses=Counter(entry.get("statuses", {})),
+            )
+        snapshot.loop_lag = LatencyHistogram.from_dict(data.get("loop_lag", {}))
+        for offender, (count, total_ms, max_ms) in data.get("loop_blocks", {}).items():
+            snapshot.loop_blocks[offender] = LoopBlockStats(count, total_ms, max_ms)
+        snapshot.search_branch_timeouts = Counter(
+            data.get("search_branch_timeouts", {})
+        )
+        return snapshot
 
 
 class MetricsService:
-    """Service for aggregating performance metrics."""
+    """Service for aggregating performance metrics of this worker.
+
+    Counters are cumulative since process start (or the last reset).
+    """
 
     def __init__(self) -> None:
-        self._endpoints: dict[str, EndpointStats] = defaultdict(EndpointStats)
-        self._global_lock = Lock()
-        self._total_requests = 0
-        self._total_errors = 0
-        self._error_4xx = 0
-        self._error_5xx = 0
+        self._endpoints: dict[tuple[str, str], EndpointStats] = {}
+        self._loop_lag = LatencyHistogram()
+        self._loop_blocks: dict[str, LoopBlockStats] = {}
+        self._search_branch_timeouts: Counter = Counter()
+        self._lock = Lock()
 
     def record_request(
         self,
@@ -52,113 +378,78 @@ class MetricsService:
         status_code: int,
         duration_ms: float,
     ) -> None:
-        """Record a request's timing and status."""
-        key = f"{method} {path}"
-        record = RequestRecord(
-            timestamp=time.time(),
-            duration_ms=duration_ms,
-            status_code=status_code,
-        )
-
-        with self._global_lock:
-            self._total_requests += 1
-            if 400 <= status_code < 500:
-                self._error_4xx += 1
-                self._total_errors += 1
-            elif status_code >= 500:
-                self._error_5xx += 1
-                self._total_errors += 1
-
-        stats = self._endpoints[key]
-        with stats.lock:
-            stats.timings.append(record)
+        """Record a request's timing and status.
+
+        Args:
+            method: HTTP method.
+            path: Route template the request matched (not the raw URL path).
+            status_code: Response status code.
+            duration_ms: Request duration in milliseconds.
+        """
+        key = (method, path)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats()
+            stats.latency.observe(duration_ms)
+            stats.statuses[status_class(status_code)] += 1
+
+    def record_loop_lag(self, lag_ms: float) -> None:
+        """Record one event loop scheduling delay sample."""
+        with self._lock:
+            self._loop_lag.observe(lag_ms)
+
+    def record_loop_block(self, offender: str, lag_ms: float) -> None:
+        """Record an event loop stall attributed to ``offender``."""
+        with self._lock:
+            blocks = self._loop_blocks.get(offender)
+            if blocks is None:
+                if len(self._loop_blocks) >= MAX_LOOP_OFFENDERS:
+                    least = min(
+                        self._loop_blocks, key=lambda k: self._loop_blocks[k].count
+                    )
+                    del self._loop_blocks[least]
+                blocks = self._loop_blocks[offender] = LoopBlockStats()
+            blocks.observe(lag_ms)
+
+    def record_search_branch_timeout(self, branch: str) -> None:
+        """Record a hybrid search ranking branch dropped at its deadline."""
+        with self._lock:
+            self._search_branch_timeouts[branch] += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Copy of this worker's current metrics."""
+        with self._lock:
+            return MetricsSnapshot(
+                endpoints={key: s.copy() for key, s in self._endpoints.items()},
+                loop_lag=self._loop_lag.copy(),
+                loop_blocks={k: b.copy() for k, b in self._loop_blocks.items()},
+                search_branch_timeouts=Counter(self._search_branch_timeouts),
+            )
 
     def get_endpoint_metrics(self, top_n: int = 20) -> list[dict]:
         """Get metrics for top N endpoints by request count."""
-        results = []
-
-        for key, stats in self._endpoints.items():
-            with stats.lock:
-                if not stats.timings:
-                    continue
-
-                method, path = key.split(" ", 1)
-                timings = [r.duration_ms for r in stats.timings]
-                errors = sum(1 for r in stats.timings if r.status_code >= 400)
-
-                sorted_timings = sorted(timings)
-                n = len(sorted_timings)
-
-                results.append(
-                    {
-                        "path": path,
-                        "method": method,
-                        "request_count": n,
-                        "error_count": errors,
-                        "error_rate_percent": (
-                            round((errors / n) * 100, 2) if n > 0 else 0
-                        ),
-                        "p50_ms": round(self._percentile(sorted_timings, 50), 2),
-                        "p95_ms": round(self._percentile(sorted_timings, 95), 2),
-                        "p99_ms": round(self._percentile(sorted_timings, 99), 2),
-                        "avg_ms": (
-                            round(statistics.mean(timings), 2) if timings else 0
-                        ),
-                        "max_ms": round(max(timings), 2) if timings else 0,
-                    }
-                )
-
-        # Sort by request count descending
-        results.sort(key=lambda x: x["request_count"], reverse=True)
-        return results[:top_n]
+        return self.snapshot().endpoint_metrics(top_n)
 
     def get_error_rates(self) -> dict:
         """Get global error rate statistics."""
-        with self._global_lock:
-            total = self._total_requests
-            errors = self._total_errors
-            rate = (errors / total * 100) if total > 0 else 0
-
-            return {
-                "total_requests": total,
-                "total_errors": errors,
-                "error_4xx_count": self._error_4xx,
-                "error_5xx_count": self._error_5xx,
-                "error_rate_percent": round(rate, 2),
-            }
+        return self.snapshot().error_rates()
 
     def get_average_response_time(self) -> float:
         """Get overall average response time."""
-        all_timings = []
-        for stats in self._endpoints.values():
-            with stats.lock:
-                all_timings.extend(r.duration_ms for r in stats.timings)
-
-        return round(statistics.mean(all_timings), 2) if all_timings else 0
+        return self.snapshot().latency_summary()["avg_ms"]
 
     def get_uptime_seconds(self) -> float:
         """Get application uptime in seconds."""
         return round(time.time() - STARTUP_TIME, 2)
 
-    @staticmethod
-    def _percentile(sorted_data: list[float], p: int) -> float:
-        """Calculate percentile from sorted data."""
-        if not sorted_data:
-            return 0.0
-        n = len(sorted_data)
-        k = (n - 1) * p / 100
-        f = int(k)
-        c = f + 1 if f + 1 < n else f
-        return sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f])
-
     def reset(self) -> None:
         """Reset all metrics (for testing)."""
-        with self._global_lock:
+        with self._lock:
             self._endpoints.clear()
-            self._total_requests = 0
-            self._total_errors = 0
-            self._error_4xx = 0
-            self._error_5xx = 0
+            self._loop_lag = LatencyHistogram()
+            self._loop_blocks.clear()
+            self._search_branch_timeouts.clear()
 
 
 # Singleton instance
@@ -180,3 +471,206 @@ def reset_metrics_service() -> None:
     if _metrics_service:
         _metrics_service.reset()
     _metrics_service = None
+
+
+# ============== Fleet aggregation (Redis) ==============
+
+_redis_client = None
+
+
+def worker_id() -> str:
+    """Identifier of this worker process (evaluated per call, fork-safe)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def _get_redis_client():
+    """Get or create the Redis client, or None if Redis is not configured."""
+    global _redis_client
+    settings = get_settings()
+    if not settings.is_redis_configured:
+        return None
+    if _redis_client is None:
+        from redis.asyncio import Redis as AsyncRedis
+
+        _redis_client = AsyncRedis.from_url(
+            settings.redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+    return _redis_client
+
+
+async def publish_snapshot() -> bool:
+    """Publish this worker's snapshot to Redis. Returns True on success."""
+    client = await _get_redis_client()
+    if client is None:
+        return False
+
+    payload = get_metrics_service().snapshot().to_dict()
+    payload["published_at"] = time.time()
+    try:
+        await client.hset(FLEET_KEY, worker_id(), json.dumps(payload))
+        return True
+    except (redis.exceptions.RedisError, ConnectionError, TimeoutError) as e:
+        logger.warning("metrics_publish_error", error=str(e))
+        return False
+
+
+async def get_fleet_snapshot() -> MetricsSnapshot:
+    """
+    Metrics merged across all live workers.
+
+    Uses this worker's live metrics plus every other worker's snapshot
+    published within ``metrics_stale_after_seconds``; stale entries (workers
+    that exited) are removed. Falls back to local metrics without Redis.
+    """
+    fleet = get_metrics_service().snapshot()
+    client = await _get_redis_client()
+    if client is None:
+        return fleet
+
+    try:
+        published = await client.hgetall(FLEET_KEY)
+    except (redis.exceptions.RedisError, ConnectionError, TimeoutError) as e:
+        logger.warning("metrics_fleet_read_error", error=str(e))
+        return fleet
+
+    cutoff = time.time() - get_settings().metrics_stale_after_seconds
+    own_id = worker_id()
+    stale = []
+    for other_id, raw in published.items():
+        if other_id == own_id:
+            continue
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            stale.append(other_id)
+            continue
+        if data.get("published_at", 0) < cutoff:
+            stale.append(other_id)
+            continue
+        fleet.merge(MetricsSnapshot.from_dict(data))
+
+    if stale:
+        with suppress(redis.exceptions.RedisError, ConnectionError, TimeoutError):
+            await client.hdel(FLEET_KEY, *stale)
+    return fleet
+
+
+async def run_metrics_publisher() -> None:
+    """Publish this worker's snapshot periodically (runs until cancelled)."""
+    interval = get_settings().metrics_publish_interval_seconds
+    client = await _get_redis_client()
+    if client is None:
+        return
+
+    try:
+        while True:
+            await publish_snapshot()
+            await asyncio.sleep(interval)
+    finally:
+        with suppress(redis.exceptions.RedisError, ConnectionError, TimeoutError):
+            await client.hdel(FLEET_KEY, worker_id())
+
+
+# ============== Prometheus exposition ==============
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def render_prometheus(snapshot: MetricsSnapshot) -> str:
+    """Render a snapshot in the Prometheus text exposition format (0.0.4)."""
+    lines = [
+        "# HELP npd_http_requests_total HTTP requests by route template and status class.",
+        "# TYPE npd_http_requests_total counter",
+    ]
+    endpoints = sorted(snapshot.endpoints.items())
+    for (method, route), stats in endpoints:
+        labels = f'method="{_escape_label(method)}",route="{_escape_label(route)}"'
+        for status, value in sorted(stats.statuses.items()):
+            lines.append(
+                f'npd_http_requests_total{{{labels},status="{status}"}} {value}'
+            )
+
+    lines += [
+        "# HELP npd_http_request_duration_seconds HTTP request latency by route template.",
+        "# TYPE npd_http_request_duration_seconds histogram",
+    ]
+    for (method, route), stats in endpoints:
+        labels = f'method="{_escape_label(method)}",route="{_escape_label(route)}"'
+        latency = stats.latency
+        for bound in PROMETHEUS_BUCKETS_MS:
+            lines.append(
+                f"npd_http_request_duration_seconds_bucket{{{labels},"
+                f'le="{_format_float(bound / 1000)}"}} {latency.cumulative_count(bound)}'
+            )
+        lines.append(
+            f'npd_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+            f"{latency.count}"
+        )
+        lines.append(
+            f"npd_http_request_duration_seconds_sum{{{labels}}} "
+            f"{_format_float(latency.sum_ms / 1000)}"
+        )
+        lines.append(
+            f"npd_http_request_duration_seconds_count{{{labels}}} {latency.count}"
+        )
+
+    lines += [
+        "# HELP npd_event_loop_lag_seconds Event loop scheduling delay samples.",
+        "# TYPE npd_event_loop_lag_seconds histogram",
+    ]
+    loop_lag = snapshot.loop_lag
+    for bound in PROMETHEUS_BUCKETS_MS:
+        lines.append(
+            f'npd_event_loop_lag_seconds_bucket{{le="{_format_float(bound / 1000)}"}} '
+            f"{loop_lag.cumulative_count(bound)}"
+        )
+    lines += [
+        f'npd_event_loop_lag_seconds_bucket{{le="+Inf"}} {loop_lag.count}',
+        f"npd_event_loop_lag_seconds_sum {_format_float(loop_lag.sum_ms / 1000)}",
+        f"npd_event_loop_lag_seconds_count {loop_lag.count}",
+        "# HELP npd_event_loop_blocked_total Event loop stalls by offending function.",
+        "# TYPE npd_event_loop_blocked_total counter",
+    ]
+    loop_blocks = sorted(snapshot.loop_blocks.items())
+    for offender, blocks in loop_blocks:
+        lines.append(
+            f'npd_event_loop_blocked_total{{function="{_escape_label(offender)}"}} '
+            f"{blocks.count}"
+        )
+    lines += [
+        "# HELP npd_event_loop_blocked_seconds_total Time the event loop was "
+        "blocked, by offending function.",
+        "# TYPE npd_event_loop_blocked_seconds_total counter",
+    ]
+    for offender, blocks in loop_blocks:
+        lines.append(
+            f"npd_event_loop_blocked_seconds_total"
+            f'{{function="{_escape_label(offender)}"}} '
+            f"{_format_float(blocks.total_ms / 1000)}"
+        )
+
+    lines += [
+        "# HELP npd_search_branch_timeouts_total Hybrid search ranking branches "
+        "dropped at their deadline.",
+        "# TYPE npd_search_branch_timeouts_total counter",
+    ]
+    for branch, count in sorted(snapshot.search_branch_timeouts.items()):
+        lines.append(
+            f'npd_search_branch_timeouts_total{{branch="{_escape_label(branch)}"}} '
+            f"{count}"
+        )
+
+    lines += [
+        "# HELP npd_metrics_workers Worker processes included in these metrics.",
+        "# TYPE npd_metrics_workers gauge",
+        f"npd_metrics_workers {snapshot.workers}",
+    ]
+    return "\n".join(lines) + "\n"
@@ -15,6 +15,7 @@ from app.config import get_settings
 from app.core.exceptions import ExternalServiceError
 from app.core.field_whitelists import CONTACT_SYNC_FIELDS, ORGANIZATION_SYNC_FIELDS
 from app.core.logging import get_logger
+from app.core.server_timing import UPSTREAM, track_time
 from app.models.contact import Contact
 from app.models.monday_sync import (
     MondaySyncLog,
@@ -25,12 +26,12 @@ from app.models.monday_sync import (
     SyncDirection,
 )
 from app.models.organization import Organization
+from app.services.cache_service import invalidate_org_cache
+from app.services.entity_index import EntityResolver, get_entity_resolver
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-MONDAY_API_URL = "https://api.monday.com/v2"
-
 
 class MondayAPIError(ExternalServiceError):
     """Base exception for Monday.com API errors."""
@@ -180,6 +181,8 @@ class MondayService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self._client: httpx.AsyncClient | None = None
+        self._resolver: EntityResolver | None = None
+        self._organizations_created = 0
 
     @property
     def is_configured(self) -> bool:
@@ -190,7 +193,7 @@ class MondayService:
         """Get or create HTTP client."""
         if self._client is None:
             self._client = httpx.AsyncClient(
-                base_url=MONDAY_API_URL,
+                base_url=settings.monday_api_url,
                 headers={
                     "Authorization": settings.monday_api_key,
                     "API-Version": settings.monday_api_version,
@@ -216,7 +219,8 @@ class MondayService:
         if variables:
             payload["variables"] = variables
 
-        response = await client.post("", json=payload)
+        with track_time(UPSTREAM):
+            response = await client.post("", json=payload)
         response.raise_for_status()
 
         data = response.json()
@@ -767,6 +771,10 @@ class MondayService:
                         )
                         self._apply_field_mapping(org, item, field_mapping)
                         self.db.add(org)
+                        await self.db.flush()
+                        # Later items with the same name update this org
+                        resolver = await self._entity_resolver()
+                        resolver.add_organization(name, org.id)
                         items_created += 1
 
                 if not cursor:
@@ -779,6 +787,8 @@ class MondayService:
             sync_log.items_created = items_created
             sync_log.items_updated = items_updated
             sync_log.items_skipped = items_skipped
+            if items_created or items_updated:
+                await invalidate_org_cache(self.db)
 
         except MondayRateLimitError as e:
             logger.error(
@@ -869,15 +879,15 @@ class MondayService:
                         continue
 
                     # Find or create organization
-                    org = await self._find_or_create_organization(org_name)
-                    if not org:
+                    org_id = await self._find_or_create_organization_id(org_name)
+                    if not org_id:
                         items_skipped += 1
                         continue
 
                     monday_id = str(item["id"])
 
                     # Check for existing contact by email in org
-                    existing = await self._find_contact(monday_id, email, org.id)
+                    existing = await self._find_contact(monday_id, email, org_id)
 
                     if existing:
                         existing.monday_id = monday_id
@@ -888,7 +898,7 @@ class MondayService:
                         contact = Contact(
                             name=name,
                             email=email,
-                            organization_id=org.id,
+                            organization_id=org_id,
                             monday_id=monday_id,
                             monday_last_synced=datetime.now(UTC),
                         )
@@ -905,6 +915,8 @@ class MondayService:
             sync_log.items_created = items_created
             sync_log.items_updated = items_updated
             sync_log.items_skipped = items_skipped
+            if self._organizations_created:
+                await invalidate_org_cache(self.db)
 
         except MondayRateLimitError as e:
             logger.error(
@@ -971,40 +983,39 @@ class MondayService:
             "recent_logs": list(recent.all()),
         }
 
+    async def _entity_resolver(self) -> EntityResolver:
+        if self._resolver is None:
+            self._resolver = await get_entity_resolver(self.db)
+        return self._resolver
+
     async def _find_organization(
         self, monday_id: str, name: str
     ) -> Organization | None:
         """Find org by monday_id first, then by name."""
-        # First try monday_id
-        result = await self.db.execute(
-            select(Organization).where(Organization.monday_id == monday_id)
-        )
-        org = result.scalar_one_or_none()
-        if org:
-            return org
-
-        # Fall back to name match
-        result = await self.db.execute(
-            select(Organization).where(func.lower(Organization.name) == name.lower())
-        )
-        return result.scalar_one_or_none()
+        resolver = await self._entity_resolver()
+        org_id = resolver.organization_id_for_monday(
+            monday_id
+        ) or resolver.organization_id(name, aliases=False)
+        if org_id is None:
+            return None
+        return await self.db.get(Organization, org_id)
 
-    async def _find_or_create_organization(self, name: str) -> Organization | None:
+    async def _find_or_create_organization_id(self, name: str) -> UUID | None:
         """Find organization by name or create if doesn't exist."""
         if not name:
             return None
 
-        result = await self.db.execute(
-            select(Organization).where(func.lower(Organization.name) == name.lower())
-        )
-        org = result.scalar_one_or_none()
-
-        if not org:
+        resolver = await self._entity_resolver()
+        org_id = resolver.organization_id(name, aliases=False)
+        if org_id is None:
             org = Organization(name=name)
             self.db.add(org)
             await self.db.flush()
+            resolver.add_organization(name, org.id)
+            self._organizations_created += 1
+            org_id = org.id
 
-        return org
+        return org_id
 
     async def _find_contact(
         self, monday_id: str, email: str, org_id: UUID
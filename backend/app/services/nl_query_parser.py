@@ -1,5 +1,24 @@
-"""Natural Language Query Parser service using Ollama LLM."""
+"""Natural Language Query Parser service using Ollama LLM.
 
+Parses are cached at two levels (see ``get_nl_parse_cache``):
+
+- Raw LLM output, keyed by normalised query text, model and prompt. The LLM
+  only extracts phrases, so this stays valid until the prompt or model
+  changes.
+- The resolved parse, keyed additionally by today's date (relative time
+  expressions such as "last 2 years" move with it) and the "tags" and
+  "orgs" cache generations (bumped when tags or organizations change).
+
+A repeated query is answered from the resolved parse; after a tag or
+organization change only entity resolution runs again, not the LLM.
+
+Before the LLM, the rule-based pre-parser in ``nl_query_rules`` tries the
+query against in-memory organization, tag, status and time phrase indexes.
+The LLM is only called when the rules are not confident. The explanation
+says which path produced the parse.
+"""
+
+import hashlib
 import json
 import re
 from datetime import date, timedelta
@@ -10,8 +29,10 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.circuit_breaker import CircuitOpenError, get_ollama_breaker
 from app.core.logging import get_logger
-from app.models.organization import Organization
+from app.core.ollama_scheduler import OllamaPriority, get_ollama_scheduler
+from app.core.server_timing import OLLAMA, track_time
 from app.models.project import ProjectStatus
 from app.models.tag import Tag, TagType
 from app.schemas.nl_query import (
@@ -19,6 +40,9 @@ from app.schemas.nl_query import (
     NLQueryParseResponse,
     ParsedQueryIntent,
 )
+from app.services.cache_service import get_cache_generation, get_nl_parse_cache
+from app.services.entity_index import EntityResolver, get_entity_resolver
+from app.services.nl_query_rules import get_query_entity_index, parse_with_rules
 
 logger = get_logger(__name__)
 
@@ -58,6 +82,9 @@ Only extract what is explicitly mentioned. Do not infer."""
         self.settings = get_settings()
         self.base_url = self.settings.ollama_base_url
         self.model = getattr(self.settings, "ollama_chat_model", "mistral")
+        # Why the last LLM call failed ("circuit_open", "timeout" or "error")
+        self.last_failure: str | None = None
+        self._resolver: EntityResolver | None = None
 
     async def parse_query(self, query: str) -> NLQueryParseResponse:
         """
@@ -72,25 +99,67 @@ Only extract what is explicitly mentioned. Do not infer."""
         if not query or not query.strip():
             return self._create_fallback_response(query, "Empty query")
 
+        cache = get_nl_parse_cache() if self.settings.nl_parse_cache_enabled else None
+        llm_key = parse_key = ""
+        if cache is not None:
+            llm_key, parse_key = await self._cache_keys(query)
+            cached = await cache.get(parse_key)
+            if cached is not None:
+                logger.debug("nl_query_cache_hit", query=query[:50], layer="parse")
+                response = NLQueryParseResponse.model_validate(cached)
+                response.original_query = query
+                return response
+
         try:
-            # Step 1: Call LLM for initial parsing
-            llm_result = await self._call_llm(query)
+            # Step 0: Deterministic rules; the LLM is only needed when they
+            # cannot make sense of the query
+            if self.settings.nl_rule_parser_enabled:
+                response = await self._parse_with_rules(query)
+                if response is not None:
+                    if cache is not None:
+                        await cache.set(parse_key, response.model_dump(mode="json"))
+                    return response
+
+            # Step 1: Call LLM for initial parsing (unless a previous parse of
+            # the same query is cached)
+            llm_result = await cache.get(llm_key) if cache is not None else None
+            llm_cached = llm_result is not None
+            if llm_cached:
+                logger.debug("nl_query_cache_hit", query=query[:50], layer="llm")
+            else:
+                llm_result = await self._call_llm(query)
 
             if llm_result is None:
-                return self._create_fallback_response(query, "LLM parsing failed")
+                reason = (
+                    "query parser temporarily unavailable"
+                    if self.last_failure == "circuit_open"
+                    else "LLM parsing failed"
+                )
+                return self._create_fallback_response(
+                    query, reason, upstream_failure=self.last_failure
+                )
 
             # Step 2: Resolve entities to database IDs
             parsed_intent = await self._resolve_entities(llm_result)
 
             # Step 3: Build explanation
-            explanation = self._build_explanation(llm_result, parsed_intent)
+            explanation = "Parsed by LLM: " + self._build_explanation(
+                llm_result, parsed_intent
+            )
 
-            return NLQueryParseResponse(
+            response = NLQueryParseResponse(
                 original_query=query,
                 parsed_intent=parsed_intent,
                 fallback_used=False,
                 parse_explanation=explanation,
             )
+            if cache is not None:
+                # Fallbacks are never cached, so the LLM is retried next time
+                if not llm_cached:
+                    await cache.set(llm_key, llm_result)
+                await cache.set(parse_key, response.model_dump(mode="json"))
+            logger.debug("nl_query_parsed", query=query[:50], method="llm")
+            return response
 
         except Exception as e:
             logger.warning(
@@ -102,38 +171,110 @@ Only extract what is explicitly mentioned. Do not infer."""
             )
             return self._create_fallback_response(query, str(e))
 
+    async def _parse_with_rules(self, query: str) -> NLQueryParseResponse | None:
+        """Parse the query with the rule-based pre-parser.
+
+        Returns None when the rules are less confident than
+        ``nl_rule_parser_min_confidence``, so the caller asks the LLM.
+        """
+        index = await get_query_entity_index(self.db)
+        rules = parse_with_rules(query, index)
+        if rules.confidence < self.settings.nl_rule_parser_min_confidence:
+            logger.debug(
+                "nl_query_rules_low_confidence",
+                query=query[:50],
+                confidence=rules.confidence,
+            )
+            return None
+
+        intent = ParsedQueryIntent(
+            search_text=rules.search_text,
+            organization_id=rules.organization_id,
+            organization_name=rules.organization_name,
+            technology_keywords=rules.technology_keywords,
+            tag_ids=rules.tag_ids,
+            status=self._parse_status_list(rules.statuses),
+            confidence=rules.confidence,
+        )
+        if rules.time_expression:
+            intent.date_range = self._parse_time_expression(rules.time_expression)
+
+        logger.debug("nl_query_parsed", query=query[:50], method="rules")
+        return NLQueryParseResponse(
+            original_query=query,
+            parsed_intent=intent,
+            fallback_used=False,
+            parse_explanation="Parsed by rules: " + self._build_explanation({}, intent),
+        )
+
+    async def _cache_keys(self, query: str) -> tuple[str, str]:
+        """Return the (raw LLM output, resolved parse) cache keys for a query."""
+        normalized = " ".join(query.lower().split())
+        prompt_digest = hashlib.md5(self.SYSTEM_PROMPT.encode()).hexdigest()[:8]
+        llm_digest = hashlib.md5(
+            json.dumps([normalized, self.model, prompt_digest]).encode()
+        ).hexdigest()
+
+        tags_generation = await get_cache_generation("tags").get()
+        orgs_generation = await get_cache_generation("orgs").get()
+        parse_digest = hashlib.md5(
+            json.dumps(
+                [llm_digest, date.today().isoformat(), tags_generation, orgs_generation]
+            ).encode()
+        ).hexdigest()
+        return f"llm:{llm_digest}", f"parse:{parse_digest}"
+
     async def _call_llm(self, query: str) -> dict | None:
         """Call Ollama LLM for query parsing."""
+        self.last_failure = None
+        breaker = get_ollama_breaker("chat")
+        timeout = breaker.timeout(self.settings.ollama_chat_timeout_seconds)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": self.SYSTEM_PROMPT},
-                            {
-                                "role": "user",
-                                "content": f"Parse this search query: {query}",
-                            },
-                        ],
-                        "stream": False,
-                        "format": "json",  # Request JSON output
-                    },
-                )
+            # Fail fast before queueing for a slot behind in-flight calls
+            breaker.check()
+            async with (
+                get_ollama_scheduler().slot(OllamaPriority.INTERACTIVE),
+                breaker.guard(),
+                httpx.AsyncClient(timeout=timeout) as client,
+            ):
+                with track_time(OLLAMA):
+                    response = await client.post(
+                        f"{self.base_url}/api/chat",
+                        json={
+                            "model": self.model,
+                            "messages": [
+                                {"role": "system", "content": self.SYSTEM_PROMPT},
+                                {
+                                    "role": "user",
+                                    "content": f"Parse this search query: {query}",
+                                },
+                            ],
+                            "stream": False,
+                            "format": "json",  # Request JSON output
+                        },
+                    )
                 response.raise_for_status()
-                data = response.json()
+            data = response.json()
 
-                # Extract message content
-                content = data.get("message", {}).get("content", "")
-                if not content:
-                    return None
+            # Extract message content
+            content = data.get("message", {}).get("content", "")
+            if not content:
+                return None
 
-                # Parse JSON from response
-                return json.loads(content)
+            # Parse JSON from response
+            return json.loads(content)
 
+        except CircuitOpenError as e:
+            self.last_failure = "circuit_open"
+            logger.debug("ollama_llm_skipped_circuit_open", retry_after=e.retry_after)
+            return None
         except httpx.HTTPError as e:
-            logger.warning("ollama_llm_error", error=str(e))
+            self.last_failure = (
+                "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+            )
+            logger.warning(
+                "ollama_llm_error", error=str(e), timeout_seconds=round(timeout, 2)
+            )
             return None
         except json.JSONDecodeError as e:
             logger.warning("llm_json_parse_error", error=str(e))
@@ -245,45 +386,34 @@ Only extract what is explicitly mentioned. Do not infer."""
 
         return None
 
-    async def _find_organization(self, name: str) -> UUID | None:
-        """Find organization by name or alias (fuzzy match)."""
-        name_lower = name.lower().strip()
-
-        # Exact match on name (case-insensitive)
-        stmt = select(Organization).where(func.lower(Organization.name) == name_lower)
-        result = await self.db.execute(stmt)
-        org = result.scalar_one_or_none()
-        if org:
-            return org.id
-
-        # Check aliases
-        stmt = select(Organization).where(Organization.aliases.isnot(None))
-        result = await self.db.execute(stmt)
-        all_orgs = result.scalars().all()
-
-        for org in all_orgs:
-            if org.aliases:
-                for alias in org.aliases:
-                    if alias.lower() == name_lower:
-                        return org.id
-
-        # Partial match on name (contains)
-        stmt = select(Organization).where(
-            func.lower(Organization.name).contains(name_lower)
-        )
-        result = await self.db.execute(stmt)
-        org = result.scalar_one_or_none()
-        if org:
-            return org.id
+    async def _entity_resolver(self) -> EntityResolver:
+        if self._resolver is None:
+            self._resolver = await get_entity_resolver(self.db)
+        return self._resolver
 
-        return None
+    async def _find_organization(self, name: str) -> UUID | None:
+        """Find organization by name or alias, then by trigram similarity."""
+        resolver = await self._entity_resolver()
+        if not self.settings.entity_fuzzy_match_enabled:
+            return resolver.organization_id(name)
+        return await resolver.fuzzy_organization_id(name)
 
     async def _find_technology_tags(self, keywords: list[str]) -> list[UUID]:
-        """Find tags matching technology keywords."""
+        """Find tags matching technology keywords.
+
+        Exact tag names are resolved from the entity index; only other
+        keywords are looked up as substrings in the database.
+        """
         tag_ids: list[UUID] = []
+        resolver = await self._entity_resolver() if keywords else None
 
         for keyword in keywords:
             keyword_lower = keyword.lower().strip()
+            tag_id = resolver.tag_id(keyword_lower)
+            if tag_id is not None:
+                if tag_id not in tag_ids:
+                    tag_ids.append(tag_id)
+                continue
 
             # Look for TECHNOLOGY type tags first, then any tag
             stmt = (
@@ -360,7 +490,7 @@ Only extract what is explicitly mentioned. Do not infer."""
         return " | ".join(parts)
 
     def _create_fallback_response(
-        self, query: str, reason: str
+        self, query: str, reason: str, upstream_failure: str | None = None
     ) -> NLQueryParseResponse:
         """Create fallback response using query as-is."""
         logger.info(
@@ -376,4 +506,5 @@ Only extract what is explicitly mentioned. Do not infer."""
             ),
             fallback_used=True,
             parse_explanation=f"Fallback to keyword search: {reason}",
+            upstream_failure=upstream_failure,
         )
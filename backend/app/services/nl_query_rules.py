@@ -0,0 +1,218 @@
+"""Deterministic pre-parser for natural language search queries.
+
+Most semantic searches are keywords, optionally with an obvious time phrase,
+status word, organization name or tag name. ``parse_with_rules`` recognises
+those against an in-memory index of organization names and aliases and tag
+names (every synonym is a tag, so synonyms match by name). It returns a
+confidence score: the caller only asks the LLM when the query contains words
+the rules cannot interpret (negations, questions, unsupported time phrases)
+or reads like a sentence.
+
+The phrase index is derived from the shared ``entity_index`` snapshot and
+rebuilt whenever that snapshot is (on "tags" or "orgs" generation changes).
+"""
+
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.entity_index import EntityIndex, get_entity_index
+from app.services.tag_matcher import MIN_SINGLE_TOKEN_LENGTH, tokenize
+
+# Time phrases understood by NLQueryParser._parse_time_expression, with an
+# optional leading preposition that is dropped along with the phrase
+TIME_PHRASE_PATTERN = re.compile(
+    r"\b(?:(?:in|from|during|over|within)\s+(?:the\s+)?)?"
+    r"(last\s+\d+\s+(?:years?|months?)|since\s+\d{4}|q[1-4]\s+\d{4}|this\s+year)\b"
+)
+
+STATUS_PHRASES: dict[tuple[str, ...], str] = {
+    ("active",): "active",
+    ("completed",): "completed",
+    ("on", "hold"): "on_hold",
+    ("approved",): "approved",
+    ("cancelled",): "cancelled",
+    ("canceled",): "cancelled",
+}
+
+# Filler words dropped from the remaining search text
+STOPWORDS = frozenset(
+    """
+    a all an and any are at by client clients customer customers did do done
+    find for from get i in involving is list me of on or our please project
+    projects related search see show that the to using was we were with work
+    """.split()
+)
+
+# Words the rules cannot interpret; their presence sends the query to the LLM
+LLM_HINT_WORDS = frozenset(
+    """
+    after ago before between during earlier except excluding how last latest
+    month months newer no not older past quarter recent recently since today
+    week weeks what when where which who why without year years yesterday
+    """.split()
+)
+
+# Remaining keywords beyond which a query reads like a sentence
+MAX_PLAIN_KEYWORDS = 6
+
+HIGH_CONFIDENCE = 1.0
+SENTENCE_CONFIDENCE = 0.5
+HINT_CONFIDENCE = 0.3
+
+
+@dataclass
+class RuleParse:
+    """What the rules recognised in a query."""
+
+    search_text: str
+    confidence: float
+    time_expression: str | None = None
+    organization_id: UUID | None = None
+    organization_name: str | None = None
+    technology_keywords: list[str] = field(default_factory=list)
+    tag_ids: list[UUID] = field(default_factory=list)
+    statuses: list[str] = field(default_factory=list)
+
+
+def _name_phrase(name: str) -> tuple[str, ...] | None:
+    """Token phrase a name is recognised by, or None if it is too ambiguous.
+
+    Filler words never identify an entity. A single token shorter than
+    ``MIN_SINGLE_TOKEN_LENGTH`` only does if it is the whole name ("C", "F#"),
+    not what is left of a longer one.
+    """
+    phrase = tuple(tokenize(name))
+    if not phrase or STOPWORDS.issuperset(phrase):
+        return None
+    if (
+        len(phrase) == 1
+        and len(phrase[0]) < MIN_SINGLE_TOKEN_LENGTH
+        and phrase[0] != name.strip().lower()
+    ):
+        return None
+    return phrase
+
+
+@dataclass
+class QueryEntityIndex:
+    """Immutable snapshot of organization and tag names keyed by token phrase."""
+
+    organizations: dict[tuple[str, ...], tuple[UUID, str]]
+    tags: dict[tuple[str, ...], list[UUID]]
+    max_phrase_tokens: int = 1
+
+    @classmethod
+    def build(
+        cls,
+        organizations: Iterable[tuple[UUID, str, list[str] | None]],
+        tags: Iterable[tuple[UUID, str]],
+    ) -> "QueryEntityIndex":
+        """Index (id, name, aliases) organizations and (id, name) tags."""
+        org_phrases: dict[tuple[str, ...], set[UUID]] = defaultdict(set)
+        org_names: dict[UUID, str] = {}
+        for org_id, name, aliases in organizations:
+            org_names[org_id] = name
+            for text in [name, *(aliases or [])]:
+                phrase = _name_phrase(text)
+                if phrase:
+                    org_phrases[phrase].add(org_id)
+
+        tag_phrases: dict[tuple[str, ...], list[UUID]] = defaultdict(list)
+        for tag_id, name in tags:
+            phrase = _name_phrase(name)
+            if phrase:
+                tag_phrases[phrase].append(tag_id)
+
+        # A phrase shared by several organizations identifies none of them
+        unique_orgs = {
+            phrase: (next(iter(ids)), org_names[next(iter(ids))])
+            for phrase, ids in org_phrases.items()
+            if len(ids) == 1
+        }
+        longest = max(
+            (len(phrase) for phrase in [*unique_orgs, *tag_phrases]), default=1
+        )
+        return cls(
+            organizations=unique_orgs,
+            tags=dict(tag_phrases),
+            max_phrase_tokens=max(longest, 2),
+        )
+
+
+def parse_with_rules(query: str, index: QueryEntityIndex) -> RuleParse:
+    """Recognise time phrases, statuses, organizations and tags in a query.
+
+    Phrases are matched longest first, left to right. Unrecognised words
+    become the search text (minus filler words).
+    """
+    text = query.lower()
+    time_expression = None
+    time_match = TIME_PHRASE_PATTERN.search(text)
+    if time_match:
+        time_expression = time_match.group(1)
+        text = text[: time_match.start()] + " " + text[time_match.end() :]
+
+    tokens = tokenize(text)
+    result = RuleParse(
+        search_text="", confidence=HIGH_CONFIDENCE, time_expression=time_expression
+    )
+    keywords: list[str] = []
+
+    i = 0
+    while i < len(tokens):
+        for length in range(min(index.max_phrase_tokens, len(tokens) - i), 0, -1):
+            phrase = tuple(tokens[i : i + length])
+            if phrase in STATUS_PHRASES:
+                if STATUS_PHRASES[phrase] not in result.statuses:
+                    result.statuses.append(STATUS_PHRASES[phrase])
+            elif phrase in index.organizations and result.organization_id is None:
+                result.organization_id, result.organization_name = index.organizations[
+                    phrase
+                ]
+            elif phrase in index.tags:
+                result.technology_keywords.append(" ".join(phrase))
+                for tag_id in index.tags[phrase]:
+                    if tag_id not in result.tag_ids:
+                        result.tag_ids.append(tag_id)
+            else:
+                continue
+            i += length
+            break
+        else:
+            if tokens[i] not in STOPWORDS:
+                keywords.append(tokens[i])
+            i += 1
+
+    result.search_text = " ".join(keywords)
+    if LLM_HINT_WORDS.intersection(keywords):
+        result.confidence = HINT_CONFIDENCE
+    elif len(keywords) > MAX_PLAIN_KEYWORDS:
+        result.confidence = SENTENCE_CONFIDENCE
+    return result
+
+
+_index: QueryEntityIndex | None = None
+_index_source: EntityIndex | None = None
+
+
+async def get_query_entity_index(db: AsyncSession) -> QueryEntityIndex:
+    """Get the process-wide phrase index, derived from the shared entity index."""
+    global _index, _index_source
+
+    entities = await get_entity_index(db)
+    if _index is None or _index_source is not entities:
+        _index = QueryEntityIndex.build(entities.organization_rows, entities.tag_rows)
+        _index_source = entities
+    return _index
+
+
+def reset_query_entity_index() -> None:
+    """Drop the cached index (for testing)."""
+    global _index, _index_source
+    _index = None
+    _index_source = None
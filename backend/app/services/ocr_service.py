@@ -14,6 +14,7 @@ from PIL import Image, ImageFilter, ImageOps
 from app.config import get_settings
 from app.core.exceptions import OCRError, OCRTimeoutError, OCRUnavailableError
 from app.core.logging import get_logger
+from app.core.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -397,6 +398,7 @@ class OCRService:
                 ) from e
             raise OCRError(message=f"OCR failed: {e}") from e
 
+    @traced("extract.ocr")
     async def extract_text_with_ocr(
         self,
         pdf_bytes: bytes,
@@ -0,0 +1,176 @@
+"""On-demand profiling of single requests, jobs and documents.
+
+Requests: an admin obtains a short-lived signed token
+(``POST /admin/profiles/token``) and sends it as the ``X-NPD-Profile``
+header. The request middleware profiles that request and returns the
+profile ID in ``X-Profile-Id``. Without the header nothing is started.
+
+Jobs and documents: an admin arms a job ID or document ID
+(``POST /admin/profiles/targets``); the next time ``process_job_queue`` or
+``process_document_queue`` handles it, the handler runs under the profiler.
+Armed targets are read once per queue run.
+
+Profiles are stored in the profile cache (shared via Redis when configured)
+for ``PROFILE_RETENTION_SECONDS`` and served in folded-stack format by
+``GET /admin/profiles/{profile_id}``.
+"""
+
+import hashlib
+import hmac
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from uuid import UUID
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.core.profiler import SamplingProfiler
+from app.services.cache_service import get_profile_cache
+
+logger = get_logger(__name__)
+
+# Cache keys (under the profile cache prefix)
+INDEX_KEY = "index"
+ARMED_KEY = "armed"
+
+# Most profiles listed by the admin index
+MAX_INDEXED_PROFILES = 50
+
+TARGET_KINDS = ("job", "document")
+
+
+def _sign(payload: str) -> str:
+    secret = get_settings().secret_key.encode()
+    return hmac.new(secret, f"profile:{payload}".encode(), hashlib.sha256).hexdigest()
+
+
+def create_profile_token(user_id: UUID) -> tuple[str, datetime]:
+    """Signed token allowing the bearer to profile requests until it expires."""
+    expires_at = int(time.time()) + get_settings().profile_token_ttl_seconds
+    payload = f"{expires_at}.{user_id}"
+    return f"{payload}.{_sign(payload)}", datetime.fromtimestamp(expires_at, UTC)
+
+
+def verify_profile_token(token: str) -> str | None:
+    """User ID the token was issued to, or None if invalid or expired."""
+    payload, _, signature = token.rpartition(".")
+    expires_at, _, user_id = payload.partition(".")
+    if not payload or not expires_at.isdigit() or not user_id:
+        return None
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    if int(expires_at) < time.time():
+        return None
+    return user_id
+
+
+@dataclass
+class ProfileHandle:
+    """A running profile; ``profile_id`` is known before it finishes."""
+
+    profile_id: str
+    kind: str
+    label: str
+
+
+@asynccontextmanager
+async def profile_block(
+    kind: str, label: str, requested_by: str | None = None
+) -> AsyncIterator[ProfileHandle]:
+    """Profile the enclosed block (and the tasks it starts) and store it."""
+    settings = get_settings()
+    handle = ProfileHandle(profile_id=uuid.uuid4().hex, kind=kind, label=label)
+    profiler = SamplingProfiler(
+        interval_ms=settings.profile_sample_interval_ms,
+        max_seconds=settings.profile_max_seconds,
+    )
+    profiler.start()
+    try:
+        yield handle
+    finally:
+        profiler.stop()
+        await save_profile(handle, profiler, requested_by)
+
+
+@asynccontextmanager
+async def maybe_profile(
+    armed: set[tuple[str, str]], kind: str, target_id: UUID, label: str
+) -> AsyncIterator[ProfileHandle | None]:
+    """Profile the block if ``(kind, target_id)`` is armed, else do nothing."""
+    if (kind, str(target_id)) not in armed:
+        yield None
+        return
+    await disarm_target(kind, target_id)
+    async with profile_block(kind, label) as handle:
+        yield handle
+
+
+async def save_profile(
+    handle: ProfileHandle, profiler: SamplingProfiler, requested_by: str | None
+) -> None:
+    """Store a finished profile and add it to the index."""
+    cache = get_profile_cache()
+    ttl = get_settings().profile_retention_seconds
+    summary = {
+        "profile_id": handle.profile_id,
+        "kind": handle.kind,
+        "label": handle.label,
+        "created_at": datetime.now(UTC).isoformat(),
+        "duration_ms": round(profiler.duration_ms, 2),
+        "samples": profiler.samples,
+        "profiled_samples": profiler.profiled_samples,
+        "interval_ms": profiler.interval * 1000,
+        "requested_by": requested_by,
+    }
+    await cache.set(handle.profile_id, {**summary, "folded": profiler.folded()}, ttl)
+
+    index = await cache.get(INDEX_KEY) or []
+    index = [summary, *index][:MAX_INDEXED_PROFILES]
+    await cache.set(INDEX_KEY, index, ttl)
+    logger.info(
+        "profile_captured",
+        **{k: v for k, v in summary.items() if k != "created_at"},
+    )
+
+
+async def get_profile(profile_id: str) -> dict | None:
+    """A stored profile with its folded stacks, if still retained."""
+    return await get_profile_cache().get(profile_id)
+
+
+async def list_profiles() -> list[dict]:
+    """Summaries of recent profiles, newest first."""
+    return await get_profile_cache().get(INDEX_KEY) or []
+
+
+async def arm_target(kind: str, target_id: UUID) -> None:
+    """Profile the next processing of a job or document."""
+    if kind not in TARGET_KINDS:
+        raise ValueError(f"Unknown profile target kind: {kind}")
+    cache = get_profile_cache()
+    ttl = get_settings().profile_retention_seconds
+    armed = await cache.get(ARMED_KEY) or {}
+    armed[f"{kind}:{target_id}"] = time.time() + ttl
+    await cache.set(ARMED_KEY, armed, ttl)
+
+
+async def disarm_target(kind: str, target_id: UUID) -> None:
+    """Remove an armed target (it is profiled once)."""
+    cache = get_profile_cache()
+    armed = await cache.get(ARMED_KEY) or {}
+    if armed.pop(f"{kind}:{target_id}", None) is not None:
+        await cache.set(ARMED_KEY, armed, get_settings().profile_retention_seconds)
+
+
+async def get_armed_targets() -> set[tuple[str, str]]:
+    """Currently armed (kind, id) pairs."""
+    armed = await get_profile_cache().get(ARMED_KEY) or {}
+    now = time.time()
+    return {
+        tuple(key.split(":", 1))
+        for key, expires_at in armed.items()
+        if expires_at > now
+    }
@@ -7,6 +7,7 @@ import redis.exceptions
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.server_timing import CACHE, track_time
 
 logger = get_logger(__name__)
 
@@ -119,7 +120,8 @@ class RedisSearchCache:
         try:
             client = await self._get_client()
             key = self._make_key(cache_key)
-            data = await client.get(key)
+            with track_time(CACHE):
+                data = await client.get(key)
             if data:
                 self._hits += 1
                 return json.loads(data)
@@ -137,7 +139,8 @@ class RedisSearchCache:
         try:
             client = await self._get_client()
             key = self._make_key(cache_key)
-            await client.setex(key, self._ttl, json.dumps(results, default=str))
+            with track_time(CACHE):
+                await client.setex(key, self._ttl, json.dumps(results, default=str))
         except RedisError as e:
             logger.warning("redis_search_cache_set_error", error=str(e))
 
@@ -301,6 +304,7 @@ def generate_cache_key(
     page: int,
     page_size: int,
     expand_synonyms: bool = True,
+    facets: list[str] | None = None,
 ) -> str:
     """
     Generate deterministic cache key from search parameters.
@@ -319,6 +323,7 @@ def generate_cache_key(
         "page": page,
         "page_size": page_size,
         "expand_synonyms": expand_synonyms,
+        "facets": sorted(set(facets)) if facets else None,
     }
 
     # Create deterministic string representation
@@ -2,24 +2,74 @@
 
 import asyncio
 import time
+from collections.abc import Awaitable, Callable, Sequence
 from datetime import date
+from functools import partial
 from uuid import UUID
 
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import bindparam, func, literal_column, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import get_settings
 from app.core.logging import get_logger
-from app.models.document import Document
+from app.database import async_session_maker
+from app.models.document import Document, DocumentChunk
 from app.models.project import Project, ProjectStatus
 from app.models.user import User
+from app.schemas.project import ProjectFacet, ProjectFacets
+from app.services.autocomplete_service import AutocompleteService
 from app.services.embedding_service import EmbeddingService
+from app.services.facet_service import FacetService
+from app.services.metrics_service import get_metrics_service
 from app.services.permission_service import PermissionService
+from app.services.slow_query_capture import capture_slow_queries
 from app.services.tag_synonym_service import TagSynonymService
 
 logger = get_logger(__name__)
 
+# SQLSTATE query_canceled, raised when statement_timeout fires
+QUERY_CANCELED = "57014"
+
+
+def _remaining_seconds(deadline_at: float | None) -> float | None:
+    """Seconds left until a perf_counter deadline, or None if unbounded."""
+    if deadline_at is None:
+        return None
+    return deadline_at - time.perf_counter()
+
+
+async def _limit_statements(db: AsyncSession, deadline_at: float | None) -> None:
+    """Bound the session's following statements by the time left.
+
+    Waiting for a pooled connection counts against the deadline too, so a
+    branch starved of connections is dropped instead of waiting out the
+    pool timeout. SET LOCAL lasts until the end of the transaction, so each
+    branch session is bounded on its own and the request session is left
+    untouched.
+    """
+    remaining = _remaining_seconds(deadline_at)
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise TimeoutError
+    await asyncio.wait_for(db.connection(), remaining)
+    timeout_ms = int(_remaining_seconds(deadline_at) * 1000)
+    if timeout_ms <= 0:
+        raise TimeoutError
+    await db.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+
+
+def _is_statement_timeout(error: DBAPIError) -> bool:
+    """Whether Postgres cancelled the statement (statement_timeout)."""
+    orig = error.orig
+    return (
+        getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    ) == QUERY_CANCELED
+
 
 class SearchService:
     """Service for searching projects using hybrid search (text + vector + RRF fusion)."""
@@ -27,9 +77,30 @@ class SearchService:
     # RRF constant - higher values give more weight to lower-ranked results
     RRF_K = 60
 
+    # Nearest chunks considered by the vector branch. An HNSW scan returns at
+    # most hnsw.ef_search rows (pgvector default 40), so a higher limit only
+    # helps if ef_search is raised too (see docs/operations/pgvector-tuning.md)
+    VECTOR_CANDIDATE_CHUNKS = 40
+
+    # Ranking branches of a hybrid search, in reporting order
+    RANKING_BRANCHES = ("project_text", "document_text", "vector")
+
     def __init__(self, db: AsyncSession):
         self.db = db
         self.embedding_service = EmbeddingService()
+        # Facet counts from the most recent search_projects call (if requested)
+        self.last_facets: ProjectFacets | None = None
+        # Fused candidate IDs from the most recent hybrid search
+        self._candidate_ids: list[UUID] = []
+        # Ranking sources the most recent search had to leave out, with the
+        # reason (e.g. {"vector": "circuit_open"} while Ollama is down)
+        self.skipped_sources: dict[str, str] = {}
+        # Ranking branches that finished and were fused in the most recent search
+        self.ranking_sources: list[str] = []
+        # Overall deadline (perf_counter seconds) of the search in progress
+        self._deadline: float | None = None
+        # Ranking branches run concurrently, each on its own session
+        self._branch_sessions = async_session_maker
 
     async def search_projects(
         self,
@@ -48,6 +119,7 @@ class SearchService:
         page_size: int = 20,
         include_documents: bool = True,
         expand_synonyms: bool = True,
+        facets: Sequence[ProjectFacet] | None = None,
     ) -> tuple[list[Project], int, dict | None]:
         """
         Search projects using hybrid search with filters.
@@ -61,10 +133,26 @@ class SearchService:
         Args:
             expand_synonyms: If True and tag_ids provided, expand to include
                 synonym tags. Uses transitive closure for synonym relationships.
+            facets: Facet dimensions to count over the full (unpaginated)
+                result set. Counts are stored in ``self.last_facets``.
+
+        Ranking branches run against a latency budget (``search_budget_ms``
+        plus a deadline per branch). Branches that miss their deadline are
+        dropped and recorded in ``self.skipped_sources`` with reason
+        ``"deadline"``; the branches that were fused are listed in
+        ``self.ranking_sources``.
 
         Returns tuple of (projects, total_count, synonym_metadata).
         synonym_metadata is None if no synonym expansion occurred.
         """
+        self.last_facets = None
+        self.skipped_sources = {}
+        self.ranking_sources = []
+        budget_ms = get_settings().search_budget_ms
+        self._deadline = (
+            time.perf_counter() + budget_ms / 1000 if budget_ms > 0 else None
+        )
+
         logger.info(
             "search_projects",
             query=query[:50] if query else None,  # Truncate for logs
@@ -118,25 +206,37 @@ class SearchService:
 
         # If no query, just return filtered projects
         if not query or not query.strip():
-            projects, total = await self._search_without_query(
+            with capture_slow_queries("search:filters"):
+                projects, total = await self._search_without_query(
+                    filter_conditions=filter_conditions,
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                    page=page,
+                    page_size=page_size,
+                )
+            if facets:
+                self.last_facets = await FacetService(self.db).get_facets(
+                    facets, filter_conditions=filter_conditions
+                )
+            return projects, total, synonym_metadata
+
+        # Perform hybrid search with RRF fusion
+        with capture_slow_queries("search:hybrid"):
+            projects, total = await self._hybrid_search(
+                query=query.strip(),
                 filter_conditions=filter_conditions,
                 sort_by=sort_by,
                 sort_order=sort_order,
                 page=page,
                 page_size=page_size,
+                include_documents=include_documents,
+            )
+        if facets:
+            # Facets over the fused candidate set - ACL and filters were
+            # already applied by each ranking branch
+            self.last_facets = await FacetService(self.db).get_facets(
+                facets, project_ids=self._candidate_ids
             )
-            return projects, total, synonym_metadata
-
-        # Perform hybrid search with RRF fusion
-        projects, total = await self._hybrid_search(
-            query=query.strip(),
-            filter_conditions=filter_conditions,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            page=page,
-            page_size=page_size,
-            include_documents=include_documents,
-        )
         return projects, total, synonym_metadata
 
     def _build_filter_conditions(
@@ -236,26 +336,60 @@ class SearchService:
         RRF Formula: score = sum(1 / (k + rank_i)) for each ranking source
 
         Optimization: Runs all ranking queries in parallel using asyncio.gather()
-        when include_documents is True, reducing total search time.
+        when include_documents is True, reducing total search time. Each
+        branch runs on its own session and is bounded by its deadline, so a
+        slow branch costs at most its deadline instead of holding up the
+        whole search.
+
+        The request transaction is committed before the branches start, so
+        a search holds one pooled connection per running branch rather than
+        one more for the idle request session.
         """
         start_time = time.perf_counter()
+        self._candidate_ids = []
+        settings = get_settings()
+
+        # Checked here, before the request connection is released: without
+        # embeddings the vector branch (and its Ollama call) is skipped
+        has_embeddings = include_documents and await self._has_embeddings()
+        await self.db.commit()
 
         # Get rankings from different sources
         # Run queries in parallel for better performance
         if include_documents:
-            project_text_ranks, document_text_ranks, vector_ranks = (
-                await asyncio.gather(
-                    self._get_project_text_ranks(query, filter_conditions),
-                    self._get_document_text_ranks(query, filter_conditions),
-                    self._get_vector_ranks(query, filter_conditions),
+            branches = [
+                self._run_branch(
+                    "project_text",
+                    partial(self._get_project_text_ranks, query, filter_conditions),
+                    settings.search_project_text_deadline_ms,
+                ),
+                self._run_branch(
+                    "document_text",
+                    partial(self._get_document_text_ranks, query, filter_conditions),
+                    settings.search_document_text_deadline_ms,
+                ),
+            ]
+            if has_embeddings:
+                branches.append(
+                    self._run_branch(
+                        "vector",
+                        partial(self._get_vector_ranks, query, filter_conditions),
+                        settings.search_vector_deadline_ms,
+                    )
                 )
+            project_text_ranks, document_text_ranks, *vector = await asyncio.gather(
+                *branches
             )
+            vector_ranks = vector[0] if vector else {}
         else:
-            project_text_ranks = await self._get_project_text_ranks(
-                query, filter_conditions
+            project_text_ranks = await self._run_branch(
+                "project_text",
+                partial(self._get_project_text_ranks, query, filter_conditions),
+                settings.search_project_text_deadline_ms,
             )
             document_text_ranks = {}
             vector_ranks = {}
+        self.ranking_sources.sort(key=self.RANKING_BRANCHES.index)
 
         # Combine all project IDs
         all_project_ids = set(project_text_ranks.keys())
@@ -273,17 +407,11 @@ class SearchService:
         if not all_project_ids:
             return [], 0
 
-        # Calculate RRF scores
-        rrf_scores: dict[UUID, float] = {}
-        for project_id in all_project_ids:
-            score = 0.0
-            if project_id in project_text_ranks:
-                score += 1.0 / (self.RRF_K + project_text_ranks[project_id])
-            if project_id in document_text_ranks:
-                score += 1.0 / (self.RRF_K + document_text_ranks[project_id])
-            if project_id in vector_ranks:
-                score += 1.0 / (self.RRF_K + vector_ranks[project_id])
-            rrf_scores[project_id] = score
+        rrf_scores = self._rrf_scores(
+            project_text_ranks, document_text_ranks, vector_ranks
+        )
+
+        self._candidate_ids = list(rrf_scores.keys())
 
         # Sort by RRF score (or other sort criteria if specified)
         if sort_by == "relevance":
@@ -373,12 +501,77 @@ class SearchService:
 
         return projects, total
 
+    async def _run_branch(
+        self,
+        name: str,
+        ranking: Callable[[AsyncSession, float | None], Awaitable[dict[UUID, int]]],
+        deadline_ms: int,
+    ) -> dict[UUID, int]:
+        """Run one ranking branch on its own session, bounded by its deadline.
+
+        The branch's deadline is the earlier of its own deadline and the end
+        of the overall search budget. Its SQL is bounded server-side with
+        statement_timeout, so Postgres cancels a slow query and only this
+        branch's session sees the error. Only the Ollama call is cancelled
+        client-side, because cancelling a task mid-execute invalidates its
+        connection. Waiting for a pooled connection is bounded by the
+        deadline as well. A branch that misses the deadline is counted in
+        the metrics and contributes no ranks.
+        """
+        deadline_at = None
+        if deadline_ms > 0:
+            deadline_at = time.perf_counter() + deadline_ms / 1000
+        if self._deadline is not None:
+            deadline_at = (
+                self._deadline
+                if deadline_at is None
+                else min(deadline_at, self._deadline)
+            )
+
+        started_at = time.perf_counter()
+        try:
+            async with self._branch_sessions() as db:
+                ranks = await ranking(db, deadline_at)
+        except (TimeoutError, PoolTimeoutError, DBAPIError) as e:
+            if isinstance(e, DBAPIError) and not _is_statement_timeout(e):
+                raise
+            self.skipped_sources[name] = "deadline"
+            get_metrics_service().record_search_branch_timeout(name)
+            logger.warning(
+                "search_branch_timeout",
+                branch=name,
+                elapsed_ms=round((time.perf_counter() - started_at) * 1000, 2),
+            )
+            return {}
+
+        if name not in self.skipped_sources:
+            self.ranking_sources.append(name)
+        return ranks
+
+    def _rrf_scores(self, *rankings: dict[UUID, int]) -> dict[UUID, float]:
+        """Fuse rankings with Reciprocal Rank Fusion.
+
+        Each ranking maps project ID to its 1-based rank; a project scores
+        1 / (RRF_K + rank) for every ranking it appears in.
+        """
+        rrf_scores: dict[UUID, float] = {}
+        for ranks in rankings:
+            for project_id, rank in ranks.items():
+                rrf_scores[project_id] = rrf_scores.get(project_id, 0.0) + 1.0 / (
+                    self.RRF_K + rank
+                )
+        return rrf_scores
+
     async def _get_project_text_ranks(
         self,
         query: str,
         filter_conditions: list,
+        db: AsyncSession | None = None,
+        deadline_at: float | None = None,
     ) -> dict[UUID, int]:
         """Get project rankings from full-text search on project fields."""
+        db = db or self.db
+        await _limit_statements(db, deadline_at)
         ts_query = func.plainto_tsquery("english", query)
 
         # Query for projects matching the text search
@@ -392,7 +585,8 @@ class SearchService:
 
         stmt = stmt.order_by(literal_column("rank").desc())
 
-        result = await self.db.execute(stmt)
+        with capture_slow_queries("search:project_text"):
+            result = await db.execute(stmt)
         rows = result.all()
 
         logger.debug(
@@ -408,8 +602,12 @@ class SearchService:
         self,
         query: str,
         filter_conditions: list,
+        db: AsyncSession | None = None,
+        deadline_at: float | None = None,
     ) -> dict[UUID, int]:
         """Get project rankings from full-text search on document content."""
+        db = db or self.db
+        await _limit_statements(db, deadline_at)
         ts_query = func.plainto_tsquery("english", query)
 
         # Find projects with documents matching the text search
@@ -433,7 +631,8 @@ class SearchService:
             )
             stmt = stmt.where(Document.project_id.in_(project_ids_subquery))
 
-        result = await self.db.execute(stmt)
+        with capture_slow_queries("search:document_text"):
+            result = await db.execute(stmt)
         rows = result.all()
 
         logger.debug(
@@ -444,56 +643,85 @@ class SearchService:
 
         return {row.project_id: idx + 1 for idx, row in enumerate(rows)}
 
+    async def _has_embeddings(self) -> bool:
+        """Whether any document chunk has an embedding.
+
+        Lets a search skip the vector branch, and its Ollama call, while the
+        database holds no embeddings.
+        """
+        result = await self.db.execute(
+            text(
+                "SELECT EXISTS(SELECT 1 FROM document_chunks WHERE embedding IS NOT NULL)"
+            )
+        )
+        return bool(result.scalar())
+
     async def _get_vector_ranks(
         self,
         query: str,
         filter_conditions: list,
+        db: AsyncSession | None = None,
+        deadline_at: float | None = None,
     ) -> dict[UUID, int]:
         """Get project rankings from vector similarity search on document chunks."""
-        # Quick check - skip if no embeddings exist at all
-        # This avoids expensive HTTP call to Ollama when database is empty or has no embeddings
-        count_result = await self.db.execute(
-            text(
-                "SELECT EXISTS(SELECT 1 FROM document_chunks WHERE embedding IS NOT NULL)"
-            )
+        db = db or self.db
+
+        # Generate embedding for the query before the first statement, so
+        # the branch session does not hold a connection while Ollama answers.
+        # The Ollama call is the only part bounded client-side: cancelling an
+        # HTTP request is safe, cancelling a statement mid-execute is not
+        remaining = _remaining_seconds(deadline_at)
+        if remaining is not None and remaining <= 0:
+            raise TimeoutError
+        query_embedding = await asyncio.wait_for(
+            self.embedding_service.generate_embedding(query), remaining
         )
-        has_embeddings = count_result.scalar()
-        if not has_embeddings:
-            logger.debug("vector_search_skipped", reason="no_embeddings_in_database")
-            return {}
-
-        # Generate embedding for the query
-        query_embedding = await self.embedding_service.generate_embedding(query)
 
         if not query_embedding:
-            logger.debug("vector_search_skipped", reason="embedding_generation_failed")
+            failure = self.embedding_service.last_failure
+            if failure:
+                # Ollama unavailable: rank by full-text search alone
+                self.skipped_sources["vector"] = failure
+            logger.debug(
+                "vector_search_skipped",
+                reason="embedding_generation_failed",
+                failure=failure,
+            )
             return {}
 
+        await _limit_statements(db, deadline_at)
         # Find most similar document chunks using cosine distance
         # pgvector uses <=> for cosine distance (lower is better)
-        # Using parameterized query with pgvector's Vector type for security
-        stmt = text(
-            """
-            SELECT DISTINCT ON (d.project_id)
-                d.project_id,
-                dc.embedding <=> :embedding AS distance
-            FROM document_chunks dc
-            JOIN documents d ON d.id = dc.document_id
-            WHERE dc.embedding IS NOT NULL
-            ORDER BY d.project_id, dc.embedding <=> :embedding
-        """
-        ).bindparams(bindparam("embedding", type_=Vector(768)))
-
-        result = await self.db.execute(stmt, {"embedding": query_embedding})
-        rows = result.all()
-
-        # Apply filter conditions separately (for simplicity)
-        project_ids_to_keep = set()
+        # Using a bound parameter with pgvector's Vector type for security.
+        # The nearest chunks are found first (ORDER BY distance LIMIT, which
+        # the HNSW index answers) and then reduced to the closest per project;
+        # ordering by project first would scan and sort every chunk.
+        distance = DocumentChunk.embedding.op("<=>")(
+            bindparam("embedding", type_=Vector(768))
+        )
+        nearest = (
+            select(Document.project_id, distance.label("distance"))
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(DocumentChunk.embedding.isnot(None))
+        )
         if filter_conditions:
-            filter_stmt = select(Project.id).where(*filter_conditions)
-            filter_result = await self.db.execute(filter_stmt)
-            project_ids_to_keep = {row[0] for row in filter_result.all()}
-            rows = [row for row in rows if row.project_id in project_ids_to_keep]
+            # Filter before the LIMIT: filtering the global nearest chunks
+            # afterwards drops every match outside them. Iterative scans let
+            # the HNSW index keep going until enough chunks pass the filter
+            # (pgvector 0.8+); the per-project ordering is restored below.
+            nearest = nearest.where(
+                Document.project_id.in_(select(Project.id).where(*filter_conditions))
+            )
+            await db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+        nearest = (
+            nearest.order_by(distance).limit(self.VECTOR_CANDIDATE_CHUNKS).subquery()
+        )
+        stmt = select(
+            nearest.c.project_id, func.min(nearest.c.distance).label("distance")
+        ).group_by(nearest.c.project_id)
+        with capture_slow_queries("search:vector"):
+            result = await db.execute(stmt, {"embedding": query_embedding})
+        rows = result.all()
 
         # Sort by distance (ascending - lower is better)
         sorted_rows = sorted(rows, key=lambda r: r.distance)
@@ -555,27 +783,26 @@ class SearchService:
         """
         Get search suggestions based on project names.
 
+        Uses pg_trgm indexes: prefix matches rank first, followed by
+        word-similarity (typo-tolerant) matches.
+
         Returns list of matching project names.
         """
         if not query or len(query) < 2:
             return []
 
-        # Use ILIKE for prefix matching
-        pattern = f"{query}%"
-        stmt = select(Project.name).where(Project.name.ilike(pattern))
-
         # ACL filtering - restrict to accessible project names
+        accessible_ids = None
         if user is not None:
             permission_service = PermissionService(self.db)
             accessible_ids = await permission_service.get_accessible_project_ids(user)
-            if accessible_ids:  # Non-empty = regular user, apply filter
-                stmt = stmt.where(Project.id.in_(accessible_ids))
             # Empty set = admin, no filtering needed
 
-        stmt = stmt.order_by(Project.name).limit(limit)
-
-        result = await self.db.execute(stmt)
-        return [row[0] for row in result.all()]
+        autocomplete = AutocompleteService(self.db)
+        matches = await autocomplete.suggest_project_names(
+            query, limit=limit, accessible_ids=accessible_ids
+        )
+        return [name for name, _score in matches]
 
     async def search_documents(
         self,
@@ -639,7 +866,8 @@ class SearchService:
                 limit=limit,
             )
 
-        result = await self.db.execute(stmt, {"embedding": query_embedding})
+        with capture_slow_queries("search:document_chunks"):
+            result = await self.db.execute(stmt, {"embedding": query_embedding})
         rows = result.all()
 
         return [
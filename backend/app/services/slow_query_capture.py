@@ -0,0 +1,291 @@
+"""Opt-in EXPLAIN capture for slow search and list queries.
+
+When ``SLOW_QUERY_EXPLAIN_ENABLED`` is set, statements issued inside a
+``capture_slow_queries(label)`` block that take longer than
+``SLOW_QUERY_EXPLAIN_THRESHOLD_MS`` are re-run in the background with
+``EXPLAIN (ANALYZE, BUFFERS)`` on a separate connection whose transaction is
+always rolled back. Only SELECT statements are explained.
+
+Captures are sampled (``SLOW_QUERY_EXPLAIN_SAMPLE_RATE``), limited to one per
+statement shape per ``SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS`` and to one
+EXPLAIN in flight per worker, so a burst of slow searches cannot double the
+database load.
+
+Parameters are never stored: the statement is kept as its fingerprint and
+quoted literals in the plan (filter values, query embeddings) are replaced by
+``'?'``. The last ``SLOW_QUERY_EXPLAIN_BUFFER_SIZE`` captures are kept per
+worker for the admin metrics endpoint, with the index scans they used.
+"""
+
+import asyncio
+import contextvars
+import random
+import re
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from threading import Lock
+
+from app.config import get_settings
+from app.core.logging import get_logger, request_id_ctx
+from app.core.query_stats import add_statement_observer, fingerprint
+
+logger = get_logger(__name__)
+
+# statement_timeout for the EXPLAIN ANALYZE re-run
+EXPLAIN_TIMEOUT_MS = 30_000
+
+# Longest plan kept (lines)
+MAX_PLAN_LINES = 200
+
+# Most statement shapes remembered for rate limiting
+MAX_RATE_LIMIT_ENTRIES = 1000
+
+_EXPLAINABLE = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+_QUOTED_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_INDEX_SCAN = re.compile(
+    r"(?:Index Scan|Index Only Scan)(?: Backward)? using (\S+)"
+    r"|Bitmap Index Scan on (\S+)"
+)
+_SEQ_SCAN = re.compile(r"Seq Scan on (\S+)")
+_EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+
+_label_ctx: ContextVar[str | None] = ContextVar("slow_query_label", default=None)
+
+
+@contextmanager
+def capture_slow_queries(label: str) -> Iterator[None]:
+    """Make slow statements in the enclosed block eligible for capture.
+
+    Blocks nest; the innermost label is recorded.
+    """
+    token = _label_ctx.set(label)
+    try:
+        yield
+    finally:
+        _label_ctx.reset(token)
+
+
+def redact_plan(lines: list[str]) -> list[str]:
+    """Replace quoted literals (parameter values) in plan lines with '?'."""
+    return [_QUOTED_LITERAL.sub("'?'", line) for line in lines[:MAX_PLAN_LINES]]
+
+
+def summarize_plan(lines: list[str]) -> tuple[list[str], list[str], float | None]:
+    """Indexes scanned, tables sequentially scanned and execution time."""
+    indexes: list[str] = []
+    seq_scans: list[str] = []
+    execution_ms = None
+    for line in lines:
+        for match in _INDEX_SCAN.finditer(line):
+            name = match.group(1) or match.group(2)
+            if name not in indexes:
+                indexes.append(name)
+        for match in _SEQ_SCAN.finditer(line):
+            if match.group(1) not in seq_scans:
+                seq_scans.append(match.group(1))
+        timing = _EXECUTION_TIME.search(line)
+        if timing:
+            execution_ms = float(timing.group(1))
+    return indexes, seq_scans, execution_ms
+
+
+@dataclass
+class SlowQueryCapture:
+    """A slow statement and its redacted EXPLAIN (ANALYZE, BUFFERS) plan."""
+
+    label: str
+    fingerprint: str
+    duration_ms: float
+    captured_at: datetime
+    request_id: str | None = None
+    plan: list[str] = field(default_factory=list)
+    execution_ms: float | None = None
+    indexes_used: list[str] = field(default_factory=list)
+    seq_scans: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+class SlowQueryCaptureService:
+    """Samples slow statements, explains them and keeps the latest plans."""
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        self.threshold_ms = settings.slow_query_explain_threshold_ms
+        self.sample_rate = settings.slow_query_explain_sample_rate
+        self.interval_seconds = settings.slow_query_explain_interval_seconds
+        self._captures: deque[SlowQueryCapture] = deque(
+            maxlen=settings.slow_query_explain_buffer_size
+        )
+        self._last_captured: dict[str, float] = {}
+        self._in_flight = False
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = Lock()
+
+    def observe(
+        self,
+        statement: str,
+        parameters: object,
+        duration_ms: float,
+        executemany: bool,
+    ) -> None:
+        """Statement observer: schedule an EXPLAIN for eligible statements."""
+        label = _label_ctx.get()
+        if label is None or executemany or duration_ms < self.threshold_ms:
+            return
+        if not _EXPLAINABLE.match(statement):
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Sync engine outside the event loop - nothing to run on
+
+        statement_fingerprint = fingerprint(statement)
+        if not self._admit(statement_fingerprint):
+            return
+
+        capture = SlowQueryCapture(
+            label=label,
+            fingerprint=statement_fingerprint,
+            duration_ms=round(duration_ms, 2),
+            captured_at=datetime.now(UTC),
+            request_id=request_id_ctx.get(),
+        )
+        # Empty context: the EXPLAIN must not count toward the request's
+        # statement stats or be captured itself
+        task = loop.create_task(
+            self._explain(capture, statement, parameters),
+            context=contextvars.Context(),
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _admit(self, statement_fingerprint: str) -> bool:
+        """Apply the in-flight limit, per-shape interval and sampling."""
+        now = time.monotonic()
+        with self._lock:
+            if self._in_flight:
+                return False
+            last = self._last_captured.get(statement_fingerprint)
+            if last is not None and now - last < self.interval_seconds:
+                return False
+            if random.random() >= self.sample_rate:
+                return False
+
+            if len(self._last_captured) >= MAX_RATE_LIMIT_ENTRIES:
+                self._last_captured = {
+                    fp: at
+                    for fp, at in self._last_captured.items()
+                    if now - at < self.interval_seconds
+                }
+            self._last_captured[statement_fingerprint] = now
+            self._in_flight = True
+            return True
+
+    async def _explain(
+        self, capture: SlowQueryCapture, statement: str, parameters: object
+    ) -> None:
+        try:
+            plan = redact_plan(await self._run_explain(statement, parameters))
+            capture.plan = plan
+            indexes, seq_scans, execution_ms = summarize_plan(plan)
+            capture.indexes_used = indexes
+            capture.seq_scans = seq_scans
+            capture.execution_ms = execution_ms
+            logger.info(
+                "slow_query_captured",
+                label=capture.label,
+                duration_ms=capture.duration_ms,
+                execution_ms=execution_ms,
+                indexes_used=indexes,
+                seq_scans=seq_scans,
+            )
+        except Exception as e:
+            # Database errors can echo parameter values - redact them too
+            capture.error = _QUOTED_LITERAL.sub("'?'", str(e))[:500]
+            logger.warning(
+                "slow_query_explain_failed",
+                label=capture.label,
+                error_type=type(e).__name__,
+            )
+        finally:
+            with self._lock:
+                self._captures.append(capture)
+                self._in_flight = False
+
+    async def _run_explain(self, statement: str, parameters: object) -> list[str]:
+        """Run EXPLAIN (ANALYZE, BUFFERS) in a rolled-back transaction."""
+        from app.database import engine
+
+        async with engine.connect() as conn:
+            try:
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}"
+                )
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters or None
+                )
+                return [row[0] for row in result]
+            finally:
+                await conn.rollback()
+
+    def get_captures(
+        self, limit: int | None = None, label: str | None = None
+    ) -> list[SlowQueryCapture]:
+        """Most recent captures first, optionally for one label."""
+        with self._lock:
+            captures = list(reversed(self._captures))
+        if label is not None:
+            captures = [c for c in captures if c.label == label]
+        return captures[:limit] if limit is not None else captures
+
+    def reset(self) -> None:
+        """Clear captures and rate-limit state (for testing)."""
+        with self._lock:
+            self._captures.clear()
+            self._last_captured.clear()
+            self._in_flight = False
+
+
+_service: SlowQueryCaptureService | None = None
+
+
+def get_slow_query_capture_service() -> SlowQueryCaptureService:
+    """Get or create the worker-wide capture service."""
+    global _service
+    if _service is None:
+        _service = SlowQueryCaptureService()
+    return _service
+
+
+def reset_slow_query_capture_service() -> None:
+    """Reset the capture service (for testing)."""
+    global _service
+    _service = None
+
+
+def _observe_statement(
+    statement: str, parameters: object, duration_ms: float, executemany: bool
+) -> None:
+    get_slow_query_capture_service().observe(
+        statement, parameters, duration_ms, executemany
+    )
+
+
+def install_slow_query_capture() -> bool:
+    """Start watching statements if capture is enabled. Returns whether it is."""
+    settings = get_settings()
+    if not settings.slow_query_explain_enabled:
+        return False
+    add_statement_observer(_observe_statement)
+    logger.info(
+        "slow_query_capture_enabled",
+        threshold_ms=settings.slow_query_explain_threshold_ms,
+        sample_rate=settings.slow_query_explain_sample_rate,
+    )
+    return True
@@ -8,7 +8,10 @@ import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.circuit_breaker import CircuitOpenError, get_ollama_breaker
 from app.core.logging import get_logger
+from app.core.ollama_scheduler import OllamaPriority, get_ollama_scheduler
+from app.core.server_timing import OLLAMA, track_time
 from app.services.search_service import SearchService
 
 logger = get_logger(__name__)
@@ -90,25 +93,31 @@ Guidelines:
             context = await self._assemble_context(query, projects, max_chunks)
             context_text, truncated = self._truncate_context(context)
 
-            # Call LLM
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": self.SYSTEM_PROMPT},
-                            {
-                                "role": "user",
-                                "content": f"Query: {query}\n\nRelevant Information:\n{context_text}",
+            # Call LLM (failing fast while Ollama chat is known to be down,
+            # instead of queueing for a slot behind in-flight calls)
+            get_ollama_breaker("chat").check()
+            async with (
+                get_ollama_scheduler().slot(OllamaPriority.INTERACTIVE),
+                httpx.AsyncClient(timeout=60.0) as client,
+            ):
+                with track_time(OLLAMA):
+                    response = await client.post(
+                        f"{self.base_url}/api/chat",
+                        json={
+                            "model": self.model,
+                            "messages": [
+                                {"role": "system", "content": self.SYSTEM_PROMPT},
+                                {
+                                    "role": "user",
+                                    "content": f"Query: {query}\n\nRelevant Information:\n{context_text}",
+                                },
+                            ],
+                            "stream": False,
+                            "options": {
+                                "num_predict": self.MAX_RESPONSE_TOKENS,
                             },
-                        ],
-                        "stream": False,
-                        "options": {
-                            "num_predict": self.MAX_RESPONSE_TOKENS,
                         },
-                    },
-                )
+                    )
                 response.raise_for_status()
                 data = response.json()
 
@@ -123,6 +132,9 @@ Guidelines:
                 truncated=truncated,
             )
 
+        except CircuitOpenError as e:
+            logger.warning("summarization_llm_circuit_open", retry_after=e.retry_after)
+            return self._create_fallback_result(projects, "LLM unavailable")
         except httpx.HTTPStatusError as e:
             logger.warning(
                 "summarization_llm_http_error",
@@ -172,23 +184,27 @@ Guidelines:
             context = await self._assemble_context(query, projects, max_chunks)
             context_text, _ = self._truncate_context(context)
 
+            get_ollama_breaker("chat").check()
             client = httpx.AsyncClient(timeout=120.0)
             try:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": self.SYSTEM_PROMPT},
-                            {
-                                "role": "user",
-                                "content": f"Query: {query}\n\nRelevant Information:\n{context_text}",
-                            },
-                        ],
-                        "stream": True,
-                    },
-                ) as response:
+                async with (
+                    get_ollama_scheduler().slot(OllamaPriority.INTERACTIVE),
+                    client.stream(
+                        "POST",
+                        f"{self.base_url}/api/chat",
+                        json={
+                            "model": self.model,
+                            "messages": [
+                                {"role": "system", "content": self.SYSTEM_PROMPT},
+                                {
+                                    "role": "user",
+                                    "content": f"Query: {query}\n\nRelevant Information:\n{context_text}",
+                                },
+                            ],
+                            "stream": True,
+                        },
+                    ) as response,
+                ):
                     response.raise_for_status()
                     async for line in response.aiter_lines():
                         if line:
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.query_stats import track_queries
 from app.database import async_session_maker
 from app.models.monday_sync import (
     SyncQueue,
@@ -412,10 +413,12 @@ async def process_sync_queue() -> dict:
                     if item.direction == SyncQueueDirection.TO_MONDAY:
                         if item.entity_type == "contact":
                             # Call sync function - it handles its own session
-                            await sync_contact_to_monday(item.entity_id)
+                            with track_queries("sync:contact"):
+                                await sync_contact_to_monday(item.entity_id)
                             success = True
                         elif item.entity_type == "organization":
-                            await sync_organization_to_monday(item.entity_id)
+                            with track_queries("sync:organization"):
+                                await sync_organization_to_monday(item.entity_id)
                             success = True
                         else:
                             error_msg = f"Unknown entity type: {item.entity_type}"
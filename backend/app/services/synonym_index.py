@@ -0,0 +1,282 @@
+"""In-process snapshot of tag synonym connected components.
+
+Synonyms are transitive (A~B and B~C means A~C), so every tag belongs to a
+connected component of the synonym graph. The snapshot is built once with
+union-find from all TagSynonym rows; afterwards expanding any tag set is a
+dictionary lookup per tag instead of a graph walk with one query per node.
+
+Freshness:
+- Changes made through TagSynonymService are recorded on the session and
+  applied to this process's snapshot when the transaction commits (and are
+  overlaid on reads within the uncommitted transaction itself).
+- Each commit bumps the "tags" cache generation so other workers rebuild.
+- Snapshots are also rebuilt after ``tag_cache_ttl`` seconds as a safety net.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.logging import get_logger
+from app.models.tag import TagSynonym
+from app.services.cache_service import get_cache_generation
+
+logger = get_logger(__name__)
+
+# Session.info key holding synonym edge changes not yet committed
+PENDING_CHANGES_KEY = "tag_synonym_changes"
+
+ADD = "add"
+REMOVE = "remove"
+DROP_TAG = "drop_tag"
+
+
+class SynonymIndex:
+    """Connected components of the synonym graph."""
+
+    def __init__(self, edges: Iterable[tuple[UUID, UUID]] = ()):
+        self._adjacency: dict[UUID, set[UUID]] = {}
+        self._component: dict[UUID, frozenset[UUID]] = {}
+
+        parent: dict[UUID, UUID] = {}
+
+        def find(node: UUID) -> UUID:
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        for a, b in edges:
+            if a == b:
+                continue
+            self._adjacency.setdefault(a, set()).add(b)
+            self._adjacency.setdefault(b, set()).add(a)
+            parent.setdefault(a, a)
+            parent.setdefault(b, b)
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        groups: dict[UUID, set[UUID]] = {}
+        for node in parent:
+            groups.setdefault(find(node), set()).add(node)
+        for members in groups.values():
+            self._assign(members)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of synonym relationships in the snapshot."""
+        return sum(len(n) for n in self._adjacency.values()) // 2
+
+    def _assign(self, members: Iterable[UUID]) -> None:
+        component = frozenset(members)
+        for node in component:
+            self._component[node] = component
+
+    def _walk(self, start: UUID) -> set[UUID]:
+        """Collect the component containing ``start`` from the adjacency."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for other in self._adjacency.get(stack.pop(), ()):
+                if other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+        return seen
+
+    def synonyms_of(self, tag_id: UUID) -> set[UUID]:
+        """All tags transitively synonymous with ``tag_id`` (excluding itself)."""
+        return set(self._component.get(tag_id, ())) - {tag_id}
+
+    def expand(self, tag_ids: Iterable[UUID]) -> dict[UUID, set[UUID]]:
+        """Map each tag ID to its synonym IDs (tags without synonyms omitted)."""
+        expanded: dict[UUID, set[UUID]] = {}
+        for tag_id in tag_ids:
+            synonyms = self.synonyms_of(tag_id)
+            if synonyms:
+                expanded[tag_id] = synonyms
+        return expanded
+
+    def add_edge(self, a: UUID, b: UUID) -> None:
+        """Record a synonym relationship, merging the two components."""
+        if a == b:
+            return
+        self._adjacency.setdefault(a, set()).add(b)
+        self._adjacency.setdefault(b, set()).add(a)
+        component_a = self._component.get(a, frozenset({a}))
+        component_b = self._component.get(b, frozenset({b}))
+        if component_a is not component_b:
+            self._assign(component_a | component_b)
+
+    def remove_edge(self, a: UUID, b: UUID) -> None:
+        """Remove a synonym relationship, splitting the component if needed."""
+        if b not in self._adjacency.get(a, ()):
+            return
+        self._adjacency[a].discard(b)
+        self._adjacency[b].discard(a)
+        self._reassign_from((a, b))
+
+    def drop_tag(self, tag_id: UUID) -> None:
+        """Remove a deleted tag and all its relationships."""
+        neighbours = self._adjacency.pop(tag_id, set())
+        for other in neighbours:
+            self._adjacency[other].discard(tag_id)
+        self._component.pop(tag_id, None)
+        self._reassign_from(neighbours)
+
+    def _reassign_from(self, nodes: Iterable[UUID]) -> None:
+        done: set[UUID] = set()
+        for node in nodes:
+            if node in done:
+                continue
+            if not self._adjacency.get(node):
+                self._adjacency.pop(node, None)
+                self._component.pop(node, None)
+                done.add(node)
+                continue
+            members = self._walk(node)
+            self._assign(members)
+            done |= members
+
+    def apply(self, changes: Iterable[tuple]) -> None:
+        """Apply recorded (operation, *tag_ids) changes in order."""
+        for operation, *args in changes:
+            if operation == ADD:
+                self.add_edge(*args)
+            elif operation == REMOVE:
+                self.remove_edge(*args)
+            elif operation == DROP_TAG:
+                self.drop_tag(*args)
+
+    def copy(self) -> "SynonymIndex":
+        """Independent copy (components are immutable and can be shared)."""
+        clone = SynonymIndex()
+        clone._adjacency = {k: set(v) for k, v in self._adjacency.items()}
+        clone._component = dict(self._component)
+        return clone
+
+
+_index: SynonymIndex | None = None
+_index_generation: int | None = None
+_index_built_at: float = 0.0
+_index_lock = asyncio.Lock()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _pending_changes(db: AsyncSession | Session, create: bool = False) -> list | None:
+    """Uncommitted synonym changes recorded on a session."""
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return None
+    if create:
+        return info.setdefault(PENDING_CHANGES_KEY, [])
+    return info.get(PENDING_CHANGES_KEY)
+
+
+def record_change(db: AsyncSession, operation: str, *tag_ids: UUID) -> None:
+    """Record a synonym change to apply to the snapshot on commit."""
+    changes = _pending_changes(db, create=True)
+    if changes is not None:
+        changes.append((operation, *tag_ids))
+
+
+async def _load_index(db: AsyncSession) -> SynonymIndex:
+    start = time.perf_counter()
+    result = await db.execute(select(TagSynonym.tag_id, TagSynonym.synonym_tag_id))
+    index = SynonymIndex((row[0], row[1]) for row in result.all())
+    logger.info(
+        "synonym_index_built",
+        edge_count=index.edge_count,
+        build_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+    return index
+
+
+async def get_synonym_index(db: AsyncSession) -> SynonymIndex:
+    """
+    Get the synonym snapshot as seen by ``db``.
+
+    Returns the shared process snapshot, rebuilt if the "tags" generation
+    changed. If the session has uncommitted synonym changes they are applied
+    to a private copy so the caller sees its own writes.
+    """
+    global _index, _index_generation, _index_built_at
+
+    generation = await get_cache_generation("tags").get()
+    max_age = get_settings().tag_cache_ttl
+
+    async with _index_lock:
+        if (
+            _index is None
+            or _index_generation != generation
+            or time.monotonic() - _index_built_at > max_age
+        ):
+            _index = await _load_index(db)
+            _index_generation = generation
+            _index_built_at = time.monotonic()
+        index = _index
+
+    pending = _pending_changes(db)
+    if pending:
+        index = index.copy()
+        index.apply(pending)
+    return index
+
+
+async def _bump_generation(applied_locally: bool) -> None:
+    """Advance the tags generation after a committed synonym change."""
+    global _index_generation
+    previous = _index_generation
+    try:
+        generation = await get_cache_generation("tags").bump()
+    except Exception as e:
+        logger.warning("synonym_generation_bump_failed", error=str(e))
+        return
+    # Our snapshot already includes the change; keep it unless someone else
+    # also changed tags in the meantime.
+    if applied_locally and previous is not None and generation == previous + 1:
+        _index_generation = generation
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session: Session) -> None:
+    """Apply a session's synonym changes to the snapshot after commit."""
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    if not changes:
+        return
+
+    applied_locally = _index is not None
+    if _index is not None:
+        _index.apply(changes)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Committed outside an event loop; the TTL covers other workers
+        return
+    task = loop.create_task(_bump_generation(applied_locally))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session: Session) -> None:
+    """Forget synonym changes from a rolled back transaction."""
+    session.info.pop(PENDING_CHANGES_KEY, None)
+
+
+def reset_synonym_index() -> None:
+    """Drop the cached snapshot (for testing)."""
+    global _index, _index_generation, _index_built_at, _index_lock
+    _index = None
+    _index_generation = None
+    _index_built_at = 0.0
+    _index_lock = asyncio.Lock()
@@ -0,0 +1,271 @@
+"""Materialised tag usage and co-occurrence statistics.
+
+The tag picker asks for popular tags and for tags that co-occur with the
+current selection on every interaction. Instead of aggregating project_tags
+per request, counts are kept in tag_usage_stats and tag_cooccurrence:
+- project tag changes apply +/-1 deltas (``record_project_tag_change``)
+- tag merges recompute the rows of the surviving tag (``refresh_tags``)
+- deleting a tag removes its rows via ON DELETE CASCADE
+- ``reconcile`` rebuilds both tables from project_tags (cron), correcting
+  drift from any write path that bypasses this service
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+from itertools import permutations
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.tag import Tag, TagCooccurrence, TagType, TagUsageStat
+
+logger = get_logger(__name__)
+
+USAGE_REBUILD_SQL = """
+    INSERT INTO tag_usage_stats (tag_id, usage_count)
+    SELECT tags.id, count(project_tags.project_id)
+    FROM tags
+    LEFT JOIN project_tags ON project_tags.tag_id = tags.id
+    {where}
+    GROUP BY tags.id
+"""
+
+COOCCURRENCE_REBUILD_SQL = """
+    INSERT INTO tag_cooccurrence (tag_id, other_tag_id, project_count)
+    SELECT pt1.tag_id, pt2.tag_id, count(*)
+    FROM project_tags pt1
+    JOIN project_tags pt2
+      ON pt2.project_id = pt1.project_id AND pt2.tag_id <> pt1.tag_id
+    {where}
+    GROUP BY pt1.tag_id, pt2.tag_id
+"""
+
+REFRESH_TAGS_WHERE = "WHERE tags.id = ANY(:tag_ids)"
+REFRESH_PAIRS_WHERE = "WHERE pt1.tag_id = ANY(:tag_ids) OR pt2.tag_id = ANY(:tag_ids)"
+
+
+class TagStatsService:
+    """Maintain and read materialised tag statistics."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_project_tag_change(
+        self,
+        old_tag_ids: Iterable[UUID],
+        new_tag_ids: Iterable[UUID],
+    ) -> None:
+        """
+        Apply the statistics delta for one project's tag set changing.
+
+        Args:
+            old_tag_ids: Tags on the project before the change (empty if new).
+            new_tag_ids: Tags on the project after the change.
+        """
+        await self.record_project_tag_changes([(old_tag_ids, new_tag_ids)])
+
+    async def record_project_tag_changes(
+        self,
+        changes: Iterable[tuple[Iterable[UUID], Iterable[UUID]]],
+    ) -> None:
+        """
+        Apply the summed statistics delta for many projects' tag sets changing.
+
+        Used by bulk import so a batch of projects costs one upsert per table.
+
+        Args:
+            changes: (old_tag_ids, new_tag_ids) pairs, one per project.
+        """
+        usage: Counter[UUID] = Counter()
+        pairs: Counter[tuple[UUID, UUID]] = Counter()
+        for old_tag_ids, new_tag_ids in changes:
+            old, new = set(old_tag_ids), set(new_tag_ids)
+            if old == new:
+                continue
+
+            for tag_id in new - old:
+                usage[tag_id] += 1
+            for tag_id in old - new:
+                usage[tag_id] -= 1
+
+            old_pairs = set(permutations(old, 2))
+            new_pairs = set(permutations(new, 2))
+            for pair in new_pairs - old_pairs:
+                pairs[pair] += 1
+            for pair in old_pairs - new_pairs:
+                pairs[pair] -= 1
+
+        # Drop deltas that cancelled out across projects
+        usage = Counter({key: delta for key, delta in usage.items() if delta})
+        pairs = Counter({key: delta for key, delta in pairs.items() if delta})
+        await self._apply_deltas(usage, pairs)
+
+    async def _apply_deltas(
+        self,
+        usage: Counter[UUID],
+        pairs: Counter[tuple[UUID, UUID]],
+    ) -> None:
+        """Upsert count deltas (rows sorted by key for a stable lock order)."""
+        if usage:
+            stmt = insert(TagUsageStat).values(
+                [
+                    {"tag_id": tag_id, "usage_count": delta}
+                    for tag_id, delta in sorted(usage.items())
+                ]
+            )
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[TagUsageStat.tag_id],
+                    set_={
+                        "usage_count": func.greatest(
+                            TagUsageStat.usage_count + stmt.excluded.usage_count, 0
+                        ),
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+
+        if pairs:
+            stmt = insert(TagCooccurrence).values(
+                [
+                    {"tag_id": a, "other_tag_id": b, "project_count": delta}
+                    for (a, b), delta in sorted(pairs.items())
+                ]
+            )
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[
+                        TagCooccurrence.tag_id,
+                        TagCooccurrence.other_tag_id,
+                    ],
+                    set_={
+                        "project_count": TagCooccurrence.project_count
+                        + stmt.excluded.project_count
+                    },
+                )
+            )
+            # Pairs that no longer co-occur are removed rather than kept at 0
+            decremented = [pair for pair, delta in pairs.items() if delta < 0]
+            if decremented:
+                await self.db.execute(
+                    delete(TagCooccurrence).where(
+                        tuple_(
+                            TagCooccurrence.tag_id, TagCooccurrence.other_tag_id
+                        ).in_(decremented),
+                        TagCooccurrence.project_count <= 0,
+                    )
+                )
+
+    async def refresh_tags(self, tag_ids: Iterable[UUID]) -> None:
+        """
+        Recompute all statistics rows involving the given tags.
+
+        Used after bulk changes to a few tags (e.g. merging tags), where
+        per-project deltas would be more work than recounting.
+        """
+        tag_ids = list(set(tag_ids))
+        if not tag_ids:
+            return
+
+        await self.db.execute(
+            delete(TagCooccurrence).where(
+                or_(
+                    TagCooccurrence.tag_id.in_(tag_ids),
+                    TagCooccurrence.other_tag_id.in_(tag_ids),
+                )
+            )
+        )
+        await self.db.execute(
+            text(
+                COOCCURRENCE_REBUILD_SQL.format(where=REFRESH_PAIRS_WHERE)
+                + " ON CONFLICT (tag_id, other_tag_id) DO UPDATE"
+                " SET project_count = EXCLUDED.project_count"
+            ),
+            {"tag_ids": tag_ids},
+        )
+        await self.db.execute(
+            text(
+                USAGE_REBUILD_SQL.format(where=REFRESH_TAGS_WHERE)
+                + " ON CONFLICT (tag_id) DO UPDATE"
+                " SET usage_count = EXCLUDED.usage_count, updated_at = now()"
+            ),
+            {"tag_ids": tag_ids},
+        )
+
+    async def reconcile(self) -> dict[str, int]:
+        """
+        Rebuild both statistics tables from project_tags.
+
+        Returns:
+            Row counts written, for logging/monitoring.
+        """
+        # Block concurrent delta writers (readers are unaffected) so that
+        # their upserts land after the rebuild instead of conflicting with it
+        await self.db.execute(
+            text("LOCK TABLE tag_usage_stats, tag_cooccurrence IN EXCLUSIVE MODE")
+        )
+        await self.db.execute(delete(TagCooccurrence))
+        await self.db.execute(delete(TagUsageStat))
+        usage_result = await self.db.execute(text(USAGE_REBUILD_SQL.format(where="")))
+        pair_result = await self.db.execute(
+            text(COOCCURRENCE_REBUILD_SQL.format(where=""))
+        )
+
+        counts = {
+            "tags": usage_result.rowcount,
+            "pairs": pair_result.rowcount,
+        }
+        logger.info("tag_stats_reconciled", **counts)
+        return counts
+
+    async def get_popular_tags(
+        self,
+        tag_type: TagType | None = None,
+        limit: int = 10,
+    ) -> list[tuple[Tag, int]]:
+        """Most used tags, read from tag_usage_stats. Returns (tag, usage_count)."""
+        stmt = (
+            select(Tag, TagUsageStat.usage_count)
+            .join(TagUsageStat, TagUsageStat.tag_id == Tag.id)
+            .order_by(TagUsageStat.usage_count.desc(), Tag.name)
+            .limit(limit)
+        )
+        if tag_type:
+            stmt = stmt.where(Tag.type == tag_type)
+
+        result = await self.db.execute(stmt)
+        return [(row[0], row[1]) for row in result.all()]
+
+    async def get_cooccurring_tags(
+        self,
+        selected_tag_ids: list[UUID],
+        limit: int = 5,
+    ) -> list[tuple[Tag, int]]:
+        """
+        Tags most often used together with the selected tags.
+
+        Counts are summed over the selected tags, so a project carrying two
+        selected tags counts twice for a candidate. For a single selected tag
+        this is exactly the number of shared projects.
+
+        Returns list of (tag, co_occurrence_count).
+        """
+        if not selected_tag_ids:
+            return []
+
+        co_count = func.sum(TagCooccurrence.project_count)
+        stmt = (
+            select(Tag, co_count.label("co_count"))
+            .join(TagCooccurrence, TagCooccurrence.other_tag_id == Tag.id)
+            .where(TagCooccurrence.tag_id.in_(selected_tag_ids))
+            .where(~TagCooccurrence.other_tag_id.in_(selected_tag_ids))
+            .group_by(Tag.id)
+            .order_by(co_count.desc(), Tag.name)
+            .limit(limit)
+        )
+
+        result = await self.db.execute(stmt)
+        return [(row[0], int(row[1])) for row in result.all()]
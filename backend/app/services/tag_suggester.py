@@ -3,17 +3,22 @@
 from difflib import SequenceMatcher
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.tag import Tag, TagType
+from app.services.autocomplete_service import AutocompleteService, escape_like
+from app.services.tag_stats_service import TagStatsService
 
 
 class TagSuggester:
     """Service for suggesting tags with fuzzy matching and deduplication."""
 
-    # Minimum similarity score (0-1) for fuzzy matches
-    FUZZY_THRESHOLD = 0.6
+    # Minimum trigram similarity (0-1) for fuzzy matches
+    FUZZY_THRESHOLD = 0.3
+
+    # Candidates fetched per requested suggestion before in-memory ranking
+    CANDIDATE_MULTIPLIER = 3
 
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -42,17 +47,27 @@ class TagSuggester:
 
         query_lower = query.lower().strip()
 
-        # Build base query
-        stmt = select(Tag)
+        # Candidate lookup is served by the pg_trgm GIN index on tags.name,
+        # so only matching tags are loaded instead of the whole table
+        contains = Tag.name.ilike(f"%{escape_like(query_lower)}%", escape="\\")
+        similarity = func.similarity(Tag.name, query_lower)
+        condition = (
+            or_(contains, Tag.name.op("%")(query_lower)) if include_fuzzy else contains
+        )
+
+        stmt = select(Tag, similarity.label("similarity")).where(condition)
         if tag_type:
             stmt = stmt.where(Tag.type == tag_type)
+        stmt = stmt.order_by(contains.desc(), similarity.desc()).limit(
+            limit * self.CANDIDATE_MULTIPLIER
+        )
 
         result = await self.db.execute(stmt)
-        all_tags = result.scalars().all()
+        candidates = result.all()
 
         suggestions: list[tuple[Tag, float, str | None]] = []
 
-        for tag in all_tags:
+        for tag, trigram_similarity in candidates:
             tag_name_lower = tag.name.lower()
 
             # Exact match - highest priority
@@ -74,10 +89,10 @@ class TagSuggester:
                 continue
 
             # Fuzzy match - for catching typos
-            if include_fuzzy:
-                similarity = self._similarity(query_lower, tag_name_lower)
-                if similarity >= self.FUZZY_THRESHOLD:
-                    suggestions.append((tag, similarity, f"Did you mean '{tag.name}'?"))
+            if include_fuzzy and trigram_similarity >= self.FUZZY_THRESHOLD:
+                suggestions.append(
+                    (tag, float(trigram_similarity), f"Did you mean '{tag.name}'?")
+                )
 
         # Sort by score descending
         suggestions.sort(key=lambda x: x[1], reverse=True)
@@ -107,15 +122,13 @@ class TagSuggester:
         if existing:
             return existing
 
-        # Check for very similar names (typo detection)
-        stmt = select(Tag)
-        if tag_type:
-            stmt = stmt.where(Tag.type == tag_type)
-
-        result = await self.db.execute(stmt)
-        all_tags = result.scalars().all()
+        # Check for very similar names (typo detection) among trigram
+        # candidates only, rather than comparing against every tag
+        candidates = await AutocompleteService(self.db).find_similar_tags(
+            name, tag_type=tag_type
+        )
 
-        for tag in all_tags:
+        for tag, _score in candidates:
             similarity = self._similarity(name, tag.name)
             if similarity >= 0.85:  # Higher threshold for duplicate detection
                 return tag
@@ -130,27 +143,14 @@ class TagSuggester:
         """
         Get most frequently used tags.
 
+        Reads the materialised usage counters (see TagStatsService).
+
         Returns list of tuples: (tag, usage_count)
         """
-        from app.models.project import ProjectTag
-
-        # Count tag usage
-        stmt = (
-            select(Tag, func.count(ProjectTag.project_id).label("usage_count"))
-            .outerjoin(ProjectTag, Tag.id == ProjectTag.tag_id)
-            .group_by(Tag.id)
-            .order_by(func.count(ProjectTag.project_id).desc())
-            .limit(limit)
+        return await TagStatsService(self.db).get_popular_tags(
+            tag_type=tag_type, limit=limit
         )
 
-        if tag_type:
-            stmt = stmt.where(Tag.type == tag_type)
-
-        result = await self.db.execute(stmt)
-        rows = result.all()
-
-        return [(row[0], row[1]) for row in rows]
-
     async def get_cooccurrence_suggestions(
         self,
         selected_tag_ids: list[UUID],
@@ -160,38 +160,18 @@ class TagSuggester:
         Get tag suggestions based on co-occurrence with selected tags.
 
         Returns tags that frequently appear alongside the selected tags,
-        ordered by co-occurrence frequency.
+        ordered by co-occurrence frequency, from the materialised
+        co-occurrence table (see TagStatsService).
 
         Returns list of tuples: (tag, co_occurrence_count)
         """
         if not selected_tag_ids:
             return []
 
-        from sqlalchemy.orm import aliased
-
-        from app.models.project import ProjectTag
-
-        # Create aliases for the self-join
-        pt1 = aliased(ProjectTag)  # For selected tags
-        pt2 = aliased(ProjectTag)  # For co-occurring tags
-
-        # Query: Find tags that appear in the same projects as selected tags
-        stmt = (
-            select(Tag, func.count(pt1.project_id.distinct()).label("co_count"))
-            .join(pt2, pt2.tag_id == Tag.id)  # Join tags to pt2
-            .join(pt1, (pt1.project_id == pt2.project_id) & (pt1.tag_id != pt2.tag_id))
-            .where(pt1.tag_id.in_(selected_tag_ids))
-            .where(~Tag.id.in_(selected_tag_ids))  # Exclude already selected
-            .group_by(Tag.id)
-            .order_by(func.count(pt1.project_id.distinct()).desc())
-            .limit(limit)
+        return await TagStatsService(self.db).get_cooccurring_tags(
+            selected_tag_ids, limit=limit
         )
 
-        result = await self.db.execute(stmt)
-        rows = result.all()
-
-        return [(row[0], row[1]) for row in rows]
-
     async def merge_tags(
         self,
         source_tag_id: UUID,
@@ -242,7 +222,8 @@ class TagSuggester:
                 )
                 updated_count += 1
 
-        # Delete the source tag
+        # Delete the source tag (its statistics rows cascade)
         await self.db.execute(delete(Tag).where(Tag.id == source_tag_id))
+        await TagStatsService(self.db).refresh_tags([target_tag_id])
 
         return updated_count
@@ -3,13 +3,11 @@
 Provides CRUD operations for tag synonyms with transitive closure support.
 If A~B and B~C, then get_synonyms(A) returns {B, C}.
 
-Transitive Closure Algorithm:
+Transitive Closure:
 - Graph representation: Tags are nodes, TagSynonym records are bidirectional edges
-- Algorithm: Breadth-First Search (BFS) from the starting tag
-- Handles: Self-reference prevention (A~A not allowed), cycles (via visited set),
-           large synonym networks (iterative BFS avoids stack overflow)
-- Performance note: For very large synonym networks with thousands of connected tags,
-                   consider adding caching (e.g., Redis) in future versions.
+- Closure is precomputed as connected components in an in-process snapshot
+  (see synonym_index), so lookups do not walk the graph in the database
+- Writes are recorded on the session and applied to the snapshot on commit
 """
 
 from uuid import UUID
@@ -21,6 +19,14 @@ from app.core.logging import get_logger
 from app.models import Tag, TagSynonym
 from app.models.project import ProjectTag
 from app.schemas.tag import TagResponse, TagSynonymCreate, TagWithSynonyms
+from app.services.synonym_index import (
+    ADD,
+    DROP_TAG,
+    REMOVE,
+    get_synonym_index,
+    record_change,
+)
+from app.services.tag_stats_service import TagStatsService
 
 logger = get_logger(__name__)
 
@@ -39,63 +45,29 @@ class TagSynonymService:
     async def get_synonyms(self, tag_id: UUID) -> list[Tag]:
         """Get all synonyms for a tag (transitive closure).
 
-        Uses BFS to traverse the synonym graph and find all transitively
-        connected tags. If A~B and B~C, returns both B and C for get_synonyms(A).
+        If A~B and B~C, returns both B and C for get_synonyms(A).
 
         Args:
             tag_id: The tag to find synonyms for
 
         Returns:
-            List of all transitively connected tags (excluding the input tag)
-
-        Note:
-            For large synonym networks, consider implementing caching
-            as this method queries the database for each level of the graph.
+            List of all transitively connected tags (excluding the input tag),
+            ordered by name
         """
-        # BFS to find all connected tags
-        visited: set[UUID] = {tag_id}
-        queue: list[UUID] = [tag_id]
-        synonyms: list[Tag] = []
-
-        while queue:
-            current_id = queue.pop(0)
-
-            # Find direct synonyms (both directions since relationship is symmetric)
-            result = await self.db.execute(
-                select(TagSynonym).where(
-                    (TagSynonym.tag_id == current_id)
-                    | (TagSynonym.synonym_tag_id == current_id)
-                )
-            )
-            synonym_records = result.scalars().all()
-
-            for record in synonym_records:
-                # Get the "other" tag in the relationship
-                other_id = (
-                    record.synonym_tag_id
-                    if record.tag_id == current_id
-                    else record.tag_id
-                )
-
-                if other_id not in visited:
-                    visited.add(other_id)
-                    queue.append(other_id)
+        synonym_ids = await self.get_synonym_ids(tag_id)
+        if not synonym_ids:
+            return []
 
-                    # Fetch the actual tag
-                    tag_result = await self.db.execute(
-                        select(Tag).where(Tag.id == other_id)
-                    )
-                    tag = tag_result.scalar_one_or_none()
-                    if tag:
-                        synonyms.append(tag)
-
-        return synonyms
+        result = await self.db.execute(
+            select(Tag).where(Tag.id.in_(synonym_ids)).order_by(Tag.name)
+        )
+        return list(result.scalars().all())
 
     async def get_synonym_ids(self, tag_id: UUID) -> set[UUID]:
         """Get all synonym tag IDs for a tag (transitive closure).
 
-        Optimized version of get_synonyms() that returns only UUIDs,
-        avoiding full Tag object retrieval.
+        Lighter version of get_synonyms() that returns only UUIDs and needs
+        no database round trip once the synonym snapshot is loaded.
 
         Args:
             tag_id: The tag to find synonyms for
@@ -103,35 +75,8 @@ class TagSynonymService:
         Returns:
             Set of all transitively connected tag IDs (excluding the input tag)
         """
-        # BFS to find all connected tag IDs
-        visited: set[UUID] = {tag_id}
-        queue: list[UUID] = [tag_id]
-        synonym_ids: set[UUID] = set()
-
-        while queue:
-            current_id = queue.pop(0)
-
-            # Find direct synonyms (both directions since relationship is symmetric)
-            result = await self.db.execute(
-                select(TagSynonym.tag_id, TagSynonym.synonym_tag_id).where(
-                    (TagSynonym.tag_id == current_id)
-                    | (TagSynonym.synonym_tag_id == current_id)
-                )
-            )
-            rows = result.all()
-
-            for row in rows:
-                # Get the "other" tag in the relationship
-                other_id = (
-                    row.synonym_tag_id if row.tag_id == current_id else row.tag_id
-                )
-
-                if other_id not in visited:
-                    visited.add(other_id)
-                    queue.append(other_id)
-                    synonym_ids.add(other_id)
-
-        return synonym_ids
+        index = await get_synonym_index(self.db)
+        return index.synonyms_of(tag_id)
 
     async def expand_tag_ids_with_synonyms(
         self, tag_ids: list[UUID]
@@ -147,14 +92,12 @@ class TagSynonymService:
             - Dict mapping original tag_id -> set of synonym_ids added
               (for metadata/logging)
         """
-        expanded: set[UUID] = set(tag_ids)
-        synonym_map: dict[UUID, set[UUID]] = {}
+        index = await get_synonym_index(self.db)
+        synonym_map = index.expand(tag_ids)
 
-        for tag_id in tag_ids:
-            synonyms = await self.get_synonym_ids(tag_id)
-            if synonyms:
-                synonym_map[tag_id] = synonyms
-                expanded.update(synonyms)
+        expanded: set[UUID] = set(tag_ids)
+        for synonyms in synonym_map.values():
+            expanded.update(synonyms)
 
         logger.debug(
             "tag_ids_expanded_with_synonyms",
@@ -232,6 +175,7 @@ class TagSynonymService:
         )
         self.db.add(synonym)
         await self.db.flush()
+        record_change(self.db, ADD, tag_id, synonym_tag_id)
 
         logger.info(
             "synonym_created",
@@ -273,6 +217,7 @@ class TagSynonymService:
         deleted = result.rowcount > 0
 
         if deleted:
+            record_change(self.db, REMOVE, tag_id, synonym_tag_id)
             logger.info(
                 "synonym_removed",
                 tag_id=str(tag_id),
@@ -361,6 +306,8 @@ class TagSynonymService:
 
         # Delete source tag (cascades to TagSynonym via FK)
         await self.db.execute(delete(Tag).where(Tag.id == source_id))
+        record_change(self.db, DROP_TAG, source_id)
+        await TagStatsService(self.db).refresh_tags([target_id])
 
         logger.info(
             "tags_merged",
@@ -25,6 +25,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.server_timing import GRAPH, track_time
 from app.database import async_session_maker
 from app.models.team import Team, TeamMember
 from app.models.user import User
@@ -122,9 +123,10 @@ class TeamSyncService:
             try:
                 # Fetch group members using Graph API
                 # Returns DirectoryObject instances (users, groups, service principals)
-                members_response = await client.groups.by_group_id(
-                    group_id
-                ).members.get()
+                with track_time(GRAPH):
+                    members_response = await client.groups.by_group_id(
+                        group_id
+                    ).members.get()
 
                 if not members_response or not members_response.value:
                     return []
@@ -142,11 +144,12 @@ class TeamSyncService:
                 next_link = getattr(members_response, "odata_next_link", None)
                 while next_link:
                     # Use the next link to get more members
-                    members_response = (
-                        await client.groups.by_group_id(group_id)
-                        .members.with_url(next_link)
-                        .get()
-                    )
+                    with track_time(GRAPH):
+                        members_response = (
+                            await client.groups.by_group_id(group_id)
+                            .members.with_url(next_link)
+                            .get()
+                        )
                     if members_response and members_response.value:
                         for member in members_response.value:
                             odata_type = getattr(member, "odata_type", None)
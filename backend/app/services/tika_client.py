@@ -7,6 +7,7 @@ import httpx
 
 from app.config import get_settings
 from app.core.logging import get_logger
+from app.core.server_timing import UPSTREAM, track_time
 
 logger = get_logger(__name__)
 
@@ -77,14 +78,15 @@ class TikaClient:
 
         try:
             async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.put(
-                    f"{self._base_url}/tika",
-                    content=content,
-                    headers={
-                        "Content-Type": mime_type,
-                        "Accept": "text/plain; charset=utf-8",
-                    },
-                )
+                with track_time(UPSTREAM):
+                    response = await client.put(
+                        f"{self._base_url}/tika",
+                        content=content,
+                        headers={
+                            "Content-Type": mime_type,
+                            "Accept": "text/plain; charset=utf-8",
+                        },
+                    )
                 response.raise_for_status()
 
                 extracted_text = response.text
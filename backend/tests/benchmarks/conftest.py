@@ -0,0 +1,100 @@
+"""Fixtures and reporting for the micro-benchmark suite.
+
+Run with ``pytest tests/benchmarks --run-benchmarks``. Results are saved to
+``--benchmark-dir`` and compared with the previous saved run.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from tests.benchmarks.harness import (
+    BenchmarkResult,
+    find_regressions,
+    format_duration,
+    load_previous_run,
+    run_benchmark,
+    save_run,
+)
+
+results_key = pytest.StashKey[list[BenchmarkResult]]()
+report_key = pytest.StashKey[list[str]]()
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Callable[..., Any]:
+    """Time a callable and record the result for this test.
+
+    Usage::
+
+        def test_chunk_text(benchmark):
+            chunks = benchmark(service.chunk_text, text)
+            assert chunks
+
+    Returns the value of the last call so tests can assert on it.
+    """
+    results = request.config.stash.setdefault(results_key, [])
+    name = request.node.nodeid.split("/")[-1]
+
+    def bench(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        result, value = run_benchmark(name, func, *args, **kwargs)
+        results.append(result)
+        return value
+
+    return bench
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Save the run and compare it with the previous one."""
+    config = session.config
+    results = config.stash.get(results_key, [])
+    if not results:
+        return
+
+    directory = Path(config.rootpath) / config.getoption("--benchmark-dir")
+    previous = load_previous_run(directory)
+    path = save_run(directory, results)
+
+    lines = [
+        f"{'benchmark':<60} {'median':>10} {'min':>10} {'stddev':>10} {'rounds':>7}"
+    ]
+    for result in sorted(results, key=lambda r: r.name):
+        lines.append(
+            f"{result.name:<60} {format_duration(result.median):>10} "
+            f"{format_duration(result.min):>10} "
+            f"{format_duration(result.stddev):>10} {result.rounds:>7}"
+        )
+    lines.append(f"Saved to {path}")
+
+    if previous is None:
+        lines.append("No previous run to compare with.")
+    else:
+        threshold = config.getoption("--benchmark-threshold")
+        regressions = find_regressions(results, previous, threshold)
+        lines.append(
+            f"Compared with {previous['commit']} ({previous['timestamp']}): "
+            f"{len(regressions)} regression(s) over {threshold:.0%}"
+        )
+        for name, before, after in regressions:
+            lines.append(
+                f"  REGRESSION {name}: {format_duration(before)} -> "
+                f"{format_duration(after)} ({after / before - 1:+.0%})"
+            )
+        if regressions and config.getoption("--benchmark-fail-on-regression"):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    config.stash[report_key] = lines
+
+
+def pytest_terminal_summary(
+    terminalreporter: Any,
+    config: pytest.Config,
+) -> None:
+    """Print the benchmark table after the test summary."""
+    lines = config.stash.get(report_key, [])
+    if lines:
+        terminalreporter.section("benchmarks")
+        for line in lines:
+            terminalreporter.write_line(line)
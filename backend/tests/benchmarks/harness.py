@@ -0,0 +1,174 @@
+"""Minimal micro-benchmark harness.
+
+Each benchmark is calibrated so one round runs for at least
+``MIN_ROUND_SECONDS`` (many iterations of fast functions per round), then
+repeated for ``MAX_TIME_SECONDS`` or ``MIN_ROUNDS`` rounds, whichever takes
+longer. Statistics are per iteration.
+
+Runs are saved as JSON (one file per run, named by timestamp and git
+commit) and compared with the previous saved run, so a slowdown between
+commits shows up as a regression in the test summary.
+"""
+
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+MIN_ROUND_SECONDS = 0.005
+MIN_ROUNDS = 5
+MAX_TIME_SECONDS = 0.5
+MAX_ITERATIONS = 1_000_000
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-iteration timings of one benchmark, in seconds."""
+
+    name: str
+    rounds: int
+    iterations: int
+    min: float
+    median: float
+    mean: float
+    stddev: float
+
+
+def _round_timer(func: Callable[..., Any], args: tuple, kwargs: dict):
+    """Return ``run(iterations) -> (elapsed seconds, last result)``."""
+    if inspect.iscoroutinefunction(func):
+
+        async def run_async(iterations: int) -> tuple[float, Any]:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = await func(*args, **kwargs)
+            return time.perf_counter() - start, result
+
+        return lambda iterations: asyncio.run(run_async(iterations))
+
+    def run(iterations: int) -> tuple[float, Any]:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            result = func(*args, **kwargs)
+        return time.perf_counter() - start, result
+
+    return run
+
+
+def run_benchmark(
+    name: str,
+    func: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> tuple[BenchmarkResult, Any]:
+    """Benchmark ``func(*args, **kwargs)`` (sync or async).
+
+    Returns:
+        The timings and the value returned by the last call.
+    """
+    run = _round_timer(func, args, kwargs)
+
+    # Warm up and calibrate iterations per round
+    iterations = 1
+    elapsed, result = run(iterations)
+    while elapsed < MIN_ROUND_SECONDS and iterations < MAX_ITERATIONS:
+        iterations *= 10 if elapsed < MIN_ROUND_SECONDS / 10 else 2
+        elapsed, result = run(iterations)
+
+    timings: list[float] = []
+    deadline = time.perf_counter() + MAX_TIME_SECONDS
+    while len(timings) < MIN_ROUNDS or time.perf_counter() < deadline:
+        elapsed, result = run(iterations)
+        timings.append(elapsed / iterations)
+
+    return (
+        BenchmarkResult(
+            name=name,
+            rounds=len(timings),
+            iterations=iterations,
+            min=min(timings),
+            median=statistics.median(timings),
+            mean=statistics.fmean(timings),
+            stddev=statistics.stdev(timings),
+        ),
+        result,
+    )
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def save_run(directory: Path, results: list[BenchmarkResult]) -> Path:
+    """Write a run to ``directory`` and return its path."""
+    directory.mkdir(parents=True, exist_ok=True)
+    commit = _git_commit()
+    now = datetime.now(UTC)
+    path = directory / f"{now:%Y%m%dT%H%M%S}_{commit}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "timestamp": now.isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "benchmarks": {result.name: asdict(result) for result in results},
+            },
+            indent=2,
+        )
+    )
+    return path
+
+
+def load_previous_run(directory: Path) -> dict | None:
+    """The most recent saved run, if any."""
+    runs = sorted(directory.glob("*.json")) if directory.is_dir() else []
+    if not runs:
+        return None
+    return json.loads(runs[-1].read_text())
+
+
+def find_regressions(
+    results: list[BenchmarkResult],
+    previous: dict,
+    threshold: float,
+) -> list[tuple[str, float, float]]:
+    """Benchmarks whose fastest round slowed down by more than ``threshold``.
+
+    The minimum is compared rather than the median as it is the least
+    affected by other load on the machine.
+
+    Returns:
+        (name, previous min, current min) for each regression.
+    """
+    regressions = []
+    for result in results:
+        before = previous["benchmarks"].get(result.name)
+        if before and result.min > before["min"] * (1 + threshold):
+            regressions.append((result.name, before["min"], result.min))
+    return regressions
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable duration with a unit suited to its size."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
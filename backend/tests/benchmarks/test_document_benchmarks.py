@@ -0,0 +1,117 @@
+"""Micro-benchmarks for document chunking, tag suggestion and text extraction."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.tag import Tag
+from app.services.document_processor import DocumentProcessor
+from app.services.document_tag_suggester import DocumentTagSuggester
+from app.services.embedding_service import EmbeddingService
+from app.services.tag_matcher import TagMatcher
+from tests.fixtures import benchmark_corpus as corpus
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize("size", [100_000, 1_000_000], ids=["100KB", "1MB"])
+def test_chunk_text(benchmark, size):
+    """Split a large extracted text into overlapping chunks."""
+    text = corpus.generate_text(size)
+
+    chunks = benchmark(EmbeddingService().chunk_text, text)
+
+    assert len(chunks) > size // EmbeddingService().chunk_size_chars
+
+
+def test_extract_keywords(benchmark):
+    """Find frequent non-stop-words in a 200KB document."""
+    text = corpus.generate_text(200_000)
+
+    keywords = benchmark(DocumentTagSuggester(AsyncMock())._extract_keywords, text)
+
+    assert keywords
+
+
+def _tags() -> list[MagicMock]:
+    tags = []
+    for name in corpus.TAG_NAMES:
+        tag = MagicMock(spec=Tag)
+        tag.id = uuid4()
+        tag.name = name
+        tags.append(tag)
+    return tags
+
+
+def test_suggest_tags_from_text(benchmark):
+    """Keyword extraction, tag matcher scan and ranking for a 200KB document."""
+    tags = _tags()
+    matcher = TagMatcher.build(
+        [(tag.id, tag.name) for tag in tags], [(tags[0].id, tags[1].id)]
+    )
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = tags
+    db.execute.return_value = result
+    text = corpus.generate_text(200_000)
+
+    with patch(
+        "app.services.document_tag_suggester.get_tag_matcher",
+        new=AsyncMock(return_value=matcher),
+    ):
+        suggestions = benchmark(
+            DocumentTagSuggester(db).suggest_tags_from_text, text, limit=5
+        )
+
+    assert suggestions
+
+
+@pytest.mark.parametrize(
+    ("mime_type", "filename", "generate"),
+    [
+        pytest.param(
+            "application/pdf",
+            "report.pdf",
+            lambda: corpus.generate_pdf(5),
+            id="pdf-5pages",
+        ),
+        pytest.param(
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "report.docx",
+            lambda: corpus.generate_docx(200),
+            id="docx-200paragraphs",
+        ),
+        pytest.param(
+            "text/csv", "export.csv", lambda: corpus.generate_csv(5000), id="csv"
+        ),
+        pytest.param(
+            "text/plain",
+            "notes.txt",
+            lambda: corpus.generate_text(500_000).encode(),
+            id="txt-500KB",
+        ),
+    ],
+)
+def test_extract_text(benchmark, mime_type, filename, generate):
+    """Native text extraction for each supported format."""
+    content = generate()
+
+    text = benchmark(DocumentProcessor().extract_text, content, mime_type, filename)
+
+    assert len(text) > 1000
+
+
+def test_extract_text_xlsx(benchmark):
+    """Native text extraction for spreadsheets."""
+    pytest.importorskip("openpyxl")
+    content = corpus.generate_xlsx(2000)
+
+    text = benchmark(
+        DocumentProcessor().extract_text,
+        content,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "data.xlsx",
+    )
+
+    assert len(text) > 1000
@@ -0,0 +1,86 @@
+"""Micro-benchmarks for the streaming project CSV export."""
+
+import random
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.projects import _generate_projects_csv_rows
+from app.models.project import ProjectLocation, ProjectStatus
+from tests.fixtures.benchmark_corpus import SEED, TAG_NAMES, generate_text
+
+pytestmark = pytest.mark.benchmark
+
+LOCATION_LABELS = {
+    ProjectLocation.HEADQUARTERS: "Headquarters",
+    ProjectLocation.TEST_HOUSE: "Test House",
+    ProjectLocation.REMOTE: "Remote",
+    ProjectLocation.CLIENT_SITE: "Client Site",
+    ProjectLocation.OTHER: "Other",
+}
+
+
+def _project(index: int, rng: random.Random) -> SimpleNamespace:
+    # Plain objects rather than mocks, so attribute access costs what ORM
+    # instances' loaded attributes do
+    location = rng.choice(list(ProjectLocation))
+    return SimpleNamespace(
+        name=f"Project {index}",
+        organization=SimpleNamespace(name=f"Client {index % 40}"),
+        owner=SimpleNamespace(display_name=f"Owner {index % 12}"),
+        status=rng.choice(list(ProjectStatus)),
+        start_date=date(2024, 1 + index % 12, 1),
+        end_date=None,
+        location=location,
+        location_other="Partner lab" if location == ProjectLocation.OTHER else None,
+        description=generate_text(600),
+        project_tags=[
+            SimpleNamespace(tag=SimpleNamespace(name=name))
+            for name in rng.sample(TAG_NAMES, 4)
+        ],
+        billing_amount=Decimal("1250.00"),
+        invoice_count=index % 4,
+        billing_recipient="accounts@example.com",
+        billing_notes=None,
+        pm_notes="Weekly sync",
+        monday_url=None,
+        jira_url=f"https://jira.example.com/browse/NPD-{index}",
+        gitlab_url=None,
+        milestone_version="v1.2",
+        run_number=str(index),
+        created_at=datetime(2024, 1, 1, tzinfo=UTC),
+        updated_at=datetime(2024, 6, 1, tzinfo=UTC),
+    )
+
+
+def test_projects_csv_rows(benchmark):
+    """Stream 1000 projects (10 batches) as CSV rows."""
+    rng = random.Random(SEED)
+    projects = [_project(index, rng) for index in range(1000)]
+    batches = [projects[start : start + 100] for start in range(0, 1000, 100)]
+
+    def execute_factory():
+        results = []
+        for batch in [*batches, []]:
+            result = MagicMock()
+            result.scalars.return_value.unique.return_value.all.return_value = batch
+            results.append(result)
+        return AsyncMock(side_effect=results)
+
+    query = MagicMock()
+    query.offset.return_value.limit.return_value = query
+    db = AsyncMock()
+
+    async def export() -> int:
+        db.execute = execute_factory()
+        rows = 0
+        async for _row in _generate_projects_csv_rows(db, query, LOCATION_LABELS):
+            rows += 1
+        return rows
+
+    rows = benchmark(export)
+
+    assert rows == 1001
@@ -0,0 +1,135 @@
+"""Micro-benchmarks for search ranking, cache keys, caches and tag matching."""
+
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.models.tag import Tag, TagType
+from app.services.cache_service import InMemoryCache
+from app.services.embedding_service import InMemoryEmbeddingCache
+from app.services.search_cache import InMemorySearchCache, generate_cache_key
+from app.services.search_service import SearchService
+from app.services.tag_suggester import TagSuggester
+from tests.fixtures.benchmark_corpus import SEED, TAG_NAMES
+
+pytestmark = pytest.mark.benchmark
+
+CACHE_SIZE = 500
+
+
+def _ranking(project_ids: list, size: int, rng: random.Random) -> dict:
+    return {pid: rank for rank, pid in enumerate(rng.sample(project_ids, size), 1)}
+
+
+@pytest.mark.parametrize("candidates", [100, 2000])
+def test_rrf_fusion(benchmark, candidates):
+    """Fuse text, document and vector rankings of overlapping projects."""
+    rng = random.Random(SEED)
+    project_ids = [uuid4() for _ in range(candidates)]
+    rankings = [_ranking(project_ids, candidates // 2, rng) for _ in range(3)]
+    service = SearchService(AsyncMock())
+
+    scores = benchmark(service._rrf_scores, *rankings)
+
+    assert len(scores) <= candidates
+
+
+def test_generate_cache_key(benchmark):
+    """Normalize and hash a fully populated set of search parameters."""
+    tag_ids = [str(uuid4()) for _ in range(5)]
+
+    key = benchmark(
+        generate_cache_key,
+        "  Acoustic Chamber Calibration ",
+        ["active", "approved"],
+        str(uuid4()),
+        tag_ids,
+        str(uuid4()),
+        "relevance",
+        "desc",
+        3,
+        20,
+        facets=["status", "tags", "organization"],
+    )
+
+    assert key
+
+
+def _keys(count: int) -> list[str]:
+    rng = random.Random(SEED)
+    # Zipf-like mix: a hot set of keys plus a long tail causing evictions
+    return [
+        f"key:{rng.randint(0, 50) if rng.random() < 0.8 else rng.randint(0, 5000)}"
+        for _ in range(count)
+    ]
+
+
+async def _cache_workload(cache, keys: list[str], value) -> None:
+    for key in keys:
+        if await cache.get(key) is None:
+            await cache.set(key, value)
+
+
+@pytest.mark.parametrize(
+    "cache_factory",
+    [
+        pytest.param(lambda: InMemoryCache(maxsize=CACHE_SIZE), id="cache_service"),
+        pytest.param(
+            lambda: InMemorySearchCache(maxsize=CACHE_SIZE), id="search_cache"
+        ),
+        pytest.param(
+            lambda: InMemoryEmbeddingCache(maxsize=CACHE_SIZE), id="embedding_cache"
+        ),
+    ],
+)
+def test_in_memory_cache_lru(benchmark, cache_factory):
+    """1000 get-or-set operations against a full LRU cache."""
+    cache = cache_factory()
+    warm = [f"warm:{index}" for index in range(CACHE_SIZE)]
+    asyncio.run(_cache_workload(cache, warm, {}))
+    keys = _keys(1000)
+
+    benchmark(_cache_workload, cache, keys, {"items": [0.1] * 8})
+
+    assert cache.stats["size"] == CACHE_SIZE
+
+
+def _tag_candidates(count: int) -> list[tuple[Tag, float]]:
+    rng = random.Random(SEED)
+    candidates = []
+    for index in range(count):
+        tag = MagicMock(spec=Tag)
+        tag.name = f"{rng.choice(TAG_NAMES)} {index}"
+        candidates.append((tag, rng.random()))
+    return candidates
+
+
+def test_tag_suggester_ranking(benchmark):
+    """Rank trigram candidates into exact, prefix, contains and fuzzy matches."""
+    db = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = _tag_candidates(30)
+    db.execute.return_value = result
+    suggester = TagSuggester(db)
+
+    suggestions = benchmark(
+        suggester.suggest_tags, "acoustcs", tag_type=TagType.TECHNOLOGY, limit=10
+    )
+
+    assert len(suggestions) <= 10
+
+
+def test_tag_similarity(benchmark):
+    """Duplicate-detection similarity against a batch of candidate names."""
+    suggester = TagSuggester(AsyncMock())
+    names = [tag.name for tag, _ in _tag_candidates(50)]
+
+    def compare_all() -> list[float]:
+        return [suggester._similarity("Microphone Aray", name) for name in names]
+
+    scores = benchmark(compare_all)
+
+    assert len(scores) == 50
@@ -0,0 +1,131 @@
+"""Shared pytest fixtures."""
+
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.circuit_breaker import reset_circuit_breakers
+from app.core.ollama_scheduler import reset_ollama_scheduler
+from app.core.query_stats import QueryStats, track_queries
+from app.services.cache_service import reset_caches
+from app.services.entity_index import EntityIndex, reset_entity_index
+from app.services.nl_query_rules import reset_query_entity_index
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Options for the micro-benchmark suite (see tests/benchmarks)."""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run tests marked 'benchmark' (skipped by default).",
+    )
+    group.addoption(
+        "--benchmark-dir",
+        default=".benchmarks",
+        help="Directory for saved benchmark runs (default: .benchmarks).",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.25,
+        help="Slowdown of a benchmark's fastest round versus the previous run "
+        "reported as a regression (default: 0.25 = 25%%).",
+    )
+    group.addoption(
+        "--benchmark-fail-on-regression",
+        action="store_true",
+        default=False,
+        help="Exit non-zero when a benchmark regressed.",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip benchmarks unless --run-benchmarks is given."""
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark (use --run-benchmarks)")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_state() -> Iterator[None]:
+    """Keep caches, circuit breakers and Ollama admission state from leaking
+    between tests (e.g. a cached query parse from another test's mocked LLM).
+    """
+    reset_caches()
+    reset_circuit_breakers()
+    reset_ollama_scheduler()
+    reset_entity_index()
+    reset_query_entity_index()
+    yield
+    reset_caches()
+    reset_circuit_breakers()
+    reset_ollama_scheduler()
+    reset_entity_index()
+    reset_query_entity_index()
+
+
+@pytest.fixture
+def entity_index() -> Iterator[AsyncMock]:
+    """Serve entity resolution from an index built by the test.
+
+    Patches ``get_entity_index`` (empty index by default) so services do not
+    load the index from their mocked session. Set ``.return_value`` to an
+    ``EntityIndex.build(...)`` to resolve known names.
+    """
+    loader = AsyncMock(return_value=EntityIndex.build([], []))
+    with patch("app.services.entity_index.get_entity_index", loader):
+        yield loader
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., AbstractContextManager[QueryStats]]:
+    """Assert how many SQL statements a block issues.
+
+    Usage::
+
+        async def test_project_list_budget(query_budget):
+            async with AsyncClient(transport=ASGITransport(app=app), ...) as client:
+                with query_budget(6, max_repeats=1):
+                    await client.get("/api/v1/projects")
+
+    Statements are counted on instrumented engines (the application engine
+    is instrumented on import), so budgets need a real database; mocked
+    sessions issue no statements. Call the app in the test's own task
+    (httpx ``ASGITransport``) - ``TestClient`` runs it in another thread,
+    outside the budget's context. The list, detail and search budgets are
+    in tests/performance/test_query_plans.py.
+
+    Args (of the returned context manager):
+        max_statements: Maximum statements the block may issue.
+        max_repeats: Maximum executions of any single statement fingerprint
+            (catches N+1 loops that stay under the total budget).
+    """
+
+    @contextmanager
+    def budget(
+        max_statements: int, max_repeats: int | None = None
+    ) -> Iterator[QueryStats]:
+        with track_queries("query_budget", aggregate=False) as stats:
+            yield stats
+
+        assert stats.count <= max_statements, (
+            f"Query budget exceeded: {stats.count} statements "
+            f"(budget {max_statements}):\n"
+            + "\n".join(f"{n}x {fp}" for fp, n in stats.fingerprints.most_common())
+        )
+        if max_repeats is not None:
+            repeated = stats.repeated(max_repeats)
+            assert not repeated, "Statements repeated above budget:\n" + "\n".join(
+                f"{n}x {fp}" for fp, n in repeated
+            )
+
+    return budget
@@ -0,0 +1,130 @@
+"""Deterministic document corpus for the micro-benchmarks.
+
+Documents are generated from a fixed seed so every run benchmarks the same
+input without storing binary files in the repository. PDF and DOCX files are
+written with PyMuPDF and python-docx.
+"""
+
+import csv
+import io
+import random
+from functools import cache
+
+SEED = 20240601
+
+VOCABULARY = (
+    "acoustic anechoic chamber measurement microphone calibration frequency "
+    "response loudspeaker amplifier headphone impedance distortion harmonic "
+    "firmware bluetooth codec latency bandwidth prototype validation test "
+    "report client project milestone deliverable schedule budget invoice "
+    "engineering design review noise vibration sensor array beamforming "
+    "signal processing algorithm filter equalizer gain threshold compliance "
+    "certification regulatory thermal enclosure mechanical assembly"
+).split()
+
+TAG_NAMES = (
+    "Acoustics",
+    "Anechoic Chamber",
+    "Audio Codec",
+    "Beamforming",
+    "Bluetooth",
+    "Calibration",
+    "Compliance Testing",
+    "Firmware",
+    "Frequency Response",
+    "Headphones",
+    "Loudspeaker Design",
+    "Microphone Array",
+    "Noise Reduction",
+    "Signal Processing",
+    "Thermal Analysis",
+    "Vibration",
+)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(VOCABULARY, k=rng.randint(8, 20))
+    return " ".join(words).capitalize() + rng.choice((". ", ". ", "? ", ".\n"))
+
+
+@cache
+def generate_text(size: int) -> str:
+    """Prose of about ``size`` characters with sentence and line breaks."""
+    rng = random.Random(SEED + size)
+    parts: list[str] = []
+    length = 0
+    while length < size:
+        sentence = _sentence(rng)
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)
+
+
+def generate_table(rows: int, columns: int = 6) -> list[list[str]]:
+    """Table of words and numbers, with a header row."""
+    rng = random.Random(SEED + rows)
+    header = [f"Column {i}" for i in range(1, columns + 1)]
+    body = [
+        [
+            rng.choice(VOCABULARY) if column % 2 else str(rng.randint(1, 10_000))
+            for column in range(columns)
+        ]
+        for _ in range(rows)
+    ]
+    return [header, *body]
+
+
+@cache
+def generate_pdf(pages: int) -> bytes:
+    """PDF with a page of prose per page."""
+    import fitz
+
+    doc = fitz.open()
+    text = generate_text(pages * 2500)
+    for page_number in range(pages):
+        page = doc.new_page()
+        chunk = text[page_number * 2500 : (page_number + 1) * 2500]
+        page.insert_textbox(fitz.Rect(50, 50, 545, 790), chunk, fontsize=9)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+@cache
+def generate_docx(paragraphs: int, table_rows: int = 50) -> bytes:
+    """DOCX with prose paragraphs followed by a table."""
+    from docx import Document
+
+    doc = Document()
+    rng = random.Random(SEED + paragraphs)
+    for _ in range(paragraphs):
+        doc.add_paragraph("".join(_sentence(rng) for _ in range(4)))
+
+    rows = generate_table(table_rows)
+    table = doc.add_table(rows=len(rows), cols=len(rows[0]))
+    for row, values in zip(table.rows, rows, strict=True):
+        for cell, value in zip(row.cells, values, strict=True):
+            cell.text = value
+
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+@cache
+def generate_csv(rows: int) -> bytes:
+    """CSV export of a generated table."""
+    output = io.StringIO()
+    csv.writer(output).writerows(generate_table(rows))
+    return output.getvalue().encode()
+
+
+@cache
+def generate_xlsx(rows: int) -> bytes:
+    """XLSX workbook with one sheet (needs openpyxl)."""
+    import pandas as pd
+
+    table = generate_table(rows)
+    output = io.BytesIO()
+    pd.DataFrame(table[1:], columns=table[0]).to_excel(output, index=False)
+    return output.getvalue()
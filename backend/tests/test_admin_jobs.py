@@ -273,3 +273,66 @@ class TestCancelJob:
 
             assert response.status_code == 404
             assert "cannot be cancelled" in response.json()["detail"]
+
+
+class TestImportJobs:
+    """Tests for the /api/v1/admin/import/jobs endpoints."""
+
+    def test_upload_enqueues_bulk_import_job(self):
+        """An uploaded file should be stored and imported by a job."""
+        app, admin_user = create_test_app_with_admin()
+        mock_job = create_mock_job(job_type=JobType.BULK_IMPORT)
+
+        with (
+            patch("app.api.admin.JobService") as mock_service_class,
+            patch("app.core.storage.StorageService") as mock_storage_class,
+        ):
+            mock_service = AsyncMock()
+            mock_service.create_job.return_value = mock_job
+            mock_service_class.return_value = mock_service
+            mock_storage_class.return_value.save_file = AsyncMock(
+                return_value="upload/projects.xlsx"
+            )
+
+            client = TestClient(app)
+            response = client.post(
+                "/api/v1/admin/import/jobs?skip_invalid=false",
+                files={"file": ("projects.xlsx", b"data", "application/octet-stream")},
+            )
+
+            assert response.status_code == 202
+            assert response.json()["id"] == str(mock_job.id)
+            kwargs = mock_service.create_job.call_args.kwargs
+            assert kwargs["job_type"] == JobType.BULK_IMPORT
+            assert kwargs["payload"] == {
+                "file_path": "upload/projects.xlsx",
+                "filename": "projects.xlsx",
+                "user_id": str(admin_user.id),
+                "skip_invalid": False,
+            }
+
+    def test_upload_rejects_other_file_types(self):
+        """Only CSV and XLSX files should be accepted."""
+        app, _ = create_test_app_with_admin()
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/admin/import/jobs",
+            files={"file": ("projects.txt", b"data", "text/plain")},
+        )
+
+        assert response.status_code == 400
+
+    def test_get_import_job_ignores_other_job_types(self):
+        """Only bulk import jobs should be returned."""
+        app, _ = create_test_app_with_admin()
+
+        with patch("app.api.admin.JobService") as mock_service_class:
+            mock_service = AsyncMock()
+            mock_service.get_job.return_value = create_mock_job()
+            mock_service_class.return_value = mock_service
+
+            client = TestClient(app)
+            response = client.get(f"/api/v1/admin/import/jobs/{uuid4()}")
+
+            assert response.status_code == 404
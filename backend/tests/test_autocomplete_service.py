@@ -0,0 +1,176 @@
+"""Tests for trigram-backed autocomplete suggestions."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.tag import Tag, TagType
+from app.services.autocomplete_service import (
+    AutocompleteService,
+    escape_like,
+    trigram_match,
+)
+from app.services.tag_suggester import TagSuggester
+
+
+def _mock_db(rows):
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    mock_db.execute.return_value = mock_result
+    return mock_db
+
+
+def _compiled_sql(mock_db) -> str:
+    stmt = mock_db.execute.call_args[0][0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _tag(name: str) -> Tag:
+    return Tag(id=uuid4(), name=name, type=TagType.TECHNOLOGY)
+
+
+class TestEscapeLike:
+    """Tests for LIKE wildcard escaping."""
+
+    def test_escapes_wildcards(self):
+        assert escape_like("50%_off") == "50\\%\\_off"
+
+    def test_escapes_backslash(self):
+        assert escape_like("a\\b") == "a\\\\b"
+
+
+class TestTrigramMatch:
+    """Tests for the trigram match expression."""
+
+    def test_uses_prefix_and_word_similarity(self):
+        condition, score = trigram_match(Tag.name, "pyth")
+        sql = str(condition.compile(dialect=postgresql.dialect()))
+        score_sql = str(score.compile(dialect=postgresql.dialect()))
+
+        assert "ILIKE" in sql
+        assert "<%" in sql
+        assert "word_similarity" in score_sql
+
+
+class TestAutocompleteService:
+    """Tests for AutocompleteService queries."""
+
+    @pytest.mark.asyncio
+    async def test_short_query_returns_empty(self):
+        mock_db = _mock_db([])
+        service = AutocompleteService(mock_db)
+
+        assert await service.suggest_project_names("a") == []
+        assert await service.suggest_organizations("") == []
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_project_names_respect_acl(self):
+        row = MagicMock()
+        row.name = "Radar Test"
+        row.score = 0.95
+        mock_db = _mock_db([row])
+        service = AutocompleteService(mock_db)
+
+        results = await service.suggest_project_names(
+            "rad", limit=5, accessible_ids={uuid4()}
+        )
+
+        assert results == [("Radar Test", 0.95)]
+        sql = _compiled_sql(mock_db)
+        assert "projects.id IN" in sql
+        assert "LIMIT" in sql
+
+    @pytest.mark.asyncio
+    async def test_organizations_match_aliases(self):
+        mock_db = _mock_db([])
+        service = AutocompleteService(mock_db)
+
+        await service.suggest_organizations("acme")
+
+        sql = _compiled_sql(mock_db)
+        assert "npd_array_to_text" in sql
+        assert "greatest" in sql
+
+    @pytest.mark.asyncio
+    async def test_contacts_match_name_and_email(self):
+        mock_db = _mock_db([])
+        service = AutocompleteService(mock_db)
+
+        await service.suggest_contacts("jane", organization_id=uuid4())
+
+        sql = _compiled_sql(mock_db)
+        assert "contacts.name" in sql
+        assert "contacts.email" in sql
+        assert "contacts.organization_id" in sql
+
+    @pytest.mark.asyncio
+    async def test_find_similar_tags_uses_similarity_operator(self):
+        mock_db = _mock_db([])
+        service = AutocompleteService(mock_db)
+
+        await service.find_similar_tags("Pyhton", tag_type=TagType.TECHNOLOGY)
+
+        sql = _compiled_sql(mock_db)
+        assert "tags.name %" in sql
+        assert "similarity(" in sql
+
+
+class TestTagSuggesterTrigram:
+    """Tests for TagSuggester using trigram candidates."""
+
+    @pytest.mark.asyncio
+    async def test_suggest_tags_ranks_candidates(self):
+        exact = _tag("Python")
+        prefix = _tag("Python Scripting")
+        fuzzy = _tag("Pyhton")
+        mock_db = _mock_db([(prefix, 0.5), (exact, 1.0), (fuzzy, 0.4)])
+        suggester = TagSuggester(mock_db)
+
+        results = await suggester.suggest_tags("python")
+
+        assert [r[0] for r in results] == [exact, prefix, fuzzy]
+        assert results[0][1] == 1.0
+        assert results[2][2] == "Did you mean 'Pyhton'?"
+
+    @pytest.mark.asyncio
+    async def test_suggest_tags_does_not_load_all_tags(self):
+        mock_db = _mock_db([])
+        suggester = TagSuggester(mock_db)
+
+        await suggester.suggest_tags("pyth", limit=5)
+
+        sql = _compiled_sql(mock_db)
+        assert "WHERE" in sql
+        assert "LIMIT" in sql
+
+    @pytest.mark.asyncio
+    async def test_suggest_tags_without_fuzzy_skips_similarity_operator(self):
+        mock_db = _mock_db([])
+        suggester = TagSuggester(mock_db)
+
+        await suggester.suggest_tags("pyth", include_fuzzy=False)
+
+        sql = _compiled_sql(mock_db)
+        assert "tags.name %" not in sql
+
+    @pytest.mark.asyncio
+    async def test_check_duplicate_uses_trigram_candidates(self):
+        similar = _tag("Kubernetes")
+        mock_db = AsyncMock()
+        exact_result = MagicMock()
+        exact_result.scalar_one_or_none.return_value = None
+        mock_db.execute.return_value = exact_result
+        suggester = TagSuggester(mock_db)
+
+        with patch(
+            "app.services.tag_suggester.AutocompleteService.find_similar_tags",
+            AsyncMock(return_value=[(similar, 0.7)]),
+        ) as mock_find:
+            duplicate = await suggester.check_duplicate("Kubernets")
+
+        assert duplicate is similar
+        mock_find.assert_called_once()
@@ -662,3 +662,124 @@ class TestCacheFactoryFunctions:
             assert cs._tag_cache is None
             assert cs._org_cache is None
             assert cs._dashboard_cache is None
+
+
+class TestCacheGeneration:
+    """Tests for shared cache generation counters."""
+
+    def teardown_method(self):
+        """Reset caches after each test."""
+        reset_caches()
+
+    @pytest.mark.asyncio
+    async def test_local_generation_bumps(self):
+        """Without Redis the generation should be a local counter."""
+        from app.services.cache_service import CacheGeneration
+
+        generation = CacheGeneration("tags")
+
+        assert await generation.get() == 0
+        assert await generation.bump() == 1
+        assert await generation.get() == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_generation_uses_incr(self):
+        """With Redis the generation should be shared via INCR."""
+        from app.services.cache_service import CacheGeneration
+
+        generation = CacheGeneration("tags", redis_url="redis://localhost:6379")
+        mock_client = AsyncMock()
+        mock_client.incr.return_value = 7
+        mock_client.get.return_value = "7"
+        generation._client = mock_client
+
+        assert await generation.bump() == 7
+        assert await generation.get() == 7
+        mock_client.incr.assert_called_once_with("gen:tags")
+
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_to_local(self):
+        """Redis errors should fall back to the local counter."""
+        import redis
+
+        from app.services.cache_service import CacheGeneration
+
+        generation = CacheGeneration("tags", redis_url="redis://localhost:6379")
+        mock_client = AsyncMock()
+        mock_client.incr.side_effect = redis.exceptions.ConnectionError("down")
+        mock_client.get.side_effect = redis.exceptions.ConnectionError("down")
+        generation._client = mock_client
+
+        assert await generation.bump() == 1
+        assert await generation.get() == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tag_cache_bumps_generation(self):
+        """invalidate_tag_cache should advance the tags generation."""
+        from app.services.cache_service import (
+            get_cache_generation,
+            invalidate_tag_cache,
+        )
+
+        with patch("app.services.cache_service.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                is_redis_configured=False,
+                tag_cache_ttl=3600,
+            )
+
+            before = await get_cache_generation("tags").get()
+            await invalidate_tag_cache()
+
+            assert await get_cache_generation("tags").get() == before + 1
+
+    @pytest.mark.asyncio
+    async def test_session_invalidation_bumps_after_commit(self):
+        """With a session, generations advance only once it commits."""
+        import asyncio
+
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        import app.services.cache_service as cs
+
+        with patch("app.services.cache_service.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                is_redis_configured=False,
+                tag_cache_ttl=3600,
+                org_cache_ttl=3600,
+            )
+            db = AsyncSession()
+            await cs.invalidate_tag_cache(db)
+            await cs.invalidate_org_cache(db)
+
+            # A reader between flush and commit still sees the old rows
+            assert await cs.get_cache_generation("tags").get() == 0
+            assert await cs.get_cache_generation("orgs").get() == 0
+            await cs.get_tag_cache().set("tags:all", ["stale"])
+
+            await db.commit()
+            await asyncio.gather(*cs._background_tasks)
+
+            assert await cs.get_cache_generation("tags").get() == 1
+            assert await cs.get_cache_generation("orgs").get() == 1
+            assert await cs.get_tag_cache().get("tags:all") is None
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_invalidation_is_discarded(self):
+        """A rolled back change should not bump the generation."""
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        import app.services.cache_service as cs
+
+        with patch("app.services.cache_service.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                is_redis_configured=False,
+                tag_cache_ttl=3600,
+            )
+            db = AsyncSession()
+            await db.begin()
+            await cs.invalidate_tag_cache(db)
+            await db.rollback()
+            await db.commit()
+
+            assert not cs._background_tasks
+            assert await cs.get_cache_generation("tags").get() == 0
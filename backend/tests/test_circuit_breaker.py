@@ -0,0 +1,397 @@
+"""Tests for upstream circuit breakers and their use around Ollama calls."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    get_circuit_breakers,
+    get_ollama_breaker,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock | None = None, **kwargs) -> CircuitBreaker:
+    options = {
+        "failure_threshold": 3,
+        "slow_call_ms": 1000.0,
+        "slow_call_rate": 0.5,
+        "window_size": 10,
+        "open_seconds": 30.0,
+        "clock": clock or FakeClock(),
+    }
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+async def fail(breaker: CircuitBreaker) -> None:
+    with pytest.raises(httpx.ConnectError):
+        async with breaker.guard():
+            raise httpx.ConnectError("refused")
+
+
+async def succeed(breaker: CircuitBreaker) -> None:
+    async with breaker.guard():
+        pass
+
+
+def record_latency(breaker: CircuitBreaker, latency_ms: float, count: int) -> None:
+    for _ in range(count):
+        breaker._record(latency_ms, success=True)
+
+
+class TestCircuitBreakerStates:
+    """Opening, fast failure and half-open probing."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self):
+        """Breaker should open after failure_threshold failures in a row."""
+        breaker = make_breaker()
+
+        await fail(breaker)
+        await fail(breaker)
+        assert breaker.state == CircuitState.CLOSED
+
+        await fail(breaker)
+        assert breaker.state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_success_resets_consecutive_failures(self):
+        """A success between failures should keep the breaker closed."""
+        breaker = make_breaker(slow_call_rate=1.0)
+
+        for _ in range(3):
+            await fail(breaker)
+            await fail(breaker)
+            await succeed(breaker)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_opens_when_calls_are_slow(self):
+        """Breaker should open when too many calls in the window are slow."""
+        breaker = make_breaker()
+
+        record_latency(breaker, 50, 3)
+        record_latency(breaker, 5000, 3)
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_needs_minimum_calls_before_slow_rate_trips(self):
+        """A single slow call should not open the breaker."""
+        breaker = make_breaker()
+
+        record_latency(breaker, 5000, 1)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast_without_calling(self):
+        """An open breaker should raise without running the guarded block."""
+        breaker = make_breaker()
+        for _ in range(3):
+            await fail(breaker)
+
+        called = False
+        with pytest.raises(CircuitOpenError) as exc_info:
+            async with breaker.guard():
+                called = True
+
+        assert called is False
+        assert exc_info.value.retry_after == pytest.approx(30.0)
+        assert breaker.stats["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_success_closes(self):
+        """After open_seconds, a successful probe should close the breaker."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            await fail(breaker)
+
+        clock.now += 30
+        assert breaker.state == CircuitState.HALF_OPEN
+
+        await succeed(breaker)
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_failure_reopens(self):
+        """A failed probe should open the breaker for another period."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            await fail(breaker)
+
+        clock.now += 30
+        await fail(breaker)
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.stats["times_opened"] == 2
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_single_probe(self):
+        """Only one call should be let through while half-open."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            await fail(breaker)
+        clock.now += 30
+
+        async with breaker.guard():
+            with pytest.raises(CircuitOpenError):
+                async with breaker.guard():
+                    pass
+
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_check_rejects_without_claiming_probe(self):
+        """check() should reject while open but leave the probe to guard()."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            await fail(breaker)
+
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+        clock.now += 30
+        breaker.check()
+        breaker.check()
+        async with breaker.guard():
+            with pytest.raises(CircuitOpenError):
+                breaker.check()
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.stats["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_breaker_never_opens(self):
+        """A disabled breaker should pass every call through."""
+        breaker = make_breaker(enabled=False)
+
+        for _ in range(10):
+            await fail(breaker)
+
+        assert breaker.state == CircuitState.CLOSED
+        await succeed(breaker)
+
+
+class TestAdaptiveTimeout:
+    """Per-call timeout derived from recent latency."""
+
+    def test_uses_ceiling_without_enough_samples(self):
+        """Timeout should be the ceiling until enough calls were seen."""
+        breaker = make_breaker()
+        record_latency(breaker, 100, 5)
+
+        assert breaker.timeout(60.0) == 60.0
+
+    def test_scales_with_p95_latency(self):
+        """Timeout should be a multiple of the p95 latency."""
+        breaker = make_breaker(timeout_multiplier=4.0, min_timeout_seconds=0.5)
+        record_latency(breaker, 500, 20)
+
+        assert breaker.timeout(60.0) == pytest.approx(2.0)
+
+    def test_clamped_to_minimum_and_ceiling(self):
+        """Timeout should stay between the minimum and the ceiling."""
+        fast = make_breaker(min_timeout_seconds=2.0)
+        record_latency(fast, 10, 20)
+        assert fast.timeout(60.0) == 2.0
+
+        slow = make_breaker(slow_call_ms=100_000.0)
+        record_latency(slow, 20_000, 20)
+        assert slow.timeout(30.0) == 30.0
+
+
+class TestOllamaBreakerRegistry:
+    """Worker-wide breakers for Ollama operations."""
+
+    def test_breakers_are_shared_per_operation(self):
+        """The same operation should always get the same breaker."""
+        embeddings = get_ollama_breaker("embeddings")
+
+        assert get_ollama_breaker("embeddings") is embeddings
+        assert get_ollama_breaker("chat") is not embeddings
+        assert set(get_circuit_breakers()) == {"ollama.embeddings", "ollama.chat"}
+
+    def test_slow_batch_embeddings_do_not_open_breakers(self):
+        """Slow ingest embeddings must not cut off query embeddings."""
+        batch = get_ollama_breaker("embeddings.batch")
+        embeddings = get_ollama_breaker("embeddings")
+
+        record_latency(batch, 60_000, 20)
+
+        assert batch is not embeddings
+        assert batch.state == CircuitState.CLOSED
+        assert embeddings.state == CircuitState.CLOSED
+
+
+class TestOllamaCallers:
+    """Embedding and search behaviour while the breaker is open."""
+
+    @pytest.mark.asyncio
+    async def test_embedding_skips_http_when_open(self):
+        """An open breaker should skip the Ollama request entirely."""
+        from app.services import embedding_service
+        from app.services.embedding_service import (
+            EmbeddingService,
+            FallbackEmbeddingCache,
+        )
+
+        embedding_service._embedding_cache = FallbackEmbeddingCache(
+            redis_url=None, maxsize=10
+        )
+        breaker = get_ollama_breaker("embeddings")
+        for _ in range(breaker.failure_threshold):
+            await fail(breaker)
+
+        with patch("httpx.AsyncClient") as MockClient:
+            service = EmbeddingService()
+            result = await service.generate_embedding("open circuit")
+
+        assert result is None
+        assert service.last_failure == "circuit_open"
+        MockClient.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_rejects_without_queueing_for_slot(self):
+        """While open, calls should fail before waiting in the lane queue."""
+        import asyncio
+
+        from app.core.ollama_scheduler import OllamaPriority, OllamaScheduler
+        from app.services import embedding_service
+        from app.services.embedding_service import (
+            EmbeddingService,
+            FallbackEmbeddingCache,
+        )
+
+        embedding_service._embedding_cache = FallbackEmbeddingCache(
+            redis_url=None, maxsize=10
+        )
+        breaker = get_ollama_breaker("embeddings")
+        for _ in range(breaker.failure_threshold):
+            await fail(breaker)
+
+        # The only interactive slot is held by an in-flight call
+        scheduler = OllamaScheduler(interactive_concurrency=1)
+        release = asyncio.Event()
+
+        async def in_flight_call():
+            async with scheduler.slot(OllamaPriority.INTERACTIVE):
+                await release.wait()
+
+        holder = asyncio.create_task(in_flight_call())
+        await asyncio.sleep(0)
+        try:
+            with patch.object(
+                embedding_service, "get_ollama_scheduler", return_value=scheduler
+            ):
+                service = EmbeddingService()
+                result = await asyncio.wait_for(
+                    service.generate_embedding("open circuit"), 1
+                )
+        finally:
+            release.set()
+            await holder
+
+        assert result is None
+        assert service.last_failure == "circuit_open"
+        assert scheduler.stats["interactive"]["admitted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_embedding_failures_open_breaker(self):
+        """Connection errors should count against the embeddings breaker."""
+        from app.services import embedding_service
+        from app.services.embedding_service import (
+            EmbeddingService,
+            FallbackEmbeddingCache,
+        )
+
+        embedding_service._embedding_cache = FallbackEmbeddingCache(
+            redis_url=None, maxsize=10
+        )
+        breaker = get_ollama_breaker("embeddings")
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = httpx.ConnectError("refused")
+
+        with patch("httpx.AsyncClient") as MockClient:
+            mock_context = AsyncMock()
+            mock_context.__aenter__.return_value = mock_client
+            mock_context.__aexit__.return_value = None
+            MockClient.return_value = mock_context
+
+            service = EmbeddingService()
+            for i in range(breaker.failure_threshold):
+                assert await service.generate_embedding(f"query {i}") is None
+                assert service.last_failure == "error"
+
+        assert breaker.state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_batch_embeddings_use_their_own_breaker(self):
+        """Batch embeddings should not be refused when the query breaker is open."""
+        from app.core.ollama_scheduler import OllamaPriority
+        from app.services import embedding_service
+        from app.services.embedding_service import (
+            EmbeddingService,
+            FallbackEmbeddingCache,
+        )
+
+        embedding_service._embedding_cache = FallbackEmbeddingCache(
+            redis_url=None, maxsize=10
+        )
+        breaker = get_ollama_breaker("embeddings")
+        for _ in range(breaker.failure_threshold):
+            await fail(breaker)
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"embedding": [0.1] * 768}
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        with patch("httpx.AsyncClient") as MockClient:
+            mock_context = AsyncMock()
+            mock_context.__aenter__.return_value = mock_client
+            mock_context.__aexit__.return_value = None
+            MockClient.return_value = mock_context
+
+            service = EmbeddingService(priority=OllamaPriority.BATCH)
+            result = await service.generate_embedding("document chunk")
+
+        assert result == [0.1] * 768
+        assert service.last_failure is None
+        assert breaker.state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_search_records_skipped_vector_source(self):
+        """Vector ranking should be reported as skipped when embeddings fail."""
+        from app.services.search_service import SearchService
+
+        mock_db = AsyncMock()
+        mock_exists_result = MagicMock()
+        mock_exists_result.scalar.return_value = True
+        mock_db.execute.return_value = mock_exists_result
+
+        service = SearchService(mock_db)
+        service.embedding_service = MagicMock()
+        service.embedding_service.generate_embedding = AsyncMock(return_value=None)
+        service.embedding_service.last_failure = "circuit_open"
+
+        result = await service._get_vector_ranks("test query", [])
+
+        assert result == {}
+        assert service.skipped_sources == {"vector": "circuit_open"}
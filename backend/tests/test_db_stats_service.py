@@ -0,0 +1,203 @@
+"""Tests for Postgres statistics and connection pool instrumentation."""
+
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.pool_stats import InstrumentedQueuePool, pool_status
+from app.services.cache_service import reset_caches
+from app.services.db_stats_service import (
+    DatabaseStatsService,
+    search_index_status,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache():
+    """Use a fresh in-memory stats cache per test."""
+    reset_caches()
+    yield
+    reset_caches()
+
+
+def _mappings(rows: list[dict]) -> MagicMock:
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = rows
+    return result
+
+
+def _index_row(**overrides) -> dict:
+    row = {
+        "table_name": "document_chunks",
+        "index_name": "ix_document_chunks_embedding",
+        "method": "hnsw",
+        "idx_scan": 120,
+        "idx_tup_read": 4000,
+        "size_bytes": 8192,
+        "is_unique": False,
+        "is_primary": False,
+        "is_valid": True,
+        "table_live_tuples": 900,
+        "table_dead_tuples": 100,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestStatementStats:
+    """Tests for pg_stat_statements reporting."""
+
+    @pytest.mark.asyncio
+    async def test_extension_not_installed(self):
+        """Test that a missing extension is reported, not raised."""
+        db = AsyncMock()
+        db.scalar.return_value = False
+
+        stats = await DatabaseStatsService(db).get_statement_stats()
+
+        assert stats["available"] is False
+        assert "not installed" in stats["reason"]
+        db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_statements_normalised_and_cached(self):
+        """Test statement rows are fingerprinted and served from cache."""
+        db = AsyncMock()
+        db.scalar.return_value = True
+        db.begin_nested = MagicMock(return_value=AsyncMock())
+        db.execute.return_value = _mappings(
+            [
+                {
+                    "queryid": 42,
+                    "query": "SELECT * FROM projects WHERE name = 'Acme'",
+                    "calls": 10,
+                    "rows": 10,
+                    "total_exec_time": 1234.5678,
+                    "mean_exec_time": 123.45678,
+                    "max_exec_time": 400.0,
+                    "shared_blks_hit": 90,
+                    "shared_blks_read": 10,
+                    "temp_blks_written": 0,
+                }
+            ]
+        )
+        service = DatabaseStatsService(db)
+
+        stats = await service.get_statement_stats(limit=5, order_by="mean_time")
+        await service.get_statement_stats(limit=5, order_by="mean_time")
+
+        assert stats["available"] is True
+        [statement] = stats["statements"]
+        assert statement["query_id"] == "42"
+        assert statement["query"] == "SELECT * FROM projects WHERE name = ?"
+        assert statement["total_ms"] == 1234.57
+        assert statement["cache_hit_ratio"] == 0.9
+        assert "ORDER BY mean_exec_time DESC" in str(db.execute.call_args.args[0])
+        assert db.execute.await_count == 1
+
+
+class TestStorageStats:
+    """Tests for table and index reporting."""
+
+    @pytest.mark.asyncio
+    async def test_tables_get_their_indexes_and_health(self):
+        """Test indexes are grouped under tables and search indexes assessed."""
+        db = AsyncMock()
+        db.execute.side_effect = [
+            _mappings(
+                [
+                    {
+                        "table_name": "document_chunks",
+                        "total_bytes": 100,
+                        "table_bytes": 60,
+                        "index_bytes": 40,
+                        "toast_bytes": 0,
+                        "live_tuples": 900,
+                        "dead_tuples": 100,
+                        "seq_scan": 3,
+                        "idx_scan": 120,
+                        "last_autovacuum": None,
+                        "last_autoanalyze": None,
+                    }
+                ]
+            ),
+            _mappings([_index_row(), _index_row(table_name="projects")]),
+            _mappings([_index_row(), _index_row(method="gin", idx_scan=0)]),
+            _mappings([]),
+            _mappings([_index_row()]),
+        ]
+
+        stats = await DatabaseStatsService(db).get_storage_stats()
+
+        [table] = stats["tables"]
+        assert table["dead_tuple_ratio"] == 0.1
+        assert [i["table_name"] for i in table["indexes"]] == ["document_chunks"]
+        assert [i["status"] for i in stats["search_indexes"]] == ["ok", "unused"]
+        assert stats["most_scanned_indexes"][0]["dead_tuple_ratio"] == 0.1
+
+
+class TestSearchIndexStatus:
+    """Tests for HNSW/GIN health assessment."""
+
+    @pytest.mark.parametrize(
+        ("overrides", "expected"),
+        [
+            ({}, "ok"),
+            ({"is_valid": False}, "invalid"),
+            ({"idx_scan": 0}, "unused"),
+            ({"dead_tuple_ratio": 0.5}, "needs_vacuum"),
+        ],
+    )
+    def test_status(self, overrides, expected):
+        """Test each health state."""
+        index = {"is_valid": True, "idx_scan": 5, "dead_tuple_ratio": 0.01}
+        index.update(overrides)
+
+        assert search_index_status(index) == expected
+
+
+class TestPoolStats:
+    """Tests for pool checkout wait instrumentation."""
+
+    @pytest.fixture
+    def engine(self):
+        """SQLite engine on a one-connection instrumented pool."""
+        engine = create_engine(
+            "sqlite://",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.2,
+        )
+        yield engine
+        engine.dispose()
+
+    def test_reports_live_usage(self, engine):
+        """Test checked-out counts and checkout totals."""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            status = pool_status(engine.pool)
+
+        assert status["checked_out"] == 1
+        assert status["overflow"] == 0
+        assert status["max_overflow"] == 0
+        assert status["checkouts"] == 1
+        assert status["timeouts"] == 0
+
+    def test_records_wait_and_timeouts(self, engine):
+        """Test that waiting for a busy pool is measured."""
+        conn = engine.connect()
+        release = threading.Timer(0.05, conn.close)
+        release.start()
+        with engine.connect():
+            pass
+        release.join()
+
+        with engine.connect(), pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        status = pool_status(engine.pool)
+        assert status["max_wait_ms"] >= 40
+        assert status["timeouts"] == 1
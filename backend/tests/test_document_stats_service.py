@@ -0,0 +1,247 @@
+"""Tests for document processing stage timings and analytics."""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import OllamaServiceError
+from app.models.document import DocumentChunk, DocumentProcessingRun
+from app.services.cache_service import reset_caches
+from app.services.document_processing_task import _process_document_content
+from app.services.document_queue_service import is_retryable_error
+from app.services.document_stats_service import (
+    STAGES,
+    DocumentStageTimer,
+    DocumentStatsService,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache():
+    """Use a fresh in-memory stats cache per test."""
+    reset_caches()
+    yield
+    reset_caches()
+
+
+def _document() -> MagicMock:
+    document = MagicMock()
+    document.id = uuid4()
+    document.mime_type = "text/plain"
+    document.file_size = 2048
+    document.display_name = "notes.txt"
+    return document
+
+
+def _mock_db() -> AsyncMock:
+    db = AsyncMock()
+    db.add = MagicMock()
+    return db
+
+
+def _recorded_run(db: AsyncMock) -> DocumentProcessingRun:
+    runs = [
+        call.args[0]
+        for call in db.add.call_args_list
+        if isinstance(call.args[0], DocumentProcessingRun)
+    ]
+    assert len(runs) == 1
+    return runs[0]
+
+
+def _analytics_row(**overrides) -> dict:
+    row = {
+        "mime_type": "application/pdf",
+        "size_bucket": "100KB-1MB",
+        "documents": 12,
+        "completed": 10,
+        "failed": 2,
+        "completed_bytes": Decimal(5_000_000),
+        "completed_ms": 20_000.0,
+        "chunks": 80,
+        "embedding_requests": 60,
+        "embedding_cache_hits": 15,
+        "embeddings_reused": 5,
+        "total_p50": 1500.123,
+        "total_p95": 4200.0,
+    }
+    for stage in STAGES:
+        row[f"{stage}_p50"] = 10.0
+        row[f"{stage}_p95"] = None
+    row.update(overrides)
+    return row
+
+
+class TestDocumentStageTimer:
+    """Tests for collecting stage timings."""
+
+    def test_stages_accumulate_and_map_to_columns(self):
+        """Test that repeated stages add up and become run columns."""
+        timer = DocumentStageTimer()
+        with timer.stage("embedding"):
+            pass
+        first = timer.stage_ms["embedding"]
+        with timer.stage("embedding"):
+            pass
+        timer.embeddings_reused = 2
+
+        run = timer.to_run(_document(), "completed", text_length=10, chunk_count=3)
+
+        assert timer.stage_ms["embedding"] >= first
+        assert run.embedding_ms is not None
+        assert run.extraction_ms is None
+        assert run.embeddings_reused == 2
+        assert run.mime_type == "text/plain"
+        assert run.total_ms >= run.embedding_ms
+
+
+class TestProcessDocumentContent:
+    """Tests for stage timings recorded by the processing pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_completed_run_recorded_with_reuse(self):
+        """Test that each stage is timed and duplicate chunks are reused."""
+        db = _mock_db()
+        document = _document()
+        timer = DocumentStageTimer()
+        with timer.stage("storage_read"):
+            pass
+
+        with (
+            patch(
+                "app.services.document_processing_task.DocumentProcessor.extract_text",
+                new=AsyncMock(return_value="short text"),
+            ),
+            patch(
+                "app.services.document_processing_task.EmbeddingService.chunk_text",
+                return_value=["header", "body", "header"],
+            ),
+            patch(
+                "app.services.embedding_service.EmbeddingService.generate_embedding",
+                new=AsyncMock(return_value=[0.1] * 768),
+            ) as mock_embed,
+        ):
+            await _process_document_content(db, document, b"short text", timer)
+
+        run = _recorded_run(db)
+        assert run.status == "completed"
+        assert run.extraction_method == "native"
+        assert run.chunk_count == 3
+        assert run.embeddings_reused == 1
+        assert mock_embed.await_count == 2
+        for column in ("storage_read", "extraction", "chunking", "embedding"):
+            assert getattr(run, f"{column}_ms") is not None
+        assert run.db_write_ms is not None
+        assert run.tag_suggestion_ms is None  # Text too short for suggestions
+        db.flush.assert_awaited_once()
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_run_recorded(self):
+        """Test that a failing extraction still records its timings."""
+        db = _mock_db()
+        document = _document()
+
+        with patch(
+            "app.services.document_processing_task.DocumentProcessor.extract_text",
+            new=AsyncMock(side_effect=ValueError("corrupt file")),
+        ):
+            await _process_document_content(db, document, b"\x00")
+
+        run = _recorded_run(db)
+        assert run.status == "failed"
+        assert run.extraction_ms is not None
+        assert run.chunk_count == 0
+        assert document.processing_status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_unavailable_embeddings_fail_for_retry(self):
+        """Test that no chunks are stored while Ollama is unavailable."""
+        db = _mock_db()
+        document = _document()
+
+        async def circuit_open(service, text):
+            service.last_failure = "circuit_open"
+            return None
+
+        with (
+            patch(
+                "app.services.document_processing_task.DocumentProcessor.extract_text",
+                new=AsyncMock(return_value="short text"),
+            ),
+            patch(
+                "app.services.document_processing_task.EmbeddingService.chunk_text",
+                return_value=["header", "body"],
+            ),
+            patch(
+                "app.services.embedding_service.EmbeddingService.generate_embedding",
+                new=circuit_open,
+            ),
+            pytest.raises(OllamaServiceError) as exc_info,
+        ):
+            await _process_document_content(db, document, b"short text")
+
+        assert is_retryable_error(str(exc_info.value))
+        assert not any(
+            isinstance(call.args[0], DocumentChunk) for call in db.add.call_args_list
+        )
+        assert _recorded_run(db).status == "failed"
+        assert document.processing_status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_unsupported_type_recorded_as_skipped(self):
+        """Test that skipped documents are recorded but not timed."""
+        db = _mock_db()
+        document = _document()
+        document.mime_type = "image/png"
+
+        await _process_document_content(db, document, b"png")
+
+        assert _recorded_run(db).status == "skipped"
+
+
+class TestProcessingAnalytics:
+    """Tests for aggregating runs."""
+
+    @pytest.mark.asyncio
+    async def test_groups_and_overall_row(self):
+        """Test that the overall row is separated and rates are derived."""
+        db = AsyncMock()
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = [
+            _analytics_row(mime_type=None, size_bucket=None, completed=20),
+            _analytics_row(),
+        ]
+        db.execute.return_value = result
+
+        analytics = await DocumentStatsService(db).get_processing_analytics(hours=10)
+
+        assert analytics["window_hours"] == 10
+        assert analytics["overall"]["docs_per_hour"] == 2.0
+        group = analytics["groups"][0]
+        assert group["mime_type"] == "application/pdf"
+        assert group["docs_per_hour"] == 1.0
+        assert group["bytes_per_second"] == 250_000.0
+        assert group["total_p50_ms"] == 1500.12
+        assert [stage["stage"] for stage in group["stages"]] == list(STAGES)
+        assert group["stages"][0] == {
+            "stage": "storage_read",
+            "p50_ms": 10.0,
+            "p95_ms": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_results_cached(self):
+        """Test that repeated requests within the TTL hit the cache."""
+        db = AsyncMock()
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = []
+        db.execute.return_value = result
+        service = DocumentStatsService(db)
+
+        await service.get_processing_analytics(hours=24)
+        await service.get_processing_analytics(hours=24)
+
+        assert db.execute.await_count == 1
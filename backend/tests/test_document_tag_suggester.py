@@ -5,7 +5,18 @@ from uuid import uuid4
 
 import pytest
 
+from app.services.cache_service import reset_caches
 from app.services.document_tag_suggester import STOP_WORDS, DocumentTagSuggester
+from app.services.tag_matcher import reset_tag_matcher
+
+
+@pytest.fixture(autouse=True)
+def reset_matcher():
+    """Each test builds its own tag matcher from its mocked tags."""
+    reset_caches()
+    reset_tag_matcher()
+    yield
+    reset_tag_matcher()
 
 
 class TestKeywordExtraction:
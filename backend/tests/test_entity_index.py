@@ -0,0 +1,147 @@
+"""Tests for the shared entity resolution index."""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.models.tag import TagType
+from app.services.entity_index import (
+    EntityIndex,
+    EntityResolver,
+    get_entity_index,
+)
+
+ACME_ID = uuid4()
+GLOBEX_ID = uuid4()
+INITECH_ID = uuid4()
+IOT_TECH_ID = uuid4()
+IOT_DOMAIN_ID = uuid4()
+USER_ID = uuid4()
+
+
+def make_index() -> EntityIndex:
+    return EntityIndex.build(
+        organizations=[
+            (ACME_ID, "Acme Corp", ["Acme", "Globex"], "m-1"),
+            (GLOBEX_ID, "Globex", ["Umbrella"], None),
+            (INITECH_ID, "Initech", ["Umbrella"], None),
+        ],
+        tags=[
+            (IOT_DOMAIN_ID, "IoT", TagType.DOMAIN),
+            (IOT_TECH_ID, "IoT", TagType.TECHNOLOGY),
+        ],
+        users=[(USER_ID, "Jane.Doe@Example.com")],
+    )
+
+
+class TestEntityIndexBuild:
+    """Lookup keys built from names, aliases, tags and emails."""
+
+    def test_names_and_aliases_are_case_insensitive(self):
+        """Names and aliases should resolve regardless of case and padding."""
+        index = make_index()
+
+        assert index.organizations["acme corp"] == ACME_ID
+        assert index.organizations["acme"] == ACME_ID
+        assert index.organizations_by_monday_id["m-1"] == ACME_ID
+        assert index.users["jane.doe@example.com"] == USER_ID
+
+    def test_name_wins_over_alias(self):
+        """An alias equal to another organization's name should not shadow it."""
+        assert make_index().organizations["globex"] == GLOBEX_ID
+
+    def test_shared_alias_is_ambiguous(self):
+        """An alias shared by two organizations should resolve to neither."""
+        assert "umbrella" not in make_index().organizations
+
+    def test_technology_tag_wins_shared_name(self):
+        """A name used by several tag types should resolve to the technology tag."""
+        assert make_index().tags["iot"] == IOT_TECH_ID
+
+
+class TestEntityResolver:
+    """Per-session resolution on top of the shared index."""
+
+    def test_resolves_without_queries(self):
+        """Known names should be dictionary lookups."""
+        db = AsyncMock()
+        resolver = EntityResolver(db, make_index())
+
+        assert resolver.organization_id("  ACME ") == ACME_ID
+        assert resolver.organization_id("Acme", aliases=False) is None
+        assert resolver.tag_id("iot") == IOT_TECH_ID
+        db.execute.assert_not_called()
+
+    def test_remembers_entities_created_in_session(self):
+        """Entities created during a session should resolve in that session."""
+        resolver = EntityResolver(AsyncMock(), make_index())
+        org_id, tag_id = uuid4(), uuid4()
+
+        resolver.add_organization("New Org", org_id)
+        resolver.add_tag("New Tag", tag_id)
+
+        assert resolver.organization_id("new org") == org_id
+        assert resolver.tag_id("NEW TAG") == tag_id
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_email_asked_once(self):
+        """Emails missing from the index should be looked up once."""
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+        db.execute.return_value = result
+        resolver = EntityResolver(db, make_index())
+
+        assert await resolver.user_id("jane.doe@example.com") == USER_ID
+        assert await resolver.user_id("new@example.com") is None
+        assert await resolver.user_id("NEW@example.com") is None
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_has_organization_checks_database_for_new_ids(self):
+        """IDs newer than the snapshot should be confirmed in the database."""
+        db = AsyncMock()
+        db.get.return_value = None
+        resolver = EntityResolver(db, make_index())
+
+        assert await resolver.has_organization(ACME_ID) is True
+        assert await resolver.has_organization(uuid4()) is False
+        db.get.assert_awaited_once()
+
+
+class TestEntityIndexCache:
+    """The process-wide index follows the tags/orgs cache generations."""
+
+    @staticmethod
+    def make_db() -> AsyncMock:
+        db = AsyncMock()
+        results = []
+        for rows in (
+            [(ACME_ID, "Acme", None, None)],
+            [(IOT_TECH_ID, "IoT", TagType.TECHNOLOGY)],
+            [(USER_ID, "jane@example.com")],
+        ):
+            result = MagicMock()
+            result.all.return_value = rows
+            results.append(result)
+        db.execute.side_effect = results * 2
+        return db
+
+    @pytest.mark.asyncio
+    async def test_index_reused_until_generation_bump(self):
+        """The index should only be reloaded after tags or orgs change."""
+        from app.services.cache_service import get_cache_generation
+
+        db = self.make_db()
+
+        first = await get_entity_index(db)
+        assert await get_entity_index(db) is first
+        assert db.execute.await_count == 3
+        assert first.organizations["acme"] == ACME_ID
+
+        await get_cache_generation("orgs").bump()
+        rebuilt = await get_entity_index(db)
+
+        assert rebuilt is not first
+        assert db.execute.await_count == 6
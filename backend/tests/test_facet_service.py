@@ -0,0 +1,271 @@
+"""Tests for facet counts computed with a GROUPING SETS query."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import exists, select
+from sqlalchemy.dialects import postgresql
+
+from app.models.project import Project, ProjectStatus, ProjectTag
+from app.schemas.project import ProjectFacet, ProjectFacets
+from app.services.facet_service import FacetService
+
+
+def _row(**values):
+    """Build a result row exposing a _mapping like SQLAlchemy Row."""
+    row = MagicMock()
+    row._mapping = values
+    return row
+
+
+def _mock_db(rows):
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    mock_db.execute.return_value = mock_result
+    return mock_db
+
+
+def _compiled_sql(mock_db) -> str:
+    stmt = mock_db.execute.call_args[0][0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestFacetQuery:
+    """Tests for the generated facet statement."""
+
+    @pytest.mark.asyncio
+    async def test_all_facets_use_single_grouping_sets_query(self):
+        """All requested facets should be computed in one statement."""
+        mock_db = _mock_db([])
+        service = FacetService(mock_db)
+
+        await service.get_facets(
+            [ProjectFacet.STATUS, ProjectFacet.ORGANIZATION, ProjectFacet.TAG],
+            filter_conditions=[Project.status == ProjectStatus.ACTIVE],
+        )
+
+        mock_db.execute.assert_called_once()
+        sql = _compiled_sql(mock_db)
+        assert "GROUPING SETS" in sql
+        assert "count(DISTINCT projects.id)" in sql
+        assert "LEFT OUTER JOIN project_tags" in sql
+        assert "projects.status = " in sql
+
+    @pytest.mark.asyncio
+    async def test_tag_join_only_when_tag_facet_requested(self):
+        """project_tags should not be joined unless the tag facet is requested."""
+        mock_db = _mock_db([])
+        service = FacetService(mock_db)
+
+        await service.get_facets([ProjectFacet.STATUS])
+
+        sql = _compiled_sql(mock_db)
+        assert "project_tags" not in sql
+        assert "organizations" not in sql
+
+    @pytest.mark.asyncio
+    async def test_tag_filter_with_tag_facet(self):
+        """Tag EXISTS filters (GET /projects?tag_ids=...) must survive the tag join."""
+        mock_db = _mock_db([])
+        service = FacetService(mock_db)
+        # Same correlated filter list_projects builds per tag_id
+        tag_filter = exists(
+            select(ProjectTag.project_id).where(
+                ProjectTag.project_id == Project.id,
+                ProjectTag.tag_id == uuid4(),
+            )
+        )
+        query = select(Project).where(tag_filter)
+
+        await service.get_facets(
+            [ProjectFacet.TAG], filter_conditions=[query.whereclause]
+        )
+
+        sql = _compiled_sql(mock_db)
+        assert "LEFT OUTER JOIN project_tags" in sql
+        assert "projects.id IN (SELECT projects.id" in sql
+        assert "WHERE EXISTS (SELECT project_tags.project_id" in sql
+
+    @pytest.mark.asyncio
+    async def test_candidate_ids_restrict_query(self):
+        """Explicit candidate IDs should be used as the result set."""
+        mock_db = _mock_db([])
+        service = FacetService(mock_db)
+
+        await service.get_facets([ProjectFacet.STATUS], project_ids=[uuid4()])
+
+        sql = _compiled_sql(mock_db)
+        assert "projects.id IN" in sql
+
+    @pytest.mark.asyncio
+    async def test_empty_candidate_set_skips_query(self):
+        """An empty candidate set should return empty facets without a query."""
+        mock_db = _mock_db([])
+        service = FacetService(mock_db)
+
+        facets = await service.get_facets(
+            [ProjectFacet.STATUS, ProjectFacet.TAG], project_ids=[]
+        )
+
+        mock_db.execute.assert_not_called()
+        assert facets.status == []
+        assert facets.tag == []
+        assert facets.organization is None
+
+    @pytest.mark.asyncio
+    async def test_no_facets_returns_empty(self):
+        """No requested facets should not hit the database."""
+        mock_db = _mock_db([])
+        service = FacetService(mock_db)
+
+        facets = await service.get_facets([])
+
+        mock_db.execute.assert_not_called()
+        assert facets == ProjectFacets()
+
+
+class TestFacetBuckets:
+    """Tests for mapping grouped rows to facet buckets."""
+
+    @pytest.mark.asyncio
+    async def test_rows_are_split_by_grouping_set(self):
+        """Rows should be assigned to facets using the grouping() flags."""
+        org_id = uuid4()
+        tag_id = uuid4()
+        rows = [
+            _row(
+                status=ProjectStatus.ACTIVE,
+                g_status=0,
+                organization_id=None,
+                organization_name=None,
+                g_organization=1,
+                tag_id=None,
+                tag_name=None,
+                g_tag=1,
+                count=4,
+            ),
+            _row(
+                status=None,
+                g_status=1,
+                organization_id=org_id,
+                organization_name="Acme",
+                g_organization=0,
+                tag_id=None,
+                tag_name=None,
+                g_tag=1,
+                count=3,
+            ),
+            _row(
+                status=None,
+                g_status=1,
+                organization_id=None,
+                organization_name=None,
+                g_organization=1,
+                tag_id=tag_id,
+                tag_name="Python",
+                g_tag=0,
+                count=2,
+            ),
+            # Projects without tags produce a NULL tag bucket
+            _row(
+                status=None,
+                g_status=1,
+                organization_id=None,
+                organization_name=None,
+                g_organization=1,
+                tag_id=None,
+                tag_name=None,
+                g_tag=0,
+                count=1,
+            ),
+        ]
+        service = FacetService(_mock_db(rows))
+
+        facets = await service.get_facets(list(ProjectFacet))
+
+        assert [(b.value, b.count) for b in facets.status] == [("active", 4)]
+        assert [(b.value, b.label, b.count) for b in facets.organization] == [
+            (str(org_id), "Acme", 3)
+        ]
+        assert [(b.value, b.label, b.count) for b in facets.tag] == [
+            (str(tag_id), "Python", 2)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_buckets_sorted_by_count_desc(self):
+        """Buckets should be ordered by count descending."""
+        rows = [
+            _row(status=ProjectStatus.ACTIVE, g_status=0, count=1),
+            _row(status=ProjectStatus.COMPLETED, g_status=0, count=5),
+        ]
+        service = FacetService(_mock_db(rows))
+
+        facets = await service.get_facets([ProjectFacet.STATUS])
+
+        assert [b.value for b in facets.status] == ["completed", "active"]
+
+
+class TestSearchServiceFacets:
+    """Tests for facet integration in SearchService."""
+
+    @pytest.mark.asyncio
+    async def test_filter_only_search_computes_facets(self):
+        """Searches without a query should compute facets over filters."""
+        from app.services.search_service import SearchService
+
+        service = SearchService(AsyncMock())
+        expected = ProjectFacets(status=[])
+
+        with (
+            patch.object(
+                service, "_search_without_query", AsyncMock(return_value=([], 0))
+            ),
+            patch(
+                "app.services.search_service.FacetService.get_facets",
+                AsyncMock(return_value=expected),
+            ) as mock_get_facets,
+        ):
+            await service.search_projects(query="", facets=[ProjectFacet.STATUS])
+
+        assert service.last_facets is expected
+        mock_get_facets.assert_called_once()
+        assert "filter_conditions" in mock_get_facets.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_text_search_uses_candidate_ids(self):
+        """Text searches should compute facets over the fused candidate set."""
+        from app.services.search_service import SearchService
+
+        service = SearchService(AsyncMock())
+        candidate_ids = [uuid4(), uuid4()]
+
+        async def fake_hybrid_search(**kwargs):
+            service._candidate_ids = candidate_ids
+            return [], 2
+
+        with (
+            patch.object(service, "_hybrid_search", side_effect=fake_hybrid_search),
+            patch(
+                "app.services.search_service.FacetService.get_facets",
+                AsyncMock(return_value=ProjectFacets()),
+            ) as mock_get_facets,
+        ):
+            await service.search_projects(query="radar", facets=[ProjectFacet.TAG])
+
+        assert mock_get_facets.call_args.kwargs["project_ids"] == candidate_ids
+
+    @pytest.mark.asyncio
+    async def test_no_facets_requested_leaves_none(self):
+        """Facets should stay None when not requested."""
+        from app.services.search_service import SearchService
+
+        service = SearchService(AsyncMock())
+
+        with patch.object(
+            service, "_search_without_query", AsyncMock(return_value=([], 0))
+        ):
+            await service.search_projects(query="")
+
+        assert service.last_facets is None
@@ -1,69 +1,113 @@
-"""Tests for import service tag resolution.
+"""Tests for import service tag resolution, bulk commit and file imports.
 
 Bug fix for GitHub Issue #69: CSV import drops unknown tags instead of creating freeform tags.
 """
 
+import io
+import zipfile
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
+from xml.sax.saxutils import escape
 
 import pytest
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
 
+from app.config import get_settings
+from app.models.project import ProjectLocation
 from app.models.tag import TagType
+from app.schemas.import_ import ImportCommitResult, ImportRowUpdate
+from app.services.entity_index import EntityIndex
 from app.services.import_service import ImportService
 
+PYTHON_TAG_ID = uuid4()
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _params(stmt) -> dict:
+    return stmt.compile(dialect=postgresql.dialect()).params
+
 
 class TestResolveTagsMethod:
     """Tests for _resolve_tags method."""
 
     @pytest.fixture
     def mock_db(self):
-        """Create a mock database session."""
+        """Create a mock database session answering tag INSERT ... RETURNING."""
         db = AsyncMock()
+
+        async def execute(stmt):
+            result = MagicMock()
+            result.all.return_value = [
+                (uuid4(), name)
+                for key, name in _params(stmt).items()
+                if key.startswith("name")
+            ]
+            return result
+
+        db.execute.side_effect = execute
         return db
 
     @pytest.fixture
-    def import_service(self, mock_db):
-        """Create an import service instance."""
+    def import_service(self, mock_db, entity_index):
+        """Create an import service resolving against a 'Python' tag."""
+        entity_index.return_value = EntityIndex.build(
+            organizations=[],
+            tags=[(PYTHON_TAG_ID, "Python", TagType.TECHNOLOGY)],
+        )
         return ImportService(mock_db)
 
     @pytest.mark.asyncio
     async def test_resolve_existing_tag_returns_id(self, import_service, mock_db):
-        """Existing tags should return their IDs."""
-        existing_tag = MagicMock()
-        existing_tag.id = uuid4()
-
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = existing_tag
-        mock_db.execute.return_value = mock_result
-
+        """Existing tags should return their IDs without a query."""
         tag_ids = await import_service._resolve_tags(["Python"])
 
-        assert len(tag_ids) == 1
-        assert tag_ids[0] == existing_tag.id
+        assert tag_ids == [PYTHON_TAG_ID]
+        mock_db.execute.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_resolve_unknown_tag_creates_freeform(self, import_service, mock_db):
         """Unknown tags should create freeform tags when create_missing=True."""
         user_id = uuid4()
 
-        # First call returns None (tag not found)
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_result
-
-        await import_service._resolve_tags(
+        tag_ids = await import_service._resolve_tags(
             ["NewTag"], user_id=user_id, create_missing=True
         )
 
-        # Verify tag was added
-        mock_db.add.assert_called_once()
-        mock_db.flush.assert_called_once()
+        stmt = mock_db.execute.call_args[0][0]
+        assert "ON CONFLICT ON CONSTRAINT uq_tag_name_type DO NOTHING" in _sql(stmt)
+        params = _params(stmt)
+        assert params["name_m0"] == "NewTag"
+        assert params["type_m0"] == TagType.FREEFORM
+        assert params["created_by_m0"] == user_id
+        assert len(tag_ids) == 1
+        assert import_service.created_tag_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_tags_created_in_one_statement(self, import_service, mock_db):
+        """All unknown names should be created by a single INSERT."""
+        tag_ids = await import_service._resolve_tags(
+            ["Alpha", "Beta", "alpha"], create_missing=True
+        )
+
+        mock_db.execute.assert_awaited_once()
+        assert len(tag_ids) == 3
+        assert tag_ids[0] == tag_ids[2]
+        assert import_service.created_tag_count == 2
+
+    @pytest.mark.asyncio
+    async def test_created_tag_reused_by_later_rows(self, import_service, mock_db):
+        """A tag created for one row should be reused, not created again."""
+        first = await import_service._resolve_tags(["NewTag"], create_missing=True)
+        second = await import_service._resolve_tags(["newtag"], create_missing=True)
 
-        # Verify the tag was created with correct type
-        created_tag = mock_db.add.call_args[0][0]
-        assert created_tag.name == "NewTag"
-        assert created_tag.type == TagType.FREEFORM
-        assert created_tag.created_by == user_id
+        mock_db.execute.assert_awaited_once()
+        assert second == first
 
     @pytest.mark.asyncio
     async def test_resolve_empty_list_returns_empty(self, import_service, mock_db):
@@ -80,59 +124,29 @@ class TestResolveTagsMethod:
         mock_db.execute.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_resolve_case_insensitive(self, import_service, mock_db):
+    async def test_resolve_case_insensitive(self, import_service):
         """Tag resolution should be case-insensitive."""
-        existing_tag = MagicMock()
-        existing_tag.id = uuid4()
-
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = existing_tag
-        mock_db.execute.return_value = mock_result
-
         tag_ids = await import_service._resolve_tags(["PYTHON"])
 
-        assert len(tag_ids) == 1
-        # Verify query was executed (case-insensitive lookup)
-        mock_db.execute.assert_called_once()
+        assert tag_ids == [PYTHON_TAG_ID]
 
     @pytest.mark.asyncio
     async def test_preview_import_does_not_create_without_flag(
         self, import_service, mock_db
     ):
         """Without create_missing=True, unknown tags should not be created."""
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_result
-
         tag_ids = await import_service._resolve_tags(
             ["UnknownTag"], create_missing=False  # Default behavior
         )
 
         # Should not create tag
-        mock_db.add.assert_not_called()
+        mock_db.execute.assert_not_called()
         assert tag_ids == []
 
     @pytest.mark.asyncio
     async def test_resolve_mixed_existing_and_new_tags(self, import_service, mock_db):
         """Mix of existing and new tags should resolve existing and create new."""
         user_id = uuid4()
-        existing_tag = MagicMock()
-        existing_tag.id = uuid4()
-
-        # First tag exists, second doesn't
-        call_count = 0
-
-        def mock_execute_side_effect(*args):
-            nonlocal call_count
-            result = MagicMock()
-            if call_count == 0:
-                result.scalar_one_or_none.return_value = existing_tag
-            else:
-                result.scalar_one_or_none.return_value = None
-            call_count += 1
-            return result
-
-        mock_db.execute.side_effect = mock_execute_side_effect
 
         tag_ids = await import_service._resolve_tags(
             ["Python", "NewTag"], user_id=user_id, create_missing=True
@@ -141,37 +155,330 @@ class TestResolveTagsMethod:
         # Should have 2 tag IDs
         assert len(tag_ids) == 2
         # First should be the existing tag ID
-        assert tag_ids[0] == existing_tag.id
+        assert tag_ids[0] == PYTHON_TAG_ID
         # Second should be the newly created tag ID
-        mock_db.add.assert_called_once()
+        mock_db.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_resolve_strips_whitespace_from_names(self, import_service, mock_db):
+    async def test_resolve_strips_whitespace_from_names(self, import_service):
         """Tag names should have whitespace stripped before lookup."""
-        existing_tag = MagicMock()
-        existing_tag.id = uuid4()
-
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = existing_tag
-        mock_db.execute.return_value = mock_result
-
         tag_ids = await import_service._resolve_tags(["  Python  "])
 
-        assert len(tag_ids) == 1
-        mock_db.execute.assert_called_once()
+        assert tag_ids == [PYTHON_TAG_ID]
 
     @pytest.mark.asyncio
     async def test_resolve_creates_tag_without_user_id(self, import_service, mock_db):
         """Tag can be created even without user_id (for backwards compatibility)."""
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_result
-
         await import_service._resolve_tags(
             ["NewTag"], user_id=None, create_missing=True
         )
 
         # Tag should still be created
-        mock_db.add.assert_called_once()
-        created_tag = mock_db.add.call_args[0][0]
-        assert created_tag.created_by is None
+        params = _params(mock_db.execute.call_args[0][0])
+        assert params["name_m0"] == "NewTag"
+        assert params["created_by_m0"] is None
+
+    @pytest.mark.asyncio
+    async def test_conflicting_tag_looked_up_case_insensitively(
+        self, import_service, mock_db
+    ):
+        """A tag created concurrently with other casing should still resolve."""
+        existing_id = uuid4()
+
+        async def execute(stmt):
+            result = MagicMock()
+            # The INSERT hits the unique constraint; the fallback finds the row
+            result.all.return_value = (
+                [(existing_id, "NEWTAG")] if isinstance(stmt, Select) else []
+            )
+            return result
+
+        mock_db.execute.side_effect = execute
+
+        tag_ids = await import_service._resolve_tags(["NewTag"], create_missing=True)
+
+        fallback = mock_db.execute.call_args[0][0]
+        assert "lower(tags.name) IN" in _sql(fallback)
+        assert list(_params(fallback).values())[-1] == ["newtag"]
+        assert tag_ids == [existing_id]
+        assert import_service.created_tag_count == 0
+
+
+ORG_ID = uuid4()
+USER_ID = uuid4()
+
+
+def _commit_db(fail_names=()):
+    """A session where ORG_ID, USER_ID and PYTHON_TAG_ID exist and project
+    INSERTs containing any of ``fail_names`` are rejected."""
+    db = AsyncMock()
+    db.begin_nested = MagicMock()
+    db.project_inserts = []
+
+    async def execute(stmt):
+        result = MagicMock()
+        if isinstance(stmt, Select):
+            result.scalars.return_value.all.return_value = [
+                ORG_ID,
+                USER_ID,
+                PYTHON_TAG_ID,
+            ]
+            return result
+        if stmt.table.name == "projects":
+            names = [v for k, v in _params(stmt).items() if k.startswith("name")]
+            if set(names) & set(fail_names):
+                raise IntegrityError("INSERT INTO projects", {}, Exception("dup"))
+            db.project_inserts.append(names)
+        return result
+
+    db.execute.side_effect = execute
+    return db
+
+
+def _row(row_number: int, name: str | None = "Project", **fields) -> ImportRowUpdate:
+    values = {
+        "organization_id": ORG_ID,
+        "start_date": date(2024, 1, 1),
+        "location": ProjectLocation.REMOTE,
+        "tag_ids": [PYTHON_TAG_ID],
+    }
+    values.update(fields)
+    return ImportRowUpdate(row_number=row_number, name=name, **values)
+
+
+class TestCommitImport:
+    """Set-based commit of import rows."""
+
+    @pytest.mark.asyncio
+    async def test_rows_inserted_in_batches(self, monkeypatch):
+        """Projects should be inserted with one multi-row INSERT per batch."""
+        monkeypatch.setattr(get_settings(), "import_commit_batch_size", 2)
+        db = _commit_db()
+
+        results = await ImportService(db).commit_import(
+            [_row(2, "A"), _row(3, "B"), _row(4, "C")], USER_ID
+        )
+
+        assert db.project_inserts == [["A", "B"], ["C"]]
+        assert [r.row_number for r in results] == [2, 3, 4]
+        assert all(r.success for r in results)
+        assert len({r.project_id for r in results}) == 3
+
+    @pytest.mark.asyncio
+    async def test_inserts_split_under_bind_parameter_limit(self, monkeypatch):
+        """Multi-row INSERTs should be chunked to the bind-parameter limit."""
+        monkeypatch.setattr("app.services.import_service.MAX_BIND_PARAMS", 8)
+        db = _commit_db()
+
+        await ImportService(db).commit_import(
+            [_row(2, "A"), _row(3, "B"), _row(4, "C")], USER_ID
+        )
+
+        tag_inserts = [
+            stmt
+            for stmt in (call.args[0] for call in db.execute.call_args_list)
+            if not isinstance(stmt, Select) and stmt.table.name == "project_tags"
+        ]
+        # project_tags has 3 columns, so 2 rows (of 2 given values) per statement
+        assert [len(_params(stmt)) for stmt in tag_inserts] == [4, 2]
+        assert db.project_inserts == [["A"], ["B"], ["C"]]
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows_reported_without_insert(self):
+        """Rows failing checks should get errors; the rest should be inserted."""
+        db = _commit_db()
+
+        results = await ImportService(db).commit_import(
+            [
+                _row(2, None),
+                _row(3, "Unknown org", organization_id=uuid4()),
+                _row(4, "Unknown tag", tag_ids=[uuid4()]),
+                _row(5, "Good"),
+            ],
+            USER_ID,
+        )
+
+        assert [r.error for r in results[:2]] == [
+            "Name is required",
+            "Organization not found",
+        ]
+        assert results[2].error.startswith("Tags not found")
+        assert results[3].success
+        assert db.project_inserts == [["Good"]]
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_retried_row_by_row(self):
+        """A database error should only fail the row that caused it."""
+        db = _commit_db(fail_names={"Bad"})
+
+        results = await ImportService(db).commit_import(
+            [_row(2, "A"), _row(3, "Bad"), _row(4, "C")], USER_ID
+        )
+
+        assert [r.success for r in results] == [True, False, True]
+        assert "dup" in results[1].error
+        assert db.project_inserts == [["A"], ["C"]]
+
+    @pytest.mark.asyncio
+    async def test_invalid_row_raises_without_skip(self):
+        """With skip_invalid=False the first invalid row should abort."""
+        db = _commit_db()
+
+        with pytest.raises(ValueError, match="Location is required"):
+            await ImportService(db).commit_import(
+                [_row(2, location=None), _row(3)], USER_ID, skip_invalid=False
+            )
+
+        assert db.project_inserts == []
+
+
+class TestImportRows:
+    """Incremental parsing and batched import of uploaded files."""
+
+    CSV = (
+        b"Name,Organization,Start Date,Location\n"
+        b"Alpha,Acme,2024-01-15,HQ\n"
+        b"Beta,Nobody,2024-02-01,Remote\n"
+        b"\n"
+        b"Gamma,acme,03/01/2024,Lab 7\n"
+    )
+
+    @pytest.fixture
+    def import_service(self, entity_index):
+        entity_index.return_value = EntityIndex.build(
+            organizations=[(ORG_ID, "Acme", None, None)], tags=[]
+        )
+        service = ImportService(AsyncMock())
+
+        async def commit(rows, _user_id, _skip_invalid=True):
+            return [
+                ImportCommitResult(row_number=r.row_number, success=True) for r in rows
+            ]
+
+        service.commit_import = AsyncMock(side_effect=commit)
+        return service
+
+    async def _import(self, service, **kwargs):
+        _, rows = service.iter_file_rows(io.BytesIO(self.CSV), "projects.csv")
+        return [batch async for batch in service.import_rows(rows, USER_ID, **kwargs)]
+
+    @pytest.mark.asyncio
+    async def test_rows_resolved_and_committed_in_batches(
+        self, import_service, monkeypatch
+    ):
+        """Valid rows should be resolved; invalid rows reported by row number."""
+        monkeypatch.setattr(get_settings(), "import_commit_batch_size", 2)
+
+        batches = await self._import(import_service)
+
+        assert [last_row for last_row, _ in batches] == [3, 4]
+        first = batches[0][1]
+        assert [r.success for r in first] == [True, False]
+        assert "Organization 'Nobody' not found" in first[1].error
+
+        committed = [
+            row
+            for call in import_service.commit_import.call_args_list
+            for row in call[0][0]
+        ]
+        assert [r.name for r in committed] == ["Alpha", "Gamma"]
+        assert committed[0].organization_id == ORG_ID
+        assert committed[0].location == ProjectLocation.HEADQUARTERS
+        assert committed[1].start_date == date(2024, 3, 1)
+        assert committed[1].location == ProjectLocation.OTHER
+        assert committed[1].location_other == "Lab 7"
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_checkpointed_rows(self, import_service):
+        """Rows up to start_after_row should not be imported again."""
+        batches = await self._import(import_service, start_after_row=3)
+
+        assert [[r.row_number for r in results] for _, results in batches] == [[4]]
+
+    @pytest.mark.asyncio
+    async def test_invalid_row_raises_without_skip(self, import_service):
+        """With skip_invalid=False an invalid row should stop the import."""
+        with pytest.raises(ValueError, match="Row 3"):
+            await self._import(import_service, skip_invalid=False)
+
+
+class TestIterFileRows:
+    """CSV and XLSX parsing."""
+
+    def test_latin1_csv(self):
+        """Files that are not valid UTF-8 should be read as Latin-1."""
+        _, rows = ImportService(AsyncMock()).iter_file_rows(
+            io.BytesIO('Name,Tags\nCafé,"a, b"\n'.encode("latin-1")), "f.csv"
+        )
+
+        assert list(rows) == [{"name": "Café", "tags": ["a", "b"]}]
+
+    def test_xlsx_first_sheet(self):
+        """XLSX cells should be read as text, skipping empty rows."""
+        mappings, rows = ImportService(AsyncMock()).iter_file_rows(
+            _xlsx([["Name", "Run"], ["Alpha", 3], ["", ""], ["Beta", "r2"]]),
+            "projects.xlsx",
+        )
+
+        assert mappings == {"Name": "name", "Run": "run_number"}
+        assert list(rows) == [
+            {"name": "Alpha", "run_number": "3"},
+            {"name": "Beta", "run_number": "r2"},
+        ]
+
+
+def _xlsx(rows: list[list]) -> io.BytesIO:
+    """A minimal single-sheet workbook with inline string cells."""
+    sheet_rows = []
+    for r, values in enumerate(rows, start=1):
+        cells = []
+        for c, value in enumerate(values):
+            ref = f"{chr(65 + c)}{r}"
+            if isinstance(value, int | float):
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            else:
+                cells.append(
+                    f'<c r="{ref}" t="inlineStr"><is><t>{escape(value)}</t></is></c>'
+                )
+        sheet_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+
+    ns = "http://schemas.openxmlformats.org"
+    rel = f"{ns}/officeDocument/2006/relationships"
+    files = {
+        "[Content_Types].xml": (
+            f'<Types xmlns="{ns}/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="'
+            "application/vnd.openxmlformats-officedocument.spreadsheetml."
+            'worksheet+xml"/></Types>'
+        ),
+        "_rels/.rels": (
+            f'<Relationships xmlns="{ns}/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel}/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            f'<workbook xmlns="{ns}/spreadsheetml/2006/main" xmlns:r="{rel}">'
+            '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+            "</workbook>"
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'<Relationships xmlns="{ns}/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel}/worksheet" '
+            'Target="worksheets/sheet1.xml"/></Relationships>'
+        ),
+        "xl/worksheets/sheet1.xml": (
+            f'<worksheet xmlns="{ns}/spreadsheetml/2006/main"><sheetData>'
+            f'{"".join(sheet_rows)}</sheetData></worksheet>'
+        ),
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
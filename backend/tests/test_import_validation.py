@@ -11,6 +11,8 @@ import pytest
 from app.schemas.import_ import ImportRowValidateRequest
 from app.services.import_service import ImportService
 
+pytestmark = pytest.mark.usefixtures("entity_index")
+
 
 class TestValidateEditedRow:
     """Tests for _validate_edited_row method."""
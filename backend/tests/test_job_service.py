@@ -6,9 +6,11 @@ from uuid import uuid4
 
 import pytest
 
-from app.models.job import JobStatus, JobType
+from app.models.job import Job, JobStatus, JobType
 from app.services.job_service import (
     BACKOFF_SCHEDULE_MINUTES,
+    JOB_FAILURE_HANDLERS,
+    JOB_HANDLERS,
     JobService,
     calculate_next_retry,
     is_retryable_error,
@@ -322,6 +324,53 @@ class TestProcessJobQueue:
         assert result["jobs_failed"] == 0
         assert result["errors"] == []
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("error", "cleaned_up"),
+        [("Upload not found", True), ("Connection timeout", False)],
+    )
+    @patch("app.services.job_service.get_armed_targets", new_callable=AsyncMock)
+    @patch("app.services.job_service.async_session_maker")
+    async def test_failure_handler_runs_only_when_job_fails_for_good(
+        self, mock_session_maker, mock_armed, error, cleaned_up
+    ):
+        """Cleanup should run for a FAILED job, not for one requeued for retry."""
+        mock_armed.return_value = set()
+        job = Job(
+            id=uuid4(),
+            job_type=JobType.BULK_IMPORT,
+            status=JobStatus.PENDING,
+            attempts=0,
+            max_attempts=5,
+            payload={"file_path": "upload/projects.csv"},
+        )
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.side_effect = [[], [job]]
+        mock_result.scalar_one_or_none.return_value = job
+        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_context = AsyncMock()
+        mock_context.__aenter__.return_value = mock_db
+        mock_context.__aexit__.return_value = None
+        mock_session_maker.return_value = mock_context
+        cleanup = AsyncMock()
+
+        with (
+            patch.dict(
+                JOB_HANDLERS,
+                {JobType.BULK_IMPORT: AsyncMock(side_effect=ValueError(error))},
+            ),
+            patch.dict(JOB_FAILURE_HANDLERS, {JobType.BULK_IMPORT: cleanup}),
+        ):
+            await process_job_queue()
+
+        if cleaned_up:
+            assert job.status == JobStatus.FAILED
+            cleanup.assert_awaited_once_with(job)
+        else:
+            assert job.status == JobStatus.PENDING
+            cleanup.assert_not_awaited()
+
 
 class TestCalculateNextRetry:
     """Tests for calculate_next_retry function."""
@@ -599,6 +648,25 @@ class TestJobServiceCancelJob:
 
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_cancel_runs_failure_handler(self):
+        """A cancelled job should release what it would have cleaned up."""
+        mock_db = AsyncMock()
+        job = MagicMock()
+        job.id = uuid4()
+        job.job_type = JobType.BULK_IMPORT
+        job.status = JobStatus.PENDING
+
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = job
+        mock_db.execute = AsyncMock(return_value=mock_result)
+        cleanup = AsyncMock()
+
+        with patch.dict(JOB_FAILURE_HANDLERS, {JobType.BULK_IMPORT: cleanup}):
+            assert await JobService(mock_db).cancel_job(job.id) is True
+
+        cleanup.assert_awaited_once_with(job)
+
     @pytest.mark.asyncio
     async def test_cannot_cancel_in_progress_job(self):
         """Test that in-progress jobs cannot be cancelled."""
@@ -746,6 +814,43 @@ class TestHandleEmbeddingGeneration:
         assert result["processed"] == 1
         assert result["chunks_created"] == 2
 
+    @pytest.mark.asyncio
+    @patch("app.services.embedding_service.EmbeddingService")
+    async def test_unavailable_embeddings_leave_document_unchunked(
+        self, mock_service_class
+    ):
+        """Test that NULL embeddings are not stored while Ollama is down."""
+        mock_db = AsyncMock()
+        mock_job = MagicMock()
+        mock_job.id = uuid4()
+        mock_job.entity_id = None
+        mock_job.payload = None
+
+        mock_doc = MagicMock()
+        mock_doc.id = uuid4()
+        mock_doc.extracted_text = "Test document content"
+
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [mock_doc]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.add = MagicMock()
+        mock_db.flush = AsyncMock()
+
+        mock_service = MagicMock()
+        mock_service.chunk_text.return_value = ["chunk1", "chunk2"]
+        mock_service.generate_embedding = AsyncMock(return_value=None)
+        mock_service.last_failure = "timeout"
+        mock_service_class.return_value = mock_service
+
+        from app.services.job_handlers import handle_embedding_generation
+
+        result = await handle_embedding_generation(mock_job, mock_db)
+
+        assert result["processed"] == 0
+        assert result["failed"] == 1
+        assert result["chunks_created"] == 0
+        mock_db.add.assert_not_called()
+
 
 class TestHandleBulkImport:
     """Tests for handle_bulk_import handler."""
@@ -866,6 +971,153 @@ class TestHandleBulkImport:
         assert len(result["errors"]) == 1
 
 
+async def chunks(*parts: bytes):
+    """An async byte stream, as returned by StorageService.read_stream."""
+    for part in parts:
+        yield part
+
+
+class TestHandleFileImport:
+    """Tests for handle_bulk_import with an uploaded file."""
+
+    @staticmethod
+    def make_job():
+        job = MagicMock()
+        job.id = uuid4()
+        job.payload = {
+            "file_path": "upload/projects.csv",
+            "filename": "projects.csv",
+            "user_id": str(uuid4()),
+        }
+        return job
+
+    @staticmethod
+    def make_db(checkpoint=None):
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = checkpoint
+        db.execute.return_value = result
+        return db
+
+    @staticmethod
+    def make_service(batches):
+        from app.schemas.import_ import ImportCommitResult
+
+        async def import_rows(_rows, _user_id, **_kwargs):
+            for last_row, outcomes in batches:
+                yield last_row, [
+                    ImportCommitResult(
+                        row_number=n, success=ok, error=None if ok else "bad"
+                    )
+                    for n, ok in outcomes
+                ]
+
+        service = MagicMock()
+        service.created_tag_count = 0
+        service.iter_file_rows.return_value = ({}, iter([]))
+        service.import_rows = MagicMock(side_effect=import_rows)
+        return service
+
+    @pytest.mark.asyncio
+    @patch("app.core.storage.StorageService")
+    @patch("app.services.import_service.ImportService")
+    async def test_checkpoints_each_batch(self, mock_service_class, mock_storage):
+        """Each batch should be committed with the job's progress."""
+        mock_storage.return_value.is_local_storage.return_value = False
+        mock_storage.return_value.read_stream = MagicMock(return_value=chunks())
+        mock_storage.return_value.delete = AsyncMock()
+        mock_service_class.return_value = self.make_service(
+            [(3, [(2, True), (3, False)]), (4, [(4, True)])]
+        )
+        mock_db = self.make_db()
+
+        from app.services.job_handlers import handle_bulk_import
+
+        result = await handle_bulk_import(self.make_job(), mock_db)
+
+        assert mock_db.commit.await_count == 2
+        assert result["complete"] is True
+        assert result["last_row"] == 4
+        assert (result["processed"], result["succeeded"], result["failed"]) == (
+            3,
+            2,
+            1,
+        )
+        assert result["errors"] == [{"row_number": 3, "error": "bad"}]
+        mock_storage.return_value.delete.assert_awaited_once_with("upload/projects.csv")
+
+    @pytest.mark.asyncio
+    @patch("app.core.storage.StorageService")
+    @patch("app.services.import_service.ImportService")
+    async def test_resumes_from_checkpoint(self, mock_service_class, mock_storage):
+        """A retried job should continue after its last committed batch."""
+        mock_storage.return_value.is_local_storage.return_value = False
+        mock_storage.return_value.read_stream = MagicMock(return_value=chunks())
+        mock_storage.return_value.delete = AsyncMock()
+        service = self.make_service([(5, [(5, True)])])
+        mock_service_class.return_value = service
+        checkpoint = {
+            "filename": "projects.csv",
+            "last_row": 4,
+            "processed": 3,
+            "succeeded": 3,
+            "failed": 0,
+            "errors": [],
+            "complete": False,
+        }
+
+        from app.services.job_handlers import handle_bulk_import
+
+        result = await handle_bulk_import(self.make_job(), self.make_db(checkpoint))
+
+        assert service.import_rows.call_args.kwargs["start_after_row"] == 4
+        assert (result["processed"], result["succeeded"]) == (4, 4)
+
+    @pytest.mark.asyncio
+    @patch("app.core.storage.StorageService")
+    @patch("app.services.import_service.ImportService")
+    async def test_remote_upload_spooled_in_chunks(
+        self, mock_service_class, mock_storage
+    ):
+        """A remote upload should be streamed to a temporary file, not read whole."""
+        mock_storage.return_value.is_local_storage.return_value = False
+        mock_storage.return_value.read = AsyncMock()
+        mock_storage.return_value.read_stream = MagicMock(
+            return_value=chunks(b"Name,Status\n", b"Alpha,active\n")
+        )
+        mock_storage.return_value.delete = AsyncMock()
+        service = self.make_service([])
+        contents = []
+        service.iter_file_rows.side_effect = lambda file, _name: (
+            contents.append(file.read()) or ({}, iter([]))
+        )
+        mock_service_class.return_value = service
+
+        from app.services.job_handlers import handle_bulk_import
+
+        await handle_bulk_import(self.make_job(), self.make_db())
+
+        assert contents == [b"Name,Status\nAlpha,active\n"]
+        mock_storage.return_value.read.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("app.core.storage.StorageService")
+    async def test_failed_import_upload_deleted(self, mock_storage):
+        """The failure handler should delete the upload of a failed import."""
+        from app.services.job_handlers import cleanup_bulk_import
+        from app.services.job_service import run_job_failure_handler
+
+        mock_storage.return_value.delete = AsyncMock()
+        job = self.make_job()
+        job.job_type = JobType.BULK_IMPORT
+        job.status = JobStatus.FAILED
+
+        assert JOB_FAILURE_HANDLERS[JobType.BULK_IMPORT] is cleanup_bulk_import
+        await run_job_failure_handler(job)
+
+        mock_storage.return_value.delete.assert_awaited_once_with("upload/projects.csv")
+
+
 class TestHandleMondaySync:
     """Tests for handle_monday_sync handler."""
 
@@ -0,0 +1,209 @@
+"""Tests for the load-test kit (seed data, fake upstreams, scenario runner)."""
+
+import argparse
+import random
+import time
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models.project_permission import ProjectVisibility
+from app.scripts.loadtest import EMBEDDING_DIMENSIONS
+from app.scripts.loadtest.fake_upstreams import UpstreamProfile, create_app
+from app.scripts.loadtest.run import (
+    LoadContext,
+    ScenarioStats,
+    _virtual_user,
+    build_report,
+    parse_mix,
+    percentile,
+)
+from app.scripts.loadtest.seed import DatasetGenerator, SeedConfig
+
+
+def _all(batches) -> list:
+    return [row for batch in batches for row in batch]
+
+
+class TestDatasetGenerator:
+    """Tests for synthetic data generation."""
+
+    def test_same_seed_same_data(self):
+        """Test that a seed reproduces IDs and content."""
+        config = SeedConfig(projects=5, organizations=2, users=3, teams=2, tags=10)
+
+        first = _all(DatasetGenerator(config).projects())
+        second = _all(DatasetGenerator(config).projects())
+
+        assert first == second
+
+    def test_rows_reference_generated_ids(self):
+        """Test that foreign keys point at generated rows."""
+        config = SeedConfig(
+            projects=40, users=5, teams=2, tags=12, restricted_ratio=0.5, batch_size=7
+        )
+        generator = DatasetGenerator(config)
+
+        projects = _all(generator.projects())
+        project_tags = _all(generator.project_tags())
+        restricted = [
+            row["id"]
+            for row in projects
+            if row["visibility"] == ProjectVisibility.RESTRICTED
+        ]
+        permissions = generator.permissions(restricted)
+
+        assert len(projects) == 40
+        assert {row["organization_id"] for row in projects} <= set(
+            generator.organization_ids
+        )
+        assert len(project_tags) == 40 * config.tags_per_project
+        assert {row["tag_id"] for row in project_tags} <= set(generator.tag_ids)
+        assert restricted
+        assert {row["project_id"] for row in permissions} == set(restricted)
+
+    def test_documents_have_unit_embeddings(self):
+        """Test that each document gets its chunks with 768-dim vectors."""
+        config = SeedConfig(projects=3, documents_per_project=2, chunks_per_document=4)
+
+        batches = list(DatasetGenerator(config).documents())
+        documents = [row for documents, _ in batches for row in documents]
+        chunks = [row for _, chunks in batches for row in chunks]
+
+        assert len(documents) == 6
+        assert len(chunks) == 24
+        assert {row["document_id"] for row in chunks} == {
+            row["id"] for row in documents
+        }
+        vector = chunks[0]["embedding"]
+        assert vector.shape == (EMBEDDING_DIMENSIONS,)
+        assert np.linalg.norm(vector) == pytest.approx(1.0, rel=1e-5)
+
+
+class TestFakeUpstreams:
+    """Tests for the stand-in upstream server."""
+
+    def test_embeddings_deterministic(self):
+        """Test that the same prompt always gets the same vector."""
+        client = TestClient(create_app())
+
+        first = client.post("/api/embeddings", json={"prompt": "anechoic chamber"})
+        second = client.post("/api/embeddings", json={"prompt": "anechoic chamber"})
+
+        assert first.json() == second.json()
+        assert len(first.json()["embedding"]) == EMBEDDING_DIMENSIONS
+
+    def test_chat_returns_parser_json(self):
+        """Test that JSON-format chat answers in the query parser's shape."""
+        client = TestClient(create_app())
+
+        response = client.post(
+            "/api/chat",
+            json={
+                "format": "json",
+                "messages": [
+                    {"role": "user", "content": "Parse this search query: radio"}
+                ],
+            },
+        )
+
+        content = response.json()["message"]["content"]
+        assert '"search_text": "radio"' in content
+
+    def test_monday_and_jira(self):
+        """Test Monday mutations and Jira issues."""
+        client = TestClient(create_app())
+
+        monday = client.post(
+            "/v2", json={"query": "mutation { create_item (board_id: 1) { id } }"}
+        )
+        issue = client.get("/rest/api/3/issue/LT-7")
+
+        assert monday.json()["data"]["create_item"]["id"]
+        assert issue.json()["key"] == "LT-7"
+        assert issue.json()["fields"]["status"]["name"] == "In Progress"
+
+    def test_latency_and_errors_per_upstream(self):
+        """Test that each upstream applies its own latency and error rate."""
+        profiles = {
+            "ollama": UpstreamProfile(latency_ms=50, jitter=0),
+            "tika": UpstreamProfile(error_rate=1.0),
+            "monday": UpstreamProfile(),
+            "jira": UpstreamProfile(),
+            "graph": UpstreamProfile(),
+        }
+        client = TestClient(create_app(profiles))
+
+        start = time.perf_counter()
+        client.post("/api/embeddings", json={"prompt": "x"})
+        elapsed = time.perf_counter() - start
+        tika = client.put("/tika", content=b"hello")
+
+        assert elapsed >= 0.05
+        assert tika.status_code == 503
+        assert client.get("/_stats").json()["tika"] == {"calls": 1, "errors": 1}
+
+
+class TestRunner:
+    """Tests for scenario execution and reporting."""
+
+    def test_percentile_interpolates(self):
+        """Test percentiles over a sorted sample."""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 99) == pytest.approx(99.01)
+        assert percentile([], 95) == 0.0
+
+    def test_report_counts_errors_and_throughput(self):
+        """Test per-scenario and overall summaries."""
+        search, upload = ScenarioStats(), ScenarioStats()
+        for latency in (10.0, 20.0, 30.0):
+            search.record(latency, 200)
+        upload.record(100.0, 429)
+        upload.record(5.0, None)
+
+        report = build_report({"search": search, "upload": upload}, 2.0, users=4)
+
+        assert report["scenarios"]["search"]["rps"] == 1.5
+        assert report["scenarios"]["search"]["p50_ms"] == 20.0
+        assert report["scenarios"]["upload"]["errors"] == 2
+        assert report["overall"]["requests"] == 5
+        assert report["overall"]["status_codes"] == {0: 1, 200: 3, 429: 1}
+        assert report["overall"]["max_ms"] == 100.0
+
+    def test_parse_mix_overrides_defaults(self):
+        """Test weight overrides and unknown scenario names."""
+        mix = parse_mix("search=1,upload=0")
+
+        assert mix["search"] == 1
+        assert mix["upload"] == 0
+        assert mix["list"] > 0
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_mix("nope=1")
+
+    @pytest.mark.asyncio
+    async def test_virtual_user_runs_until_deadline(self):
+        """Test that a virtual user records each request it makes."""
+        app = FastAPI()
+        seen = []
+
+        @app.get("/api/v1/projects")
+        async def projects(page: int = 1) -> dict:
+            seen.append(page)
+            return {"items": []}
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            ctx = LoadContext(client=client, rng=random.Random(1), project_ids=["p"])
+            results: dict[str, ScenarioStats] = {}
+            await _virtual_user(
+                ctx, ["list"], [1], time.monotonic() + 0.1, 0.0, results
+            )
+
+        assert len(results["list"].latencies_ms) == len(seen) > 0
+        assert results["list"].errors == 0
@@ -0,0 +1,162 @@
+"""Tests for the event loop lag monitor."""
+
+import asyncio
+import time
+import traceback
+from unittest.mock import patch
+
+import pytest
+
+from app.core.loop_monitor import (
+    APP_ROOT,
+    UNKNOWN_OFFENDER,
+    EventLoopMonitor,
+    find_offender,
+)
+from app.services.metrics_service import (
+    get_metrics_service,
+    render_prometheus,
+    reset_metrics_service,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Isolate metrics between tests."""
+    reset_metrics_service()
+    yield
+    reset_metrics_service()
+
+
+def _frame(path: str, name: str) -> traceback.FrameSummary:
+    return traceback.FrameSummary(path, 1, name, lookup_line=False)
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class TestFindOffender:
+    """Tests for attributing a stack to a function."""
+
+    def test_innermost_app_frame_is_offender(self):
+        """Test that the app code making the blocking call is named."""
+        stack = traceback.StackSummary.from_list(
+            [
+                _frame("/usr/lib/python3.11/asyncio/events.py", "_run"),
+                _frame(str(APP_ROOT / "api" / "admin.py"), "sharepoint_health"),
+                _frame(
+                    str(APP_ROOT / "services" / "sharepoint" / "auth.py"),
+                    "get_app_token",
+                ),
+                _frame("/site-packages/msal/application.py", "acquire_token"),
+            ]
+        )
+
+        offender, blocking_call = find_offender(stack)
+
+        assert offender == "app.services.sharepoint.auth:get_app_token"
+        assert blocking_call == "msal.application:acquire_token"
+
+    def test_library_only_stack(self):
+        """Test fallback to the innermost frame without app frames."""
+        stack = traceback.StackSummary.from_list(
+            [_frame("/site-packages/pdfplumber/page.py", "extract_text")]
+        )
+
+        assert find_offender(stack) == (
+            "pdfplumber.page:extract_text",
+            "pdfplumber.page:extract_text",
+        )
+
+    def test_empty_stack(self):
+        """Test that uncaptured stalls are reported as unknown."""
+        assert find_offender(traceback.StackSummary()) == (
+            UNKNOWN_OFFENDER,
+            UNKNOWN_OFFENDER,
+        )
+
+
+class TestEventLoopMonitor:
+    """Tests for sampling and stall capture."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_captured_and_counted(self):
+        """Test that a blocking call is named in logs and metrics."""
+        monitor = EventLoopMonitor(interval_ms=10, threshold_ms=50)
+        with patch("app.core.loop_monitor.logger") as mock_logger:
+            monitor.start()
+            try:
+                await asyncio.sleep(0.05)
+                _block_loop(0.3)
+                await asyncio.sleep(0.05)
+            finally:
+                await monitor.stop()
+
+        summary = get_metrics_service().snapshot().loop_summary()
+        assert summary["samples"] > 0
+        assert summary["blocked_count"] >= 1
+        assert summary["lag_max_ms"] >= 200
+        assert summary["offenders"][0]["function"].endswith(
+            "test_loop_monitor:_block_loop"
+        )
+
+        kwargs = mock_logger.warning.call_args.kwargs
+        assert mock_logger.warning.call_args.args[0] == "event_loop_blocked"
+        assert kwargs["offender"].endswith(":_block_loop")
+        assert any("_block_loop" in line for line in kwargs["stack"])
+
+    @pytest.mark.asyncio
+    async def test_no_stall_below_threshold(self):
+        """Test that a responsive loop records samples but no stalls."""
+        monitor = EventLoopMonitor(interval_ms=10, threshold_ms=200)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+
+        summary = get_metrics_service().snapshot().loop_summary()
+        assert summary["samples"] > 0
+        assert summary["blocked_count"] == 0
+
+
+class TestLoopMetrics:
+    """Tests for loop stats in snapshots and Prometheus output."""
+
+    def test_snapshot_round_trip_and_merge(self):
+        """Test that loop stats survive publishing and merge across workers."""
+        service = get_metrics_service()
+        service.record_loop_lag(1.0)
+        service.record_loop_block("app.services.x:parse", 250.0)
+
+        merged = service.snapshot()
+        merged.merge(type(merged).from_dict(service.snapshot().to_dict()))
+
+        summary = merged.loop_summary()
+        assert summary["samples"] == 2
+        assert summary["offenders"] == [
+            {
+                "function": "app.services.x:parse",
+                "count": 2,
+                "total_ms": 500.0,
+                "max_ms": 250.0,
+            }
+        ]
+
+    def test_prometheus_output(self):
+        """Test loop lag histogram and offender counters are exposed."""
+        service = get_metrics_service()
+        service.record_loop_lag(3.0)
+        service.record_loop_block("app.services.x:parse", 250.0)
+
+        output = render_prometheus(service.snapshot())
+
+        assert "npd_event_loop_lag_seconds_count 1" in output
+        assert 'npd_event_loop_blocked_total{function="app.services.x:parse"} 1' in (
+            output
+        )
+        assert (
+            'npd_event_loop_blocked_seconds_total{function="app.services.x:parse"} 0.25'
+            in output
+        )
@@ -1,11 +1,20 @@
 """Tests for metrics service."""
 
+import json
 import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 from app.services.metrics_service import (
+    LatencyHistogram,
     MetricsService,
+    MetricsSnapshot,
+    get_fleet_snapshot,
     get_metrics_service,
+    render_prometheus,
     reset_metrics_service,
+    worker_id,
 )
 
 
@@ -192,3 +201,196 @@ class TestMetricsService:
         endpoints = service.get_endpoint_metrics()
         assert endpoints[0]["error_count"] == 1
         assert endpoints[0]["error_rate_percent"] == 25.0
+
+
+class TestLatencyHistogram:
+    """Tests for fixed-bucket latency histograms."""
+
+    def test_percentile_error_bounded_by_bucket_width(self):
+        """Test percentile estimates stay within ~10% on a wide distribution."""
+        histogram = LatencyHistogram()
+        values = [0.5 * 1.01**i for i in range(1000)]
+        for value in values:
+            histogram.observe(value)
+
+        for p in (50, 95, 99):
+            exact = values[int(len(values) * p / 100) - 1]
+            assert abs(histogram.percentile(p) - exact) / exact < 0.1
+
+    def test_memory_is_constant(self):
+        """Test bucket storage does not grow with observations."""
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for i in range(5000):
+            histogram.observe(float(i))
+
+        assert len(histogram.counts) == size
+        assert histogram.count == 5000
+        assert histogram.max_ms == 4999.0
+
+    def test_overflow_bucket_uses_max(self):
+        """Test observations beyond the last bound report the true maximum."""
+        histogram = LatencyHistogram()
+        histogram.observe(250000.0)
+
+        assert histogram.percentile(100) == 250000.0
+        assert 90000.0 < histogram.percentile(50) < 250000.0
+
+    def test_merge_adds_counts(self):
+        """Test merging two histograms equals observing both streams."""
+        a, b, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1, 51):
+            a.observe(float(i))
+            combined.observe(float(i))
+        for i in range(51, 101):
+            b.observe(float(i))
+            combined.observe(float(i))
+
+        a.merge(b)
+        assert a.counts == combined.counts
+        assert a.percentile(95) == combined.percentile(95)
+        assert a.max_ms == 100.0
+
+    def test_dict_roundtrip(self):
+        """Test serialisation keeps only non-zero buckets and round-trips."""
+        histogram = LatencyHistogram()
+        for value in (1.0, 1.0, 42.0):
+            histogram.observe(value)
+
+        data = histogram.to_dict()
+        assert len(data["buckets"]) == 2
+
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(data)))
+        assert restored.counts == histogram.counts
+        assert restored.sum_ms == histogram.sum_ms
+
+
+class TestMetricsSnapshot:
+    """Tests for snapshot merging and rendering."""
+
+    def test_merge_combines_workers(self):
+        """Test snapshots from two workers merge per route."""
+        worker_a, worker_b = MetricsService(), MetricsService()
+        worker_a.record_request("GET", "/api/v1/projects/{project_id}", 200, 10.0)
+        worker_b.record_request("GET", "/api/v1/projects/{project_id}", 500, 30.0)
+        worker_b.record_request("GET", "/api/v1/search", 200, 5.0)
+
+        fleet = worker_a.snapshot()
+        fleet.merge(MetricsSnapshot.from_dict(worker_b.snapshot().to_dict()))
+
+        assert fleet.workers == 2
+        endpoints = {e["path"]: e for e in fleet.endpoint_metrics()}
+        project = endpoints["/api/v1/projects/{project_id}"]
+        assert project["request_count"] == 2
+        assert project["error_count"] == 1
+        assert fleet.error_rates()["error_5xx_count"] == 1
+
+    def test_snapshot_is_independent_copy(self):
+        """Test later requests do not change an earlier snapshot."""
+        service = MetricsService()
+        service.record_request("GET", "/test", 200, 10.0)
+        snapshot = service.snapshot()
+        service.record_request("GET", "/test", 200, 10.0)
+
+        assert snapshot.error_rates()["total_requests"] == 1
+
+    def test_render_prometheus(self):
+        """Test Prometheus text output for counters and histograms."""
+        service = MetricsService()
+        service.record_request("GET", "/api/v1/projects/{project_id}", 200, 3.0)
+        service.record_request("GET", "/api/v1/projects/{project_id}", 404, 700.0)
+
+        text = render_prometheus(service.snapshot())
+        labels = 'method="GET",route="/api/v1/projects/{project_id}"'
+
+        assert "# TYPE npd_http_request_duration_seconds histogram" in text
+        assert f'npd_http_requests_total{{{labels},status="2xx"}} 1' in text
+        assert f'npd_http_requests_total{{{labels},status="4xx"}} 1' in text
+        assert (
+            f'npd_http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+        )
+        assert (
+            f'npd_http_request_duration_seconds_bucket{{{labels},le="1.0"}} 2' in text
+        )
+        assert (
+            f'npd_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        )
+        assert f"npd_http_request_duration_seconds_count{{{labels}}} 2" in text
+        assert "npd_metrics_workers 1" in text
+
+    def test_search_branch_timeouts_merge_and_render(self):
+        """Test search branch timeouts survive publishing and are exported."""
+        worker_a, worker_b = MetricsService(), MetricsService()
+        worker_a.record_search_branch_timeout("vector")
+        worker_b.record_search_branch_timeout("vector")
+        worker_b.record_search_branch_timeout("document_text")
+
+        fleet = worker_a.snapshot()
+        fleet.merge(MetricsSnapshot.from_dict(worker_b.snapshot().to_dict()))
+
+        assert fleet.search_branch_timeouts == {"vector": 2, "document_text": 1}
+        text = render_prometheus(fleet)
+        assert "# TYPE npd_search_branch_timeouts_total counter" in text
+        assert 'npd_search_branch_timeouts_total{branch="vector"} 2' in text
+
+    def test_render_prometheus_escapes_labels(self):
+        """Test label values are escaped."""
+        service = MetricsService()
+        service.record_request("GET", 'odd"route', 200, 1.0)
+
+        assert 'route="odd\\"route"' in render_prometheus(service.snapshot())
+
+
+class TestFleetSnapshot:
+    """Tests for cross-worker aggregation via Redis."""
+
+    def setup_method(self):
+        reset_metrics_service()
+
+    def teardown_method(self):
+        reset_metrics_service()
+
+    @pytest.mark.asyncio
+    async def test_local_only_without_redis(self):
+        """Test the fleet view falls back to this worker's metrics."""
+        get_metrics_service().record_request("GET", "/test", 200, 10.0)
+
+        with patch(
+            "app.services.metrics_service._get_redis_client",
+            new=AsyncMock(return_value=None),
+        ):
+            fleet = await get_fleet_snapshot()
+
+        assert fleet.workers == 1
+        assert fleet.error_rates()["total_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_merges_fresh_workers_and_drops_stale(self):
+        """Test other workers are merged and stale entries removed."""
+        get_metrics_service().record_request("GET", "/test", 200, 10.0)
+
+        other = MetricsService()
+        other.record_request("GET", "/test", 200, 20.0)
+        fresh = other.snapshot().to_dict() | {"published_at": time.time()}
+        stale = other.snapshot().to_dict() | {"published_at": time.time() - 3600}
+        own = other.snapshot().to_dict() | {"published_at": time.time()}
+
+        client = MagicMock()
+        client.hgetall = AsyncMock(
+            return_value={
+                "other:1": json.dumps(fresh),
+                "gone:2": json.dumps(stale),
+                worker_id(): json.dumps(own),
+            }
+        )
+        client.hdel = AsyncMock()
+
+        with patch(
+            "app.services.metrics_service._get_redis_client",
+            new=AsyncMock(return_value=client),
+        ):
+            fleet = await get_fleet_snapshot()
+
+        assert fleet.workers == 2
+        assert fleet.error_rates()["total_requests"] == 2
+        client.hdel.assert_awaited_once_with("metrics:workers", "gone:2")
@@ -5,6 +5,8 @@ from uuid import uuid4
 
 import pytest
 
+from app.models.organization import Organization
+from app.services.entity_index import EntityIndex
 from app.services.monday_service import (
     MondayAPIError,
     MondayRateLimitError,
@@ -173,42 +175,58 @@ class TestMondayServiceOrganizationSync:
         return MondayService(mock_db)
 
     @pytest.mark.asyncio
-    async def test_find_organization_by_monday_id(self, monday_service, mock_db):
+    async def test_find_organization_by_monday_id(
+        self, monday_service, mock_db, entity_index
+    ):
         """Test finding organization by Monday ID."""
         mock_org = MagicMock()
         mock_org.id = uuid4()
         mock_org.name = "Test Org"
         mock_org.monday_id = "12345"
 
-        # Setup mock query result - make scalar_one_or_none return the org directly
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_org
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        entity_index.return_value = EntityIndex.build(
+            organizations=[(mock_org.id, "Renamed Org", None, "12345")], tags=[]
+        )
+        mock_db.get = AsyncMock(return_value=mock_org)
 
         result = await monday_service._find_organization("12345", "Test Org")
         assert result == mock_org
+        mock_db.get.assert_awaited_once_with(Organization, mock_org.id)
+        mock_db.execute.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_find_organization_by_name_fallback(self, monday_service, mock_db):
+    async def test_find_organization_by_name_fallback(
+        self, monday_service, mock_db, entity_index
+    ):
         """Test finding organization by name when monday_id not found."""
         mock_org = MagicMock()
         mock_org.id = uuid4()
         mock_org.name = "Test Org"
         mock_org.monday_id = None
 
-        # First query (by monday_id) returns None, second (by name) returns org
-        mock_result_none = MagicMock()
-        mock_result_none.scalar_one_or_none.return_value = None
+        entity_index.return_value = EntityIndex.build(
+            organizations=[(mock_org.id, "Test Org", None, None)], tags=[]
+        )
+        mock_db.get = AsyncMock(return_value=mock_org)
 
-        mock_result_org = MagicMock()
-        mock_result_org.scalar_one_or_none.return_value = mock_org
+        result = await monday_service._find_organization("99999", "test org")
+        assert result == mock_org
 
-        mock_db.execute = AsyncMock(side_effect=[mock_result_none, mock_result_org])
+    @pytest.mark.asyncio
+    async def test_find_organization_ignores_aliases(
+        self, monday_service, entity_index
+    ):
+        """An alias of another organization should not match a Monday item."""
+        entity_index.return_value = EntityIndex.build(
+            organizations=[(uuid4(), "Test Organization", ["Test Org"], None)],
+            tags=[],
+        )
 
         result = await monday_service._find_organization("99999", "Test Org")
-        assert result == mock_org
+        assert result is None
 
 
+@pytest.mark.usefixtures("entity_index")
 class TestMondayServiceContactSync:
     """Tests for contact sync operations."""
 
@@ -244,26 +262,40 @@ class TestMondayServiceContactSync:
     async def test_find_or_create_organization_creates_new(
         self, monday_service, mock_db
     ):
-        """Test _find_or_create_organization creates new org if not found."""
-        # First query returns None (org not found)
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        """Test _find_or_create_organization_id creates new org if not found."""
         mock_db.add = MagicMock()
         mock_db.flush = AsyncMock()
 
-        await monday_service._find_or_create_organization("New Org")
+        await monday_service._find_or_create_organization_id("New Org")
 
         # Should have added a new organization
         assert mock_db.add.called
         assert mock_db.flush.called
 
+    @pytest.mark.asyncio
+    async def test_find_or_create_organization_reuses_created_org(
+        self, monday_service, mock_db
+    ):
+        """Contacts of an organization created earlier in the sync reuse it."""
+        mock_db.add = MagicMock()
+
+        async def assign_id():
+            mock_db.add.call_args[0][0].id = uuid4()
+
+        mock_db.flush = AsyncMock(side_effect=assign_id)
+
+        first = await monday_service._find_or_create_organization_id("New Org")
+        second = await monday_service._find_or_create_organization_id("new org")
+
+        assert second == first
+        mock_db.add.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_find_or_create_organization_returns_none_for_empty_name(
         self, monday_service
     ):
-        """Test _find_or_create_organization returns None for empty name."""
-        result = await monday_service._find_or_create_organization("")
+        """Test _find_or_create_organization_id returns None for empty name."""
+        result = await monday_service._find_or_create_organization_id("")
         assert result is None
 
 
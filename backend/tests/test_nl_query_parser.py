@@ -7,7 +7,9 @@ from uuid import uuid4
 
 import pytest
 
+from app.config import get_settings
 from app.schemas.nl_query import DateRange, NLQueryParseResponse, ParsedQueryIntent
+from app.services.entity_index import EntityIndex
 
 
 class TestTimeExpressionParsing:
@@ -226,76 +228,70 @@ class TestStatusParsing:
 class TestOrganizationLookup:
     """Tests for organization name resolution."""
 
+    ORG_ID = uuid4()
+
+    @pytest.fixture(autouse=True)
+    def _acme_index(self, entity_index):
+        entity_index.return_value = EntityIndex.build(
+            organizations=[(self.ORG_ID, "Acme Corp", ["AC", "Acme"], None)],
+            tags=[],
+        )
+
     @pytest.mark.asyncio
     async def test_find_organization_exact_match(self):
-        """Should find organization by exact name match."""
+        """Should find organization by exact name match without a query."""
         from app.services.nl_query_parser import NLQueryParser
 
         mock_db = AsyncMock()
-        org_id = uuid4()
+        parser = NLQueryParser(mock_db)
+        result = await parser._find_organization("acme corp")
 
-        # Mock exact match query
-        mock_org = MagicMock()
-        mock_org.id = org_id
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_org
-        mock_db.execute.return_value = mock_result
+        assert result == self.ORG_ID
+        mock_db.execute.assert_not_called()
 
-        parser = NLQueryParser(mock_db)
-        result = await parser._find_organization("Acme Corp")
+    @pytest.mark.asyncio
+    async def test_find_organization_by_alias(self):
+        """Should find organization by alias."""
+        from app.services.nl_query_parser import NLQueryParser
 
-        assert result == org_id
+        parser = NLQueryParser(AsyncMock())
+        result = await parser._find_organization("Acme")
+
+        assert result == self.ORG_ID
 
     @pytest.mark.asyncio
-    async def test_find_organization_not_found(self):
-        """Should return None when organization not found."""
+    async def test_find_organization_fuzzy_match(self):
+        """Should fall back to a trigram match for other spellings."""
         from app.services.nl_query_parser import NLQueryParser
 
         mock_db = AsyncMock()
-
-        # Mock all queries returning None
+        other_id = uuid4()
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_result.scalars.return_value.all.return_value = []
+        mock_result.first.return_value = (other_id, 0.92)
         mock_db.execute.return_value = mock_result
 
         parser = NLQueryParser(mock_db)
-        result = await parser._find_organization("Nonexistent Corp")
+        result = await parser._find_organization("Globex")
 
-        assert result is None
+        assert result == other_id
 
     @pytest.mark.asyncio
-    async def test_find_organization_by_alias(self):
-        """Should find organization by alias."""
+    async def test_find_organization_not_found(self):
+        """Should return None when no organization is similar enough."""
         from app.services.nl_query_parser import NLQueryParser
 
         mock_db = AsyncMock()
-        org_id = uuid4()
-
-        # First query returns None (no exact match)
-        # Second query returns orgs with aliases
-        mock_org = MagicMock()
-        mock_org.id = org_id
-        mock_org.aliases = ["AC", "Acme", "AcmeCorp"]
-
-        def execute_side_effect(stmt):
-            mock_result = MagicMock()
-            # Check if it's the alias query
-            if hasattr(stmt, "_where_criteria") or "aliases" in str(stmt):
-                # Return org with aliases on second call
-                mock_result.scalar_one_or_none.return_value = None
-                mock_result.scalars.return_value.all.return_value = [mock_org]
-            else:
-                mock_result.scalar_one_or_none.return_value = None
-                mock_result.scalars.return_value.all.return_value = []
-            return mock_result
-
-        mock_db.execute.side_effect = execute_side_effect
+        mock_result = MagicMock()
+        mock_result.first.return_value = (uuid4(), 0.2)
+        mock_db.execute.return_value = mock_result
 
         parser = NLQueryParser(mock_db)
-        result = await parser._find_organization("Acme")
+        result = await parser._find_organization("Nonexistent Corp")
+        assert result is None
 
-        assert result == org_id
+        # The miss is memoised for this parser
+        assert await parser._find_organization("Nonexistent Corp") is None
+        assert mock_db.execute.await_count == 1
 
 
 class TestTagLookup:
@@ -374,6 +370,11 @@ class TestTagLookup:
 class TestLLMIntegration:
     """Tests for LLM parsing integration."""
 
+    @pytest.fixture(autouse=True)
+    def _llm_path_only(self, monkeypatch):
+        """These tests exercise the LLM path, so skip the rule-based parser."""
+        monkeypatch.setattr(get_settings(), "nl_rule_parser_enabled", False)
+
     @pytest.mark.asyncio
     async def test_parse_query_with_llm_success(self):
         """Should parse query successfully when LLM responds."""
@@ -673,3 +674,105 @@ class TestParserInitialization:
         # Should have base URL set from settings
         assert parser.base_url is not None
         assert isinstance(parser.base_url, str)
+
+
+class TestParseCache:
+    """Tests for caching parses of repeated queries."""
+
+    LLM_OUTPUT = {
+        "search_text": "projects",
+        "time_expression": "last 2 years",
+        "organization_mention": "Acme",
+        "technologies": ["IoT"],
+        "status_filter": ["active"],
+        "confidence": 0.9,
+    }
+
+    @pytest.fixture(autouse=True)
+    def _llm_path_only(self, monkeypatch):
+        """These tests exercise the LLM path, so skip the rule-based parser."""
+        monkeypatch.setattr(get_settings(), "nl_rule_parser_enabled", False)
+
+    def setup_method(self):
+        """Set up a parser whose LLM call and entity lookups are mocked."""
+        from app.services.nl_query_parser import NLQueryParser
+
+        self.org_id = uuid4()
+        self.tag_id = uuid4()
+        self.parser = NLQueryParser(AsyncMock())
+        self.parser._call_llm = AsyncMock(return_value=dict(self.LLM_OUTPUT))
+        self.parser._find_organization = AsyncMock(return_value=self.org_id)
+        self.parser._find_technology_tags = AsyncMock(return_value=[self.tag_id])
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_skips_llm_and_resolution(self):
+        """A repeated (normalised) query should be answered from the cache."""
+        first = await self.parser.parse_query("IoT projects at Acme, last 2 years")
+        second = await self.parser.parse_query(" iot projects at ACME,  last 2 years")
+
+        assert self.parser._call_llm.await_count == 1
+        assert self.parser._find_organization.await_count == 1
+        assert second.original_query == " iot projects at ACME,  last 2 years"
+        assert second.parsed_intent == first.parsed_intent
+        assert second.parsed_intent.organization_id == self.org_id
+        assert second.parsed_intent.tag_ids == [self.tag_id]
+
+    @pytest.mark.asyncio
+    async def test_entity_change_reresolves_without_llm(self):
+        """A tags/orgs generation bump should re-resolve entities only."""
+        from app.services.cache_service import get_cache_generation
+
+        await self.parser.parse_query("IoT projects at Acme")
+        new_org_id = uuid4()
+        self.parser._find_organization.return_value = new_org_id
+        await get_cache_generation("orgs").bump()
+
+        result = await self.parser.parse_query("IoT projects at Acme")
+
+        assert self.parser._call_llm.await_count == 1
+        assert self.parser._find_organization.await_count == 2
+        assert result.parsed_intent.organization_id == new_org_id
+
+    @pytest.mark.asyncio
+    async def test_new_day_recomputes_relative_dates(self):
+        """Relative time expressions should follow the date they are read on."""
+        from app.services import nl_query_parser
+
+        tomorrow = date.today() + timedelta(days=1)
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return tomorrow
+
+        await self.parser.parse_query("IoT projects in the last 2 years")
+        with patch.object(nl_query_parser, "date", Tomorrow):
+            result = await self.parser.parse_query("IoT projects in the last 2 years")
+
+        assert self.parser._call_llm.await_count == 1
+        assert result.parsed_intent.date_range.end_date == tomorrow
+
+    @pytest.mark.asyncio
+    async def test_fallback_is_not_cached(self):
+        """A failed LLM call should be retried on the next request."""
+        self.parser._call_llm.return_value = None
+        fallback = await self.parser.parse_query("IoT projects")
+        assert fallback.fallback_used is True
+
+        self.parser._call_llm.return_value = dict(self.LLM_OUTPUT)
+        result = await self.parser.parse_query("IoT projects")
+
+        assert result.fallback_used is False
+        assert self.parser._call_llm.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_can_be_disabled(self):
+        """With the cache disabled every parse should call the LLM."""
+        self.parser.settings = MagicMock(
+            nl_parse_cache_enabled=False, nl_rule_parser_enabled=False
+        )
+
+        await self.parser.parse_query("IoT projects")
+        await self.parser.parse_query("IoT projects")
+
+        assert self.parser._call_llm.await_count == 2
@@ -0,0 +1,201 @@
+"""Tests for the rule-based natural language query pre-parser."""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.project import ProjectStatus
+from app.models.tag import TagType
+from app.services.entity_index import EntityIndex
+from app.services.nl_query_rules import (
+    QueryEntityIndex,
+    get_query_entity_index,
+    parse_with_rules,
+)
+
+ACME_ID = uuid4()
+GLOBEX_ID = uuid4()
+IOT_ID = uuid4()
+BLE_ID = uuid4()
+WIFI_ID = uuid4()
+
+
+def make_index() -> QueryEntityIndex:
+    return QueryEntityIndex.build(
+        organizations=[
+            (ACME_ID, "Acme Corporation", ["Acme", "ACME Corp"]),
+            (GLOBEX_ID, "Globex", ["Umbrella Holdings"]),
+            (uuid4(), "Initech", ["Umbrella Holdings"]),
+        ],
+        tags=[
+            (IOT_ID, "IoT"),
+            (BLE_ID, "Bluetooth Low Energy"),
+            (uuid4(), "Bluetooth"),
+            (WIFI_ID, "Wi-Fi"),
+        ],
+    )
+
+
+class TestParseWithRules:
+    """Matching organizations, tags, statuses and time phrases."""
+
+    def setup_method(self):
+        self.index = make_index()
+
+    def test_keyword_query_is_confident(self):
+        """Plain keywords should be parsed without the LLM."""
+        result = parse_with_rules("antenna design", self.index)
+
+        assert result.search_text == "antenna design"
+        assert result.confidence == 1.0
+
+    def test_matches_org_alias_tags_status_and_time(self):
+        """All recognised phrases should be lifted out of the search text."""
+        result = parse_with_rules(
+            "show me active IoT sensor projects for ACME Corp in the last 2 years",
+            self.index,
+        )
+
+        assert result.organization_id == ACME_ID
+        assert result.organization_name == "Acme Corporation"
+        assert result.tag_ids == [IOT_ID]
+        assert result.technology_keywords == ["iot"]
+        assert result.statuses == ["active"]
+        assert result.time_expression == "last 2 years"
+        assert result.search_text == "sensor"
+        assert result.confidence == 1.0
+
+    def test_prefers_longest_phrase(self):
+        """A multi-word tag should win over its first word."""
+        result = parse_with_rules("bluetooth low energy wi fi", self.index)
+
+        assert result.tag_ids == [BLE_ID, WIFI_ID]
+        assert result.search_text == ""
+
+    def test_ambiguous_alias_is_not_an_organization(self):
+        """An alias shared by two organizations should stay search text."""
+        result = parse_with_rules("umbrella holdings", self.index)
+
+        assert result.organization_id is None
+        assert result.search_text == "umbrella holdings"
+
+    def test_multi_word_status(self):
+        """'on hold' should be read as a status, not two words."""
+        result = parse_with_rules("projects on hold since 2022", self.index)
+
+        assert result.statuses == ["on_hold"]
+        assert result.time_expression == "since 2022"
+        assert result.search_text == ""
+
+    def test_language_names_keep_their_symbols(self):
+        """C, C++ and C# should be separate tags, not one "c" phrase."""
+        c_id, cpp_id, csharp_id = uuid4(), uuid4(), uuid4()
+        index = QueryEntityIndex.build(
+            organizations=[],
+            tags=[(c_id, "C"), (cpp_id, "C++"), (csharp_id, "C#")],
+        )
+
+        assert parse_with_rules("C++ firmware", index).tag_ids == [cpp_id]
+        assert parse_with_rules("c# tools", index).tag_ids == [csharp_id]
+        assert parse_with_rules("embedded C", index).tag_ids == [c_id]
+
+    def test_short_leftover_of_a_name_is_not_a_tag(self):
+        """A name reduced to one short token should not become a tag filter."""
+        index = QueryEntityIndex.build(
+            organizations=[(uuid4(), "X.", None)],
+            tags=[(uuid4(), "R&"), (uuid4(), "(V)")],
+        )
+
+        result = parse_with_rules("r v x antenna", index)
+
+        assert result.tag_ids == []
+        assert result.organization_id is None
+        assert result.search_text == "r v x antenna"
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "IoT projects not at Acme",
+            "which projects used Bluetooth",
+            "IoT projects from the past few years",
+            "sensor work before 2020",
+        ],
+    )
+    def test_unhandled_words_need_llm(self, query):
+        """Negations, questions and other time phrases should go to the LLM."""
+        assert parse_with_rules(query, self.index).confidence < 0.8
+
+    def test_long_sentence_needs_llm(self):
+        """A query with many leftover words reads like a sentence."""
+        result = parse_with_rules(
+            "ruggedized enclosure thermal testing for outdoor gateway deployments",
+            self.index,
+        )
+
+        assert result.confidence < 0.8
+
+
+class TestQueryEntityIndexCache:
+    """The phrase index follows the shared entity index."""
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_with_entity_index(self, entity_index):
+        """A new entity index snapshot should produce a new phrase index."""
+        entity_index.return_value = EntityIndex.build(
+            [(ACME_ID, "Acme", None, None)], [(IOT_ID, "IoT", TagType.TECHNOLOGY)]
+        )
+        with patch("app.services.nl_query_rules.get_entity_index", entity_index):
+            first = await get_query_entity_index(AsyncMock())
+            assert await get_query_entity_index(AsyncMock()) is first
+            assert first.organizations[("acme",)] == (ACME_ID, "Acme")
+
+            entity_index.return_value = EntityIndex.build([], [])
+            rebuilt = await get_query_entity_index(AsyncMock())
+
+        assert rebuilt is not first
+        assert rebuilt.organizations == {}
+
+
+class TestParserFastPath:
+    """NLQueryParser uses the rules before the LLM."""
+
+    def setup_method(self):
+        from app.services.nl_query_parser import NLQueryParser
+
+        self.parser = NLQueryParser(AsyncMock())
+        self.parser._call_llm = AsyncMock(
+            return_value={"search_text": "projects", "confidence": 0.9}
+        )
+
+    @pytest.mark.asyncio
+    async def test_confident_query_skips_llm(self):
+        """A query the rules understand should not call the LLM."""
+        with patch(
+            "app.services.nl_query_parser.get_query_entity_index",
+            AsyncMock(return_value=make_index()),
+        ):
+            result = await self.parser.parse_query(
+                "completed IoT projects for Acme this year"
+            )
+
+        self.parser._call_llm.assert_not_awaited()
+        assert result.fallback_used is False
+        assert result.parse_explanation.startswith("Parsed by rules:")
+        intent = result.parsed_intent
+        assert intent.organization_id == ACME_ID
+        assert intent.tag_ids == [IOT_ID]
+        assert intent.status == [ProjectStatus.COMPLETED]
+        assert intent.date_range.original_expression == "this year"
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_query_uses_llm(self):
+        """A query the rules cannot interpret should be parsed by the LLM."""
+        with patch(
+            "app.services.nl_query_parser.get_query_entity_index",
+            AsyncMock(return_value=make_index()),
+        ):
+            result = await self.parser.parse_query("IoT projects without Acme")
+
+        self.parser._call_llm.assert_awaited_once()
+        assert result.parse_explanation.startswith("Parsed by LLM:")
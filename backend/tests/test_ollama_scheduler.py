@@ -0,0 +1,247 @@
+"""Tests for Ollama priority admission control."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.ollama_scheduler import (
+    OllamaPriority,
+    OllamaScheduler,
+    get_ollama_scheduler,
+)
+
+INTERACTIVE = OllamaPriority.INTERACTIVE
+BATCH = OllamaPriority.BATCH
+
+
+async def hold_slot(
+    scheduler: OllamaScheduler,
+    priority: OllamaPriority,
+    release: asyncio.Event,
+    admitted: list[str],
+    name: str,
+) -> None:
+    async with scheduler.slot(priority):
+        admitted.append(name)
+        await release.wait()
+
+
+async def settle() -> None:
+    """Let queued tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestLaneLimits:
+    """Concurrency caps and FIFO queueing per lane."""
+
+    @pytest.mark.asyncio
+    async def test_lane_caps_concurrency(self):
+        """Calls over a lane's cap should wait for a free slot."""
+        scheduler = OllamaScheduler(interactive_concurrency=2)
+        release = asyncio.Event()
+        admitted: list[str] = []
+
+        tasks = [
+            asyncio.create_task(
+                hold_slot(scheduler, INTERACTIVE, release, admitted, f"q{i}")
+            )
+            for i in range(3)
+        ]
+        await settle()
+
+        assert admitted == ["q0", "q1"]
+        assert scheduler.stats["interactive"]["in_flight"] == 2
+        assert scheduler.stats["interactive"]["queued"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert admitted == ["q0", "q1", "q2"]
+        assert scheduler.stats["interactive"]["in_flight"] == 0
+        assert scheduler.stats["interactive"]["admitted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """A call cancelled while queued should not hold a slot."""
+        scheduler = OllamaScheduler(interactive_concurrency=1)
+        release = asyncio.Event()
+        admitted: list[str] = []
+
+        first = asyncio.create_task(
+            hold_slot(scheduler, INTERACTIVE, release, admitted, "first")
+        )
+        queued = asyncio.create_task(
+            hold_slot(scheduler, INTERACTIVE, release, admitted, "queued")
+        )
+        await settle()
+        queued.cancel()
+        await settle()
+
+        assert scheduler.stats["interactive"]["queued"] == 0
+
+        release.set()
+        await first
+        assert admitted == ["first"]
+        assert scheduler.stats["interactive"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_released_on_error(self):
+        """A failing call should give its slot back."""
+        scheduler = OllamaScheduler(interactive_concurrency=1)
+
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot(INTERACTIVE):
+                raise RuntimeError("ollama down")
+
+        assert scheduler.stats["interactive"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_scheduler_admits_everything(self):
+        """A disabled scheduler should not queue or count calls."""
+        scheduler = OllamaScheduler(enabled=False, interactive_concurrency=1)
+
+        async with scheduler.slot(INTERACTIVE), scheduler.slot(INTERACTIVE):
+            pass
+
+        assert scheduler.stats["interactive"]["admitted"] == 0
+
+
+class TestPriority:
+    """Interactive calls take precedence over batch calls."""
+
+    @pytest.mark.asyncio
+    async def test_batch_waits_while_interactive_in_flight(self):
+        """No batch call should start while an interactive call runs."""
+        scheduler = OllamaScheduler(interactive_concurrency=2, batch_concurrency=2)
+        interactive_done = asyncio.Event()
+        batch_done = asyncio.Event()
+        admitted: list[str] = []
+
+        query = asyncio.create_task(
+            hold_slot(scheduler, INTERACTIVE, interactive_done, admitted, "query")
+        )
+        await settle()
+        chunk = asyncio.create_task(
+            hold_slot(scheduler, BATCH, batch_done, admitted, "chunk")
+        )
+        await settle()
+
+        assert admitted == ["query"]
+        assert scheduler.stats["batch"]["queued"] == 1
+
+        interactive_done.set()
+        await query
+        await settle()
+        assert admitted == ["query", "chunk"]
+
+        batch_done.set()
+        await chunk
+
+    @pytest.mark.asyncio
+    async def test_interactive_admitted_before_queued_batch(self):
+        """Queued interactive calls should be admitted ahead of queued batch."""
+        scheduler = OllamaScheduler(interactive_concurrency=1, batch_concurrency=1)
+        running_batch = asyncio.Event()
+        release = asyncio.Event()
+        admitted: list[str] = []
+
+        first = asyncio.create_task(
+            hold_slot(scheduler, BATCH, running_batch, admitted, "batch-1")
+        )
+        await settle()
+        tasks = [
+            asyncio.create_task(
+                hold_slot(scheduler, BATCH, release, admitted, "batch-2")
+            ),
+        ]
+        await settle()
+        tasks.append(
+            asyncio.create_task(
+                hold_slot(scheduler, INTERACTIVE, release, admitted, "query")
+            )
+        )
+        await settle()
+
+        # Interactive has its own lane: it runs beside the batch call
+        assert admitted == ["batch-1", "query"]
+
+        running_batch.set()
+        await first
+        await settle()
+        # batch-2 stays queued while the query is in flight
+        assert admitted == ["batch-1", "query"]
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert admitted == ["batch-1", "query", "batch-2"]
+
+
+class TestAdaptiveBatchLimit:
+    """Batch concurrency follows observed latency."""
+
+    @staticmethod
+    def batch_limit(scheduler: OllamaScheduler) -> int:
+        return scheduler.stats["batch"]["limit"]
+
+    def test_slow_batch_call_halves_limit(self):
+        """A batch call over the target latency should halve the cap."""
+        scheduler = OllamaScheduler(batch_concurrency=4, batch_target_latency_ms=100)
+
+        scheduler._adapt_batch_limit(500, succeeded=True)
+        assert self.batch_limit(scheduler) == 2
+
+        scheduler._adapt_batch_limit(10, succeeded=False)
+        scheduler._adapt_batch_limit(10, succeeded=False)
+        assert self.batch_limit(scheduler) == 1
+
+    def test_fast_batch_calls_grow_limit_to_maximum(self):
+        """Fast batch calls should grow the cap back one step at a time."""
+        scheduler = OllamaScheduler(batch_concurrency=3, batch_target_latency_ms=100)
+        scheduler._adapt_batch_limit(500, succeeded=True)
+        assert self.batch_limit(scheduler) == 1
+
+        scheduler._adapt_batch_limit(10, succeeded=True)
+        assert self.batch_limit(scheduler) == 2
+        scheduler._adapt_batch_limit(10, succeeded=True)
+        scheduler._adapt_batch_limit(10, succeeded=True)
+        assert self.batch_limit(scheduler) == 3
+
+        for _ in range(10):
+            scheduler._adapt_batch_limit(10, succeeded=True)
+        assert self.batch_limit(scheduler) == 3
+
+
+class TestEmbeddingLanes:
+    """Embedding callers are scheduled in their lane."""
+
+    @pytest.mark.asyncio
+    async def test_embedding_service_uses_its_priority(self):
+        """Batch embedding calls should be admitted through the batch lane."""
+        from app.services import embedding_service
+        from app.services.embedding_service import (
+            EmbeddingService,
+            FallbackEmbeddingCache,
+        )
+
+        embedding_service._embedding_cache = FallbackEmbeddingCache(
+            redis_url=None, maxsize=10
+        )
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"embedding": [0.1, 0.2]}
+        mock_client.post.return_value = mock_response
+
+        with patch("httpx.AsyncClient") as MockClient:
+            mock_context = AsyncMock()
+            mock_context.__aenter__.return_value = mock_client
+            mock_context.__aexit__.return_value = None
+            MockClient.return_value = mock_context
+
+            service = EmbeddingService(priority=BATCH)
+            assert await service.generate_embedding("chunk text") == [0.1, 0.2]
+
+        stats = get_ollama_scheduler().stats
+        assert stats["batch"]["admitted"] == 1
+        assert stats["interactive"]["admitted"] == 0
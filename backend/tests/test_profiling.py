@@ -0,0 +1,198 @@
+"""Tests for on-demand request/job profiling."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiler import OTHER_TASKS_ROOT, PROFILED_ROOT, SamplingProfiler
+from app.middleware.timing import RequestContextMiddleware
+from app.services.cache_service import reset_caches
+from app.services.profiling_service import (
+    arm_target,
+    create_profile_token,
+    get_armed_targets,
+    get_profile,
+    list_profiles,
+    maybe_profile,
+    verify_profile_token,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache():
+    """Use a fresh in-memory profile store per test."""
+    reset_caches()
+    yield
+    reset_caches()
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def _crunch() -> None:
+    _busy(0.1)
+
+
+class TestProfileToken:
+    """Tests for signed profile tokens."""
+
+    def test_round_trip(self):
+        """Test that a fresh token identifies its issuer."""
+        user_id = uuid4()
+        token, _expires_at = create_profile_token(user_id)
+
+        assert verify_profile_token(token) == str(user_id)
+
+    def test_tampered_token_rejected(self):
+        """Test that changing the user or expiry invalidates the signature."""
+        token, _ = create_profile_token(uuid4())
+        expires_at, _user, signature = token.split(".")
+
+        assert verify_profile_token(f"{expires_at}.{uuid4()}.{signature}") is None
+        assert (
+            verify_profile_token(f"{int(expires_at) + 1}.{_user}.{signature}") is None
+        )
+        assert verify_profile_token("garbage") is None
+
+    def test_expired_token_rejected(self):
+        """Test that tokens stop working after their TTL."""
+        with patch("app.services.profiling_service.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(
+                profile_token_ttl_seconds=-1, secret_key="x" * 32
+            )
+            token, _ = create_profile_token(uuid4())
+
+            assert verify_profile_token(token) is None
+
+
+class TestSamplingProfiler:
+    """Tests for the sampling profiler."""
+
+    @pytest.mark.asyncio
+    async def test_attributes_child_tasks_to_profiled_root(self):
+        """Test that work in tasks started by the profiled task is attributed."""
+        loop = asyncio.get_running_loop()
+        factory_before = loop.get_task_factory()
+        profiler = SamplingProfiler(interval_ms=2)
+
+        profiler.start()
+        try:
+            await asyncio.gather(_crunch(), _crunch())
+        finally:
+            profiler.stop()
+
+        folded = profiler.folded()
+        assert profiler.profiled_samples > 10
+        assert any(
+            line.startswith(PROFILED_ROOT) and ":_crunch;" in line
+            for line in folded.splitlines()
+        )
+        assert loop.get_task_factory() is factory_before
+
+    @pytest.mark.asyncio
+    async def test_other_tasks_kept_separate(self):
+        """Test that concurrent unrelated tasks are not attributed to the profile."""
+
+        async def unrelated() -> None:
+            await asyncio.sleep(0.01)
+            _busy(0.1)
+
+        other = asyncio.create_task(unrelated())  # Started before profiling
+        profiler = SamplingProfiler(interval_ms=2)
+
+        profiler.start()
+        try:
+            await other
+        finally:
+            profiler.stop()
+
+        lines = profiler.folded().splitlines()
+        assert any(
+            line.startswith(OTHER_TASKS_ROOT) and ":unrelated" in line for line in lines
+        )
+        assert not any(
+            line.startswith(PROFILED_ROOT) and ":unrelated" in line for line in lines
+        )
+
+
+class TestArmedTargets:
+    """Tests for profiling armed jobs and documents."""
+
+    @pytest.mark.asyncio
+    async def test_unarmed_target_not_profiled(self):
+        """Test that nothing is recorded for targets nobody armed."""
+        async with maybe_profile(set(), "job", uuid4(), "job:test") as handle:
+            pass
+
+        assert handle is None
+        assert await list_profiles() == []
+
+    @pytest.mark.asyncio
+    async def test_armed_target_profiled_once(self):
+        """Test that an armed job is profiled, stored and disarmed."""
+        job_id = uuid4()
+        await arm_target("job", job_id)
+        armed = await get_armed_targets()
+        assert ("job", str(job_id)) in armed
+
+        async with maybe_profile(armed, "job", job_id, "job:test") as handle:
+            await _crunch()
+
+        profile = await get_profile(handle.profile_id)
+        assert profile["kind"] == "job"
+        assert profile["label"] == "job:test"
+        assert ":_crunch" in profile["folded"]
+        assert [p["profile_id"] for p in await list_profiles()] == [handle.profile_id]
+        assert await get_armed_targets() == set()
+
+
+class TestRequestProfiling:
+    """Tests for profiling via the request middleware."""
+
+    @pytest.fixture
+    def client(self):
+        """Test client for an app wrapped in the middleware."""
+        test_app = FastAPI()
+        test_app.add_middleware(RequestContextMiddleware)
+
+        @test_app.get("/items/{item_id}")
+        async def get_item(item_id: int) -> dict:
+            await _crunch()
+            return {"item_id": item_id}
+
+        with patch("app.services.metrics_service.get_metrics_service"):
+            yield TestClient(test_app)
+
+    def test_valid_token_profiles_request(self, client):
+        """Test that a signed header yields a stored profile."""
+        token, _ = create_profile_token(uuid4())
+
+        response = client.get("/items/1", headers={"X-NPD-Profile": token})
+
+        profile_id = response.headers["X-Profile-Id"]
+        profile = asyncio.run(get_profile(profile_id))
+        assert profile["kind"] == "request"
+        assert profile["label"] == "GET /items/{item_id}"
+        assert ":_crunch" in profile["folded"]
+
+    def test_no_header_no_profile(self, client):
+        """Test that requests without the header are not profiled."""
+        response = client.get("/items/1")
+
+        assert "X-Profile-Id" not in response.headers
+        assert asyncio.run(list_profiles()) == []
+
+    def test_invalid_token_ignored(self, client):
+        """Test that a bad token does not profile or fail the request."""
+        response = client.get("/items/1", headers={"X-NPD-Profile": "1.2.3"})
+
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
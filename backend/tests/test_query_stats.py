@@ -0,0 +1,221 @@
+"""Tests for per-request SQL statement statistics and N+1 detection."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.query_stats import (
+    MAX_TRACKED_REPEATS,
+    QueryStats,
+    QueryStatsRegistry,
+    add_statement_observer,
+    fingerprint,
+    get_query_stats_registry,
+    instrument_engine,
+    record_statement,
+    remove_statement_observer,
+    reset_query_stats_registry,
+    track_queries,
+)
+
+
+@pytest.fixture
+def sqlite_engine():
+    """In-memory SQLite engine with statement instrumentation."""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        for i in range(20):
+            conn.execute(
+                text("INSERT INTO items (id, name) VALUES (:id, :name)"),
+                {"id": i, "name": f"item {i}"},
+            )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    """Isolate the worker-wide registry between tests."""
+    reset_query_stats_registry()
+    yield
+    reset_query_stats_registry()
+
+
+class TestFingerprint:
+    """Tests for statement normalisation."""
+
+    def test_bind_params_and_literals_normalised(self):
+        """Test that parameter styles and literals collapse to ?."""
+        a = fingerprint("SELECT * FROM projects WHERE id = $1 AND name = 'x'")
+        b = fingerprint("SELECT *  FROM projects\n WHERE id = $7 AND name = 'y''s'")
+
+        assert a == b == "SELECT * FROM projects WHERE id = ? AND name = ?"
+
+    def test_in_lists_of_any_length_match(self):
+        """Test that IN lists (with asyncpg casts) share one fingerprint."""
+        one = fingerprint("SELECT 1 FROM tags WHERE id IN ($1::UUID)")
+        three = fingerprint(
+            "SELECT 1 FROM tags WHERE id IN ($1::UUID, $2::UUID, $3::UUID)"
+        )
+
+        assert one == three
+        assert "IN (?+)" in one
+
+    def test_casts_and_identifiers_preserved(self):
+        """Test that ::casts and digits inside identifiers are kept."""
+        result = fingerprint("SELECT pt1.tag_id::text FROM project_tags pt1")
+
+        assert result == "SELECT pt1.tag_id::text FROM project_tags pt1"
+
+
+class TestTracking:
+    """Tests for tracking scopes."""
+
+    def test_no_op_outside_scope(self):
+        """Test that statements outside a scope are ignored."""
+        record_statement("SELECT 1", 1.0)
+
+        assert get_query_stats_registry().summary()["labels"] == []
+
+    def test_nested_scopes_both_count(self):
+        """Test that a statement counts toward every open scope."""
+        with track_queries("outer") as outer:
+            record_statement("SELECT 1", 1.0)
+            with track_queries("inner") as inner:
+                record_statement("SELECT 2", 2.0)
+
+        assert outer.count == 2
+        assert inner.count == 1
+        assert inner.total_ms == 2.0
+
+    def test_repeated_statement_logged_as_n_plus_one(self):
+        """Test that a fingerprint above the threshold is logged."""
+        with (
+            patch("app.core.query_stats.logger") as mock_logger,
+            track_queries("GET /api/v1/projects"),
+        ):
+            for i in range(12):
+                record_statement(f"SELECT * FROM tags WHERE id = {i}", 1.0)
+
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args.args[0] == "n_plus_one_suspected"
+        assert mock_logger.warning.call_args.kwargs["repeats"] == 12
+
+    def test_below_threshold_not_logged(self):
+        """Test that a few repeats are not flagged."""
+        with (
+            patch("app.core.query_stats.logger") as mock_logger,
+            track_queries("GET /api/v1/projects"),
+        ):
+            for i in range(3):
+                record_statement(f"SELECT * FROM tags WHERE id = {i}", 1.0)
+
+        mock_logger.warning.assert_not_called()
+
+    def test_instrumented_engine_counts_real_statements(self, sqlite_engine):
+        """Test that engine events feed the active scope."""
+        with track_queries("loop") as stats, sqlite_engine.connect() as conn:
+            for i in range(5):
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": i})
+
+        assert stats.count == 5
+        assert stats.repeated(4) == [("SELECT name FROM items WHERE id = ?", 5)]
+
+    def test_statement_observers_called(self, sqlite_engine):
+        """Test that observers see every timed statement with its parameters."""
+        seen = []
+
+        def observer(statement, parameters, duration_ms, executemany):
+            seen.append((statement, parameters, executemany))
+
+        add_statement_observer(observer)
+        try:
+            with sqlite_engine.connect() as conn:
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": 3})
+        finally:
+            remove_statement_observer(observer)
+
+        assert seen == [("SELECT name FROM items WHERE id = ?", (3,), False)]
+
+
+class TestQueryStatsRegistry:
+    """Tests for worker-wide aggregation."""
+
+    def test_summary_aggregates_per_label(self):
+        """Test per-label totals and flagged statements."""
+        registry = QueryStatsRegistry()
+        light = QueryStats(label="GET /a")
+        light.record("SELECT ?", 1.0)
+        heavy = QueryStats(label="GET /b")
+        for _ in range(15):
+            heavy.record("SELECT * FROM t WHERE id = ?", 2.0)
+
+        registry.observe(light, [])
+        registry.observe(heavy, heavy.repeated(10))
+        registry.observe(heavy, heavy.repeated(10))
+
+        summary = registry.summary()
+        assert summary["labels"][0]["label"] == "GET /b"
+        assert summary["labels"][0]["executions"] == 2
+        assert summary["labels"][0]["avg_statements"] == 15
+        assert summary["labels"][0]["n_plus_one_count"] == 2
+        assert summary["repeated_statements"] == [
+            {
+                "label": "GET /b",
+                "fingerprint": "SELECT * FROM t WHERE id = ?",
+                "occurrences": 2,
+                "max_repeats": 15,
+            }
+        ]
+
+    def test_repeated_statements_bounded(self):
+        """Test that flagged statements are capped."""
+        registry = QueryStatsRegistry()
+        for i in range(MAX_TRACKED_REPEATS + 10):
+            stats = QueryStats(label="job:x")
+            registry.observe(stats, [(f"SELECT {i}", 11)])
+
+        summary = registry.summary(top_n=1000)
+        assert len(summary["repeated_statements"]) == MAX_TRACKED_REPEATS
+
+
+class TestQueryBudgetFixture:
+    """Tests for the query_budget pytest fixture."""
+
+    def test_within_budget(self, query_budget, sqlite_engine):
+        """Test a block inside its budget passes."""
+        with query_budget(2, max_repeats=1) as stats, sqlite_engine.connect() as conn:
+            conn.execute(text("SELECT count(*) FROM items"))
+            conn.execute(text("SELECT name FROM items WHERE id = 1"))
+
+        assert stats.count == 2
+
+    def test_over_budget_fails(self, query_budget, sqlite_engine):
+        """Test exceeding the statement budget fails the test."""
+        with (
+            pytest.raises(AssertionError, match="Query budget exceeded"),
+            query_budget(3),
+            sqlite_engine.connect() as conn,
+        ):
+            for i in range(4):
+                conn.execute(text(f"SELECT name FROM items WHERE id = {i}"))
+
+    def test_repeat_budget_catches_n_plus_one(self, query_budget, sqlite_engine):
+        """Test the per-fingerprint budget catches loops under the total."""
+        with (
+            pytest.raises(AssertionError, match="repeated above budget"),
+            query_budget(10, max_repeats=2),
+            sqlite_engine.connect() as conn,
+        ):
+            for i in range(3):
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": i})
+
+    def test_budget_scope_not_aggregated(self, query_budget):
+        """Test budgets do not pollute the admin statistics."""
+        with query_budget(5):
+            record_statement("SELECT 1", 1.0)
+
+        assert get_query_stats_registry().summary()["labels"] == []
@@ -1,5 +1,6 @@
 """Tests for search service and search_vector model definitions."""
 
+from functools import partial
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
@@ -49,35 +50,38 @@ class TestSearchServiceOptimizations:
 
         service = SearchService(mock_db)
 
-        # Call _get_vector_ranks
-        result = await service._get_vector_ranks("test query", [])
+        with (
+            patch.object(service, "_get_project_text_ranks", return_value={}),
+            patch.object(service, "_get_document_text_ranks", return_value={}),
+            patch.object(service, "_get_vector_ranks") as vector_ranks,
+        ):
+            await service._hybrid_search(
+                query="test",
+                filter_conditions=[],
+                sort_by="relevance",
+                sort_order="desc",
+                page=1,
+                page_size=20,
+                include_documents=True,
+            )
 
-        # Should return empty dict without calling embedding service
-        assert result == {}
+        # The vector branch (and its Ollama call) should not run at all
+        vector_ranks.assert_not_called()
+        assert "vector" not in service.ranking_sources
 
-        # Verify the EXISTS query was executed
+        # Verify the EXISTS query was executed on the request session
         mock_db.execute.assert_called_once()
         call_args = mock_db.execute.call_args[0][0]
         assert "EXISTS" in str(call_args)
 
     @pytest.mark.asyncio
-    async def test_vector_search_proceeds_when_embeddings_exist(self):
-        """Vector search should proceed when embeddings exist in database."""
+    async def test_vector_search_embeds_before_first_statement(self):
+        """No statement should run (and hold a connection) before the embedding."""
         from app.services.search_service import SearchService
 
         # Create mock db session
         mock_db = AsyncMock()
 
-        # First call: EXISTS query returns True
-        # Second call: Vector search query
-        mock_exists_result = MagicMock()
-        mock_exists_result.scalar.return_value = True
-
-        mock_search_result = MagicMock()
-        mock_search_result.all.return_value = []
-
-        mock_db.execute.side_effect = [mock_exists_result, mock_search_result]
-
         service = SearchService(mock_db)
 
         # Mock the embedding service to return None (simulating failure)
@@ -89,9 +93,49 @@ class TestSearchServiceOptimizations:
 
         # Should return empty dict because embedding generation failed
         assert result == {}
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_vector_filter_applied_before_candidate_limit(self):
+        """Filters must restrict the nearest chunks in SQL, not afterwards.
 
-        # First call should be the EXISTS check
-        assert mock_db.execute.call_count >= 1
+        Otherwise a filter excluding the global top-40 chunks leaves no
+        vector matches at all.
+        """
+        from sqlalchemy.dialects import postgresql
+
+        from app.models.project import ProjectStatus
+        from app.services.search_service import SearchService
+
+        project_id = uuid4()
+        mock_db = AsyncMock()
+        mock_search_result = MagicMock()
+        mock_search_result.all.return_value = [
+            MagicMock(project_id=project_id, distance=0.7)
+        ]
+        mock_db.execute.side_effect = [MagicMock(), mock_search_result]
+
+        service = SearchService(mock_db)
+        filters = service._build_filter_conditions(
+            status=[ProjectStatus.ACTIVE],
+            organization_id=None,
+            tag_ids=[uuid4()],
+            owner_id=None,
+        )
+        with patch.object(
+            service.embedding_service, "generate_embedding", return_value=[0.1] * 768
+        ):
+            result = await service._get_vector_ranks("test query", filters)
+
+        # The SQL result is used as is - no second filter query
+        assert result == {project_id: 1}
+        assert mock_db.execute.call_count == 2
+        assert "hnsw.iterative_scan" in str(mock_db.execute.call_args_list[0][0][0])
+        vector_stmt = mock_db.execute.call_args_list[1][0][0]
+        sql = str(vector_stmt.compile(dialect=postgresql.dialect()))
+        nearest = sql[sql.index("FROM (") : sql.index(") AS anon_1")]
+        assert "documents.project_id IN (SELECT projects.id" in nearest
+        assert nearest.index("project_tags") < nearest.index("LIMIT")
 
     @pytest.mark.asyncio
     async def test_hybrid_search_runs_queries_in_parallel(self):
@@ -241,6 +285,308 @@ class TestSearchServiceOptimizations:
         assert result == {}
 
 
+class _QueryCanceled(Exception):
+    """asyncpg's QueryCanceledError, as raised by statement_timeout."""
+
+    sqlstate = "57014"
+
+
+class _BranchSession:
+    """Branch session that honours SET LOCAL statement_timeout.
+
+    A statement slower than the timeout is cancelled "server-side": it waits
+    out the timeout and raises query_canceled, like Postgres would.
+    """
+
+    def __init__(self, result=None, delay: float = 0.0, checkout_delay: float = 0.0):
+        self.result = result if result is not None else MagicMock()
+        self.delay = delay
+        self.checkout_delay = checkout_delay
+        self.timeouts_ms: list[int] = []
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+        return False
+
+    async def connection(self):
+        """Pool checkout; blocks for ``checkout_delay`` like an exhausted pool."""
+        import asyncio
+
+        await asyncio.sleep(self.checkout_delay)
+
+    async def execute(self, stmt, _params=None):
+        import asyncio
+
+        from sqlalchemy.exc import OperationalError
+
+        sql = str(stmt)
+        if sql.startswith("SET LOCAL statement_timeout"):
+            self.timeouts_ms.append(int(sql.rsplit(" ", 1)[1]))
+            return MagicMock()
+        if self.delay:
+            timeout = self.timeouts_ms[-1] / 1000 if self.timeouts_ms else None
+            if timeout is not None and timeout < self.delay:
+                await asyncio.sleep(timeout)
+                raise OperationalError(sql, {}, _QueryCanceled())
+            await asyncio.sleep(self.delay)
+        return self.result
+
+
+class _RequestSession:
+    """Request session whose connection breaks if an execute is cancelled."""
+
+    def __init__(self, result):
+        self.result = result
+        self.statements: list[str] = []
+        # Statements run before each commit
+        self.commits: list[int] = []
+        self.broken = False
+
+    async def commit(self):
+        self.commits.append(len(self.statements))
+
+    async def execute(self, stmt, _params=None):
+        import asyncio
+
+        from sqlalchemy.exc import InterfaceError
+
+        if self.broken:
+            raise InterfaceError(str(stmt), {}, Exception("connection is closed"))
+        self.statements.append(str(stmt))
+        try:
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.broken = True
+            raise
+        return self.result
+
+
+class TestSearchDeadlines:
+    """Tests for per-branch deadlines and partial results."""
+
+    @staticmethod
+    def _settings(**overrides):
+        settings = MagicMock()
+        settings.search_budget_ms = 2500
+        settings.search_project_text_deadline_ms = 1000
+        settings.search_document_text_deadline_ms = 1000
+        settings.search_vector_deadline_ms = 1000
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        return settings
+
+    @staticmethod
+    def _branch_sessions(service, *sessions):
+        """Hand out the given sessions to the branches, in gather order."""
+        pending = list(sessions)
+        service._branch_sessions = lambda: pending.pop(0)
+
+    @staticmethod
+    def _page_result(*projects):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = list(projects)
+        return result
+
+    async def _search(self, service, settings):
+        import time
+
+        service._deadline = time.perf_counter() + settings.search_budget_ms / 1000
+        with (
+            patch("app.services.search_service.get_settings", return_value=settings),
+            patch.object(
+                service.embedding_service,
+                "generate_embedding",
+                AsyncMock(return_value=[0.1] * 768),
+            ),
+        ):
+            return await service._hybrid_search(
+                query="test",
+                filter_conditions=[],
+                sort_by="relevance",
+                sort_order="desc",
+                page=1,
+                page_size=20,
+                include_documents=True,
+            )
+
+    @pytest.mark.asyncio
+    async def test_cancelled_branch_statement_leaves_request_session_usable(self):
+        """A branch cancelled at its deadline must not break result paging."""
+        from app.services.metrics_service import get_metrics_service
+        from app.services.search_service import SearchService
+
+        project_id = uuid4()
+        mock_project = MagicMock(id=project_id)
+        request_db = _RequestSession(self._page_result(mock_project))
+        project_text = _BranchSession()
+        project_text.result.all.return_value = [MagicMock(id=project_id)]
+        document_text = _BranchSession()
+        document_text.result.all.return_value = []
+        vector = _BranchSession(delay=5)
+
+        service = SearchService(request_db)
+        self._branch_sessions(service, project_text, document_text, vector)
+        metrics = get_metrics_service()
+        timeouts_before = metrics.snapshot().search_branch_timeouts["vector"]
+
+        projects, total = await self._search(
+            service, self._settings(search_vector_deadline_ms=50)
+        )
+
+        assert projects == [mock_project]
+        assert total == 1
+        assert service.skipped_sources == {"vector": "deadline"}
+        assert service.ranking_sources == ["project_text", "document_text"]
+        assert (
+            metrics.snapshot().search_branch_timeouts["vector"] == timeouts_before + 1
+        )
+        # The deadline was enforced by Postgres on the branch's own session
+        assert 0 < vector.timeouts_ms[0] <= 50
+        assert all(s.closed for s in (project_text, document_text, vector))
+        # The request transaction was committed before the branches ran;
+        # only the EXISTS check and the page fetch used it, and it still works
+        assert request_db.commits == [1]
+        assert not request_db.broken
+        assert len(request_db.statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_overall_budget_caps_branch_deadlines(self):
+        """No branch should outlive the overall search budget."""
+        import time
+
+        from app.services.search_service import SearchService
+
+        sessions = [_BranchSession(delay=5) for _ in range(3)]
+        service = SearchService(_RequestSession(self._page_result()))
+        self._branch_sessions(service, *sessions)
+
+        started = time.perf_counter()
+        projects, total = await self._search(
+            service, self._settings(search_budget_ms=50)
+        )
+
+        assert time.perf_counter() - started < 1
+        assert (projects, total) == ([], 0)
+        assert set(service.skipped_sources) == {
+            "project_text",
+            "document_text",
+            "vector",
+        }
+        assert service.ranking_sources == []
+        assert all(s.timeouts_ms[0] <= 50 for s in sessions)
+
+    @pytest.mark.asyncio
+    async def test_hung_embedding_call_dropped_at_deadline(self):
+        """The Ollama call is the one part cancelled client-side."""
+        import asyncio
+        import time
+
+        from app.services.search_service import SearchService
+
+        async def hung_embedding(query):
+            await asyncio.sleep(5)
+
+        vector = _BranchSession()
+        vector.result.scalar.return_value = True
+        service = SearchService(_RequestSession(self._page_result()))
+        self._branch_sessions(service, vector)
+        service.embedding_service.generate_embedding = hung_embedding
+
+        started = time.perf_counter()
+        ranks = await service._run_branch(
+            "vector", partial(service._get_vector_ranks, "test", []), 50
+        )
+
+        assert time.perf_counter() - started < 1
+        assert ranks == {}
+        assert service.skipped_sources == {"vector": "deadline"}
+
+    @pytest.mark.asyncio
+    async def test_pool_checkout_bounded_by_deadline(self):
+        """A branch waiting for a pooled connection is dropped at its deadline."""
+        import time
+
+        from app.services.search_service import SearchService
+
+        starved = _BranchSession(checkout_delay=5)
+        service = SearchService(AsyncMock())
+        self._branch_sessions(service, starved)
+
+        started = time.perf_counter()
+        ranks = await service._run_branch(
+            "project_text", partial(service._get_project_text_ranks, "test", []), 50
+        )
+
+        assert time.perf_counter() - started < 1
+        assert ranks == {}
+        assert service.skipped_sources == {"project_text": "deadline"}
+        # No statement ran once the deadline had passed
+        assert starved.timeouts_ms == []
+
+    @pytest.mark.asyncio
+    async def test_pool_timeout_counts_as_deadline(self):
+        """SQLAlchemy's pool timeout should not fail the whole search."""
+        from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+        from app.services.search_service import SearchService
+
+        service = SearchService(AsyncMock())
+        self._branch_sessions(service, _BranchSession())
+
+        async def pool_exhausted(db, deadline_at):
+            raise PoolTimeoutError("QueuePool limit of size 10 overflow 20 reached")
+
+        ranks = await service._run_branch("document_text", pool_exhausted, 50)
+
+        assert ranks == {}
+        assert service.skipped_sources == {"document_text": "deadline"}
+
+    @pytest.mark.asyncio
+    async def test_other_database_errors_propagate(self):
+        """Only statement timeouts count as a missed deadline."""
+        from sqlalchemy.exc import OperationalError
+
+        from app.services.search_service import SearchService
+
+        service = SearchService(AsyncMock())
+        self._branch_sessions(service, _BranchSession())
+
+        async def failing_ranks(db, deadline_at):
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+        with pytest.raises(OperationalError):
+            await service._run_branch("project_text", failing_ranks, 50)
+        assert service.skipped_sources == {}
+
+    @pytest.mark.asyncio
+    async def test_skipped_vector_not_reported_as_contributing(self):
+        """A vector branch that skipped Ollama should not count as fused."""
+        from app.services.search_service import SearchService
+
+        service = SearchService(AsyncMock())
+        self._branch_sessions(service, *(_BranchSession() for _ in range(3)))
+
+        async def unavailable_vector_ranks(*args):
+            service.skipped_sources["vector"] = "circuit_open"
+            return {}
+
+        with (
+            patch.object(service, "_get_project_text_ranks", return_value={}),
+            patch.object(service, "_get_document_text_ranks", return_value={}),
+            patch.object(
+                service, "_get_vector_ranks", side_effect=unavailable_vector_ranks
+            ),
+        ):
+            await self._search(service, self._settings())
+
+        assert service.ranking_sources == ["project_text", "document_text"]
+        assert service.skipped_sources == {"vector": "circuit_open"}
+
+
 class TestNonRelevanceSortPagination:
     """Tests for non-relevance sort modes with pagination (Issue #67 regression tests)."""
 
@@ -619,11 +965,9 @@ class TestVectorQuerySecurity:
         from app.services.search_service import SearchService
 
         mock_db = AsyncMock()
-        mock_exists_result = MagicMock()
-        mock_exists_result.scalar.return_value = True
         mock_search_result = MagicMock()
         mock_search_result.all.return_value = []
-        mock_db.execute.side_effect = [mock_exists_result, mock_search_result]
+        mock_db.execute.return_value = mock_search_result
 
         service = SearchService(mock_db)
 
@@ -634,12 +978,12 @@ class TestVectorQuerySecurity:
         ):
             await service._get_vector_ranks("test query", [])
 
-        # Verify the vector query was called (second call)
-        assert mock_db.execute.call_count >= 2
+        # Verify the vector query was called
+        mock_db.execute.assert_called_once()
 
         # The SQL should NOT contain the literal embedding values
         # It should use :embedding placeholder instead
-        vector_call = mock_db.execute.call_args_list[1]
+        vector_call = mock_db.execute.call_args
         sql_text = str(vector_call[0][0])
 
         # Should NOT contain literal embedding array
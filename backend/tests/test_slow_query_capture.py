@@ -0,0 +1,167 @@
+"""Tests for the opt-in slow-query EXPLAIN capture."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.slow_query_capture import (
+    SlowQueryCaptureService,
+    capture_slow_queries,
+    redact_plan,
+    summarize_plan,
+)
+
+SAMPLE_PLAN = [
+    "Limit  (cost=0.42..8.44 rows=10 width=24) (actual time=612.1..612.3 rows=10 loops=1)",
+    "  ->  Index Scan using ix_document_chunks_embedding_hnsw on document_chunks dc",
+    "        Order By: (embedding <=> '[0.12,0.5,0.33]'::vector)",
+    "  ->  Bitmap Heap Scan on documents d",
+    "        Recheck Cond: (search_vector @@ plainto_tsquery('english'::regconfig, 'acme bridge'::text))",
+    "        ->  Bitmap Index Scan on ix_documents_search_vector",
+    "  ->  Seq Scan on projects",
+    "        Filter: (owner_id = 'c0ffee00-0000-0000-0000-000000000001'::uuid)",
+    "        Buffers: shared hit=42 read=7",
+    "Planning Time: 0.4 ms",
+    "Execution Time: 612.512 ms",
+]
+
+SLOW_SELECT = "SELECT id FROM projects WHERE owner_id = $1::UUID"
+
+
+@pytest.fixture
+def service():
+    """Capture service with a low threshold and no sampling."""
+    capture_service = SlowQueryCaptureService()
+    capture_service.threshold_ms = 100
+    capture_service.sample_rate = 1.0
+    capture_service.interval_seconds = 300
+    capture_service._run_explain = AsyncMock(return_value=SAMPLE_PLAN)
+    return capture_service
+
+
+async def _drain(capture_service: SlowQueryCaptureService) -> None:
+    """Wait for scheduled EXPLAIN tasks."""
+    if capture_service._tasks:
+        await asyncio.gather(*capture_service._tasks)
+
+
+class TestPlanParsing:
+    """Tests for plan redaction and summarisation."""
+
+    def test_redacts_quoted_literals(self):
+        """Test that filter values and query vectors are removed."""
+        plan = "\n".join(redact_plan(SAMPLE_PLAN))
+
+        assert "acme bridge" not in plan
+        assert "c0ffee00" not in plan
+        assert "0.12" not in plan
+        assert "'?'::vector" in plan
+
+    def test_summarizes_indexes_and_seq_scans(self):
+        """Test that HNSW/GIN index use and sequential scans are reported."""
+        indexes, seq_scans, execution_ms = summarize_plan(SAMPLE_PLAN)
+
+        assert indexes == [
+            "ix_document_chunks_embedding_hnsw",
+            "ix_documents_search_vector",
+        ]
+        assert seq_scans == ["projects"]
+        assert execution_ms == 612.512
+
+
+class TestSlowQueryCaptureService:
+    """Tests for sampling, rate limiting and the ring buffer."""
+
+    @pytest.mark.asyncio
+    async def test_captures_slow_select_in_labelled_block(self, service):
+        """Test that a slow labelled SELECT is explained and buffered."""
+        with capture_slow_queries("search:vector"):
+            service.observe(SLOW_SELECT, ("secret-owner",), 250.0, False)
+        await _drain(service)
+
+        service._run_explain.assert_awaited_once_with(SLOW_SELECT, ("secret-owner",))
+        [capture] = service.get_captures()
+        assert capture.label == "search:vector"
+        assert capture.fingerprint == "SELECT id FROM projects WHERE owner_id = ?::UUID"
+        assert capture.duration_ms == 250.0
+        assert capture.indexes_used[0] == "ix_document_chunks_embedding_hnsw"
+        assert "secret-owner" not in repr(capture)
+
+    @pytest.mark.asyncio
+    async def test_ignores_ineligible_statements(self, service):
+        """Test unlabelled, fast, executemany and non-SELECT statements."""
+        service.observe(SLOW_SELECT, (), 250.0, False)
+        with capture_slow_queries("projects:list"):
+            service.observe(SLOW_SELECT, (), 50.0, False)
+            service.observe(SLOW_SELECT, (), 250.0, True)
+            service.observe("UPDATE projects SET name = $1", (), 250.0, False)
+        await _drain(service)
+
+        service._run_explain.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_per_statement_shape(self, service):
+        """Test that one shape is explained once per interval."""
+        with capture_slow_queries("projects:list"):
+            service.observe(SLOW_SELECT, (), 250.0, False)
+            await _drain(service)
+            service.observe(SLOW_SELECT, (), 300.0, False)
+            service.observe("SELECT 1 FROM tags", (), 300.0, False)
+            await _drain(service)
+
+        assert service._run_explain.await_count == 2
+        assert [c.fingerprint for c in service.get_captures()] == [
+            "SELECT ? FROM tags",
+            "SELECT id FROM projects WHERE owner_id = ?::UUID",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_one_explain_in_flight(self, service):
+        """Test that concurrent slow statements do not stack EXPLAINs."""
+        with capture_slow_queries("search:hybrid"):
+            service.observe(SLOW_SELECT, (), 250.0, False)
+            service.observe("SELECT 1 FROM tags", (), 250.0, False)
+        await _drain(service)
+
+        assert service._run_explain.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sampling(self, service):
+        """Test that unsampled statements are skipped."""
+        service.sample_rate = 0.0
+        with capture_slow_queries("search:hybrid"):
+            service.observe(SLOW_SELECT, (), 250.0, False)
+        await _drain(service)
+
+        service._run_explain.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_explain_recorded_redacted(self, service):
+        """Test that EXPLAIN errors are kept without parameter values."""
+        service._run_explain.side_effect = Exception(
+            "invalid input syntax for type uuid: 'secret-owner'"
+        )
+        with (
+            patch("app.services.slow_query_capture.logger"),
+            capture_slow_queries("search:filters"),
+        ):
+            service.observe(SLOW_SELECT, ("secret-owner",), 250.0, False)
+            await _drain(service)
+
+        [capture] = service.get_captures()
+        assert capture.error == "invalid input syntax for type uuid: '?'"
+        assert capture.plan == []
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_and_label_filter(self, service):
+        """Test that the buffer keeps the newest captures."""
+        service.interval_seconds = 0
+        service._captures = type(service._captures)(maxlen=2)
+        for label in ("a", "b", "c"):
+            with capture_slow_queries(label):
+                service.observe(SLOW_SELECT, (), 250.0, False)
+            await _drain(service)
+
+        assert [c.label for c in service.get_captures()] == ["c", "b"]
+        assert [c.label for c in service.get_captures(label="b")] == ["b"]
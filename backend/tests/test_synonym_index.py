@@ -0,0 +1,128 @@
+"""Tests for the in-process synonym component snapshot."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.services import synonym_index
+from app.services.cache_service import get_cache_generation, reset_caches
+from app.services.synonym_index import (
+    PENDING_CHANGES_KEY,
+    SynonymIndex,
+    get_synonym_index,
+    reset_synonym_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_index():
+    reset_caches()
+    reset_synonym_index()
+    yield
+    reset_synonym_index()
+
+
+class TestSynonymIndex:
+    """Tests for component maintenance."""
+
+    def test_components_are_transitive(self):
+        a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+        index = SynonymIndex([(a, b), (c, b)])
+
+        assert index.synonyms_of(a) == {b, c}
+        assert index.synonyms_of(d) == set()
+        assert index.edge_count == 2
+
+    def test_add_edge_merges_components(self):
+        a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+        index = SynonymIndex([(a, b), (c, d)])
+
+        index.add_edge(b, c)
+
+        assert index.synonyms_of(a) == {b, c, d}
+        assert index.synonyms_of(d) == {a, b, c}
+
+    def test_remove_bridge_splits_component(self):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        index = SynonymIndex([(a, b), (b, c)])
+
+        index.remove_edge(c, b)
+
+        assert index.synonyms_of(a) == {b}
+        assert index.synonyms_of(c) == set()
+
+    def test_remove_edge_in_cycle_keeps_component(self):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        index = SynonymIndex([(a, b), (b, c), (c, a)])
+
+        index.remove_edge(a, b)
+
+        assert index.synonyms_of(a) == {b, c}
+
+    def test_drop_tag_removes_node(self):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        index = SynonymIndex([(a, b), (b, c)])
+
+        index.drop_tag(b)
+
+        assert index.synonyms_of(a) == set()
+        assert index.synonyms_of(c) == set()
+        assert index.edge_count == 0
+
+    def test_copy_is_independent(self):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        index = SynonymIndex([(a, b)])
+
+        clone = index.copy()
+        clone.add_edge(b, c)
+
+        assert index.synonyms_of(a) == {b}
+        assert clone.synonyms_of(a) == {b, c}
+
+
+class TestCommitHook:
+    """Tests for applying committed changes to the process snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_commit_applies_changes_without_rebuild(self):
+        a, b = uuid4(), uuid4()
+        mock_db = AsyncMock()
+        result = MagicMock()
+        result.all.return_value = []
+        mock_db.execute.return_value = result
+
+        await get_synonym_index(mock_db)
+        session = SimpleNamespace(info={PENDING_CHANGES_KEY: [("add", a, b)]})
+
+        synonym_index._apply_committed_changes(session)
+        await asyncio.gather(*synonym_index._background_tasks)
+
+        index = await get_synonym_index(mock_db)
+        assert index.synonyms_of(a) == {b}
+        assert PENDING_CHANGES_KEY not in session.info
+        assert await get_cache_generation("tags").get() == 1
+        # Loaded once; the committed change did not force a reload
+        assert mock_db.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_foreign_generation_bump_forces_rebuild(self):
+        mock_db = AsyncMock()
+        result = MagicMock()
+        result.all.return_value = []
+        mock_db.execute.return_value = result
+
+        await get_synonym_index(mock_db)
+        await get_cache_generation("tags").bump()
+        await get_synonym_index(mock_db)
+
+        assert mock_db.execute.call_count == 2
+
+    def test_rollback_discards_changes(self):
+        session = SimpleNamespace(info={PENDING_CHANGES_KEY: [("add", 1, 2)]})
+
+        synonym_index._discard_rolled_back_changes(session)
+
+        assert PENDING_CHANGES_KEY not in session.info
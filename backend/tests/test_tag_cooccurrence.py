@@ -46,18 +46,16 @@ class TestTagCooccurrenceServiceMethod:
         limit_param = sig.parameters["limit"]
         assert limit_param.default == 5
 
-    def test_service_uses_aliased_tables_for_self_join(self):
-        """Service should use SQLAlchemy aliased tables for the self-join query."""
+    def test_service_reads_materialised_cooccurrence(self):
+        """Service should read the maintained co-occurrence table, not self-join."""
         import inspect
 
-        from app.services.tag_suggester import TagSuggester
+        from app.services.tag_stats_service import TagStatsService
 
-        # Get the source code of the method
-        source = inspect.getsource(TagSuggester.get_cooccurrence_suggestions)
+        source = inspect.getsource(TagStatsService.get_cooccurring_tags)
 
-        # Verify aliased tables are used
-        assert "aliased" in source
-        assert "pt1" in source or "pt2" in source  # Alias names from the plan
+        assert "TagCooccurrence" in source
+        assert "aliased" not in source
 
 
 class TestTagCooccurrenceSchema:
@@ -197,9 +195,9 @@ class TestTagCooccurrenceQueryStructure:
         """Query should group results by tag ID."""
         import inspect
 
-        from app.services.tag_suggester import TagSuggester
+        from app.services.tag_stats_service import TagStatsService
 
-        source = inspect.getsource(TagSuggester.get_cooccurrence_suggestions)
+        source = inspect.getsource(TagStatsService.get_cooccurring_tags)
 
         # Verify GROUP BY is present
         assert "group_by" in source.lower()
@@ -208,9 +206,9 @@ class TestTagCooccurrenceQueryStructure:
         """Query should order results by co-occurrence count descending."""
         import inspect
 
-        from app.services.tag_suggester import TagSuggester
+        from app.services.tag_stats_service import TagStatsService
 
-        source = inspect.getsource(TagSuggester.get_cooccurrence_suggestions)
+        source = inspect.getsource(TagStatsService.get_cooccurring_tags)
 
         # Verify ORDER BY with DESC is present
         assert "order_by" in source.lower()
@@ -220,9 +218,9 @@ class TestTagCooccurrenceQueryStructure:
         """Query should apply the limit parameter."""
         import inspect
 
-        from app.services.tag_suggester import TagSuggester
+        from app.services.tag_stats_service import TagStatsService
 
-        source = inspect.getsource(TagSuggester.get_cooccurrence_suggestions)
+        source = inspect.getsource(TagStatsService.get_cooccurring_tags)
 
         # Verify LIMIT is present
         assert ".limit(" in source
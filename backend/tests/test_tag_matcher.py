@@ -0,0 +1,174 @@
+"""Tests for the compiled tag name matcher."""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.services.cache_service import get_cache_generation, reset_caches
+from app.services.tag_matcher import (
+    TagMatcher,
+    get_tag_matcher,
+    reset_tag_matcher,
+    tokenize,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_matcher():
+    """Start every test without a cached matcher."""
+    reset_caches()
+    reset_tag_matcher()
+    yield
+    reset_tag_matcher()
+
+
+class TestTokenize:
+    """Tests for tokenization."""
+
+    def test_splits_letters_and_digits(self):
+        assert tokenize("Python3 and Java / Machine-Learning") == [
+            "python",
+            "3",
+            "and",
+            "java",
+            "machine",
+            "learning",
+        ]
+
+    def test_keeps_symbols_of_language_names(self):
+        """C++, C#, F# and .NET should not collapse to single letters or "net"."""
+        assert tokenize("C++, C#, C and F# on .NET 4.5 with Node.js.") == [
+            "c++",
+            "c#",
+            "c",
+            "and",
+            "f#",
+            "on",
+            ".net",
+            "4.5",
+            "with",
+            "node.js",
+        ]
+
+
+class TestTagMatcher:
+    """Tests for TagMatcher scoring."""
+
+    def test_multi_word_phrase_match(self):
+        """A repeated multi-word tag name should be a full match."""
+        ml_id = uuid4()
+        matcher = TagMatcher.build([(ml_id, "Machine Learning")])
+        tokens = tokenize("machine learning and more machine learning")
+
+        scores = matcher.match(tokens, keywords=set())
+
+        assert scores == {ml_id: 1.0}
+
+    def test_single_occurrence_is_not_full_match(self):
+        """A name seen once should not count as a full match."""
+        tag_id = uuid4()
+        matcher = TagMatcher.build([(tag_id, "Radar")])
+
+        assert matcher.match(tokenize("one radar mention"), keywords=set()) == {}
+
+    def test_overlapping_patterns(self):
+        """Patterns sharing suffixes should all be counted."""
+        short_id = uuid4()
+        long_id = uuid4()
+        matcher = TagMatcher.build([(short_id, "Learning"), (long_id, "Deep Learning")])
+        tokens = tokenize("deep learning, deep learning, learning")
+
+        scores = matcher.match(tokens, keywords=set())
+
+        assert scores == {short_id: 1.0, long_id: 1.0}
+
+    def test_symbol_names_do_not_share_a_pattern(self):
+        """C++ in a document should not match the C# tag (or vice versa)."""
+        cpp_id = uuid4()
+        csharp_id = uuid4()
+        net_id = uuid4()
+        matcher = TagMatcher.build(
+            [(cpp_id, "C++"), (csharp_id, "C#"), (net_id, ".NET")]
+        )
+        tokens = tokenize("Written in C++. The C++ code, not the network net net.")
+
+        scores = matcher.match(tokens, keywords=set())
+
+        assert scores == {cpp_id: 1.0}
+
+    def test_short_and_stop_word_names_not_full_matched(self):
+        """Single-token names under 3 characters or stop words are skipped."""
+        c_id = uuid4()
+        the_id = uuid4()
+        ml_id = uuid4()
+        matcher = TagMatcher.build(
+            [(c_id, "C"), (the_id, "The"), (ml_id, "ML Ops")],
+            stop_words=frozenset({"the"}),
+        )
+        tokens = tokenize("the c code and the c tests, ml ops and ml ops")
+
+        scores = matcher.match(tokens, keywords=set())
+
+        assert scores == {ml_id: 1.0}
+
+    def test_partial_match_from_keywords(self):
+        """Tag words among the keywords should give a partial score."""
+        tag_id = uuid4()
+        matcher = TagMatcher.build([(tag_id, "signal-processing-lab")])
+
+        scores = matcher.match([], keywords={"signal", "processing"})
+
+        assert scores[tag_id] == pytest.approx(0.6 + (2 / 3) * 0.3)
+
+    def test_synonyms_inherit_discounted_score(self):
+        """Synonyms of matched tags should be suggested with a lower score."""
+        js_id = uuid4()
+        ecma_id = uuid4()
+        matcher = TagMatcher.build(
+            [(js_id, "JavaScript"), (ecma_id, "ECMAScript")],
+            synonym_pairs=[(ecma_id, js_id)],
+        )
+
+        scores = matcher.match(tokenize("javascript javascript"), keywords=set())
+
+        assert scores[js_id] == 1.0
+        assert scores[ecma_id] == pytest.approx(0.9)
+
+
+class TestGetTagMatcher:
+    """Tests for the process-wide matcher cache."""
+
+    @staticmethod
+    def _mock_db():
+        tag = MagicMock()
+        tag.id = uuid4()
+        tag.name = "Python"
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [tag]
+        result.all.return_value = []
+        db.execute.return_value = result
+        return db
+
+    @pytest.mark.asyncio
+    async def test_matcher_is_cached(self):
+        """Repeated calls should reuse the compiled matcher."""
+        db = self._mock_db()
+
+        first = await get_tag_matcher(db)
+        second = await get_tag_matcher(db)
+
+        assert first is second
+        assert db.execute.call_count == 2  # tags + synonyms, once
+
+    @pytest.mark.asyncio
+    async def test_generation_bump_rebuilds(self):
+        """Bumping the tags generation should rebuild the matcher."""
+        db = self._mock_db()
+
+        first = await get_tag_matcher(db)
+        await get_cache_generation("tags").bump()
+        second = await get_tag_matcher(db)
+
+        assert first is not second
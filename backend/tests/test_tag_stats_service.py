@@ -0,0 +1,175 @@
+"""Tests for materialised tag usage and co-occurrence statistics."""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.tag_stats_service import TagStatsService
+
+
+def _mock_db(rows=None):
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows or []
+    mock_result.rowcount = 0
+    mock_db.execute.return_value = mock_result
+    return mock_db
+
+
+def _statements(mock_db):
+    return [call[0][0] for call in mock_db.execute.call_args_list]
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _params(stmt) -> dict:
+    return stmt.compile(dialect=postgresql.dialect()).params
+
+
+class TestRecordProjectTagChange:
+    """Tests for incremental delta maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_tags_skip_queries(self):
+        a, b = uuid4(), uuid4()
+        mock_db = _mock_db()
+
+        await TagStatsService(mock_db).record_project_tag_change([a, b], [b, a])
+
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_new_project_increments_usage_and_pairs(self):
+        a, b = uuid4(), uuid4()
+        mock_db = _mock_db()
+
+        await TagStatsService(mock_db).record_project_tag_change([], [a, b])
+
+        usage_stmt, pair_stmt = _statements(mock_db)
+        assert "ON CONFLICT (tag_id) DO UPDATE" in _sql(usage_stmt)
+        assert "tag_cooccurrence" in _sql(pair_stmt)
+
+        usage_params = _params(usage_stmt)
+        assert sorted(v for k, v in usage_params.items() if "usage_count" in k) == [
+            1,
+            1,
+        ]
+        pair_params = _params(pair_stmt)
+        # Both directions of the (a, b) pair are incremented
+        assert [v for k, v in pair_params.items() if "project_count" in k] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_replacing_tag_moves_counts(self):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        mock_db = _mock_db()
+
+        await TagStatsService(mock_db).record_project_tag_change([a, b], [a, c])
+
+        usage_stmt, pair_stmt, cleanup_stmt = _statements(mock_db)
+        usage_deltas = {
+            params_key: value
+            for params_key, value in _params(usage_stmt).items()
+            if "usage_count" in params_key
+        }
+        assert sorted(usage_deltas.values()) == [-1, 1]
+
+        pair_deltas = [v for k, v in _params(pair_stmt).items() if "project_count" in k]
+        assert sorted(pair_deltas) == [-1, -1, 1, 1]
+
+        # Only the decremented pairs are checked for removal
+        cleanup_sql = _sql(cleanup_stmt)
+        assert cleanup_sql.startswith("DELETE FROM tag_cooccurrence")
+        assert "project_count <= " in cleanup_sql
+
+    @pytest.mark.asyncio
+    async def test_single_tag_has_no_pairs(self):
+        mock_db = _mock_db()
+
+        await TagStatsService(mock_db).record_project_tag_change([], [uuid4()])
+
+        assert len(_statements(mock_db)) == 1
+
+    @pytest.mark.asyncio
+    async def test_many_projects_summed_into_one_upsert(self):
+        a, b = uuid4(), uuid4()
+        mock_db = _mock_db()
+
+        await TagStatsService(mock_db).record_project_tag_changes(
+            [([], [a, b]), ([], [a]), ([a], [a])]
+        )
+
+        usage_stmt, pair_stmt = _statements(mock_db)
+        usage_params = _params(usage_stmt)
+        assert sorted(v for k, v in usage_params.items() if "usage_count" in k) == [
+            1,
+            2,
+        ]
+        pair_params = _params(pair_stmt)
+        assert [v for k, v in pair_params.items() if "project_count" in k] == [1, 1]
+
+
+class TestReads:
+    """Tests for reading materialised statistics."""
+
+    @pytest.mark.asyncio
+    async def test_cooccurring_tags_reads_table(self):
+        selected = [uuid4()]
+        tag = MagicMock()
+        mock_db = _mock_db([(tag, 3)])
+
+        results = await TagStatsService(mock_db).get_cooccurring_tags(selected, limit=5)
+
+        assert results == [(tag, 3)]
+        sql = _sql(_statements(mock_db)[0])
+        assert "FROM tags JOIN tag_cooccurrence" in sql
+        assert "project_tags" not in sql
+        assert "LIMIT" in sql
+
+    @pytest.mark.asyncio
+    async def test_cooccurring_tags_empty_selection(self):
+        mock_db = _mock_db()
+
+        assert await TagStatsService(mock_db).get_cooccurring_tags([]) == []
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_popular_tags_reads_usage_counters(self):
+        mock_db = _mock_db()
+
+        await TagStatsService(mock_db).get_popular_tags(limit=3)
+
+        sql = _sql(_statements(mock_db)[0])
+        assert "tag_usage_stats.usage_count DESC" in sql
+        assert "project_tags" not in sql
+
+
+class TestRebuild:
+    """Tests for targeted refresh and full reconciliation."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_tags_recounts_given_tags(self):
+        target = uuid4()
+        mock_db = _mock_db()
+
+        await TagStatsService(mock_db).refresh_tags([target])
+
+        statements = _statements(mock_db)
+        assert len(statements) == 3
+        assert "ANY(:tag_ids)" in str(statements[1])
+        assert mock_db.execute.call_args_list[2][0][1] == {"tag_ids": [target]}
+
+    @pytest.mark.asyncio
+    async def test_reconcile_locks_and_rebuilds(self):
+        mock_db = _mock_db()
+
+        counts = await TagStatsService(mock_db).reconcile()
+
+        statements = [str(s) for s in _statements(mock_db)]
+        assert statements[0].startswith("LOCK TABLE")
+        assert "INSERT INTO tag_usage_stats" in statements[3]
+        assert "INSERT INTO tag_cooccurrence" in statements[4]
+        assert counts == {"tags": 0, "pairs": 0}
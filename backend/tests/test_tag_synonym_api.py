@@ -17,6 +17,7 @@ from app.schemas.tag import (
     TagSynonymListResponse,
     TagWithSynonyms,
 )
+from app.services.synonym_index import reset_synonym_index
 from app.services.tag_synonym_service import TagSynonymService
 
 
@@ -156,6 +157,10 @@ class TestTagSynonymSchemas:
 class TestTagSynonymEndpointLogic:
     """Tests for tag synonym API endpoint logic and service integration."""
 
+    def setup_method(self):
+        """Load the synonym snapshot from each test's mocked edges."""
+        reset_synonym_index()
+
     @pytest.mark.asyncio
     async def test_list_synonyms_returns_paginated_response(self):
         """Test listing synonyms returns paginated data."""
@@ -228,26 +233,18 @@ class TestTagSynonymEndpointLogic:
         mock_result1 = MagicMock()
         mock_result1.scalar_one_or_none.return_value = mock_tag
 
-        # Get synonyms - synonym record
-        mock_synonym_record = MagicMock(spec=TagSynonym)
-        mock_synonym_record.tag_id = tag_id
-        mock_synonym_record.synonym_tag_id = synonym_id
+        # Synonym snapshot load: one (tag_id, synonym_tag_id) edge
         mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.all.return_value = [mock_synonym_record]
+        mock_result2.all.return_value = [(tag_id, synonym_id)]
 
-        # Fetch synonym tag
+        # Fetch synonym tags
         mock_result3 = MagicMock()
-        mock_result3.scalar_one_or_none.return_value = mock_synonym_tag
-
-        # No more synonyms for the synonym
-        mock_result4 = MagicMock()
-        mock_result4.scalars.return_value.all.return_value = []
+        mock_result3.scalars.return_value.all.return_value = [mock_synonym_tag]
 
         mock_db.execute.side_effect = [
             mock_result1,
             mock_result2,
             mock_result3,
-            mock_result4,
         ]
 
         service = TagSynonymService(mock_db)
@@ -8,9 +8,41 @@ import pytest
 from app.models import Tag, TagSynonym, TagType
 from app.models.project import ProjectTag
 from app.schemas.tag import TagSynonymCreate
+from app.services.cache_service import reset_caches
+from app.services.synonym_index import PENDING_CHANGES_KEY, reset_synonym_index
 from app.services.tag_synonym_service import TagSynonymService
 
 
+@pytest.fixture(autouse=True)
+def reset_index():
+    """Each test loads the synonym snapshot from its own mocked edges."""
+    reset_caches()
+    reset_synonym_index()
+    yield
+    reset_synonym_index()
+
+
+def _edges_result(*pairs):
+    """Result of the synonym snapshot query: (tag_id, synonym_tag_id) rows."""
+    result = MagicMock()
+    result.all.return_value = list(pairs)
+    return result
+
+
+def _tags_result(*tags):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(tags)
+    return result
+
+
+def _mock_tag(tag_id, name="Tag", tag_type=TagType.FREEFORM):
+    tag = MagicMock(spec=Tag)
+    tag.id = tag_id
+    tag.name = name
+    tag.type = tag_type
+    return tag
+
+
 class TestGetSynonyms:
     """Tests for get_synonyms method (transitive closure)."""
 
@@ -19,31 +51,13 @@ class TestGetSynonyms:
         """Test that direct synonyms are returned."""
         tag_a_id = uuid4()
         tag_b_id = uuid4()
-
-        mock_tag_b = MagicMock(spec=Tag)
-        mock_tag_b.id = tag_b_id
-        mock_tag_b.name = "Tag B"
-        mock_tag_b.type = TagType.FREEFORM
-
-        mock_synonym = MagicMock(spec=TagSynonym)
-        mock_synonym.tag_id = tag_a_id
-        mock_synonym.synonym_tag_id = tag_b_id
+        mock_tag_b = _mock_tag(tag_b_id, "Tag B")
 
         mock_db = AsyncMock()
-
-        # First query returns the synonym record for tag_a
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.all.return_value = [mock_synonym]
-
-        # Second query returns the tag_b
-        mock_result2 = MagicMock()
-        mock_result2.scalar_one_or_none.return_value = mock_tag_b
-
-        # Third query returns no more synonyms (for tag_b)
-        mock_result3 = MagicMock()
-        mock_result3.scalars.return_value.all.return_value = []
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2, mock_result3]
+        mock_db.execute.side_effect = [
+            _edges_result((tag_a_id, tag_b_id)),
+            _tags_result(mock_tag_b),
+        ]
 
         service = TagSynonymService(mock_db)
         synonyms = await service.get_synonyms(tag_a_id)
@@ -58,57 +72,10 @@ class TestGetSynonyms:
         tag_b_id = uuid4()
         tag_c_id = uuid4()
 
-        # A~B synonym
-        mock_synonym_ab = MagicMock(spec=TagSynonym)
-        mock_synonym_ab.tag_id = tag_a_id
-        mock_synonym_ab.synonym_tag_id = tag_b_id
-
-        # B~C synonym
-        mock_synonym_bc = MagicMock(spec=TagSynonym)
-        mock_synonym_bc.tag_id = tag_b_id
-        mock_synonym_bc.synonym_tag_id = tag_c_id
-
-        mock_tag_b = MagicMock(spec=Tag)
-        mock_tag_b.id = tag_b_id
-        mock_tag_b.name = "Tag B"
-        mock_tag_b.type = TagType.FREEFORM
-
-        mock_tag_c = MagicMock(spec=Tag)
-        mock_tag_c.id = tag_c_id
-        mock_tag_c.name = "Tag C"
-        mock_tag_c.type = TagType.FREEFORM
-
         mock_db = AsyncMock()
-
-        # First query: synonyms of A -> returns A~B
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.all.return_value = [mock_synonym_ab]
-
-        # Second query: fetch tag B
-        mock_result2 = MagicMock()
-        mock_result2.scalar_one_or_none.return_value = mock_tag_b
-
-        # Third query: synonyms of B -> returns B~C (and A~B again but A is visited)
-        mock_result3 = MagicMock()
-        mock_result3.scalars.return_value.all.return_value = [
-            mock_synonym_ab,
-            mock_synonym_bc,
-        ]
-
-        # Fourth query: fetch tag C
-        mock_result4 = MagicMock()
-        mock_result4.scalar_one_or_none.return_value = mock_tag_c
-
-        # Fifth query: synonyms of C -> returns B~C but B is visited
-        mock_result5 = MagicMock()
-        mock_result5.scalars.return_value.all.return_value = [mock_synonym_bc]
-
         mock_db.execute.side_effect = [
-            mock_result1,
-            mock_result2,
-            mock_result3,
-            mock_result4,
-            mock_result5,
+            _edges_result((tag_a_id, tag_b_id), (tag_b_id, tag_c_id)),
+            _tags_result(_mock_tag(tag_b_id, "Tag B"), _mock_tag(tag_c_id, "Tag C")),
         ]
 
         service = TagSynonymService(mock_db)
@@ -119,6 +86,10 @@ class TestGetSynonyms:
         assert tag_b_id in synonym_ids
         assert tag_c_id in synonym_ids
 
+        # The tag fetch is a single IN query over the closure
+        tag_stmt = mock_db.execute.call_args_list[1][0][0]
+        assert "IN" in str(tag_stmt)
+
     @pytest.mark.asyncio
     async def test_get_synonyms_handles_cycles(self):
         """Test that cycles don't cause infinite loops (A~B, B~C, C~A)."""
@@ -126,62 +97,12 @@ class TestGetSynonyms:
         tag_b_id = uuid4()
         tag_c_id = uuid4()
 
-        # Create cycle: A~B, B~C, C~A
-        mock_synonym_ab = MagicMock(spec=TagSynonym)
-        mock_synonym_ab.tag_id = tag_a_id
-        mock_synonym_ab.synonym_tag_id = tag_b_id
-
-        mock_synonym_bc = MagicMock(spec=TagSynonym)
-        mock_synonym_bc.tag_id = tag_b_id
-        mock_synonym_bc.synonym_tag_id = tag_c_id
-
-        mock_synonym_ca = MagicMock(spec=TagSynonym)
-        mock_synonym_ca.tag_id = tag_c_id
-        mock_synonym_ca.synonym_tag_id = tag_a_id
-
-        mock_tag_b = MagicMock(spec=Tag)
-        mock_tag_b.id = tag_b_id
-
-        mock_tag_c = MagicMock(spec=Tag)
-        mock_tag_c.id = tag_c_id
-
         mock_db = AsyncMock()
-
-        # First: synonyms of A -> A~B, C~A
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.all.return_value = [
-            mock_synonym_ab,
-            mock_synonym_ca,
-        ]
-
-        # Fetch B
-        mock_result2 = MagicMock()
-        mock_result2.scalar_one_or_none.return_value = mock_tag_b
-
-        # Fetch C
-        mock_result3 = MagicMock()
-        mock_result3.scalar_one_or_none.return_value = mock_tag_c
-
-        # Synonyms of B -> A~B (A visited), B~C
-        mock_result4 = MagicMock()
-        mock_result4.scalars.return_value.all.return_value = [
-            mock_synonym_ab,
-            mock_synonym_bc,
-        ]
-
-        # Synonyms of C -> B~C (B visited), C~A (A visited)
-        mock_result5 = MagicMock()
-        mock_result5.scalars.return_value.all.return_value = [
-            mock_synonym_bc,
-            mock_synonym_ca,
-        ]
-
         mock_db.execute.side_effect = [
-            mock_result1,
-            mock_result2,
-            mock_result3,
-            mock_result4,
-            mock_result5,
+            _edges_result(
+                (tag_a_id, tag_b_id), (tag_b_id, tag_c_id), (tag_c_id, tag_a_id)
+            ),
+            _tags_result(_mock_tag(tag_b_id), _mock_tag(tag_c_id)),
         ]
 
         service = TagSynonymService(mock_db)
@@ -199,14 +120,30 @@ class TestGetSynonyms:
         tag_id = uuid4()
 
         mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        mock_db.execute.return_value = _edges_result()
 
         service = TagSynonymService(mock_db)
         synonyms = await service.get_synonyms(tag_id)
 
         assert synonyms == []
+        # Only the snapshot load; no tag fetch for an empty closure
+        assert mock_db.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_reused_across_calls(self):
+        """The synonym snapshot should be loaded once per generation."""
+        tag_a_id = uuid4()
+        tag_b_id = uuid4()
+
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = _edges_result((tag_a_id, tag_b_id))
+
+        service = TagSynonymService(mock_db)
+        await service.get_synonym_ids(tag_a_id)
+        await service.get_synonym_ids(tag_b_id)
+        await TagSynonymService(mock_db).get_synonym_ids(tag_a_id)
+
+        assert mock_db.execute.call_count == 1
 
 
 class TestAddSynonym:
@@ -374,61 +311,36 @@ class TestMergeTags:
         synonym_id = uuid4()
         user_id = uuid4()
 
-        # Source has synonym that target doesn't have
-        mock_source_synonym_tag = MagicMock(spec=Tag)
-        mock_source_synonym_tag.id = synonym_id
-
         mock_db = AsyncMock()
+        mock_db.info = {}
 
-        # Mock get_synonyms for source: returns synonym_id
-        mock_result1 = MagicMock()
-        mock_source_synonym_record = MagicMock(spec=TagSynonym)
-        mock_source_synonym_record.tag_id = source_id
-        mock_source_synonym_record.synonym_tag_id = synonym_id
-        mock_result1.scalars.return_value.all.return_value = [
-            mock_source_synonym_record
-        ]
+        # Tag existence checks for add_synonym
+        tag_exists = MagicMock()
+        tag_exists.scalar_one_or_none.return_value = MagicMock(spec=Tag)
+        no_existing = MagicMock()
+        no_existing.scalar_one_or_none.return_value = None
 
-        mock_result2 = MagicMock()
-        mock_result2.scalar_one_or_none.return_value = mock_source_synonym_tag
-
-        mock_result3 = MagicMock()
-        mock_result3.scalars.return_value.all.return_value = []
-
-        # Mock get_synonyms for target: returns empty
-        mock_result4 = MagicMock()
-        mock_result4.scalars.return_value.all.return_value = []
-
-        # Mock add_synonym calls (tag exists check + no existing synonym)
-        mock_result5 = MagicMock()
-        mock_result5.scalar_one_or_none.return_value = MagicMock(spec=Tag)
-        mock_result6 = MagicMock()
-        mock_result6.scalar_one_or_none.return_value = MagicMock(spec=Tag)
-        mock_result7 = MagicMock()
-        mock_result7.scalar_one_or_none.return_value = None
-
-        # Mock ProjectTag queries
-        mock_result8 = MagicMock()
-        mock_result8.all.return_value = []  # target has no projects
-        mock_result9 = MagicMock()
-        mock_result9.scalars.return_value.all.return_value = (
-            []
-        )  # source has no projects
-
-        # Mock delete source tag
-        mock_result10 = MagicMock()
+        # ProjectTag queries: target and source have no projects
+        target_projects = MagicMock()
+        target_projects.all.return_value = []
 
         mock_db.execute.side_effect = [
-            mock_result1,
-            mock_result2,
-            mock_result3,
-            mock_result4,
-            mock_result5,
-            mock_result6,
-            mock_result7,
-            mock_result8,
-            mock_result9,
-            mock_result10,
+            # Snapshot load: source~synonym
+            _edges_result((source_id, synonym_id)),
+            # get_synonyms(source): fetch synonym tag
+            _tags_result(_mock_tag(synonym_id)),
+            # add_synonym(target, synonym)
+            tag_exists,
+            tag_exists,
+            no_existing,
+            target_projects,
+            _tags_result(),
+            # Delete source tag
+            MagicMock(),
+            # Statistics refresh for the target tag
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
         ]
         mock_db.add = MagicMock()
         mock_db.flush = AsyncMock()
@@ -440,6 +352,12 @@ class TestMergeTags:
         assert mock_db.add.called
         # No project updates (no source associations)
         assert result == 0
+        # Changes are recorded for the snapshot until commit
+        assert mock_db.info[PENDING_CHANGES_KEY] == [
+            ("add", target_id, synonym_id),
+            ("drop_tag", source_id),
+        ]
+        assert await service.get_synonym_ids(target_id) == {synonym_id}
 
     @pytest.mark.asyncio
     async def test_merge_tags_updates_project_associations(self):
@@ -450,37 +368,31 @@ class TestMergeTags:
 
         mock_db = AsyncMock()
 
-        # Mock get_synonyms for source and target: both empty
-        mock_result1 = MagicMock()
-        mock_result1.scalars.return_value.all.return_value = []
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.all.return_value = []
-
-        # Mock ProjectTag queries
-        mock_result3 = MagicMock()
-        mock_result3.all.return_value = []  # target has no projects
+        # Target has no projects
+        target_projects = MagicMock()
+        target_projects.all.return_value = []
 
         # Source has one project association
         mock_project_tag = MagicMock(spec=ProjectTag)
         mock_project_tag.project_id = project_id
         mock_project_tag.tag_id = source_id
-        mock_result4 = MagicMock()
-        mock_result4.scalars.return_value.all.return_value = [mock_project_tag]
 
         # Update result
-        mock_result5 = MagicMock()
-        mock_result5.rowcount = 1
-
-        # Delete source tag result
-        mock_result6 = MagicMock()
+        update_result = MagicMock()
+        update_result.rowcount = 1
 
         mock_db.execute.side_effect = [
-            mock_result1,
-            mock_result2,
-            mock_result3,
-            mock_result4,
-            mock_result5,
-            mock_result6,
+            # Snapshot load: no synonyms for source or target
+            _edges_result(),
+            target_projects,
+            _tags_result(mock_project_tag),
+            update_result,
+            # Delete source tag
+            MagicMock(),
+            # Statistics refresh for the target tag
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
         ]
         mock_db.flush = AsyncMock()
 
@@ -622,22 +534,8 @@ class TestGetSynonymIds:
         tag_a_id = uuid4()
         tag_b_id = uuid4()
 
-        # Create mock row with attribute access
-        mock_row = MagicMock()
-        mock_row.tag_id = tag_a_id
-        mock_row.synonym_tag_id = tag_b_id
-
         mock_db = AsyncMock()
-
-        # First query returns the synonym relationship
-        mock_result1 = MagicMock()
-        mock_result1.all.return_value = [mock_row]
-
-        # Second query returns no more synonyms
-        mock_result2 = MagicMock()
-        mock_result2.all.return_value = []
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2]
+        mock_db.execute.return_value = _edges_result((tag_a_id, tag_b_id))
 
         service = TagSynonymService(mock_db)
         result = await service.get_synonym_ids(tag_a_id)
@@ -648,43 +546,20 @@ class TestGetSynonymIds:
 
     @pytest.mark.asyncio
     async def test_get_synonym_ids_transitive(self):
-        """Should include transitive synonyms via BFS."""
+        """Should include transitive synonyms."""
         tag_a_id = uuid4()
         tag_b_id = uuid4()
         tag_c_id = uuid4()
 
-        # Create mock rows with attribute access
-        mock_row_ab = MagicMock()
-        mock_row_ab.tag_id = tag_a_id
-        mock_row_ab.synonym_tag_id = tag_b_id
-
-        mock_row_bc = MagicMock()
-        mock_row_bc.tag_id = tag_b_id
-        mock_row_bc.synonym_tag_id = tag_c_id
-
         mock_db = AsyncMock()
-
-        # First query: synonyms of A -> returns A~B
-        mock_result1 = MagicMock()
-        mock_result1.all.return_value = [mock_row_ab]
-
-        # Second query: synonyms of B -> returns A~B, B~C
-        mock_result2 = MagicMock()
-        mock_result2.all.return_value = [mock_row_ab, mock_row_bc]
-
-        # Third query: synonyms of C -> returns B~C
-        mock_result3 = MagicMock()
-        mock_result3.all.return_value = [mock_row_bc]
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2, mock_result3]
+        mock_db.execute.return_value = _edges_result(
+            (tag_a_id, tag_b_id), (tag_b_id, tag_c_id)
+        )
 
         service = TagSynonymService(mock_db)
         result = await service.get_synonym_ids(tag_a_id)
 
-        assert isinstance(result, set)
-        assert tag_b_id in result
-        assert tag_c_id in result
-        assert tag_a_id not in result
+        assert result == {tag_b_id, tag_c_id}
 
     @pytest.mark.asyncio
     async def test_get_synonym_ids_empty_for_no_synonyms(self):
@@ -692,15 +567,31 @@ class TestGetSynonymIds:
         tag_id = uuid4()
 
         mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        mock_db.execute.return_value = _edges_result()
 
         service = TagSynonymService(mock_db)
         result = await service.get_synonym_ids(tag_id)
 
         assert result == set()
 
+    @pytest.mark.asyncio
+    async def test_get_synonym_ids_sees_uncommitted_changes(self):
+        """Changes recorded on the session should be visible to that session."""
+        tag_a_id = uuid4()
+        tag_b_id = uuid4()
+        tag_c_id = uuid4()
+
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = _edges_result((tag_a_id, tag_b_id))
+        mock_db.info = {PENDING_CHANGES_KEY: [("add", tag_b_id, tag_c_id)]}
+        other_db = AsyncMock()
+
+        service = TagSynonymService(mock_db)
+
+        assert await service.get_synonym_ids(tag_a_id) == {tag_b_id, tag_c_id}
+        # Other sessions still see the committed snapshot
+        assert await TagSynonymService(other_db).get_synonym_ids(tag_a_id) == {tag_b_id}
+
 
 class TestExpandTagIdsWithSynonyms:
     """Tests for expand_tag_ids_with_synonyms method."""
@@ -711,22 +602,8 @@ class TestExpandTagIdsWithSynonyms:
         tag_a_id = uuid4()
         tag_b_id = uuid4()
 
-        # Create mock row with attribute access
-        mock_row_ab = MagicMock()
-        mock_row_ab.tag_id = tag_a_id
-        mock_row_ab.synonym_tag_id = tag_b_id
-
         mock_db = AsyncMock()
-
-        # First query: synonyms of A -> returns A~B
-        mock_result1 = MagicMock()
-        mock_result1.all.return_value = [mock_row_ab]
-
-        # Second query: synonyms of B -> returns A~B (no new ones)
-        mock_result2 = MagicMock()
-        mock_result2.all.return_value = [mock_row_ab]
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2]
+        mock_db.execute.return_value = _edges_result((tag_a_id, tag_b_id))
 
         service = TagSynonymService(mock_db)
         expanded, synonym_map = await service.expand_tag_ids_with_synonyms([tag_a_id])
@@ -738,52 +615,25 @@ class TestExpandTagIdsWithSynonyms:
 
     @pytest.mark.asyncio
     async def test_expand_multiple_tags(self):
-        """Should expand multiple tags with their synonyms."""
+        """Should expand multiple tags with their synonyms in one lookup."""
         tag_a_id = uuid4()
         tag_b_id = uuid4()
         tag_c_id = uuid4()
         tag_d_id = uuid4()
 
-        # Create mock rows with attribute access
-        mock_row_ab = MagicMock()
-        mock_row_ab.tag_id = tag_a_id
-        mock_row_ab.synonym_tag_id = tag_b_id
-
-        mock_row_cd = MagicMock()
-        mock_row_cd.tag_id = tag_c_id
-        mock_row_cd.synonym_tag_id = tag_d_id
-
         mock_db = AsyncMock()
-
-        # First tag (A) has synonym B
-        mock_result1 = MagicMock()
-        mock_result1.all.return_value = [mock_row_ab]
-        mock_result2 = MagicMock()
-        mock_result2.all.return_value = [mock_row_ab]
-
-        # Second tag (C) has synonym D
-        mock_result3 = MagicMock()
-        mock_result3.all.return_value = [mock_row_cd]
-        mock_result4 = MagicMock()
-        mock_result4.all.return_value = [mock_row_cd]
-
-        mock_db.execute.side_effect = [
-            mock_result1,
-            mock_result2,
-            mock_result3,
-            mock_result4,
-        ]
+        mock_db.execute.return_value = _edges_result(
+            (tag_a_id, tag_b_id), (tag_c_id, tag_d_id)
+        )
 
         service = TagSynonymService(mock_db)
         expanded, synonym_map = await service.expand_tag_ids_with_synonyms(
             [tag_a_id, tag_c_id]
         )
 
-        assert len(expanded) == 4  # A, B, C, D
-        assert tag_a_id in expanded
-        assert tag_b_id in expanded
-        assert tag_c_id in expanded
-        assert tag_d_id in expanded
+        assert expanded == {tag_a_id, tag_b_id, tag_c_id, tag_d_id}
+        assert synonym_map == {tag_a_id: {tag_b_id}, tag_c_id: {tag_d_id}}
+        assert mock_db.execute.call_count == 1
 
     @pytest.mark.asyncio
     async def test_expand_tags_no_synonyms(self):
@@ -791,9 +641,7 @@ class TestExpandTagIdsWithSynonyms:
         tag_a_id = uuid4()
 
         mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        mock_db.execute.return_value = _edges_result()
 
         service = TagSynonymService(mock_db)
         expanded, synonym_map = await service.expand_tag_ids_with_synonyms([tag_a_id])
@@ -811,15 +659,8 @@ class TestGetTagWithSynonyms:
         tag_id = uuid4()
         synonym_id = uuid4()
 
-        mock_tag = MagicMock(spec=Tag)
-        mock_tag.id = tag_id
-        mock_tag.name = "Main Tag"
-        mock_tag.type = TagType.TECHNOLOGY
-
-        mock_synonym_tag = MagicMock(spec=Tag)
-        mock_synonym_tag.id = synonym_id
-        mock_synonym_tag.name = "Synonym Tag"
-        mock_synonym_tag.type = TagType.TECHNOLOGY
+        mock_tag = _mock_tag(tag_id, "Main Tag", TagType.TECHNOLOGY)
+        mock_synonym_tag = _mock_tag(synonym_id, "Synonym Tag", TagType.TECHNOLOGY)
 
         mock_db = AsyncMock()
 
@@ -827,26 +668,10 @@ class TestGetTagWithSynonyms:
         mock_result1 = MagicMock()
         mock_result1.scalar_one_or_none.return_value = mock_tag
 
-        # Get synonyms - synonym record
-        mock_synonym_record = MagicMock(spec=TagSynonym)
-        mock_synonym_record.tag_id = tag_id
-        mock_synonym_record.synonym_tag_id = synonym_id
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.all.return_value = [mock_synonym_record]
-
-        # Fetch synonym tag
-        mock_result3 = MagicMock()
-        mock_result3.scalar_one_or_none.return_value = mock_synonym_tag
-
-        # No more synonyms for the synonym
-        mock_result4 = MagicMock()
-        mock_result4.scalars.return_value.all.return_value = []
-
         mock_db.execute.side_effect = [
             mock_result1,
-            mock_result2,
-            mock_result3,
-            mock_result4,
+            _edges_result((tag_id, synonym_id)),
+            _tags_result(mock_synonym_tag),
         ]
 
         service = TagSynonymService(mock_db)
@@ -876,10 +701,7 @@ class TestGetTagWithSynonyms:
         """Test that empty synonyms list returned when tag has no synonyms."""
         tag_id = uuid4()
 
-        mock_tag = MagicMock(spec=Tag)
-        mock_tag.id = tag_id
-        mock_tag.name = "Lone Tag"
-        mock_tag.type = TagType.FREEFORM
+        mock_tag = _mock_tag(tag_id, "Lone Tag")
 
         mock_db = AsyncMock()
 
@@ -887,11 +709,7 @@ class TestGetTagWithSynonyms:
         mock_result1 = MagicMock()
         mock_result1.scalar_one_or_none.return_value = mock_tag
 
-        # No synonyms
-        mock_result2 = MagicMock()
-        mock_result2.scalars.return_value.all.return_value = []
-
-        mock_db.execute.side_effect = [mock_result1, mock_result2]
+        mock_db.execute.side_effect = [mock_result1, _edges_result()]
 
         service = TagSynonymService(mock_db)
         result = await service.get_tag_with_synonyms(tag_id)
@@ -1,115 +1,178 @@
-"""Tests for timing middleware."""
+"""Tests for request context and timing middleware."""
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
-from starlette.requests import Request
-from starlette.responses import Response
-
-from app.middleware.timing import SLOW_REQUEST_THRESHOLD_MS, TimingMiddleware
-
-
-class TestTimingMiddleware:
-    """Tests for TimingMiddleware class."""
-
-    @pytest.fixture
-    def mock_request(self):
-        """Create mock request."""
-        request = MagicMock(spec=Request)
-        request.method = "GET"
-        request.url = MagicMock()
-        request.url.path = "/api/v1/test"
-        return request
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.logging import request_id_ctx
+from app.core.server_timing import (
+    DB,
+    OLLAMA,
+    format_server_timing,
+    get_request_timings,
+    record_timing,
+    start_request_timings,
+    stop_request_timings,
+    track_time,
+)
+from app.middleware.timing import SLOW_REQUEST_THRESHOLD_MS, RequestContextMiddleware
+from app.services.metrics_service import UNMATCHED_ROUTE
+
+
+def _build_app() -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(RequestContextMiddleware)
+
+    @test_app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        record_timing(DB, 2.5)
+        record_timing(DB, 1.5)
+        with track_time(OLLAMA):
+            await asyncio.sleep(0)
+        return {"item_id": item_id, "request_id": request_id_ctx.get()}
+
+    @test_app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for i in range(3):
+                yield f"row{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    @test_app.get("/boom")
+    async def boom() -> dict:
+        raise RuntimeError("boom")
+
+    return test_app
+
+
+class TestRequestContextMiddleware:
+    """Tests for RequestContextMiddleware."""
 
     @pytest.fixture
-    def mock_response(self):
-        """Create mock response."""
-        response = MagicMock(spec=Response)
-        response.status_code = 200
-        response.headers = {}
-        return response
-
-    @pytest.mark.asyncio
-    async def test_adds_timing_header(self, mock_request, mock_response):
-        """Test that X-Response-Time-Ms header is added."""
-
-        async def call_next(request):
-            return mock_response
-
-        # Patch at the source module where it's imported
-        with patch(
-            "app.services.metrics_service.get_metrics_service"
-        ) as mock_get_service:
-            mock_service = MagicMock()
-            mock_get_service.return_value = mock_service
-
-            middleware = TimingMiddleware(MagicMock())
-            result = await middleware.dispatch(mock_request, call_next)
-
-            assert "X-Response-Time-Ms" in result.headers
-
-    @pytest.mark.asyncio
-    async def test_records_to_metrics_service(self, mock_request, mock_response):
-        """Test that request is recorded in metrics service."""
-
-        async def call_next(request):
-            return mock_response
-
+    def mock_service(self):
+        """Patch the metrics service at its source module."""
         with patch(
             "app.services.metrics_service.get_metrics_service"
         ) as mock_get_service:
-            mock_service = MagicMock()
-            mock_get_service.return_value = mock_service
-
-            middleware = TimingMiddleware(MagicMock())
-            await middleware.dispatch(mock_request, call_next)
-
-            mock_service.record_request.assert_called_once()
-            call_args = mock_service.record_request.call_args
-            assert call_args.kwargs["method"] == "GET"
-            assert call_args.kwargs["path"] == "/api/v1/test"
-            assert call_args.kwargs["status_code"] == 200
+            service = MagicMock()
+            mock_get_service.return_value = service
+            yield service
 
-    @pytest.mark.asyncio
-    async def test_slow_request_threshold_configured(self):
+    @pytest.fixture
+    def client(self, mock_service):  # noqa: ARG002
+        """Test client for an app wrapped in the middleware."""
+        return TestClient(_build_app(), raise_server_exceptions=False)
+
+    def test_adds_request_id_and_timing_headers(self, client):
+        """Test that request ID and response time headers are added."""
+        response = client.get("/items/1")
+
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == response.json()["request_id"]
+        assert float(response.headers["X-Response-Time-Ms"]) >= 0
+
+    def test_server_timing_breakdown(self, client):
+        """Test that sub-timings are emitted as Server-Timing entries."""
+        response = client.get("/items/1")
+
+        server_timing = response.headers["Server-Timing"]
+        assert 'db;dur=4.0;desc="2x"' in server_timing
+        assert "ollama;dur=" in server_timing
+        assert "total;dur=" in server_timing
+
+    def test_records_route_template(self, client, mock_service):
+        """Test that metrics are keyed on the route template, not the URL."""
+        client.get("/items/123")
+
+        mock_service.record_request.assert_called_once()
+        call_args = mock_service.record_request.call_args
+        assert call_args.kwargs["method"] == "GET"
+        assert call_args.kwargs["path"] == "/items/{item_id}"
+        assert call_args.kwargs["status_code"] == 200
+        assert call_args.kwargs["duration_ms"] >= 0
+
+    def test_unmatched_requests_share_one_label(self, client, mock_service):
+        """Test that requests without a matched route are not keyed by URL."""
+        response = client.get("/does-not-exist/42")
+
+        assert response.status_code == 404
+        call_args = mock_service.record_request.call_args
+        assert call_args.kwargs["path"] == UNMATCHED_ROUTE
+
+    def test_streaming_response_passes_through(self, client, mock_service):
+        """Test that streamed bodies arrive intact with headers set."""
+        response = client.get("/stream")
+
+        assert response.text == "row0\nrow1\nrow2\n"
+        assert "X-Request-ID" in response.headers
+        mock_service.record_request.assert_called_once()
+
+    def test_unhandled_exception_recorded_as_500(self, client, mock_service):
+        """Test that failing requests are still recorded."""
+        client.get("/boom")
+
+        call_args = mock_service.record_request.call_args
+        assert call_args.kwargs["status_code"] == 500
+        assert call_args.kwargs["path"] == "/boom"
+
+    def test_slow_request_threshold_configured(self):
         """Test that slow request threshold constant is defined."""
         assert SLOW_REQUEST_THRESHOLD_MS == 500
 
-    @pytest.mark.asyncio
-    async def test_timing_is_positive(self, mock_request, mock_response):
-        """Test that recorded timing is a positive number."""
 
-        async def call_next(request):
-            return mock_response
+class TestServerTiming:
+    """Tests for contextvar-based sub-timings."""
 
-        with patch(
-            "app.services.metrics_service.get_metrics_service"
-        ) as mock_get_service:
-            mock_service = MagicMock()
-            mock_get_service.return_value = mock_service
+    def test_no_op_outside_request(self):
+        """Test that tracking without an active request does nothing."""
+        record_timing(DB, 5.0)
+        with track_time(DB):
+            pass
 
-            middleware = TimingMiddleware(MagicMock())
-            await middleware.dispatch(mock_request, call_next)
+        assert get_request_timings() == {}
 
-            call_args = mock_service.record_request.call_args
-            assert call_args.kwargs["duration_ms"] >= 0
+    def test_accumulates_per_name(self):
+        """Test that durations and counts accumulate per category."""
+        token = start_request_timings()
+        try:
+            record_timing(DB, 1.0)
+            record_timing(DB, 2.0)
+            record_timing(OLLAMA, 10.0)
 
-    @pytest.mark.asyncio
-    async def test_header_value_is_float_string(self, mock_request, mock_response):
-        """Test that header value is a properly formatted float string."""
-
-        async def call_next(request):
-            return mock_response
-
-        with patch(
-            "app.services.metrics_service.get_metrics_service"
-        ) as mock_get_service:
-            mock_service = MagicMock()
-            mock_get_service.return_value = mock_service
+            assert get_request_timings() == {
+                "db": {"ms": 3.0, "count": 2},
+                "ollama": {"ms": 10.0, "count": 1},
+            }
+        finally:
+            stop_request_timings(token)
 
-            middleware = TimingMiddleware(MagicMock())
-            result = await middleware.dispatch(mock_request, call_next)
-
-            # Should be parseable as float
-            timing_value = float(result.headers["X-Response-Time-Ms"])
-            assert timing_value >= 0
+    @pytest.mark.asyncio
+    async def test_child_tasks_share_request_timings(self):
+        """Test that work in child tasks is attributed to the request."""
+        token = start_request_timings()
+        try:
+
+            async def query():
+                record_timing(DB, 1.0)
+
+            await asyncio.gather(query(), query())
+
+            assert get_request_timings()["db"]["count"] == 2
+        finally:
+            stop_request_timings(token)
+
+    def test_format_server_timing(self):
+        """Test header formatting."""
+        header = format_server_timing(
+            {"ollama": {"ms": 12.5, "count": 1}, "db": {"ms": 3.0, "count": 4}},
+            total_ms=20.123,
+        )
+
+        assert header == (
+            'db;dur=3.0;desc="4x", ollama;dur=12.5;desc="1x", total;dur=20.12'
+        )
@@ -0,0 +1,239 @@
+"""Tests for distributed tracing."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import SpanKind
+from sqlalchemy import create_engine, text
+
+from app.core.query_stats import instrument_engine
+from app.core.server_timing import UPSTREAM, track_time
+from app.core.tracing import (
+    JOB_TRACE_KEY,
+    FileSpanExporter,
+    child_span,
+    continue_trace,
+    current_traceparent,
+    encode_spans,
+    install_tracing,
+    shutdown_tracing,
+)
+from app.middleware.timing import RequestContextMiddleware
+from app.models.document_queue import DocumentQueueOperation
+from app.models.job import JobType
+from app.services.document_queue_service import DocumentQueueService
+from app.services.job_service import JobService
+
+INCOMING_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+INCOMING_TRACEPARENT = f"00-{INCOMING_TRACE_ID}-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def exporter():
+    """Install a tracer exporting synchronously to memory."""
+    memory = InMemorySpanExporter()
+    install_tracing(memory, batch=False)
+    yield memory
+    shutdown_tracing()
+
+
+def _by_name(exporter: InMemorySpanExporter) -> dict:
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def _mock_db() -> AsyncMock:
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    mock_db.add = MagicMock()
+    mock_db.flush = AsyncMock()
+    return mock_db
+
+
+class TestPropagation:
+    """Tests for carrying a trace through queued work."""
+
+    def test_continue_trace_resumes_stored_parent(self, exporter):
+        """Test that queued work joins the trace of the code that enqueued it."""
+        with (
+            continue_trace(None, "POST /documents", kind=SpanKind.SERVER),
+            child_span("enqueue"),
+        ):
+            traceparent = current_traceparent()
+
+        with (
+            continue_trace(None, "POST /cron/document-queue"),
+            continue_trace(traceparent, "document_queue.process"),
+        ):
+            pass
+
+        spans = _by_name(exporter)
+        request, enqueue = spans["POST /documents"], spans["enqueue"]
+        process, cron = (
+            spans["document_queue.process"],
+            spans["POST /cron/document-queue"],
+        )
+        assert process.context.trace_id == request.context.trace_id
+        assert process.parent.span_id == enqueue.context.span_id
+        assert process.kind == SpanKind.CONSUMER
+        assert [link.context.span_id for link in process.links] == [
+            cron.context.span_id
+        ]
+
+    def test_no_tracer_is_no_op(self):
+        """Test that helpers do nothing without an installed tracer."""
+        with continue_trace(INCOMING_TRACEPARENT, "job") as current:
+            assert current is None
+            assert current_traceparent() is None
+
+    def test_child_span_needs_active_trace(self, exporter):
+        """Test that cache and storage calls outside a trace record nothing."""
+        with child_span("cache"), track_time(UPSTREAM):
+            pass
+
+        assert exporter.get_finished_spans() == ()
+
+    @pytest.mark.asyncio
+    async def test_enqueue_stores_traceparent(self, exporter):  # noqa: ARG002
+        """Test that queue rows carry the enqueuing trace."""
+        service = DocumentQueueService(_mock_db())
+
+        with continue_trace(None, "POST /documents"):
+            traceparent = current_traceparent()
+            item = await service.enqueue(uuid4(), DocumentQueueOperation.PROCESS)
+
+        assert item.trace_context == traceparent
+
+    @pytest.mark.asyncio
+    async def test_create_job_stores_traceparent(self, exporter):  # noqa: ARG002
+        """Test that job payloads carry the creating trace."""
+        service = JobService(_mock_db())
+
+        with continue_trace(None, "POST /admin/jira/refresh"):
+            traceparent = current_traceparent()
+            job = await service.create_job(
+                JobType.JIRA_REFRESH, payload={"project_id": "p1"}
+            )
+
+        assert job.payload == {"project_id": "p1", JOB_TRACE_KEY: traceparent}
+
+
+class TestChildSpans:
+    """Tests for spans around backend calls."""
+
+    def test_track_time_names_category_and_caller(self, exporter):
+        """Test that tracked upstream calls become spans named by caller."""
+        with continue_trace(None, "request"), track_time(UPSTREAM):
+            pass
+
+        name = "upstream TestChildSpans.test_track_time_names_category_and_caller"
+        upstream = _by_name(exporter)[name]
+        assert upstream.attributes["npd.category"] == UPSTREAM
+        assert upstream.kind == SpanKind.CLIENT
+
+    def test_sql_statements_recorded(self, exporter):
+        """Test that statements run inside a trace become db spans."""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        try:
+            with continue_trace(None, "job:test"), engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        finally:
+            engine.dispose()
+
+        spans = _by_name(exporter)
+        statement = spans["db SELECT"]
+        assert statement.attributes["db.statement"] == "SELECT 1"
+        assert statement.parent.span_id == spans["job:test"].context.span_id
+        assert statement.end_time >= statement.start_time
+
+
+class TestExport:
+    """Tests for OTLP/JSON encoding and the file exporter."""
+
+    def test_encode_spans_otlp_json(self, exporter):
+        """Test the OTLP/JSON shape of exported spans."""
+        with (
+            continue_trace(INCOMING_TRACEPARENT, "request", kind=SpanKind.SERVER),
+            child_span("storage.read", attempt=2),
+        ):
+            pass
+
+        request = encode_spans(exporter.get_finished_spans())
+        resource_spans = request["resourceSpans"][0]
+        spans = resource_spans["scopeSpans"][0]["spans"]
+        read, root = spans
+
+        assert {"key": "service.name", "value": {"stringValue": "npd-backend"}} in (
+            resource_spans["resource"]["attributes"]
+        )
+        assert root["traceId"] == INCOMING_TRACE_ID
+        assert root["parentSpanId"] == "00f067aa0ba902b7"
+        assert root["kind"] == 2  # SPAN_KIND_SERVER
+        assert read["parentSpanId"] == root["spanId"]
+        assert read["attributes"] == [{"key": "attempt", "value": {"intValue": "2"}}]
+        assert int(read["endTimeUnixNano"]) >= int(read["startTimeUnixNano"])
+
+    def test_file_exporter_appends_lines(self, tmp_path):
+        """Test that each exported batch is one JSON line."""
+        path = tmp_path / "traces.jsonl"
+        install_tracing(FileSpanExporter(str(path)), batch=False)
+        try:
+            with continue_trace(None, "first"):
+                pass
+            with continue_trace(None, "second"):
+                pass
+        finally:
+            shutdown_tracing()
+
+        lines = path.read_text().splitlines()
+        names = [
+            json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"]
+            for line in lines
+        ]
+        assert names == ["first", "second"]
+
+
+class TestRequestSpans:
+    """Tests for request spans from the middleware."""
+
+    @pytest.fixture
+    def client(self):
+        """Test client for an app wrapped in the middleware."""
+        test_app = FastAPI()
+        test_app.add_middleware(RequestContextMiddleware)
+
+        @test_app.get("/items/{item_id}")
+        async def get_item(item_id: int) -> dict:
+            with child_span("storage.read"):
+                return {"item_id": item_id}
+
+        with patch("app.services.metrics_service.get_metrics_service"):
+            yield TestClient(test_app)
+
+    def test_incoming_traceparent_continued(self, client, exporter):
+        """Test that a caller's trace is continued and its ID returned."""
+        response = client.get("/items/1", headers={"traceparent": INCOMING_TRACEPARENT})
+
+        assert response.headers["X-Trace-Id"] == INCOMING_TRACE_ID
+        spans = _by_name(exporter)
+        request = spans["GET /items/{item_id}"]
+        assert request.kind == SpanKind.SERVER
+        assert request.context.trace_id == int(INCOMING_TRACE_ID, 16)
+        assert request.attributes["http.response.status_code"] == 200
+        assert spans["storage.read"].parent.span_id == request.context.span_id
+
+    def test_no_trace_id_without_tracer(self, client):
+        """Test that untraced requests get no trace header."""
+        response = client.get("/items/1")
+
+        assert response.status_code == 200
+        assert "X-Trace-Id" not in response.headers
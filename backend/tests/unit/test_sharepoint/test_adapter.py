@@ -247,6 +247,37 @@ class TestSharePointStorageAdapterRead:
 
         assert "nonexistent" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_read_stream_yields_chunks(self, mock_adapter):
+        """read_stream() yields the download in chunks."""
+        adapter, mock_client = mock_adapter
+
+        async def download_stream(_drive_id, _item_id):
+            yield b"first "
+            yield b"second"
+
+        mock_client.download_stream = MagicMock(side_effect=download_stream)
+
+        chunks = [chunk async for chunk in adapter.read_stream("item123")]
+
+        assert chunks == [b"first ", b"second"]
+        mock_client.download_stream.assert_called_once_with("drv123", "item123")
+
+    @pytest.mark.asyncio
+    async def test_read_stream_not_found_raises_file_not_found(self, mock_adapter):
+        """read_stream() raises FileNotFoundError for missing file."""
+        adapter, mock_client = mock_adapter
+
+        async def download_stream(_drive_id, _item_id):
+            raise SharePointNotFoundError("Not found")
+            yield b""  # pragma: no cover
+
+        mock_client.download_stream = MagicMock(side_effect=download_stream)
+
+        with pytest.raises(FileNotFoundError):
+            async for _ in adapter.read_stream("nonexistent"):
+                pass
+
 
 class TestSharePointStorageAdapterDelete:
     """Tests for delete method."""